@@ -0,0 +1,389 @@
+"""In-memory storage driver for benchmarks.
+
+Implements the subset of ``ObjectStoragePort`` / ``UserAdminPort`` that the
+services call, with the same attribute names as the real data objects, and
+plugs in through the usual driver contract::
+
+    S3_CLIENT_PATH=benchmarks.fake_backend
+    ADMIN_PATH=benchmarks.fake_backend
+
+Dataset size and simulated latency come from the environment:
+
+=========================  =====================================  =======
+Variable                   Meaning                                Default
+=========================  =====================================  =======
+``BENCH_BUCKETS``          number of buckets                      20
+``BENCH_KEYS``             objects per bucket                     2000
+``BENCH_USERS``            storage users                          500
+``BENCH_GROUPS``           groups                                 50
+``BENCH_POLICIES``         policies                               50
+``BENCH_S3_LATENCY_MS``    added to every object storage call     2
+``BENCH_ADMIN_LATENCY_MS`` added to every admin call (CLI-like)   50
+=========================  =====================================  =======
+
+The dataset is built once per process and shared by all clients.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+# ── Data objects (attribute names match the mine_spec models) ────────────────
+
+
+@dataclass
+class Bucket:
+    name: str
+    creation_date: datetime
+
+
+@dataclass
+class ObjectInfo:
+    key: str
+    size: int
+    last_modified: datetime
+    etag: str
+    storage_class: str = 'STANDARD'
+    content_type: str = 'application/octet-stream'
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+class ListObjectsResult:
+    objects: list
+    is_truncated: bool
+    next_continuation_token: Optional[str]
+
+
+@dataclass
+class BucketUsage:
+    objects: int
+    size_bytes: int
+
+
+@dataclass
+class BucketQuota:
+    bucket: str
+    quota_bytes: int
+
+
+@dataclass
+class GroupMembership:
+    name: str
+    policies: list
+
+
+@dataclass
+class User:
+    access_key: str
+    status: str
+    policy_name: str = ''
+    member_of: list = field(default_factory=list)
+
+
+@dataclass
+class GroupList:
+    groups: list
+
+
+@dataclass
+class GroupInfo:
+    status: str
+    group_name: str
+    members: list
+
+
+@dataclass
+class PolicyInfo:
+    policy_name: str
+    policy: dict
+
+
+@dataclass
+class Policy:
+    policy: str
+    is_group: bool
+    policy_info: Optional[PolicyInfo] = None
+
+
+@dataclass
+class ServiceAccount:
+    access_key: str
+
+
+# ── Dataset ──────────────────────────────────────────────────────────────────
+
+
+class Dataset:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self.buckets: dict[str, Bucket] = {}
+        self.objects: dict[str, dict[str, ObjectInfo]] = {}
+        self.sorted_keys: dict[str, list[str]] = {}
+        for b in range(_env_int('BENCH_BUCKETS', 20)):
+            name = f'bench-bucket-{b:03d}'
+            self.buckets[name] = Bucket(name, now)
+            objects = {}
+            for k in range(_env_int('BENCH_KEYS', 2000)):
+                key = f'prefix-{k % 10}/dir-{k % 100:02d}/object-{k:06d}.bin'
+                objects[key] = ObjectInfo(
+                    key=key,
+                    size=1024 * (k % 512 + 1),
+                    last_modified=now,
+                    etag=f'"{k:032x}"',
+                )
+            self.objects[name] = objects
+            self.sorted_keys[name] = sorted(objects)
+
+        group_count = _env_int('BENCH_GROUPS', 50)
+        policy_count = _env_int('BENCH_POLICIES', 50)
+
+        self.policies = {
+            f'policy-{p:03d}': {
+                'Version': '2012-10-17',
+                'Statement': [
+                    {
+                        'Effect': 'Allow',
+                        'Action': ['s3:GetObject', 's3:ListBucket'],
+                        'Resource': [f'arn:aws:s3:::bench-bucket-{p % 20:03d}/*'],
+                    }
+                ],
+            }
+            for p in range(policy_count)
+        }
+        self.groups = {
+            f'group-{g:03d}': {
+                'members': set(),
+                'policies': [f'policy-{g % max(policy_count, 1):03d}'],
+                'status': 'enabled',
+            }
+            for g in range(group_count)
+        }
+        self.users: dict[str, dict] = {}
+        for u in range(_env_int('BENCH_USERS', 500)):
+            name = f'user-{u:05d}'
+            group = f'group-{u % max(group_count, 1):03d}'
+            self.users[name] = {'status': 'enabled', 'groups': [group]}
+            if group in self.groups:
+                self.groups[group]['members'].add(name)
+        self.quotas: dict[str, int] = {}
+
+
+@lru_cache
+def get_dataset() -> Dataset:
+    return Dataset()
+
+
+def _sleep(env: str, default: int) -> None:
+    delay = _env_int(env, default)
+    if delay:
+        time.sleep(delay / 1000)
+
+
+# ── Object storage ───────────────────────────────────────────────────────────
+
+
+class FakeObjectStorage:
+    def __init__(self, data: Dataset) -> None:
+        self.data = data
+
+    def _latency(self) -> None:
+        _sleep('BENCH_S3_LATENCY_MS', 2)
+
+    def _bucket(self, bucket: str) -> dict[str, ObjectInfo]:
+        if bucket not in self.data.objects:
+            raise RuntimeError(f'NoSuchBucket: {bucket}')
+        return self.data.objects[bucket]
+
+    def list_buckets(self):
+        self._latency()
+        return list(self.data.buckets.values())
+
+    def create_bucket(self, name: str):
+        self._latency()
+        with self.data.lock:
+            self.data.buckets[name] = Bucket(name, datetime.now(timezone.utc))
+            self.data.objects[name] = {}
+            self.data.sorted_keys[name] = []
+
+    def delete_bucket(self, name: str):
+        self._latency()
+        with self.data.lock:
+            self.data.buckets.pop(name, None)
+            self.data.objects.pop(name, None)
+            self.data.sorted_keys.pop(name, None)
+
+    def list_objects(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        limit: int = 100,
+        continuation_token: Optional[str] = None,
+    ):
+        self._latency()
+        objects = self._bucket(bucket)
+        keys = self.data.sorted_keys[bucket]
+        start = bisect_left(keys, prefix or '')
+        if continuation_token:
+            start = max(start, bisect_right(keys, continuation_token))
+        page: list[ObjectInfo] = []
+        for key in keys[start:]:
+            if prefix and not key.startswith(prefix):
+                break
+            if len(page) == limit:
+                return ListObjectsResult(page, True, page[-1].key)
+            page.append(objects[key])
+        return ListObjectsResult(page, False, None)
+
+    def get_bucket_usage(self, bucket: str):
+        self._latency()
+        objects = self._bucket(bucket)
+        return BucketUsage(len(objects), sum(o.size for o in objects.values()))
+
+    def get_bucket_policy(self, bucket: str):
+        self._latency()
+        return None
+
+    def get_bucket_versioning_status(self, bucket: str):
+        self._latency()
+        return 'Suspended'
+
+    def get_object_metadata(self, bucket: str, key: str):
+        self._latency()
+        try:
+            return self._bucket(bucket)[key]
+        except KeyError:
+            raise RuntimeError(f'NoSuchKey: {key}')
+
+    def get_object_tags(self, bucket: str, key: str):
+        self._latency()
+        return {}
+
+    def delete_object(self, bucket: str, key: str):
+        self._latency()
+        with self.data.lock:
+            if self._bucket(bucket).pop(key, None) is not None:
+                self.data.sorted_keys[bucket].remove(key)
+
+    def generate_download_url(self, bucket: str, key: str, expires_in: int = 3600):
+        return f'http://fake/{bucket}/{key}?expires={expires_in}'
+
+    def generate_upload_url(self, bucket: str, key: str, expires_in: int = 3600):
+        return f'http://fake/{bucket}/{key}?upload&expires={expires_in}'
+
+
+# ── Admin ────────────────────────────────────────────────────────────────────
+
+
+class FakeAdmin:
+    def __init__(self, data: Dataset) -> None:
+        self.data = data
+
+    def _latency(self) -> None:
+        _sleep('BENCH_ADMIN_LATENCY_MS', 50)
+
+    def setup(self) -> None:
+        pass
+
+    def _user(self, name: str) -> User:
+        info = self.data.users.get(name)
+        if info is None:
+            raise RuntimeError(f'user not found: {name}')
+        return User(
+            access_key=name,
+            status=info['status'],
+            member_of=[
+                GroupMembership(g, self.data.groups.get(g, {}).get('policies', []))
+                for g in info['groups']
+            ],
+        )
+
+    def list_users(self):
+        self._latency()
+        return [self._user(name) for name in self.data.users]
+
+    def get_user(self, username: str):
+        self._latency()
+        return [self._user(username)]
+
+    def create_user(self, username: str, password: str):
+        self._latency()
+        with self.data.lock:
+            if username in self.data.users:
+                raise RuntimeError(f'user already exists: {username}')
+            self.data.users[username] = {'status': 'enabled', 'groups': []}
+        return [self._user(username)]
+
+    def delete_user(self, username: str):
+        self._latency()
+        with self.data.lock:
+            self.data.users.pop(username, None)
+
+    def enable_user(self, username: str):
+        self._latency()
+        self.data.users[username]['status'] = 'enabled'
+
+    def disable_user(self, username: str):
+        self._latency()
+        self.data.users[username]['status'] = 'disabled'
+
+    def list_groups(self):
+        self._latency()
+        return [GroupList(sorted(self.data.groups))]
+
+    def group_info(self, name: str):
+        self._latency()
+        group = self.data.groups.get(name)
+        if group is None:
+            raise RuntimeError(f'group not found: {name}')
+        return [GroupInfo(group['status'], name, sorted(group['members']))]
+
+    def list_policies(self):
+        self._latency()
+        return [
+            Policy(name, False, PolicyInfo(name, document))
+            for name, document in self.data.policies.items()
+        ]
+
+    def get_policy(self, name: str):
+        self._latency()
+        if name not in self.data.policies:
+            raise RuntimeError(f'policy not found: {name}')
+        return [Policy(name, False, PolicyInfo(name, self.data.policies[name]))]
+
+    def get_bucket_quota(self, bucket: str):
+        self._latency()
+        return [BucketQuota(bucket, self.data.quotas.get(bucket, 0))]
+
+    def set_bucket_quota(self, bucket: str, quota: str):
+        self._latency()
+        gib = float(str(quota).rstrip('GiB') or 0)
+        self.data.quotas[bucket] = int(gib * 1024**3)
+        return [BucketQuota(bucket, self.data.quotas[bucket])]
+
+    def list_service_accounts(self, username: str):
+        self._latency()
+        return [ServiceAccount(f'{username}-sa-{i}') for i in range(3)]
+
+
+# ── Driver contract ──────────────────────────────────────────────────────────
+
+
+def get_s3_client(sts_credentials: dict) -> FakeObjectStorage:
+    return FakeObjectStorage(get_dataset())
+
+
+def get_admin_client() -> FakeAdmin:
+    return FakeAdmin(get_dataset())
@@ -0,0 +1,273 @@
+"""Concurrent load benchmark for the HTTP API and the MCP tools.
+
+Runs the real FastAPI app in-process (``httpx`` ASGI transport, no network)
+against :mod:`benchmarks.fake_backend`, so the numbers cover routing, auth,
+caching, the admin executor and serialization — everything but the storage
+backend, whose latency is simulated instead.
+
+For every scenario it fires ``--requests`` calls with ``--concurrency``
+in flight and reports throughput and latency percentiles::
+
+    scenario                        req/s   p50 ms   p95 ms   p99 ms  errors
+
+Dataset size and backend latency are set with the flags below (they map to
+the ``BENCH_*`` variables documented in :mod:`benchmarks.fake_backend`).
+Without ``REDIS_HOST`` the response cache is off and the ``search``
+scenario (which needs Redis) is skipped; point it at a local Redis to
+measure warm-cache behaviour.
+
+Run with::
+
+    poetry run python -m benchmarks.load_bench
+    poetry run python -m benchmarks.load_bench --concurrency 64 \\
+        --admin-latency-ms 200 --only users users_page mcp_list_users
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Awaitable, Callable
+
+FAKE_BACKEND = 'benchmarks.fake_backend'
+
+# Required settings with harmless values, so the benchmark runs without a
+# .env file. Explicit environment variables still win.
+_DEFAULT_ENV = {
+    'S3_REGION': 'us-east-1',
+    'S3_ENDPOINT': 'localhost:9000',
+    'S3_ACCESS_KEY': 'bench',
+    'S3_SECRET_KEY': 'bench',
+    'KEYCLOAK_URL': 'http://localhost:8080',
+    'KEYCLOAK_REALM': 'bench',
+    'KEYCLOAK_CLIENT_ID': 'bench',
+    'KEYCLOAK_CLIENT_SECRET': 'bench',
+    'OPENID_ROLE_CLAIM': 'realm_access.roles',
+    'ADMIN_ROLE': 'admin',
+    'INTERNAL_TOKEN_SECRET': 'bench-secret',
+    'INTERNAL_TOKEN_EXP_MINUTES': '60',
+}
+
+
+def configure_env(args: argparse.Namespace) -> None:
+    for name, value in _DEFAULT_ENV.items():
+        os.environ.setdefault(name, value)
+    os.environ['S3_CLIENT_PATH'] = FAKE_BACKEND
+    os.environ['ADMIN_PATH'] = FAKE_BACKEND
+    os.environ['BENCH_BUCKETS'] = str(args.buckets)
+    os.environ['BENCH_KEYS'] = str(args.keys)
+    os.environ['BENCH_USERS'] = str(args.users)
+    os.environ['BENCH_GROUPS'] = str(args.groups)
+    os.environ['BENCH_POLICIES'] = str(args.policies)
+    os.environ['BENCH_S3_LATENCY_MS'] = str(args.s3_latency_ms)
+    os.environ['BENCH_ADMIN_LATENCY_MS'] = str(args.admin_latency_ms)
+
+
+def make_token() -> str:
+    """An admin session token, as issued after a real login."""
+    from mine_backend.config import settings
+    from mine_backend.services.session_service import issue_internal_token
+
+    user: dict = {
+        'sub': 'bench',
+        'preferred_username': 'bench',
+        'realm_access': {'roles': [settings.ADMIN_ROLE]},
+    }
+    # Put the admin role wherever OPENID_ROLE_CLAIM points.
+    *parents, leaf = settings.OPENID_ROLE_CLAIM.split('.')
+    node = user
+    for part in parents:
+        node = node.setdefault(part, {})
+    node[leaf] = [settings.ADMIN_ROLE]
+
+    sts = {
+        'access_key': 'bench',
+        'secret_key': 'bench',
+        'session_token': 'bench',
+    }
+    return issue_internal_token(user, sts)
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────────
+
+Call = Callable[[int], Awaitable[None]]
+
+
+def http_scenarios(client, bucket: str, key: str) -> dict[str, Call]:
+    def get(path: str, **params) -> Call:
+        async def call(i: int) -> None:
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+
+        return call
+
+    async def objects_deep(i: int) -> None:
+        # Walk three pages, as the object browser does when scrolling.
+        token = None
+        for _ in range(3):
+            params = {'bucket': bucket, 'limit': 100}
+            if token:
+                params['continuation_token'] = token
+            response = await client.get('/objects', params=params)
+            response.raise_for_status()
+            token = response.json()['data'].get('next_continuation_token')
+            if not token:
+                break
+
+    async def search(i: int) -> None:
+        response = await client.post('/search', json={'query': 'object-0001'})
+        response.raise_for_status()
+        search_id = response.json()['data']['search_id']
+        async with client.stream('GET', f'/search/{search_id}/stream') as r:
+            r.raise_for_status()
+            async for _ in r.aiter_bytes():
+                pass
+
+    return {
+        'buckets': get('/buckets'),
+        'bucket_usage': get(f'/buckets/{bucket}/usage'),
+        'objects': get('/objects', bucket=bucket, limit=100),
+        'objects_prefix': get('/objects', bucket=bucket, prefix='prefix-3/'),
+        'objects_deep': objects_deep,
+        'object_metadata': get('/objects/metadata', bucket=bucket, key=key),
+        'quotas': get('/quotas'),
+        'users': get('/users'),
+        'users_page': get('/users', limit=50, sort='status'),
+        'groups': get('/groups'),
+        'policies': get('/policies'),
+        'search': search,
+    }
+
+
+def mcp_scenarios(mcp, token: str, bucket: str) -> dict[str, Call]:
+    def tool(name: str, **arguments) -> Call:
+        async def call(i: int) -> None:
+            await mcp.call_tool(name, {'token': token, **arguments})
+
+        return call
+
+    return {
+        'mcp_list_buckets': tool('list_buckets'),
+        'mcp_list_objects': tool('list_objects', bucket=bucket),
+        'mcp_list_users': tool('list_users'),
+        'mcp_list_policies': tool('list_policies'),
+    }
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank.
+    index = math.ceil(p / 100 * len(sorted_values)) - 1
+    return sorted_values[min(max(index, 0), len(sorted_values) - 1)]
+
+
+async def run_scenario(
+    call: Call, requests: int, concurrency: int
+) -> tuple[float, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    from mine_backend.core.redis import redis
+    from mine_backend.main import app
+    from mine_backend.mcp.server import mcp
+
+    from benchmarks.fake_backend import get_dataset
+
+    # main.py logs at DEBUG; one JSON line per request would drown the table.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    dataset = get_dataset()
+    bucket = next(iter(dataset.buckets))
+    key = dataset.sorted_keys[bucket][len(dataset.sorted_keys[bucket]) // 2]
+    token = make_token()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url='http://bench',
+        headers={'Authorization': f'Bearer {token}'},
+        timeout=None,
+    ) as client:
+        scenarios = http_scenarios(client, bucket, key)
+        if not args.no_mcp:
+            scenarios.update(mcp_scenarios(mcp, token, bucket))
+        if redis is None:
+            scenarios.pop('search')
+        if args.only:
+            scenarios = {n: c for n, c in scenarios.items() if n in args.only}
+
+        print(
+            f'\nconcurrency={args.concurrency} requests={args.requests} '
+            f's3_latency={args.s3_latency_ms}ms '
+            f'admin_latency={args.admin_latency_ms}ms '
+            f'redis={"on" if redis is not None else "off"}'
+        )
+        print(
+            f'{"scenario":<20} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} '
+            f'{"p99 ms":>8} {"errors":>7}'
+        )
+
+        for name, call in scenarios.items():
+            for i in range(args.warmup):
+                await call(i)
+            elapsed, latencies, errors = await run_scenario(
+                call, args.requests, args.concurrency
+            )
+            print(
+                f'{name:<20} {len(latencies) / elapsed:>9.1f} '
+                f'{percentile(latencies, 50) * 1e3:>8.2f} '
+                f'{percentile(latencies, 95) * 1e3:>8.2f} '
+                f'{percentile(latencies, 99) * 1e3:>8.2f} '
+                f'{errors:>7}'
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', nargs='+', help='scenario names to run')
+    parser.add_argument('--no-mcp', action='store_true')
+    parser.add_argument('--buckets', type=int, default=20)
+    parser.add_argument('--keys', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--policies', type=int, default=50)
+    parser.add_argument('--s3-latency-ms', type=int, default=2)
+    parser.add_argument('--admin-latency-ms', type=int, default=50)
+    args = parser.parse_args()
+
+    # Settings are read at import time, so the environment goes first.
+    configure_env(args)
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark for the indexed list snapshots behind the paginated admin lists.
+
+For each list size it times:
+
+* ``build``  – turning the driver result into a snapshot (once per cache TTL);
+* ``page``   – one 50-row page deep into the list (cursor bisect + slice);
+* ``filter`` – the first page of a filtered/sorted view, cold and memoized.
+
+``page`` staying flat while the list grows is the point of the snapshot.
+
+Run with::
+
+    poetry run python -m benchmarks.pagination_bench
+"""
+
+import argparse
+import time
+
+from mine_backend.core.pagination import encode_cursor
+from mine_backend.services.listing import user_snapshot
+
+
+def make_users(size: int) -> dict:
+    return {
+        f'user{i:06d}': {
+            'status': 'enabled' if i % 7 else 'disabled',
+            'member_of': [{'name': f'group-{i % 40}'}],
+        }
+        for i in range(size)
+    }
+
+
+def _time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 50000],
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f'{"size":>7} {"build ms":>9} {"page µs":>8} '
+        f'{"filter ms":>10} {"filter memo µs":>15}'
+    )
+
+    for size in args.sizes:
+        users = make_users(size)
+        build_s = _time(lambda: user_snapshot(users), args.repeat)
+
+        snapshot = user_snapshot(users)
+        keys, _ = snapshot._order('username')
+        middle = encode_cursor(['username', 'asc', list(keys[size // 2])])
+        page_s = _time(
+            lambda: snapshot.page(limit=50, cursor=middle), args.repeat
+        )
+
+        def filtered():
+            return snapshot.page(
+                limit=50,
+                sort='status',
+                filters={'groups': 'group-3', 'status': 'enabled'},
+            )
+
+        def cold():
+            snapshot._views.clear()
+            filtered()
+
+        filter_s = _time(cold, args.repeat)
+        memo_s = _time(filtered, args.repeat)
+
+        print(
+            f'{size:>7} {build_s * 1e3:>9.2f} {page_s * 1e6:>8.1f} '
+            f'{filter_s * 1e3:>10.2f} {memo_s * 1e6:>15.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Startup benchmark: from interpreter start to a ready app.
+
+Each run is a fresh interpreter (imports are cached per process) against
+:mod:`benchmarks.fake_backend`, and measures:
+
+* ``import`` – ``import mine_backend.main`` (app, routers, MCP server);
+* ``ready``  – import plus the lifespan startup, i.e. when uvicorn would
+               start accepting connections;
+* ``mcp``    – the first MCP ``tools/list``, which loads the tool modules.
+
+Reports the median and worst of ``--runs``. ``--importtime N`` also prints
+the N slowest imports (cumulative, from ``python -X importtime``) of one
+extra run, to see what to defer next.
+
+Run with::
+
+    poetry run python -m benchmarks.startup_bench
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.load_bench import _DEFAULT_ENV, FAKE_BACKEND
+
+
+CHILD = '''
+import asyncio, json, time
+start = time.perf_counter()
+import mine_backend.main as main
+imported = time.perf_counter()
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        await main.mcp.list_tools()
+        listed = time.perf_counter()
+    return ready, listed
+
+ready, listed = asyncio.run(startup())
+print(json.dumps({
+    'import': (imported - start) * 1e3,
+    'ready': (ready - start) * 1e3,
+    'mcp': (listed - ready) * 1e3,
+}))
+'''
+
+
+def child_env() -> dict:
+    env = {**_DEFAULT_ENV, **os.environ}
+    env.update(
+        S3_CLIENT_PATH=FAKE_BACKEND,
+        ADMIN_PATH=FAKE_BACKEND,
+        BENCH_S3_LATENCY_MS='0',
+        BENCH_ADMIN_LATENCY_MS='0',
+    )
+    return env
+
+
+def run_once(extra_args: list[str] = ()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, '-c', CHILD],
+        env=child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def slowest_imports(stderr: str, top: int) -> list[tuple[float, str]]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us) / 1e3, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', type=int, default=0, metavar='N')
+    args = parser.parse_args()
+
+    results = [
+        json.loads(run_once().stdout.splitlines()[-1])
+        for _ in range(args.runs)
+    ]
+
+    print(f'\n{"phase":<8} {"median ms":>10} {"max ms":>9}')
+    for phase in ('import', 'ready', 'mcp'):
+        values = [r[phase] for r in results]
+        print(
+            f'{phase:<8} {statistics.median(values):>10.1f} {max(values):>9.1f}'
+        )
+
+    if args.importtime:
+        stderr = run_once(['-X', 'importtime']).stderr
+        print(f'\n{"cumulative ms":>13}  module')
+        for ms, name in slowest_imports(stderr, args.importtime):
+            print(f'{ms:>13.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Scaling benchmark for the policy and lifecycle validators.
+
+Generates documents with a growing number of statements / rules and times
+two scenarios per size:
+
+* ``cold``   – cache cleared, the whole document is validated (this is also
+               the cost of any edit, since every edit changes the hash);
+* ``repeat`` – the exact same document again, answered by content hash.
+
+``µs/item`` staying flat across sizes shows validation scales linearly.
+
+Run with::
+
+    poetry run python -m benchmarks.validation_bench
+"""
+
+import argparse
+import time
+
+from mine_backend.services import lifecycle_validator, policy_validator
+
+
+def make_policy(size: int) -> dict:
+    return {
+        'Version': '2012-10-17',
+        'Statement': [
+            {
+                'Sid': f'Stmt{i}',
+                'Effect': 'Allow' if i % 3 else 'Deny',
+                'Principal': {'AWS': [f'arn:aws:iam:::user/user{i}']},
+                'Action': ['s3:GetObject', 's3:PutObject', 's3:ListBucket'],
+                'Resource': [
+                    f'arn:aws:s3:::bucket-{i % 50}',
+                    f'arn:aws:s3:::bucket-{i % 50}/prefix-{i}/*',
+                ],
+                'Condition': {'IpAddress': {'aws:SourceIp': '10.0.0.0/8'}},
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def make_lifecycle(size: int) -> dict:
+    return {
+        'Rules': [
+            {
+                'ID': f'rule-{i}',
+                'Status': 'Enabled',
+                'Filter': {'Prefix': f'logs/{i}/'},
+                'Expiration': {'Days': 30 + i},
+                'Transitions': [
+                    {'Days': 7, 'StorageClass': 'STANDARD_IA'},
+                    {'Days': 14, 'StorageClass': 'GLACIER'},
+                ],
+                'NoncurrentVersionExpiration': {'NoncurrentDays': 60},
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def _time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(name, make, validate, cache, sizes, repeat):
+    print(f'\n{name}')
+    print(
+        f'{"size":>6} {"cold ms":>9} {"µs/item":>8} {"repeat ms":>10}'
+    )
+
+    for size in sizes:
+        document = make(size)
+
+        def cold():
+            cache.clear()
+            validate(document)
+
+        cold_s = _time(cold, repeat)
+        repeat_s = _time(lambda: validate(document), repeat)
+
+        print(
+            f'{size:>6} {cold_s * 1e3:>9.2f} {cold_s / size * 1e6:>8.2f} '
+            f'{repeat_s * 1e3:>10.2f}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[100, 200, 400, 800, 1600],
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bench(
+        'policy_validator.validate_policy_detailed',
+        make_policy,
+        policy_validator.validate_policy_detailed,
+        policy_validator._document_cache,
+        args.sizes,
+        args.repeat,
+    )
+    bench(
+        'lifecycle_validator.validate_lifecycle_detailed',
+        make_lifecycle,
+        lifecycle_validator.validate_lifecycle_detailed,
+        lifecycle_validator._document_cache,
+        args.sizes,
+        args.repeat,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+from typing import Literal, Optional
+
+from fastapi import Query
+
+from mine_backend.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    ListSnapshot,
+)
+
+
+class PageParams:
+    """Query parameters shared by the paginated admin lists.
+
+    Without any of them the endpoints keep returning the full list, so
+    existing clients are unaffected.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: Literal['asc', 'desc'] = 'asc',
+        q: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.order = order
+        self.q = q
+
+    def apply(self, snapshot: ListSnapshot, **filters: Optional[str]):
+        """Return the requested page, or the unpaginated list when no
+        paging, sorting or filtering was asked for.
+        """
+        active = {k: v for k, v in filters.items() if v is not None}
+        requested = (
+            self.limit is not None
+            or self.cursor is not None
+            or self.sort is not None
+            or self.q is not None
+            or bool(active)
+        )
+        if not requested:
+            return snapshot.raw
+
+        return snapshot.page(
+            limit=self.limit or DEFAULT_PAGE_SIZE,
+            cursor=self.cursor,
+            sort=self.sort,
+            order=self.order,
+            q=self.q,
+            filters=active,
+        )
@@ -19,7 +19,9 @@ ERROR_STATUS_MAP: Dict[str, int] = {
     'GROUP_NOT_FOUND': 404,
     'GROUP_ALREADY_EXISTS' : 409,
 
-    'UNAVAILABLE_ERROR': 503
+    'UNAVAILABLE_ERROR': 503,
+    'TOO_MANY_REQUESTS': 429,
+    'OPERATION_TIMEOUT': 504,
 }
 
 
@@ -1,9 +1,46 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from mine_backend.api.dependencies.authorization import require_role
+from mine_backend.api.utils.response import success_response
+from mine_backend.config import settings
+from mine_backend.core.admin_executor import get_admin_executor
+from mine_backend.core.profiling import get_profile_store
 
 router = APIRouter()
 
 
 @router.get("/admin-only")
 async def admin_route(user=Depends(require_role("consoleAdmin"))):
-    return {"message": "You are admin", "user": user}
\ No newline at end of file
+    return {"message": "You are admin", "user": user}
+
+
+@router.get("/admin/executor")
+async def admin_executor_stats(
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    """Queue depth, rejections, timeouts and per-operation latency of the
+    admin driver executor."""
+    return success_response(get_admin_executor().stats())
+
+
+@router.get("/admin/profiles")
+async def list_profiles(
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    """Stored request profiles, newest first (metadata only)."""
+    return success_response(await get_profile_store().list())
+
+
+@router.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(
+    profile_id: str,
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    """Download a profile as collapsed stacks (flamegraph.pl / speedscope)."""
+    document = await get_profile_store().get(profile_id)
+    return PlainTextResponse(
+        document['folded'],
+        headers={
+            'Content-Disposition': f'attachment; filename="{profile_id}.folded"'
+        },
+    )
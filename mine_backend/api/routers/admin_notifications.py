@@ -5,6 +5,7 @@ from mine_backend.services.admin_notification_service import (
 from fastapi import APIRouter, Depends
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.cache import get_cache_manager
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.cache import CacheManager
 
 from mine_backend.api.schemas.response import StandardResponse
@@ -30,8 +31,10 @@ async def create_webhook(
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    service = AdminNotificationService(get_admin())
-    response = service.create_target(type, payload.identifier, payload.config)
+    service = AsyncAdmin(AdminNotificationService(get_admin()))
+    response = await service.create_target(
+        type, payload.identifier, payload.config
+    )
     await cache.invalidate(f'notifications:{type}')
     return success_response(response)
 
@@ -43,8 +46,8 @@ async def delete_webhook(
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    service = AdminNotificationService(get_admin())
-    response = service.delete_target(type, identifier)
+    service = AsyncAdmin(AdminNotificationService(get_admin()))
+    response = await service.delete_target(type, identifier)
     await cache.invalidate(f'notifications:{type}')
     return success_response(response)
 
@@ -58,7 +61,7 @@ async def list_webhooks(
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    service = AdminNotificationService(get_admin())
+    service = AsyncAdmin(AdminNotificationService(get_admin()))
     response = await cache.get_or_set(
         f'notifications:{type}',
         service.list_targets,
@@ -1,7 +1,13 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
 from mine_backend.core.security import extract_sts_credentials
 from mine_backend.config import get_s3_client
 from mine_backend.services.bucket_service import BucketService
+from mine_backend.services.prefix_usage_service import PrefixUsageService
+from mine_backend.services.storage_analytics_service import (
+    StorageAnalyticsService,
+)
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.auth import get_current_user
 from mine_backend.api.dependencies.cache import get_cache_manager
@@ -10,15 +16,19 @@ from mine_backend.core.cache import CacheManager
 from mine_backend.api.schemas.response import StandardResponse
 from mine_backend.api.utils.response import success_response
 from mine_backend.api.schemas.buckets import (
+    BucketAnalyticsResponse,
     BucketPolicyResponse,
     BucketQuotaGetResponse,
     BucketResponse,
     BucketStatusResponse,
     BucketUsageResponse,
+    PrefixUsageResponse,
     BucketVersionResponse,
     UpdateBucketPolicyRequest,
     UpdateBucketLifecycleRequest,
     LifecycleValidationResponse,
+    LifecycleSimulationResponse,
+    SimulateLifecycleRequest,
 )
 from typing import List
 
@@ -150,6 +160,46 @@ async def get_usage(
     return success_response(usage)
 
 
+@router.get(
+    '/{name}/prefix-usage',
+    response_model=StandardResponse[PrefixUsageResponse],
+)
+async def get_prefix_usage(
+    name: str,
+    prefix: str | None = None,
+    depth: int = 1,
+    top: int = 20,
+    delimiter: str = '/',
+    refresh: bool = False,
+    sts=Depends(get_sts),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    """Size and object count under *prefix*, with the *top* heaviest
+    sub-prefixes up to *depth* levels down."""
+    service = PrefixUsageService(get_s3_client(sts), cache)
+    usage = await service.get_usage(name, prefix, depth, top, delimiter, refresh)
+    return success_response(usage)
+
+
+@router.get(
+    '/{name}/analytics',
+    response_model=StandardResponse[BucketAnalyticsResponse],
+)
+async def get_bucket_analytics(
+    name: str,
+    prefix: str | None = None,
+    top: int = 20,
+    refresh: bool = False,
+    sts=Depends(get_sts),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    """Size and age histograms, storage classes and the *top* largest
+    objects under *prefix*, from a cached scan."""
+    service = StorageAnalyticsService(get_s3_client(sts), cache)
+    analytics = await service.get_analytics(name, prefix, top, refresh)
+    return success_response(analytics)
+
+
 @router.post(
     '/{name}/policy/validate',
     response_model=StandardResponse[LifecycleValidationResponse],
@@ -188,6 +238,7 @@ async def put_bucket_policy(
 ):
     policy = service.put_bucket_policy(name, payload.policy)
     await cache.invalidate(f'buckets:{name}:policy')
+    await cache.invalidate_prefix('permissions:')
     return success_response(policy)
 
 
@@ -202,6 +253,7 @@ async def delete_bucket_policy(
 ):
     policy = service.delete_bucket_policy(name)
     await cache.invalidate(f'buckets:{name}:policy')
+    await cache.invalidate_prefix('permissions:')
     return success_response(policy)
 
 
@@ -231,6 +283,23 @@ def validate_lifecycle(
     return success_response(result)
 
 
+@router.post(
+    '/{name}/lifecycle/simulate',
+    response_model=StandardResponse[LifecycleSimulationResponse],
+)
+async def simulate_lifecycle(
+    name: str,
+    payload: SimulateLifecycleRequest,
+    service: BucketService = Depends(get_bucket_service),
+):
+    """What a lifecycle configuration would expire or transition, per
+    rule, without applying it."""
+    result = await asyncio.to_thread(
+        service.simulate_lifecycle, name, payload.lifecycle, payload.at
+    )
+    return success_response(result)
+
+
 @router.put(
     '/{name}/lifecycle',
     response_model=StandardResponse[BucketStatusResponse],
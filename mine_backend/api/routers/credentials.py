@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Union
 from fastapi import APIRouter, Depends
 from mine_backend.services.credential_service import CredentialService
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.cache import get_cache_manager
+from mine_backend.api.dependencies.pagination import PageParams
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.cache import CacheManager
+from mine_backend.services.listing import credential_snapshot
 from mine_backend.api.schemas.response import StandardResponse
+from mine_backend.api.schemas.pagination import Page
 from mine_backend.api.utils.response import success_response
 from mine_backend.api.schemas.credentials import (
     CredentialsResponse,
@@ -19,25 +23,29 @@ router = APIRouter(prefix='/credentials', tags=['admin-credentials'])
 
 
 def get_service():
-    return CredentialService(get_admin())
+    return AsyncAdmin(CredentialService(get_admin()))
 
 
 @router.get(
     '',
-    response_model=StandardResponse[List[CredentialsResponse]],
+    response_model=StandardResponse[
+        Union[List[CredentialsResponse], Page[CredentialsResponse]]
+    ],
 )
 async def list_credentials(
     username: str,
-    service: CredentialService = Depends(get_service),
+    page: PageParams = Depends(),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    credentials = await cache.get_or_set(
+    snapshot = await cache.get_snapshot(
         f'credentials:{username}',
         service.list_credentials,
+        credential_snapshot,
         username,
     )
-    return success_response(credentials)
+    return success_response(page.apply(snapshot))
 
 
 @router.post(
@@ -46,11 +54,11 @@ async def list_credentials(
 )
 async def create_credential(
     payload: CreateCredentialRequest,
-    service: CredentialService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    credentials = service.create_credential(
+    credentials = await service.create_credential(
         payload.username,
         payload.policy,
         payload.expiration,
@@ -65,11 +73,11 @@ async def create_credential(
 )
 async def delete_credential(
     access_key: str,
-    service: CredentialService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    credentials = service.delete_credential(access_key)
+    credentials = await service.delete_credential(access_key)
     # username not available from access_key alone — bust all credential caches
     await cache.invalidate_prefix('credentials:')
     return success_response(credentials)
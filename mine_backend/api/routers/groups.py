@@ -1,14 +1,20 @@
 from fastapi import APIRouter, Depends
-from typing import List
+from typing import List, Union
 from mine_backend.services.group_service import GroupService
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.cache import get_cache_manager
+from mine_backend.api.dependencies.pagination import PageParams
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.cache import CacheManager
+from mine_backend.services.listing import group_snapshot
 
 from mine_backend.api.schemas.response import StandardResponse
+from mine_backend.api.schemas.bulk import BulkOperationResponse
+from mine_backend.api.schemas.pagination import Page
 from mine_backend.api.schemas.group import (
     GroupResponse,
     GroupListResponse,
+    GroupRow,
     GroupPolicyReponse,
     GroupPolicyMappReponse,
     CreateGroupRequest,
@@ -17,7 +23,7 @@ from mine_backend.api.schemas.group import (
     GroupPolicyRequest,
     GroupPolicyDeatached,
     GroupPolicyAttached,
-
+    BulkGroupUsersRequest,
 )
 from mine_backend.api.utils.response import success_response
 
@@ -28,20 +34,66 @@ router = APIRouter(prefix='/groups', tags=['admin-groups'])
 
 
 def get_service():
-    return GroupService(get_admin())
+    return AsyncAdmin(GroupService(get_admin()))
 
 
 @router.get(
     '',
-    response_model=StandardResponse[List[GroupListResponse]],
+    response_model=StandardResponse[
+        Union[List[GroupListResponse], Page[GroupRow]]
+    ],
 )
 async def list_groups(
-    service: GroupService = Depends(get_service),
+    page: PageParams = Depends(),
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    snapshot = await cache.get_snapshot(
+        'groups:list', service.list_groups, group_snapshot
+    )
+    return success_response(page.apply(snapshot))
+
+
+# --------------------------------------------------------
+# BULK
+# --------------------------------------------------------
+async def _bulk_membership_action(fn, payload, cache: CacheManager):
+    memberships = [m.model_dump() for m in payload.memberships]
+    result = await fn(memberships)
+    await cache.invalidate(
+        'groups:list', *[f'groups:{m["name"]}' for m in memberships]
+    )
+    await cache.invalidate_prefix('permissions:')
+    return success_response(result)
+
+
+@router.post(
+    '/bulk/add-users',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_add_users(
+    payload: BulkGroupUsersRequest,
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    return await _bulk_membership_action(service.bulk_add_users, payload, cache)
+
+
+@router.post(
+    '/bulk/remove-users',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_remove_users(
+    payload: BulkGroupUsersRequest,
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group_list = await cache.get_or_set('groups:list', service.list_groups)
-    return success_response(group_list)
+    return await _bulk_membership_action(
+        service.bulk_remove_users, payload, cache
+    )
 
 
 @router.get(
@@ -50,7 +102,7 @@ async def list_groups(
 )
 async def get_group(
     name: str,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
@@ -64,11 +116,11 @@ async def get_group(
 )
 async def create_group(
     payload: CreateGroupRequest,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.create_group(payload.name, payload.users)
+    group = await service.create_group(payload.name, payload.users)
     await cache.invalidate('groups:list')
     return success_response(group)
 
@@ -79,12 +131,13 @@ async def create_group(
 )
 async def delete_group(
     name: str,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.delete_group(name)
+    group = await service.delete_group(name)
     await cache.invalidate('groups:list', f'groups:{name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group)
 
 
@@ -94,12 +147,13 @@ async def delete_group(
 )
 async def add_users(
     payload: GroupUsersRequest,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.add_users(payload.name, payload.users)
+    group = await service.add_users(payload.name, payload.users)
     await cache.invalidate('groups:list', f'groups:{payload.name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group)
 
 
@@ -110,12 +164,13 @@ async def add_users(
 async def remove_users(
     name: str,
     payload: DeleteGroupUsersRequest,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.remove_users(name, payload.users)
+    group = await service.remove_users(name, payload.users)
     await cache.invalidate('groups:list', f'groups:{name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group)
 
 
@@ -125,12 +180,13 @@ async def remove_users(
 )
 async def enable_group(
     name: str,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.enable_group(name)
+    group = await service.enable_group(name)
     await cache.invalidate('groups:list', f'groups:{name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group)
 
 
@@ -140,12 +196,13 @@ async def enable_group(
 )
 async def disable_group(
     name: str,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group = service.disable_group(name)
+    group = await service.disable_group(name)
     await cache.invalidate('groups:list', f'groups:{name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group)
 
 
@@ -155,12 +212,13 @@ async def disable_group(
 )
 async def attach_policy(
     payload: GroupPolicyRequest,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group_policy = service.attach_policy(payload.group, payload.policy)
+    group_policy = await service.attach_policy(payload.group, payload.policy)
     await cache.invalidate(f'groups:{payload.group}:policies')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group_policy)
 
 
@@ -170,12 +228,13 @@ async def attach_policy(
 )
 async def detach_policy(
     payload: GroupPolicyRequest,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    group_policy = service.detach_policy(payload.group, payload.policy)
+    group_policy = await service.detach_policy(payload.group, payload.policy)
     await cache.invalidate(f'groups:{payload.group}:policies')
+    await cache.invalidate_prefix('permissions:')
     return success_response(group_policy)
 
 
@@ -185,7 +244,7 @@ async def detach_policy(
 )
 async def policies(
     name: str,
-    service: GroupService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
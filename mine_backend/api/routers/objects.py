@@ -1,14 +1,51 @@
+import asyncio
+import json
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from mine_backend.core.security import extract_sts_credentials
-from mine_backend.config import get_s3_client
+from mine_backend.config import (
+    get_multipart_client,
+    get_s3_client,
+    get_signing_client,
+)
+from mine_backend.config import settings
+from mine_backend.core.redis import redis
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.object_listing import (
+    ListingChain,
+    get_listing_prefetcher,
+)
+from mine_backend.services.archive import ARCHIVE_FORMATS
+from mine_backend.services.inventory import INVENTORY_FORMATS
+from mine_backend.services.multipart_service import MultipartUploadService
 from mine_backend.services.object_service import ObjectService
+from mine_backend.services.prefix_usage_service import record_object_changes
+from mine_backend.services.restore_service import RestoreJobService
 from mine_backend.api.dependencies.auth import get_current_user
 from mine_backend.api.dependencies.cache import get_cache_manager
 from mine_backend.core.cache import CacheManager
 
+from mine_backend.api.schemas.bulk import BulkOperationResponse
 from mine_backend.api.schemas.response import StandardResponse
 from mine_backend.api.utils.response import success_response
 from mine_backend.api.schemas.objects import (
+    AbortMultipartResponse,
+    BulkHeadObjectsRequest,
+    FindDuplicatesRequest,
+    FindDuplicatesResponse,
+    CompleteMultipartRequest,
+    CompleteMultipartResponse,
+    InitiateMultipartRequest,
+    InventoryExportRequest,
+    InventoryExportResponse,
+    InitiateMultipartResponse,
+    ListMultipartUploadsResponse,
+    ListPartsResponse,
+    PresignPartsRequest,
+    PresignPartsResponse,
     ListObjectsResponse,
     ObjectMessageReponse,
     GenerateUploadUrlResponse,
@@ -17,6 +54,14 @@ from mine_backend.api.schemas.objects import (
     DeleteObjectVersionResponse,
     RestoreObjectVersionResponse,
     ObjectMetadataResponse,
+    PresignUrlsRequest,
+    PresignUrlsResponse,
+    PurgeVersionsRequest,
+    PurgeVersionsResponse,
+    SyncBucketsRequest,
+    SyncBucketsResponse,
+    RestoreJobRequest,
+    RestoreJobResponse,
     UpdateObjectMetadataRequest,
     UpdateObjectMetadataResponse,
     UpdateObjectTagsResponse,
@@ -28,6 +73,14 @@ from mine_backend.api.schemas.objects import (
 
 router = APIRouter(prefix='/objects', tags=['objects'])
 
+# Keep proxies from caching or buffering the event streams below.
+_SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+
+def _sse_event(event: str, data: dict) -> str:
+    payload = json.dumps(jsonable_encoder(data))
+    return f'event: {event}\ndata: {payload}\n\n'
+
 
 def get_sts(session: dict = Depends(get_current_user)):
     return extract_sts_credentials(session)
@@ -38,6 +91,34 @@ def get_object_service(sts=Depends(get_sts)):
     return ObjectService(s3_client)
 
 
+def get_signing_service(sts=Depends(get_sts)):
+    # Signing is local: reuse the client (and its signer) across requests.
+    return ObjectService(
+        get_signing_client(sts),
+        signing_scope=sts['aws_access_key_id'],
+    )
+
+
+def get_multipart_service(sts=Depends(get_sts)):
+    return MultipartUploadService(get_multipart_client(sts))
+
+
+def get_purge_service(sts=Depends(get_sts)):
+    # Purging lists and deletes through boto3: the driver neither lists
+    # keys behind a delete marker nor deletes in batches.
+    return ObjectService(
+        get_s3_client(sts), boto_client=get_multipart_client(sts)
+    )
+
+
+def get_restore_service(
+    session: dict = Depends(get_current_user),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    s3_client = get_s3_client(extract_sts_credentials(session))
+    return RestoreJobService(s3_client, cache, session.get('sub', 'anonymous'))
+
+
 @router.get(
     '',
     response_model=StandardResponse[ListObjectsResponse],
@@ -47,19 +128,68 @@ async def list_objects(
     prefix: str | None = None,
     limit: int = 100,
     continuation_token: str | None = None,
+    delimiter: str | None = None,
+    page: int | None = None,
     service: ObjectService = Depends(get_object_service),
     cache: CacheManager = Depends(get_cache_manager),
 ):
-    cache_key = f'objects:{bucket}:{prefix or ""}:{limit}:{continuation_token or ""}'
+    if delimiter:
+        # Each page lists only as far as it needs; without Redis pages are
+        # still kept in process memory, since a level may stand for a large
+        # subtree when the driver cannot list by delimiter.
+        listing = await cache.get_or_set_local(
+            f'objects:{bucket}:{prefix or ""}:dir:{delimiter}:{limit}:'
+            f'{continuation_token or ""}',
+            asyncio.to_thread,
+            service.list_directory,
+            bucket,
+            prefix,
+            delimiter,
+            limit,
+            continuation_token,
+        )
+        return success_response(listing)
+
+    if page is not None:
+        if continuation_token:
+            raise InconsistentDataError(
+                'Pass either page or continuation_token, not both.'
+            )
+        if page < 1:
+            raise InconsistentDataError('Page must be 1 or greater.')
+
+    if limit <= 0 or limit > 1000:
+        limit = 100
+
+    chain = ListingChain(cache, bucket, prefix, limit)
+    if page is not None:
+        continuation_token = await chain.token_for(page)
+    else:
+        page = await chain.page_of(continuation_token)
+
     response = await cache.get_or_set(
-        cache_key,
+        chain.page_key(continuation_token),
         service.list_objects,
         bucket,
         prefix,
         limit,
         continuation_token,
     )
-    return success_response(response)
+
+    next_token = response.get('next_continuation_token')
+    if page is not None and next_token:
+        await chain.link(page + 1, next_token)
+    if next_token and settings.LISTING_PREFETCH_ENABLED and redis is not None:
+        get_listing_prefetcher().schedule(
+            cache,
+            chain.page_key(next_token),
+            service.list_objects,
+            bucket,
+            prefix,
+            limit,
+            next_token,
+        )
+    return success_response({**response, 'page': page})
 
 
 @router.delete(
@@ -74,6 +204,7 @@ async def delete_object(
 ):
     response = service.delete_object(bucket, key)
     await cache.invalidate_prefix(f'objects:{bucket}:')
+    await record_object_changes(bucket, key)
     return success_response(response)
 
 
@@ -94,6 +225,7 @@ async def copy_object(
 ):
     response = service.copy_object(source_bucket, source_key, dest_bucket, dest_key)
     await cache.invalidate_prefix(f'objects:{dest_bucket}:')
+    await record_object_changes(dest_bucket, dest_key)
     return success_response(response)
 
 
@@ -111,6 +243,8 @@ async def move_object(
 ):
     response = service.move_object(source_bucket, source_key, dest_bucket, dest_key)
     await cache.invalidate_prefix(f'objects:{source_bucket}:', f'objects:{dest_bucket}:')
+    await record_object_changes(source_bucket, source_key)
+    await record_object_changes(dest_bucket, dest_key)
     return success_response(response)
 
 
@@ -130,6 +264,99 @@ async def upload_object(
     ct = content_type or file.content_type or 'application/octet-stream'
     response = await service.upload_object_proxy(bucket, key, data, ct)
     await cache.invalidate_prefix(f'objects:{bucket}:')
+    await record_object_changes(bucket, key)
+    return success_response(response)
+
+
+@router.get('/archive')
+async def download_archive(
+    bucket: str,
+    prefix: str | None = None,
+    format: str = 'zip',
+    service: ObjectService = Depends(get_object_service),
+):
+    # Listed (and size-checked) up front, so errors are still plain JSON
+    # responses; only the object contents are streamed.
+    entries = await asyncio.to_thread(
+        service.plan_archive, bucket, prefix, format
+    )
+    folder = [p for p in (prefix or '').split('/') if p]
+    filename = (folder[-1] if folder else bucket).replace('"', '')
+    return StreamingResponse(
+        service.stream_archive(bucket, entries, format),
+        media_type=ARCHIVE_FORMATS[format],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}.{format}"',
+            'X-Accel-Buffering': 'no',
+        },
+    )
+
+
+@router.get('/inventory')
+def download_inventory(
+    bucket: str,
+    prefix: str | None = None,
+    format: str = 'csv',
+    min_size: int | None = None,
+    max_size: int | None = None,
+    modified_after: datetime | None = None,
+    modified_before: datetime | None = None,
+    storage_class: str | None = None,
+    suffix: str | None = None,
+    service: ObjectService = Depends(get_object_service),
+):
+    chunks = service.stream_inventory(
+        bucket,
+        prefix,
+        format,
+        {
+            'min_size': min_size,
+            'max_size': max_size,
+            'modified_after': modified_after,
+            'modified_before': modified_before,
+            'storage_class': storage_class,
+            'suffix': suffix,
+        },
+    )
+    extension = 'jsonl' if format == 'ndjson' else format
+    return StreamingResponse(
+        chunks,
+        media_type=INVENTORY_FORMATS[format],
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="{bucket}-inventory.{extension}"'
+            ),
+            'X-Accel-Buffering': 'no',
+        },
+    )
+
+
+@router.post(
+    '/inventory/export',
+    response_model=StandardResponse[InventoryExportResponse],
+)
+async def export_inventory(
+    payload: InventoryExportRequest,
+    service: ObjectService = Depends(get_object_service),
+    uploader: MultipartUploadService = Depends(get_multipart_service),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    chunks = service.stream_inventory(
+        payload.bucket,
+        payload.prefix,
+        payload.format,
+        payload.filters.model_dump(),
+    )
+    # Listing, encoding and upload run together, one part at a time.
+    response = await asyncio.to_thread(
+        uploader.upload_stream,
+        payload.dest_bucket,
+        payload.dest_key,
+        chunks,
+        INVENTORY_FORMATS[payload.format],
+    )
+    await cache.invalidate_prefix(f'objects:{payload.dest_bucket}:')
+    await record_object_changes(payload.dest_bucket, payload.dest_key)
     return success_response(response)
 
 
@@ -142,7 +369,7 @@ def generate_upload_url(
     key: str,
     content_type: str | None = None,
     expires_in: int = 3600,
-    service: ObjectService = Depends(get_object_service),
+    service: ObjectService = Depends(get_signing_service),
 ):
     response = service.generate_upload_url(
         bucket,
@@ -159,7 +386,7 @@ def generate_upload_url(
 )
 def generate_presigned_download(
     payload: PresignedDownloadRequest,
-    service: ObjectService = Depends(get_object_service),
+    service: ObjectService = Depends(get_signing_service),
 ):
     disposition = None
 
@@ -176,22 +403,274 @@ def generate_presigned_download(
     return success_response(response)
 
 
+@router.post(
+    '/presign',
+    response_model=StandardResponse[PresignUrlsResponse],
+)
+def presign_urls(
+    payload: PresignUrlsRequest,
+    service: ObjectService = Depends(get_signing_service),
+):
+    response = service.presign_urls(
+        payload.bucket,
+        payload.keys,
+        payload.method,
+        payload.expires_in,
+        payload.content_type,
+    )
+    return success_response(response)
+
+
+# --------------------------------------------------------
+# MULTIPART UPLOAD (parts go from the browser to storage)
+# --------------------------------------------------------
+@router.post(
+    '/multipart',
+    response_model=StandardResponse[InitiateMultipartResponse],
+)
+def initiate_multipart_upload(
+    payload: InitiateMultipartRequest,
+    service: MultipartUploadService = Depends(get_multipart_service),
+):
+    response = service.initiate(
+        payload.bucket,
+        payload.key,
+        payload.content_type,
+        payload.size,
+        payload.part_size,
+    )
+    return success_response(response)
+
+
+@router.get(
+    '/multipart',
+    response_model=StandardResponse[ListMultipartUploadsResponse],
+)
+def list_multipart_uploads(
+    bucket: str,
+    prefix: str | None = None,
+    service: MultipartUploadService = Depends(get_multipart_service),
+):
+    return success_response(service.list_uploads(bucket, prefix))
+
+
+@router.post(
+    '/multipart/parts',
+    response_model=StandardResponse[PresignPartsResponse],
+)
+def presign_multipart_parts(
+    payload: PresignPartsRequest,
+    service: MultipartUploadService = Depends(get_multipart_service),
+):
+    response = service.presign_parts(
+        payload.bucket,
+        payload.key,
+        payload.upload_id,
+        payload.part_numbers,
+        payload.expires_in,
+    )
+    return success_response(response)
+
+
+@router.get(
+    '/multipart/parts',
+    response_model=StandardResponse[ListPartsResponse],
+)
+def list_multipart_parts(
+    bucket: str,
+    key: str,
+    upload_id: str,
+    service: MultipartUploadService = Depends(get_multipart_service),
+):
+    return success_response(service.list_parts(bucket, key, upload_id))
+
+
+@router.post(
+    '/multipart/complete',
+    response_model=StandardResponse[CompleteMultipartResponse],
+)
+async def complete_multipart_upload(
+    payload: CompleteMultipartRequest,
+    service: MultipartUploadService = Depends(get_multipart_service),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    parts = (
+        [part.model_dump() for part in payload.parts]
+        if payload.parts is not None
+        else None
+    )
+    # Storage assembles the parts before answering; keep it off the loop.
+    response = await asyncio.to_thread(
+        service.complete,
+        payload.bucket,
+        payload.key,
+        payload.upload_id,
+        parts,
+    )
+    await cache.invalidate_prefix(f'objects:{payload.bucket}:')
+    await record_object_changes(payload.bucket, payload.key)
+    return success_response(response)
+
+
+@router.delete(
+    '/multipart',
+    response_model=StandardResponse[AbortMultipartResponse],
+)
+def abort_multipart_upload(
+    bucket: str,
+    key: str,
+    upload_id: str,
+    service: MultipartUploadService = Depends(get_multipart_service),
+):
+    return success_response(service.abort(bucket, key, upload_id))
+
+
 @router.get(
     '/versions',
     response_model=StandardResponse[ListObjectVersionsResponse],
 )
 async def list_versions(
     bucket: str,
-    key: str,
+    key: str | None = None,
+    prefix: str | None = None,
+    limit: int = 100,
+    key_marker: str | None = None,
+    version_id_marker: str | None = None,
     service: ObjectService = Depends(get_object_service),
     cache: CacheManager = Depends(get_cache_manager),
 ):
+    if key is not None:
+        # The port returns a key's whole history in one call: fetch it once
+        # per key and page it from the cache.
+        history = await cache.get_or_set_local(
+            f'objects:{bucket}:{key}:versions',
+            asyncio.to_thread,
+            service.version_history,
+            bucket,
+            key,
+        )
+        return success_response(
+            service.list_object_versions(
+                bucket,
+                key,
+                limit,
+                key_marker,
+                version_id_marker,
+                history=history,
+            )
+        )
+
     response = await cache.get_or_set(
-        f'objects:{bucket}:{key}:versions',
+        f'objects:{bucket}:{prefix}:versions/:{limit}:{key_marker or ""}:'
+        f'{version_id_marker or ""}',
+        asyncio.to_thread,
         service.list_object_versions,
         bucket,
         key,
+        limit,
+        key_marker,
+        version_id_marker,
+        prefix,
+    )
+    return success_response(response)
+
+
+@router.get('/versions/stream')
+def stream_versions(
+    bucket: str,
+    prefix: str | None = None,
+    key_marker: str | None = None,
+    service: ObjectService = Depends(get_object_service),
+):
+    versions = service.stream_object_versions(bucket, prefix, key_marker)
+
+    # A plain generator: Starlette iterates it on a worker thread, so the
+    # blocking driver calls stay off the event loop.
+    def event_generator():
+        count = 0
+        try:
+            for row in versions:
+                count += 1
+                yield _sse_event('version', row)
+        except Exception as e:
+            yield _sse_event('error', {'message': str(e), 'count': count})
+            return
+        yield _sse_event('done', {'count': count})
+
+    return StreamingResponse(
+        event_generator(),
+        media_type='text/event-stream',
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.post(
+    '/duplicates',
+    response_model=StandardResponse[FindDuplicatesResponse],
+)
+async def find_duplicates(
+    payload: FindDuplicatesRequest,
+    service: ObjectService = Depends(get_object_service),
+):
+    response = await asyncio.to_thread(
+        service.find_duplicates,
+        payload.buckets,
+        payload.prefix,
+        payload.min_size,
+        payload.top,
+    )
+    return success_response(response)
+
+
+@router.get('/diff')
+def diff_buckets(
+    source_bucket: str,
+    dest_bucket: str,
+    prefix: str | None = None,
+    service: ObjectService = Depends(get_object_service),
+):
+    differences = service.diff_buckets(source_bucket, dest_bucket, prefix)
+
+    # Both listings are read on a worker thread, as for /versions/stream.
+    def event_generator():
+        counts = {'added': 0, 'changed': 0, 'removed': 0}
+        try:
+            for difference in differences:
+                counts[difference['status']] += 1
+                yield _sse_event('difference', difference)
+        except Exception as e:
+            yield _sse_event('error', {'message': str(e), **counts})
+            return
+        yield _sse_event('done', counts)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type='text/event-stream',
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.post(
+    '/sync',
+    response_model=StandardResponse[SyncBucketsResponse],
+)
+async def sync_buckets(
+    payload: SyncBucketsRequest,
+    service: ObjectService = Depends(get_object_service),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    response = await asyncio.to_thread(
+        service.sync_buckets,
+        payload.source_bucket,
+        payload.dest_bucket,
+        payload.prefix,
+        payload.delete,
+        payload.dry_run,
     )
+    changed_keys = response.pop('changed_keys')
+    if changed_keys:
+        await cache.invalidate_prefix(f'objects:{payload.dest_bucket}:')
+        await record_object_changes(payload.dest_bucket, *changed_keys)
     return success_response(response)
 
 
@@ -207,8 +686,30 @@ async def delete_version(
     cache: CacheManager = Depends(get_cache_manager),
 ):
     response = service.delete_object_version(bucket, key, version_id)
-    await cache.invalidate(f'objects:{bucket}:{key}:versions')
     await cache.invalidate_prefix(f'objects:{bucket}:')
+    await record_object_changes(bucket, key)
+    return success_response(response)
+
+
+@router.post(
+    '/versions/purge',
+    response_model=StandardResponse[PurgeVersionsResponse],
+)
+async def purge_versions(
+    payload: PurgeVersionsRequest,
+    service: ObjectService = Depends(get_purge_service),
+    cache: CacheManager = Depends(get_cache_manager),
+):
+    response = await asyncio.to_thread(
+        service.purge_object_versions,
+        payload.bucket,
+        payload.prefix,
+        payload.keep,
+        payload.older_than_days,
+        payload.dry_run,
+    )
+    if not payload.dry_run:
+        await cache.invalidate_prefix(f'objects:{payload.bucket}:')
     return success_response(response)
 
 
@@ -224,11 +725,62 @@ async def restore_version(
     cache: CacheManager = Depends(get_cache_manager),
 ):
     response = service.restore_object_version(bucket, key, version_id)
-    await cache.invalidate(f'objects:{bucket}:{key}:versions')
     await cache.invalidate_prefix(f'objects:{bucket}:')
+    await record_object_changes(bucket, key)
+    return success_response(response)
+
+
+@router.post(
+    '/restore-jobs',
+    response_model=StandardResponse[RestoreJobResponse],
+)
+async def create_restore_job(
+    payload: RestoreJobRequest,
+    service: RestoreJobService = Depends(get_restore_service),
+):
+    response = await service.create_job(
+        payload.bucket,
+        payload.prefix,
+        payload.at,
+        payload.delete_newer,
+        payload.dry_run,
+    )
     return success_response(response)
 
 
+@router.get(
+    '/restore-jobs/{job_id}',
+    response_model=StandardResponse[RestoreJobResponse],
+)
+async def get_restore_job(
+    job_id: str,
+    service: RestoreJobService = Depends(get_restore_service),
+):
+    return success_response(await service.get_job(job_id))
+
+
+@router.post(
+    '/restore-jobs/{job_id}/resume',
+    response_model=StandardResponse[RestoreJobResponse],
+)
+async def resume_restore_job(
+    job_id: str,
+    service: RestoreJobService = Depends(get_restore_service),
+):
+    return success_response(await service.resume_job(job_id))
+
+
+@router.delete(
+    '/restore-jobs/{job_id}',
+    response_model=StandardResponse[RestoreJobResponse],
+)
+async def cancel_restore_job(
+    job_id: str,
+    service: RestoreJobService = Depends(get_restore_service),
+):
+    return success_response(await service.cancel_job(job_id))
+
+
 @router.get(
     '/metadata',
     response_model=StandardResponse[ObjectMetadataResponse],
@@ -293,3 +845,20 @@ async def update_object_tags(
     response = service.update_object_tags(payload.bucket, payload.key, payload.tags)
     await cache.invalidate(f'objects:{payload.bucket}:{payload.key}:tags')
     return success_response(response)
+
+
+@router.post(
+    '/bulk/head',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+def bulk_head_objects(
+    payload: BulkHeadObjectsRequest,
+    service: ObjectService = Depends(get_object_service),
+):
+    response = service.bulk_head_objects(
+        payload.bucket,
+        payload.keys,
+        metadata=payload.metadata,
+        tags=payload.tags,
+    )
+    return success_response(response)
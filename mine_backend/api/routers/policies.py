@@ -1,39 +1,84 @@
+import hashlib
+
 from fastapi import APIRouter, Depends
 from mine_backend.services.policy_service import PolicyService
+from mine_backend.services.permission_service import PermissionService
+from mine_backend.api.dependencies.auth import get_current_user
+from mine_backend.core.security import extract_sts_credentials
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.cache import get_cache_manager
+from mine_backend.api.dependencies.pagination import PageParams
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.cache import CacheManager
+from mine_backend.services.listing import policy_snapshot
 from mine_backend.api.utils.response import success_response
 from mine_backend.api.schemas.response import StandardResponse
+from mine_backend.api.schemas.pagination import Page
 from mine_backend.api.schemas.policies import (
     PolicyResponse,
+    PolicyRow,
     PolicyGroupsResponse,
     PolicyAttachedResponse,
     PolicyDetachedResponse,
     CreatePolicyRequest,
     AttachPolicyRequest,
+    EvaluatePermissionsRequest,
+    EvaluatePermissionsResponse,
 )
-from typing import List
-from mine_backend.config import get_admin, settings
+from typing import List, Optional, Union
+from mine_backend.config import get_admin, get_s3_client, settings
 
 router = APIRouter(prefix='/policies', tags=['admin-policies'])
 
 
 def get_service():
-    return PolicyService(get_admin())
+    return AsyncAdmin(PolicyService(get_admin()))
+
+
+def get_permission_service(session: dict = Depends(get_current_user)):
+    sts = extract_sts_credentials(session)
+    return PermissionService(get_s3_client(sts), get_admin())
 
 
 @router.get(
     '',
-    response_model=StandardResponse[List[PolicyResponse]],
+    response_model=StandardResponse[Union[List[PolicyResponse], Page[PolicyRow]]],
 )
 async def list_policies(
-    service: PolicyService = Depends(get_service),
+    is_group: Optional[bool] = None,
+    page: PageParams = Depends(),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    policies = await cache.get_or_set('policies:list', service.list_policies)
-    return success_response(policies)
+    snapshot = await cache.get_snapshot(
+        'policies:list', service.list_policies, policy_snapshot
+    )
+    return success_response(page.apply(snapshot, is_group=is_group))
+
+
+@router.post(
+    '/evaluate',
+    response_model=StandardResponse[EvaluatePermissionsResponse],
+)
+async def evaluate_permissions(
+    payload: EvaluatePermissionsRequest,
+    service: PermissionService = Depends(get_permission_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    # Validation and evaluation are pure CPU; only collecting the documents
+    # talks to the admin backend and goes through its executor.
+    checks = [check.model_dump() for check in payload.checks]
+    buckets = service.validate_checks(checks)
+    digest = hashlib.sha1(','.join(sorted(buckets)).encode()).hexdigest()
+    documents = await cache.get_or_set(
+        f'permissions:{payload.username}:{digest}',
+        AsyncAdmin(service).collect_documents,
+        payload.username,
+        buckets,
+    )
+    return success_response(service.evaluate(documents, checks))
 
 
 @router.get(
@@ -42,7 +87,7 @@ async def list_policies(
 )
 async def get_policy_groups(
     name: str,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
@@ -60,7 +105,7 @@ async def get_policy_groups(
 )
 async def get_policy(
     name: str,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
@@ -74,12 +119,13 @@ async def get_policy(
 )
 async def create_policy(
     payload: CreatePolicyRequest,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    policy = service.create_policy(payload.name, payload.document)
+    policy = await service.create_policy(payload.name, payload.document)
     await cache.invalidate('policies:list')
+    await cache.invalidate_prefix('permissions:')
     return success_response(policy)
 
 
@@ -89,12 +135,13 @@ async def create_policy(
 )
 async def delete_policy(
     name: str,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    policy = service.delete_policy(name)
+    policy = await service.delete_policy(name)
     await cache.invalidate('policies:list', f'policies:{name}')
+    await cache.invalidate_prefix('permissions:')
     return success_response(policy)
 
 
@@ -104,12 +151,13 @@ async def delete_policy(
 )
 async def attach_policy(
     payload: AttachPolicyRequest,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    attached_policy = service.attach_policy(payload.policy, payload.username)
+    attached_policy = await service.attach_policy(payload.policy, payload.username)
     await cache.invalidate(f'policies:{payload.policy}:groups', 'users:list')
+    await cache.invalidate_prefix(f'permissions:{payload.username}:')
     return success_response(attached_policy)
 
 
@@ -119,10 +167,11 @@ async def attach_policy(
 )
 async def detach_policy(
     payload: AttachPolicyRequest,
-    service: PolicyService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    attached_policy = service.detach_policy(payload.policy, payload.username)
+    attached_policy = await service.detach_policy(payload.policy, payload.username)
     await cache.invalidate(f'policies:{payload.policy}:groups', 'users:list')
+    await cache.invalidate_prefix(f'permissions:{payload.username}:')
     return success_response(attached_policy)
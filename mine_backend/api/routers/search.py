@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -7,6 +9,7 @@ from mine_backend.api.dependencies.authorization import is_admin
 from mine_backend.api.schemas.response import StandardResponse
 from mine_backend.api.utils.response import success_response
 from mine_backend.config import get_admin, get_s3_client
+from mine_backend.core.metrics import SEARCH_STREAM_DURATION, timed
 from mine_backend.core.security import extract_sts_credentials
 from mine_backend.services.search_service import SearchService
 
@@ -47,8 +50,15 @@ async def stream_search(
     service: SearchService = Depends(get_search_service),
 ):
     async def event_generator():
-        async for chunk in service.stream_results(search_id):
-            yield chunk
+        with timed(SEARCH_STREAM_DURATION) as labels:
+            labels['outcome'] = 'error'
+            try:
+                async for chunk in service.stream_results(search_id):
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                labels['outcome'] = 'disconnected'
+                raise
+            labels['outcome'] = 'completed'
 
     return StreamingResponse(
         event_generator(),
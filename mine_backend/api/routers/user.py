@@ -4,14 +4,22 @@ from mine_backend.services.user_service import UserService
 
 from mine_backend.api.dependencies.authorization import require_role
 from mine_backend.api.dependencies.cache import get_cache_manager
+from mine_backend.api.dependencies.pagination import PageParams
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.cache import CacheManager
+from mine_backend.services.listing import user_snapshot
 
 from mine_backend.api.schemas.response import StandardResponse
+from mine_backend.api.schemas.bulk import BulkOperationResponse
+from mine_backend.api.schemas.pagination import Page
 from mine_backend.api.schemas.user import (
     UserResponse,
+    UserRow,
     CreateUserRequest,
+    BulkCreateUsersRequest,
+    BulkUsernamesRequest,
 )
-from typing import List
+from typing import List, Optional, Union
 from mine_backend.config import get_admin, settings
 
 
@@ -19,20 +27,98 @@ router = APIRouter(prefix='/users', tags=['admin-users'])
 
 
 def get_service():
-    return UserService(get_admin())
+    return AsyncAdmin(UserService(get_admin()))
 
 
 @router.get(
     '',
-    response_model=StandardResponse[List[UserResponse]],
+    response_model=StandardResponse[Union[List[UserResponse], Page[UserRow]]],
 )
 async def list_users(
-    service: UserService = Depends(get_service),
+    status: Optional[str] = None,
+    group: Optional[str] = None,
+    page: PageParams = Depends(),
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    snapshot = await cache.get_snapshot(
+        'users:list', service.list_users, user_snapshot
+    )
+    return success_response(page.apply(snapshot, status=status, groups=group))
+
+
+# --------------------------------------------------------
+# BULK
+# Declared before the '/{username}/...' routes so that 'bulk' is not
+# captured as a username.
+# --------------------------------------------------------
+@router.post(
+    '/bulk/create',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_create_users(
+    payload: BulkCreateUsersRequest,
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    users = [u.model_dump() for u in payload.users]
+    result = await service.bulk_create_users(users)
+    await cache.invalidate('users:list')
+    return success_response(result)
+
+
+async def _bulk_user_action(fn, usernames: list[str], cache: CacheManager):
+    result = await fn(usernames)
+    await cache.invalidate('users:list', *[f'users:{u}' for u in usernames])
+    await cache.invalidate_prefix('permissions:')
+    return success_response(result)
+
+
+@router.post(
+    '/bulk/delete',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_delete_users(
+    payload: BulkUsernamesRequest,
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    return await _bulk_user_action(
+        service.bulk_delete_users, payload.usernames, cache
+    )
+
+
+@router.post(
+    '/bulk/enable',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_enable_users(
+    payload: BulkUsernamesRequest,
+    service: AsyncAdmin = Depends(get_service),
+    cache: CacheManager = Depends(get_cache_manager),
+    user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
+):
+    return await _bulk_user_action(
+        service.bulk_enable_users, payload.usernames, cache
+    )
+
+
+@router.post(
+    '/bulk/disable',
+    response_model=StandardResponse[BulkOperationResponse],
+)
+async def bulk_disable_users(
+    payload: BulkUsernamesRequest,
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    users = await cache.get_or_set('users:list', service.list_users)
-    return success_response(users)
+    return await _bulk_user_action(
+        service.bulk_disable_users, payload.usernames, cache
+    )
 
 
 @router.get(
@@ -41,7 +127,7 @@ async def list_users(
 )
 async def get_user(
     username: str,
-    service: UserService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
@@ -52,11 +138,11 @@ async def get_user(
 @router.post('', response_model=StandardResponse[List[UserResponse]])
 async def create_user(
     payload: CreateUserRequest,
-    service: UserService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    user_data = service.create_user(payload.username, payload.password)
+    user_data = await service.create_user(payload.username, payload.password)
     await cache.invalidate('users:list')
     return success_response(user_data)
 
@@ -67,12 +153,13 @@ async def create_user(
 )
 async def delete_user(
     username: str,
-    service: UserService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    deleted_user_data = service.delete_user(username)
+    deleted_user_data = await service.delete_user(username)
     await cache.invalidate('users:list', f'users:{username}')
+    await cache.invalidate_prefix(f'permissions:{username}:')
     return success_response(deleted_user_data)
 
 
@@ -82,12 +169,13 @@ async def delete_user(
 )
 async def enable_user(
     username: str,
-    service: UserService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    result = service.enable_user(username)
+    result = await service.enable_user(username)
     await cache.invalidate('users:list', f'users:{username}')
+    await cache.invalidate_prefix(f'permissions:{username}:')
     return success_response(result)
 
 
@@ -97,10 +185,11 @@ async def enable_user(
 )
 async def disable_user(
     username: str,
-    service: UserService = Depends(get_service),
+    service: AsyncAdmin = Depends(get_service),
     cache: CacheManager = Depends(get_cache_manager),
     user=Depends(require_role(f'{settings.ADMIN_ROLE}')),
 ):
-    result = service.disable_user(username)
+    result = await service.disable_user(username)
     await cache.invalidate('users:list', f'users:{username}')
+    await cache.invalidate_prefix(f'permissions:{username}:')
     return success_response(result)
@@ -37,6 +37,64 @@ class BucketUsageResponse(BaseModel):
     size_bytes: int
 
 
+class PrefixUsageItem(BaseModel):
+    prefix: str
+    depth: int
+    size: int
+    objects: int
+
+
+class PrefixUsageResponse(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    delimiter: str
+    depth: int
+    total_size: int
+    total_objects: int
+    direct_size: int
+    direct_objects: int
+    top: List[PrefixUsageItem]
+    scanned_at: float
+
+
+class HistogramBin(BaseModel):
+    min: float
+    max: Optional[float] = None  # open-ended last bin
+    objects: int
+    size: int
+
+
+class AnalyticsTotal(BaseModel):
+    objects: int
+    size: int
+
+
+class StorageClassUsage(BaseModel):
+    storage_class: str
+    objects: int
+    size: int
+
+
+class LargestObject(BaseModel):
+    key: str
+    size: int
+
+
+class BucketAnalyticsResponse(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    total_size: int
+    total_objects: int
+    size_histogram: List[HistogramBin]  # bounds in bytes
+    age_histogram: List[HistogramBin]  # bounds in days
+    unknown_age: AnalyticsTotal
+    storage_classes: List[StorageClassUsage]
+    largest: List[LargestObject]
+    oldest_modified: Optional[float] = None
+    newest_modified: Optional[float] = None
+    scanned_at: float
+
+
 class BucketPolicyResponse(BaseModel):
     bucket: str
     policy: Optional[dict]
@@ -50,6 +108,59 @@ class UpdateBucketLifecycleRequest(BaseModel):
     lifecycle: Dict[str, Any]
 
 
+class SimulateLifecycleRequest(BaseModel):
+    # Omitted: the bucket's current configuration.
+    lifecycle: Optional[Dict[str, Any]] = None
+    # Evaluate as of this time (default: now).
+    at: Optional[datetime] = None
+
+
+class LifecycleImpact(BaseModel):
+    objects: int
+    size: int
+
+
+class LifecycleTransitionImpact(BaseModel):
+    storage_class: str
+    objects: int
+    size: int
+
+
+class LifecycleRuleImpact(BaseModel):
+    id: str
+    enabled: bool
+    matched: LifecycleImpact
+    expire: LifecycleImpact
+    transition: List[LifecycleTransitionImpact]
+    noncurrent_expire: LifecycleImpact
+    noncurrent_transition: List[LifecycleTransitionImpact]
+
+
+class LifecycleTotals(BaseModel):
+    expire: LifecycleImpact
+    transition: List[LifecycleTransitionImpact]
+    noncurrent_expire: LifecycleImpact
+    noncurrent_transition: List[LifecycleTransitionImpact]
+
+
+class LifecycleSimulationResponse(BaseModel):
+    bucket: str
+    at: datetime
+    scanned_objects: int
+    scanned_versions: int
+    tag_lookups: int
+    rules: List[LifecycleRuleImpact]
+    # Each object counted once: expiration wins over transition.
+    totals: LifecycleTotals
+    not_simulated: List[str]
+
+
+class ValidationErrorDetail(BaseModel):
+    pointer: str
+    message: str
+
+
 class LifecycleValidationResponse(BaseModel):
     valid: bool
     errors: List[str]
+    details: List[ValidationErrorDetail] = []
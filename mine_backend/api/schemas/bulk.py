@@ -0,0 +1,19 @@
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+from mine_backend.api.schemas.response import Error
+
+
+class BulkItemResult(BaseModel):
+    item: str
+    success: bool
+    result: Optional[Any] = None
+    error: Optional[Error] = None
+
+
+class BulkOperationResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
@@ -6,6 +6,10 @@ class GroupListResponse(BaseModel):
     groups: Optional[List[str]] = None
 
 
+class GroupRow(BaseModel):
+    name: str
+
+
 class GroupResponse(BaseModel):
     status: str
     group_name: str
@@ -65,3 +69,7 @@ class GroupPolicyDeatached(BaseModel):
 class GroupPolicyAttached(BaseModel):
     group: str
     policies_attached: Optional[List[str]] = None
+
+
+class BulkGroupUsersRequest(BaseModel):
+    memberships: List[GroupUsersRequest]
@@ -18,6 +18,11 @@ class ListObjectsResponse(BaseModel):
     objects: List[ObjectItemResponse]
     is_truncated: bool
     next_continuation_token: Optional[str] = None
+    # 1-based page number, when known; can be passed back as ``page``.
+    page: Optional[int] = None
+    # Only set when listing with a delimiter.
+    delimiter: Optional[str] = None
+    common_prefixes: List[str] = []
 
 
 class ObjectMessageReponse(BaseModel):
@@ -38,17 +43,158 @@ class GenerateDownloadUrlResponse(BaseModel):
     expires_in: int = Field(description='Expiration time in seconds')
 
 
+class PresignUrlsRequest(BaseModel):
+    bucket: str
+    keys: List[str]
+    method: str = 'download'  # or 'upload'
+    expires_in: int = 3600
+    content_type: Optional[str] = None
+
+
+class PresignedUrlItem(BaseModel):
+    key: str
+    url: str
+    # Unix time; a reused URL expires before now + expires_in.
+    expires_at: int
+
+
+class PresignUrlsResponse(BaseModel):
+    bucket: str
+    method: str
+    expires_in: int
+    count: int
+    urls: List[PresignedUrlItem]
+
+
+class InitiateMultipartRequest(BaseModel):
+    bucket: str
+    key: str
+    content_type: Optional[str] = None
+    size: Optional[int] = None  # bytes; used to size the parts
+    part_size: Optional[int] = None
+
+
+class InitiateMultipartResponse(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    part_size: int
+    part_count: Optional[int] = None
+
+
+class PresignPartsRequest(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    part_numbers: List[int]
+    expires_in: int = 3600
+
+
+class PresignedPartItem(BaseModel):
+    part_number: int
+    url: str
+
+
+class PresignPartsResponse(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    expires_at: int
+    urls: List[PresignedPartItem]
+
+
+class UploadedPartItem(BaseModel):
+    part_number: int
+    etag: str
+    size: Optional[int] = None
+
+
+class ListPartsResponse(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    parts: List[UploadedPartItem]
+
+
+class MultipartUploadItem(BaseModel):
+    key: str
+    upload_id: str
+    initiated: datetime
+
+
+class ListMultipartUploadsResponse(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    uploads: List[MultipartUploadItem]
+    is_truncated: bool
+
+
+class CompleteMultipartRequest(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    # Omitted: complete with the parts stored for the upload.
+    parts: Optional[List[UploadedPartItem]] = None
+
+
+class CompleteMultipartResponse(BaseModel):
+    bucket: str
+    key: str
+    etag: Optional[str] = None
+    message: str
+
+
+class AbortMultipartResponse(BaseModel):
+    bucket: str
+    key: str
+    upload_id: str
+    message: str
+
+
+class InventoryFilters(BaseModel):
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    modified_after: Optional[datetime] = None
+    modified_before: Optional[datetime] = None
+    storage_class: Optional[str] = None
+    suffix: Optional[str] = None
+
+
+class InventoryExportRequest(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    format: str = 'csv'  # csv, ndjson or parquet
+    filters: InventoryFilters = InventoryFilters()
+    dest_bucket: str
+    dest_key: str
+
+
+class InventoryExportResponse(BaseModel):
+    bucket: str
+    key: str
+    etag: Optional[str] = None
+    size: int
+    parts: int
+
+
 class ObjectVersionItemResponse(BaseModel):
+    key: Optional[str] = None
     version_id: str
     is_latest: bool
     last_modified: datetime
     size: int
+    is_delete_marker: bool = False
 
 
 class ListObjectVersionsResponse(BaseModel):
     bucket: str
-    key: str
+    # Exactly one of key (versions of one object) or prefix is set.
+    key: Optional[str] = None
+    prefix: Optional[str] = None
     versions: List[ObjectVersionItemResponse]
+    is_truncated: bool = False
+    next_key_marker: Optional[str] = None
+    next_version_id_marker: Optional[str] = None
 
 
 class DeleteObjectVersionResponse(BaseModel):
@@ -65,6 +211,148 @@ class RestoreObjectVersionResponse(BaseModel):
     restored_from_version: Optional[str] = None
 
 
+class PurgeVersionsRequest(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    # Noncurrent versions to keep per key, newest first.
+    keep: int = 0
+    # Only purge versions noncurrent for at least this many days.
+    older_than_days: Optional[int] = None
+    dry_run: bool = True
+
+
+class PurgeVersionError(BaseModel):
+    key: str
+    version_id: str
+    code: str
+    message: str
+
+
+class PurgeVersionsResponse(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    dry_run: bool
+    selected: int
+    delete_markers: int
+    reclaimed_bytes: int
+    deleted: int
+    failed: int
+    sample: List[ObjectVersionItemResponse]
+    errors: List[PurgeVersionError]
+
+
+class BucketDifferenceItem(BaseModel):
+    key: str
+    status: str  # added, changed or removed
+    source_size: Optional[int] = None
+    dest_size: Optional[int] = None
+    source_etag: Optional[str] = None
+    dest_etag: Optional[str] = None
+
+
+class SyncBucketsRequest(BaseModel):
+    source_bucket: str
+    dest_bucket: str
+    prefix: Optional[str] = None
+    # Also delete keys the source no longer has.
+    delete: bool = False
+    dry_run: bool = True
+
+
+class SyncBucketsError(BaseModel):
+    key: str
+    code: str
+    message: str
+
+
+class SyncBucketsResponse(BaseModel):
+    source_bucket: str
+    dest_bucket: str
+    prefix: Optional[str] = None
+    dry_run: bool
+    added: int
+    changed: int
+    removed: int
+    unchanged: int
+    copy_bytes: int
+    copied: int
+    deleted: int
+    failed: int
+    sample: List[BucketDifferenceItem]
+    errors: List[SyncBucketsError]
+
+
+class FindDuplicatesRequest(BaseModel):
+    buckets: List[str]
+    prefix: Optional[str] = None
+    # Smaller objects are ignored (empty objects all look alike).
+    min_size: int = 1
+    top: int = 20
+
+
+class DuplicateLocation(BaseModel):
+    bucket: str
+    key: str
+
+
+class DuplicateGroup(BaseModel):
+    etag: str
+    size: int
+    copies: int
+    reclaimable_bytes: int
+    locations: List[DuplicateLocation]  # first 10
+
+
+class FindDuplicatesResponse(BaseModel):
+    buckets: List[str]
+    prefix: Optional[str] = None
+    scanned: int
+    groups: int
+    duplicate_objects: int
+    reclaimable_bytes: int
+    top: List[DuplicateGroup]
+
+
+class RestoreJobRequest(BaseModel):
+    bucket: str
+    prefix: Optional[str] = None
+    # Point in time to bring the prefix back to.
+    at: datetime
+    # Also delete objects created after ``at``.
+    delete_newer: bool = False
+    dry_run: bool = False
+
+
+class RestoreJobError(BaseModel):
+    key: str
+    code: str
+    message: str
+
+
+class RestoreJobResponse(BaseModel):
+    id: str
+    bucket: str
+    prefix: Optional[str] = None
+    at: datetime
+    delete_newer: bool
+    dry_run: bool
+    status: str
+    cancelled: bool
+    # Last key done; a resumed job continues after it.
+    checkpoint: Optional[str] = None
+    scanned: int
+    restored: int
+    deleted: int
+    unchanged: int
+    skipped: int
+    failed: int
+    errors: List[RestoreJobError]
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+    finished_at: Optional[float] = None
+
+
 class ObjectMetadataResponse(BaseModel):
     bucket: str
     key: str
@@ -113,6 +401,13 @@ class UpdateObjectMetadataRequest(BaseModel):
     metadata: Dict[str, str]
 
 
+class BulkHeadObjectsRequest(BaseModel):
+    bucket: str
+    keys: List[str]
+    metadata: bool = True
+    tags: bool = False
+
+
 class ObjectTagsRequest(BaseModel):
     bucket: str
     key: str
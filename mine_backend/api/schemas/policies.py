@@ -14,6 +14,9 @@ class PolicyResponse(BaseModel):
     is_group: bool
     policy_info: Optional[PolicyInfoResponse] = None
 
+class PolicyRow(PolicyResponse):
+    name: str
+
 class PolicyAttachedResponse(BaseModel):
     policies_attached: Optional[List[str]] = None
     user: str
@@ -37,3 +40,35 @@ class AttachPolicyRequest(BaseModel):
     policy: str
     username: str
 
+
+
+class PermissionCheck(BaseModel):
+    action: str
+    bucket: str
+    key: Optional[str] = None
+
+
+class EvaluatePermissionsRequest(BaseModel):
+    username: str
+    checks: List[PermissionCheck]
+
+
+class MatchedStatement(BaseModel):
+    source: str
+    statement: int
+    sid: Optional[str] = None
+    effect: str
+
+
+class PermissionDecision(BaseModel):
+    action: str
+    resource: str
+    allowed: bool
+    decision: str
+    matched: List[MatchedStatement] = []
+    conditional: List[MatchedStatement] = []
+
+
+class EvaluatePermissionsResponse(BaseModel):
+    username: str
+    results: List[PermissionDecision]
@@ -13,6 +13,19 @@ class UserResponse(BaseModel):
     member_of: Optional[List[GroupMembership]] = None
 
 
+class UserRow(UserResponse):
+    username: str
+    groups: List[str] = []
+
+
 class CreateUserRequest(BaseModel):
     username: str
     password: str
+
+
+class BulkCreateUsersRequest(BaseModel):
+    users: List[CreateUserRequest]
+
+
+class BulkUsernamesRequest(BaseModel):
+    usernames: List[str]
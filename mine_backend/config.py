@@ -1,7 +1,11 @@
 from pydantic_settings import BaseSettings
+import hashlib
 import importlib
 from functools import lru_cache
 
+from mine_backend.core.memo import LRUCache
+from mine_backend.core.metrics import InstrumentedClient
+
 
 class Settings(BaseSettings, extra='allow'):
     S3_REGION: str
@@ -28,6 +32,81 @@ class Settings(BaseSettings, extra='allow'):
     REDIS_PORT: int = 0
     REDIS_DB: int = 0
 
+    # Items of one bulk request in flight at once; each item is its own
+    # call on the admin executor, within ADMIN_EXECUTOR_WORKERS.
+    ADMIN_BULK_CONCURRENCY: int = 8
+    ADMIN_BULK_MAX_ITEMS: int = 1000
+
+    # Bulk object reads (HEAD/tags). 10 matches botocore's default
+    # connection pool: more threads would only queue for a connection.
+    OBJECT_BULK_CONCURRENCY: int = 10
+    OBJECT_BULK_MAX_ITEMS: int = 1000
+
+    ADMIN_EXECUTOR_WORKERS: int = 8
+    ADMIN_EXECUTOR_MAX_QUEUE: int = 64
+    ADMIN_CALL_TIMEOUT: float = 30.0
+    # Per-operation overrides, keyed by service/driver method name.
+    ADMIN_CALL_TIMEOUTS: dict[str, float] = {}
+
+    METRICS_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5
+
+    # '' (disabled), 'otlp', 'file' or 'console'
+    TRACING_EXPORTER: str = ''
+    TRACING_SERVICE_NAME: str = 'mine-backend'
+    TRACING_OTLP_ENDPOINT: str = 'http://localhost:4318/v1/traces'
+    TRACING_FILE: str = 'traces.jsonl'
+    TRACING_SAMPLE_RATIO: float = 1.0
+
+    # Prefix usage ("du") trees: cache lifetime, deepest breakdown allowed
+    # and how many recent writes per bucket are kept for incremental refresh.
+    PREFIX_USAGE_TTL: int = 3600
+    PREFIX_USAGE_MAX_DEPTH: int = 5
+    PREFIX_USAGE_CHANGE_LOG: int = 10000
+
+    # Bucket analytics (size/age histograms): how long a scan is served.
+    ANALYTICS_TTL: int = 3600
+
+    # Duplicate detection: buckets per scan, and entries sorted in memory
+    # before spilling to temporary files.
+    DEDUP_MAX_BUCKETS: int = 50
+    DEDUP_MEMORY_ENTRIES: int = 1_000_000
+
+    # GET /objects/archive: largest total size of a ZIP/TAR download, and
+    # how many objects are read ahead while the archive is written.
+    ARCHIVE_MAX_BYTES: int = 5 * 1024**3
+    ARCHIVE_CONCURRENCY: int = 4
+
+    # Point-in-time restore jobs: how long their state (and checkpoint) is
+    # kept in Redis.
+    RESTORE_JOB_TTL: int = 7 * 24 * 3600
+
+    # GET /objects: background fetch of the next page, and how long the
+    # page-number → continuation-token links are remembered.
+    LISTING_PREFETCH_ENABLED: bool = True
+    LISTING_PREFETCH_CONCURRENCY: int = 8
+    LISTING_CHAIN_TTL: int = 300
+
+    # Presigned URLs: keys per batch request, and how long a signed URL is
+    # reused for the same key and expiry (0 disables reuse).
+    PRESIGN_MAX_KEYS: int = 5000
+    PRESIGN_CACHE_SECONDS: int = 60
+
+    # Browser multipart uploads: default part size (grown to stay within
+    # 10,000 parts) and part URLs signed per request.
+    MULTIPART_PART_SIZE: int = 16 * 1024**2
+    MULTIPART_MAX_PRESIGN: int = 1000
+
+    # Request profiling: admins opt in per request with PROFILING_HEADER;
+    # PROFILING_THRESHOLD_MS > 0 also keeps the profile of any slower request.
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = 'X-Profile'
+    PROFILING_THRESHOLD_MS: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_DIR: str = 'profiles'  # used when Redis is not configured
+    PROFILING_TTL: int = 86400
+    PROFILING_MAX_PROFILES: int = 100
+
     CORS_ALLOWED_ORIGINS: list[str] = ['http://localhost:4200']
     MCP_ALLOWED_HOSTS: list[str] = []
     MCP_ALLOWED_ORIGINS: list[str] = []
@@ -42,6 +121,21 @@ class Settings(BaseSettings, extra='allow'):
 settings = Settings()
 
 
+@lru_cache
+def _driver_factory(module_path: str, factory: str):
+    """
+    Importa o módulo do driver e resolve a função fábrica uma única vez.
+    O import (boto3, SDKs, ...) só acontece no primeiro uso do driver.
+    """
+
+    module = importlib.import_module(module_path)
+
+    if not hasattr(module, factory):
+        raise RuntimeError(f"Module '{module_path}' must define {factory}()")
+
+    return getattr(module, factory)
+
+
 @lru_cache
 def get_admin():
     """
@@ -49,14 +143,10 @@ def get_admin():
     Espera que o módulo tenha uma função get_admin_client().
     """
 
-    module = importlib.import_module(settings.ADMIN_PATH)
-
-    if not hasattr(module, 'get_admin_client'):
-        raise RuntimeError(
-            f"Module '{settings.ADMIN_PATH}' must define get_admin_client()"
-        )
-
-    return module.get_admin_client()
+    client = _driver_factory(settings.ADMIN_PATH, 'get_admin_client')()
+    if settings.METRICS_ENABLED:
+        client = InstrumentedClient(client, 'admin')
+    return client
 
 
 def get_s3_client(sts_credentials: dict):
@@ -66,11 +156,69 @@ def get_s3_client(sts_credentials: dict):
     Espera que o módulo tenha uma função get_s3_client(sts).
     """
 
-    module = importlib.import_module(settings.S3_CLIENT_PATH)
+    client = _driver_factory(settings.S3_CLIENT_PATH, 'get_s3_client')(
+        sts_credentials
+    )
+    if settings.METRICS_ENABLED:
+        client = InstrumentedClient(client, 's3')
+    return client
 
-    if not hasattr(module, 'get_s3_client'):
-        raise RuntimeError(
-            f"Module '{settings.S3_CLIENT_PATH}' must define get_s3_client()"
-        )
 
-    return module.get_s3_client(sts_credentials)
+_signing_clients = LRUCache(maxsize=256)
+_multipart_clients = LRUCache(maxsize=256)
+
+
+def _fingerprint(sts_credentials: dict) -> str:
+    return hashlib.sha256(
+        '\0'.join(
+            str(sts_credentials.get(k) or '') for k in sorted(sts_credentials)
+        ).encode()
+    ).hexdigest()
+
+
+def get_signing_client(sts_credentials: dict):
+
+    """
+    Cliente S3 reaproveitado entre requisições com as mesmas credenciais
+    STS. Usado para operações locais (assinatura de URLs), em que criar um
+    cliente novo custa mais que a própria operação.
+    """
+
+    fingerprint = _fingerprint(sts_credentials)
+    client = _signing_clients.get(fingerprint)
+    if client is None:
+        client = get_s3_client(sts_credentials)
+        _signing_clients.set(fingerprint, client)
+    return client
+
+
+def get_multipart_client(sts_credentials: dict):
+
+    """
+    Cliente boto3 para uploads multipart (e outras operações que o driver
+    não expõe, como a listagem e remoção em lote de versões), reaproveitado
+    entre requisições com as mesmas credenciais STS. Essas operações vão
+    direto ao endpoint S3 (como o STS).
+    """
+
+    fingerprint = _fingerprint(sts_credentials)
+    client = _multipart_clients.get(fingerprint)
+    if client is None:
+        import boto3
+        from botocore.config import Config
+
+        client = boto3.client(
+            's3',
+            endpoint_url=(
+                f"http{'s' if settings.S3_SECURE else ''}://"
+                f'{settings.S3_ENDPOINT}'
+            ),
+            region_name=settings.S3_REGION,
+            config=Config(
+                signature_version='s3v4',
+                s3={'addressing_style': 'path'},
+            ),
+            **sts_credentials,
+        )
+        _multipart_clients.set(fingerprint, client)
+    return client
@@ -0,0 +1,219 @@
+import asyncio
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
+
+from mine_backend.config import get_admin, settings
+from mine_backend.core.metrics import (
+    ADMIN_EXECUTOR_QUEUED,
+    ADMIN_EXECUTOR_REJECTED,
+    ADMIN_EXECUTOR_RUNNING,
+    ADMIN_EXECUTOR_TIMEOUTS,
+)
+from mine_backend.exceptions.application import (
+    OperationTimeoutError,
+    TooManyRequestsError,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdminExecutor:
+    """Bounded thread pool for blocking admin-driver calls.
+
+    Admin drivers are synchronous (many shell out to an ``mc``-style CLI),
+    so calling them straight from an ``async`` handler freezes the worker.
+    Calls submitted here run on at most ``workers`` threads with at most
+    ``max_queue`` more waiting; anything beyond that is rejected at once
+    with :class:`TooManyRequestsError` (HTTP 429) instead of piling up.
+
+    A call that exceeds its timeout raises :class:`OperationTimeoutError`
+    (HTTP 504) to the caller. The thread cannot be interrupted, so it keeps
+    its slot until the driver returns — a hung backend therefore shows up
+    as back-pressure rather than as an unbounded number of stuck threads.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        timeout: float,
+        timeouts: Optional[dict[str, float]] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='admin'
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._counters = {
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'timed_out': 0,
+        }
+        self._operations: dict[str, dict[str, float]] = {}
+
+    # ── Accounting ────────────────────────────────────────────────────────────
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._counters['rejected'] += 1
+                ADMIN_EXECUTOR_REJECTED.inc()
+                raise TooManyRequestsError(
+                    'The storage admin backend is busy. Try again shortly.'
+                )
+            self._pending += 1
+            self._publish()
+
+    def _publish(self) -> None:
+        # Caller holds the lock.
+        ADMIN_EXECUTOR_RUNNING.set(self._running)
+        ADMIN_EXECUTOR_QUEUED.set(max(0, self._pending - self._running))
+
+    def _record(self, operation: str, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._counters['completed' if ok else 'failed'] += 1
+            op = self._operations.setdefault(
+                operation, {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            )
+            op['count'] += 1
+            op['errors'] += 0 if ok else 1
+            op['total_ms'] += elapsed * 1000
+            op['max_ms'] = max(op['max_ms'], elapsed * 1000)
+            self._publish()
+
+    def _invoke(self, operation: str, fn: Callable, args, kwargs) -> Any:
+        with self._lock:
+            self._running += 1
+            self._publish()
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._record(operation, time.perf_counter() - start, ok)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def timeout_for(self, operation: str) -> float:
+        return self.timeouts.get(operation, self.timeout)
+
+    async def run(
+        self, operation: str, fn: Callable, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        self._acquire()
+        loop = asyncio.get_running_loop()
+        # Carry contextvars (the active trace span) into the worker thread.
+        context = contextvars.copy_context()
+        try:
+            future = loop.run_in_executor(
+                self._pool,
+                partial(context.run, self._invoke, operation, fn, args, kwargs),
+            )
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        timeout = self.timeout_for(operation)
+        try:
+            # shield: a timeout must not cancel the bookkeeping of a thread
+            # that is still running.
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._counters['timed_out'] += 1
+            ADMIN_EXECUTOR_TIMEOUTS.labels(operation=operation).inc()
+            logger.warning(
+                'Admin operation timed out',
+                extra={'operation': operation, 'timeout': timeout},
+            )
+            raise OperationTimeoutError(
+                f"Storage admin operation '{operation}' timed out "
+                f'after {timeout:g}s.'
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': max(0, self._pending - self._running),
+                **self._counters,
+                'operations': {
+                    name: {
+                        'count': int(op['count']),
+                        'errors': int(op['errors']),
+                        'avg_ms': round(op['total_ms'] / op['count'], 3)
+                        if op['count']
+                        else 0.0,
+                        'max_ms': round(op['max_ms'], 3),
+                    }
+                    for name, op in sorted(self._operations.items())
+                },
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncAdmin:
+    """Async facade over a synchronous admin object.
+
+    Wraps either the ``UserAdminPort`` itself or a service built on it;
+    every method becomes a coroutine executed on :class:`AdminExecutor`
+    under its own name (so ``ADMIN_CALL_TIMEOUTS`` is keyed by method
+    name). Methods that are already coroutines (the bulk ones, which
+    submit each item here themselves) and non-callable attributes are
+    returned as is.
+    """
+
+    def __init__(self, target: Any, executor: Optional[AdminExecutor] = None):
+        self._target = target
+        self._executor = executor or get_admin_executor()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr) or inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._executor.run(name, attr, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = getattr(attr, '__doc__', None)
+        return call
+
+
+@lru_cache
+def get_admin_executor() -> AdminExecutor:
+    return AdminExecutor(
+        workers=settings.ADMIN_EXECUTOR_WORKERS,
+        max_queue=settings.ADMIN_EXECUTOR_MAX_QUEUE,
+        timeout=settings.ADMIN_CALL_TIMEOUT,
+        timeouts=settings.ADMIN_CALL_TIMEOUTS,
+    )
+
+
+def get_async_admin() -> AsyncAdmin:
+    """The process-wide ``UserAdminPort`` behind the async facade."""
+    return AsyncAdmin(get_admin())
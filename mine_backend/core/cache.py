@@ -1,12 +1,68 @@
+import functools
+import inspect
 import json
+import time
+import uuid
 from typing import Any, Callable
 
+from opentelemetry import trace
+
 from fastapi.encoders import jsonable_encoder
 
+from mine_backend.core.memo import LRUCache
+from mine_backend.core.metrics import (
+    CACHE_DURATION,
+    CACHE_REQUESTS,
+    key_prefix,
+    timed,
+)
 from mine_backend.core.redis import redis
+from mine_backend.core.tracing import span
 
 CACHE_TTL = 30  # seconds
 
+# Process-local snapshots, keyed by full cache key → (token, snapshot).
+_snapshots = LRUCache(maxsize=128)
+# Values of get_or_set_local and set while Redis is off, keyed by full
+# cache key → (expires_at, value).
+_local = LRUCache(maxsize=256)
+
+
+def _local_get(full_key: str) -> Any:
+    entry = _local.get(full_key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _traced(operation: str) -> Callable:
+    """Run a CacheManager coroutine method inside a ``cache.*`` span."""
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            with span(
+                f'cache.{operation}',
+                **{'cache.key': str(args[0]) if args else None},
+            ):
+                return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _record_lookup(prefix: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(prefix=prefix, result='hit' if hit else 'miss').inc()
+    trace.get_current_span().set_attribute('cache.hit', hit)
+
+
+async def _call(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    result = fn(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
 
 class CacheManager:
     """
@@ -21,6 +77,8 @@ class CacheManager:
     --------------
     When Redis is not configured (``redis is None``) every operation is a
     no-op: reads call the service directly and writes skip invalidation.
+    The exceptions are :meth:`get_or_set_local` and :meth:`get` /
+    :meth:`set`, which then keep values in process memory.
     """
 
     def __init__(self, user_id: str, is_admin: bool) -> None:
@@ -36,6 +94,7 @@ class CacheManager:
 
     # ── Read ──────────────────────────────────────────────────────────────────
 
+    @_traced('get_or_set')
     async def get_or_set(
         self,
         resource_key: str,
@@ -44,56 +103,194 @@ class CacheManager:
         **kwargs: Any,
     ) -> Any:
         """Return the cached value for *resource_key*; on a miss call *fn* and
-        store the result.  The callable must be **synchronous**.
+        store the result.  The callable may be synchronous or return an
+        awaitable (e.g. a method of an ``AsyncAdmin`` facade).
 
         When Redis is unavailable the callable is executed directly and the
         result is returned without caching.
         """
+        prefix = key_prefix(resource_key)
+
         if redis is None:
-            return fn(*args, **kwargs)
+            with timed(CACHE_DURATION, prefix=prefix, operation='load'):
+                return await _call(fn, *args, **kwargs)
 
         full_key = self._build_key(resource_key)
 
-        cached = await redis.get(full_key)
+        with timed(CACHE_DURATION, prefix=prefix, operation='get'):
+            cached = await redis.get(full_key)
         if cached is not None:
+            _record_lookup(prefix, True)
             return json.loads(cached)
+        _record_lookup(prefix, False)
 
-        result = fn(*args, **kwargs)
-        serializable = jsonable_encoder(result)
-        await redis.setex(full_key, CACHE_TTL, json.dumps(serializable))
+        with timed(CACHE_DURATION, prefix=prefix, operation='load'):
+            result = await _call(fn, *args, **kwargs)
+        with timed(CACHE_DURATION, prefix=prefix, operation='set'):
+            serializable = jsonable_encoder(result)
+            await redis.setex(full_key, CACHE_TTL, json.dumps(serializable))
         return serializable
 
+    @_traced('get_or_set_local')
+    async def get_or_set_local(
+        self, resource_key: str, fn: Callable, *args: Any
+    ) -> Any:
+        """:meth:`get_or_set` for values too costly to rebuild on every
+        request: without Redis they are kept in process memory for
+        ``CACHE_TTL``, and :meth:`invalidate` / :meth:`invalidate_prefix`
+        drop them as they would the Redis entries.
+        """
+        if redis is not None:
+            return await self.get_or_set(resource_key, fn, *args)
+
+        prefix = key_prefix(resource_key)
+        full_key = self._build_key(resource_key)
+        cached = _local_get(full_key)
+        if cached is not None:
+            _record_lookup(prefix, True)
+            return cached
+        _record_lookup(prefix, False)
+
+        with timed(CACHE_DURATION, prefix=prefix, operation='load'):
+            result = await _call(fn, *args)
+        _local.set(full_key, (time.monotonic() + CACHE_TTL, result))
+        return result
+
+    @_traced('get')
+    async def get(self, resource_key: str) -> Any:
+        """Return the cached value for *resource_key*, or ``None``."""
+        prefix = key_prefix(resource_key)
+        if redis is None:
+            cached = _local_get(self._build_key(resource_key))
+            _record_lookup(prefix, cached is not None)
+            return cached
+
+        with timed(CACHE_DURATION, prefix=prefix, operation='get'):
+            cached = await redis.get(self._build_key(resource_key))
+        _record_lookup(prefix, cached is not None)
+        return json.loads(cached) if cached is not None else None
+
+    @_traced('set')
+    async def set(
+        self, resource_key: str, value: Any, ttl: int = CACHE_TTL
+    ) -> None:
+        """Store *value* under *resource_key*; for entries that are
+        maintained explicitly and outlive the default TTL. Without Redis
+        the value is kept in process memory, as in
+        :meth:`get_or_set_local`."""
+        if redis is None:
+            _local.set(
+                self._build_key(resource_key), (time.monotonic() + ttl, value)
+            )
+            return
+
+        with timed(CACHE_DURATION, prefix=key_prefix(resource_key), operation='set'):
+            await redis.setex(
+                self._build_key(resource_key),
+                ttl,
+                json.dumps(jsonable_encoder(value)),
+            )
+
+    @_traced('get_snapshot')
+    async def get_snapshot(
+        self,
+        resource_key: str,
+        fn: Callable,
+        index: Callable[[Any], Any],
+        *args: Any,
+    ) -> Any:
+        """Return the indexed snapshot for *resource_key*; when missing or
+        stale, fetch the list with ``fn(*args)`` (sync or awaitable, as in
+        :meth:`get_or_set`) and index it with *index*.
+
+        *index* is usually a ``ListSnapshot`` builder, but any in-memory
+        index of the result works.
+
+        The snapshot itself stays in process memory; Redis only holds a small
+        generation token under the usual key, so the existing
+        ``invalidate('users:list')`` calls — from any worker — still make every
+        worker rebuild on its next request.
+
+        When Redis is unavailable the snapshot is rebuilt on every call.
+        """
+        prefix = key_prefix(resource_key)
+
+        if redis is None:
+            with timed(CACHE_DURATION, prefix=prefix, operation='load'):
+                return index(await _call(fn, *args))
+
+        full_key = self._build_key(resource_key)
+
+        with timed(CACHE_DURATION, prefix=prefix, operation='get'):
+            token = await redis.get(full_key)
+        if token is not None:
+            entry = _snapshots.get(full_key)
+            if entry is not None and entry[0] == token:
+                _record_lookup(prefix, True)
+                return entry[1]
+        _record_lookup(prefix, False)
+
+        with timed(CACHE_DURATION, prefix=prefix, operation='load'):
+            snapshot = index(await _call(fn, *args))
+
+        if token is None:
+            token = uuid.uuid4().hex.encode()
+            created = await redis.set(full_key, token, ex=CACHE_TTL, nx=True)
+            if not created:
+                # Another worker published a generation first; adopt it.
+                token = await redis.get(full_key)
+
+        if token is not None:
+            _snapshots.set(full_key, (token, snapshot))
+        return snapshot
+
     # ── Invalidation ──────────────────────────────────────────────────────────
 
+    @_traced('invalidate')
     async def invalidate(self, *resource_keys: str) -> None:
         """Delete specific cache entries.
 
         Both the global namespace and the current user's namespace are cleared
         so that writes by non-admin users also bust the shared admin cache.
         """
-        if redis is None:
-            return
-
         keys: list[str] = []
         for rk in resource_keys:
             keys.append(f'cache:global:{rk}')
             keys.append(f'cache:user:{self.user_id}:{rk}')
 
+        if redis is None:
+            for key in keys:
+                _local.pop(key)
+            return
+
         if keys:
-            await redis.delete(*keys)
+            with timed(
+                CACHE_DURATION,
+                prefix=key_prefix(resource_keys[0]),
+                operation='invalidate',
+            ):
+                await redis.delete(*keys)
 
+    @_traced('invalidate_prefix')
     async def invalidate_prefix(self, *prefixes: str) -> None:
         """Delete all cache entries whose resource key starts with any of the
         given prefixes (scanned across both global and user namespaces).
         """
         if redis is None:
+            namespaces = ('cache:global:', f'cache:user:{self.user_id}:')
+            scoped = tuple(ns + prefix for prefix in prefixes for ns in namespaces)
+            _local.pop_where(lambda key: key.startswith(scoped))
             return
 
-        patterns: list[str] = []
         for prefix in prefixes:
-            patterns.append(f'cache:global:{prefix}*')
-            patterns.append(f'cache:user:{self.user_id}:{prefix}*')
-
-        for pattern in patterns:
-            async for key in redis.scan_iter(pattern):
-                await redis.delete(key)
+            with timed(
+                CACHE_DURATION,
+                prefix=key_prefix(prefix),
+                operation='invalidate_prefix',
+            ):
+                for pattern in (
+                    f'cache:global:{prefix}*',
+                    f'cache:user:{self.user_id}:{prefix}*',
+                ):
+                    async for key in redis.scan_iter(pattern):
+                        await redis.delete(key)
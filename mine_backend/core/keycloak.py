@@ -1,6 +1,7 @@
 import time
 import httpx
 from mine_backend.config import settings
+from mine_backend.core.tracing import span
 
 _jwks_cache = None
 _jwks_expiration = 0
@@ -21,8 +22,9 @@ async def get_jwks():
         f'{settings.KEYCLOAK_REALM}/protocol/openid-connect/certs'
     )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(jwks_url)
+    with span('keycloak.jwks', **{'url.full': jwks_url}):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(jwks_url)
         response.raise_for_status()
         _jwks_cache = response.json()
         _jwks_expiration = now + JWKS_TTL
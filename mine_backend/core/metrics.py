@@ -0,0 +1,184 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+from mine_backend.core.tracing import span
+
+
+# Buckets tuned for an API in front of a storage backend: most calls are
+# single-digit milliseconds, CLI-backed admin calls are hundreds of ms.
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'mine_http_request_duration_seconds',
+    'HTTP request latency by route template.',
+    ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    'mine_cache_requests_total',
+    'CacheManager lookups by key prefix and result (hit/miss).',
+    ['prefix', 'result'],
+)
+
+CACHE_DURATION = Histogram(
+    'mine_cache_operation_duration_seconds',
+    'CacheManager operation latency by key prefix.',
+    ['prefix', 'operation'],
+    buckets=LATENCY_BUCKETS,
+)
+
+BACKEND_CALL_DURATION = Histogram(
+    'mine_backend_call_duration_seconds',
+    'Storage driver call latency (backend is "s3" or "admin").',
+    ['backend', 'operation', 'outcome'],
+    buckets=LATENCY_BUCKETS,
+)
+
+ADMIN_EXECUTOR_RUNNING = Gauge(
+    'mine_admin_executor_running',
+    'Admin driver calls currently running on the executor.',
+)
+
+ADMIN_EXECUTOR_QUEUED = Gauge(
+    'mine_admin_executor_queued',
+    'Admin driver calls waiting for an executor thread.',
+)
+
+ADMIN_EXECUTOR_REJECTED = Counter(
+    'mine_admin_executor_rejected_total',
+    'Admin driver calls rejected with 429 because the executor was full.',
+)
+
+ADMIN_EXECUTOR_TIMEOUTS = Counter(
+    'mine_admin_executor_timeouts_total',
+    'Admin driver calls that exceeded their timeout.',
+    ['operation'],
+)
+
+STS_DURATION = Histogram(
+    'mine_sts_request_duration_seconds',
+    'AssumeRoleWithWebIdentity latency.',
+    ['outcome'],
+    buckets=LATENCY_BUCKETS,
+)
+
+SEARCH_STREAM_DURATION = Histogram(
+    'mine_search_stream_duration_seconds',
+    'Duration of SSE search streams.',
+    ['outcome'],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+EVENT_LOOP_LAG = Gauge(
+    'mine_event_loop_lag_seconds',
+    'Most recent event-loop scheduling delay.',
+)
+
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    'mine_event_loop_lag_distribution_seconds',
+    'Distribution of event-loop scheduling delay.',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def key_prefix(resource_key: str) -> str:
+    """First segment of a cache key (``users:alice`` → ``users``), which
+    keeps label cardinality bounded."""
+    return resource_key.split(':', 1)[0]
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[dict]:
+    """Observe the block's duration. The yielded dict may be used to set
+    labels that are only known at the end (e.g. ``outcome``)."""
+    late: dict = {}
+    start = time.perf_counter()
+    try:
+        yield late
+    finally:
+        histogram.labels(**labels, **late).observe(time.perf_counter() - start)
+
+
+class InstrumentedClient:
+    """Transparent proxy that times and traces every method call of a
+    driver.
+
+    Used for the object storage and admin ports so each operation
+    (``list_objects``, ``create_user``, ...) gets its own latency series
+    and its own ``s3.list_objects`` / ``admin.create_user`` span.
+    """
+
+    def __init__(self, target: Any, backend: str) -> None:
+        self._target = target
+        self._backend = backend
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        backend = self._backend
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with span(
+                f'{backend}.{name}',
+                **{'mine.backend': backend, 'mine.operation': name},
+            ), timed(
+                BACKEND_CALL_DURATION, backend=backend, operation=name
+            ) as labels:
+                labels['outcome'] = 'error'
+                result = attr(*args, **kwargs)
+                labels['outcome'] = 'ok'
+                return result
+
+        call.__name__ = name
+        call.__doc__ = getattr(attr, '__doc__', None)
+        call.__wrapped__ = attr
+        return call
+
+
+async def http_metrics_middleware(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get('route')
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=getattr(route, 'path', 'unmatched'),
+            status=str(status),
+        ).observe(time.perf_counter() - start)
+
+
+async def monitor_event_loop(interval: float = 0.5) -> None:
+    """Measure how late the loop wakes us up; run as a background task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,191 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Optional
+
+from mine_backend.core.memo import LRUCache
+from mine_backend.exceptions.application import InconsistentDataError
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def _sort_value(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value).lower()
+
+
+def _matches(value: Any, expected: str) -> bool:
+    if isinstance(value, (list, tuple, set)):
+        return any(_sort_value(v) == expected for v in value)
+    return _sort_value(value) == expected
+
+
+def encode_cursor(payload: list) -> str:
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InconsistentDataError('Invalid pagination cursor.')
+    if not isinstance(payload, list) or len(payload) != 3:
+        raise InconsistentDataError('Invalid pagination cursor.')
+    return payload
+
+
+class ListSnapshot:
+    """Immutable, indexed copy of an admin list (users, groups, ...).
+
+    ``raw`` is what the driver returned and is served unchanged to callers
+    that do not paginate. ``rows`` are the flat dicts built from it; sort
+    orders and filtered views are computed on first use and memoized, so
+    paging through a view costs a bisect plus a slice.
+
+    Cursors are keyset based — they carry the sort value and key of the last
+    row returned — so they stay valid (never skip or repeat a row) when the
+    snapshot is rebuilt between two page requests.
+    """
+
+    def __init__(
+        self,
+        raw: Any,
+        rows: Iterable[dict],
+        key: str,
+        sortable: Iterable[str] = (),
+        filterable: Iterable[str] = (),
+    ) -> None:
+        self.raw = raw
+        self.key = key
+        self.rows = [row for row in rows if row.get(key) is not None]
+        self.sortable = (key,) + tuple(f for f in sortable if f != key)
+        self.filterable = tuple(filterable)
+        self._orders: dict[str, tuple[list[tuple[str, str]], list[int]]] = {}
+        self._views = LRUCache(maxsize=32)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ── Indexes ───────────────────────────────────────────────────────────────
+
+    def _order(self, field: str) -> tuple[list[tuple[str, str]], list[int]]:
+        """Ascending ``(sort_value, key)`` tuples and matching row indexes."""
+        order = self._orders.get(field)
+        if order is None:
+            decorated = sorted(
+                (
+                    (_sort_value(row.get(field)), str(row[self.key])),
+                    index,
+                )
+                for index, row in enumerate(self.rows)
+            )
+            order = ([k for k, _ in decorated], [i for _, i in decorated])
+            self._orders[field] = order
+        return order
+
+    def _view(
+        self, field: str, q: Optional[str], filters: tuple
+    ) -> tuple[list[tuple[str, str]], list[int]]:
+        if not q and not filters:
+            return self._order(field)
+
+        view_key = (field, q, filters)
+        view = self._views.get(view_key)
+        if view is None:
+            keys, indexes = self._order(field)
+            selected = [
+                position
+                for position, index in enumerate(indexes)
+                if self._accepts(self.rows[index], q, filters)
+            ]
+            view = (
+                [keys[p] for p in selected],
+                [indexes[p] for p in selected],
+            )
+            self._views.set(view_key, view)
+        return view
+
+    def _accepts(self, row: dict, q: Optional[str], filters: tuple) -> bool:
+        if q and q not in _sort_value(row.get(self.key)):
+            return False
+        return all(_matches(row.get(f), expected) for f, expected in filters)
+
+    # ── Paging ────────────────────────────────────────────────────────────────
+
+    def page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = 'asc',
+        q: Optional[str] = None,
+        filters: Optional[dict[str, Optional[str]]] = None,
+    ) -> dict:
+        sort = sort or self.key
+        if sort not in self.sortable:
+            raise InconsistentDataError(
+                f"Cannot sort by '{sort}'. "
+                f"Allowed: {', '.join(self.sortable)}."
+            )
+        if order not in ('asc', 'desc'):
+            raise InconsistentDataError("Order must be 'asc' or 'desc'.")
+        if limit <= 0 or limit > MAX_PAGE_SIZE:
+            raise InconsistentDataError(
+                f'Limit must be between 1 and {MAX_PAGE_SIZE}.'
+            )
+
+        applied = tuple(
+            sorted(
+                (f, _sort_value(v))
+                for f, v in (filters or {}).items()
+                if v is not None and f in self.filterable
+            )
+        )
+        q = q.lower() if q else None
+
+        keys, indexes = self._view(sort, q, applied)
+
+        start = 0 if order == 'asc' else len(keys)
+        if cursor:
+            cursor_sort, cursor_order, last = decode_cursor(cursor)
+            if cursor_sort != sort or cursor_order != order:
+                raise InconsistentDataError(
+                    'Cursor does not match the requested sort order.'
+                )
+            if not (
+                isinstance(last, list)
+                and len(last) == 2
+                and all(isinstance(part, str) for part in last)
+            ):
+                raise InconsistentDataError('Invalid pagination cursor.')
+            last = tuple(last)
+            if order == 'asc':
+                start = bisect_right(keys, last)
+            else:
+                start = bisect_left(keys, last)
+
+        if order == 'asc':
+            positions = range(start, min(start + limit, len(keys)))
+            more = start + limit < len(keys)
+        else:
+            positions = range(start - 1, max(start - limit, 0) - 1, -1)
+            more = start - limit > 0
+
+        items = [self.rows[indexes[p]] for p in positions]
+        next_cursor = None
+        if more and items:
+            next_cursor = encode_cursor([sort, order, list(keys[positions[-1]])])
+
+        return {
+            'items': items,
+            'total': len(keys),
+            'next_cursor': next_cursor,
+        }
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import lru_cache
+from types import FrameType
+from typing import Any, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from mine_backend.config import settings
+from mine_backend.core.authorization import is_admin
+from mine_backend.core.redis import redis
+from mine_backend.core.security import verify_internal_session
+from mine_backend.exceptions.application import NotFoundError
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = 'profile:{}'
+PROFILE_INDEX_KEY = 'profiles'
+
+
+# ── Stack sampling ───────────────────────────────────────────────────────────
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    return (
+        f'{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+    )
+
+
+def _coroutine_chain(task: asyncio.Task) -> tuple[list[FrameType], Any]:
+    """Frames of the task's await chain, outermost first, and the object
+    the innermost coroutine is waiting on (a future, or ``None``)."""
+    frames: list[FrameType] = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, 'cr_frame', None)
+            or getattr(awaitable, 'gi_frame', None)
+            or getattr(awaitable, 'ag_frame', None)
+        )
+        if frame is None:
+            return frames, awaitable
+        frames.append(frame)
+        awaitable = (
+            getattr(awaitable, 'cr_await', None)
+            or getattr(awaitable, 'gi_yieldfrom', None)
+            or getattr(awaitable, 'ag_await', None)
+        )
+    return frames, None
+
+
+class RequestProfile:
+    """Samples collected for one in-flight request.
+
+    A request is an asyncio task, so a sample is the task's await chain
+    (where it is suspended) and, if the task happens to be executing on the
+    event loop at that instant, the synchronous frames above it — which is
+    where blocking driver calls made from ``async`` handlers show up.
+    """
+
+    def __init__(self, task: asyncio.Task, thread_id: int) -> None:
+        self.task = task
+        self.thread_id = thread_id
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def sample(self, thread_frames: dict[int, FrameType]) -> None:
+        chain, waiting_on = _coroutine_chain(self.task)
+        if not chain:
+            return
+        stack = [_label(f) for f in chain]
+
+        running = []
+        frame = thread_frames.get(self.thread_id)
+        while frame is not None and frame is not chain[-1]:
+            running.append(frame)
+            frame = frame.f_back
+        if frame is not None:
+            stack.extend(_label(f) for f in reversed(running))
+        elif waiting_on is not None:
+            stack.append(f'<await {type(waiting_on).__name__}>')
+
+        self.stacks[';'.join(stack)] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed-stack text (``frame;frame;frame count`` per line), as
+        read by flamegraph.pl, speedscope and most flame graph viewers."""
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self.stacks.most_common()
+        )
+
+
+class StackSampler:
+    """One background thread sampling every active :class:`RequestProfile`.
+
+    The thread runs only while at least one request is being profiled, so
+    the cost with profiling enabled but idle is a set insertion per request.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._active: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='profiler', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = list(self._active)
+            frames = sys._current_frames()
+            for profile in active:
+                try:
+                    profile.sample(frames)
+                except (AttributeError, ValueError, RuntimeError):
+                    # The task moved on while we were walking it.
+                    continue
+
+
+# ── Storage ──────────────────────────────────────────────────────────────────
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in Redis when it is configured,
+    otherwise as JSON files under ``directory``."""
+
+    def __init__(self, directory: str, ttl: int, max_profiles: int) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_profiles = max_profiles
+
+    async def save(self, meta: dict, folded: str) -> None:
+        document = json.dumps({'meta': meta, 'folded': folded})
+        if redis is not None:
+            await redis.setex(PROFILE_KEY.format(meta['id']), self.ttl, document)
+            await redis.zadd(PROFILE_INDEX_KEY, {meta['id']: meta['created_at']})
+            await redis.zremrangebyrank(
+                PROFILE_INDEX_KEY, 0, -self.max_profiles - 1
+            )
+            return
+        await asyncio.to_thread(self._write, meta['id'], document)
+
+    def _write(self, profile_id: str, document: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile_id), 'w', encoding='utf-8') as f:
+            f.write(document)
+        files = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith('.json')),
+            key=lambda e: e.stat().st_mtime,
+        )
+        for entry in files[: max(0, len(files) - self.max_profiles)]:
+            os.remove(entry.path)
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f'{profile_id}.json')
+
+    async def _load(self, profile_id: str) -> Optional[dict]:
+        if redis is not None:
+            raw = await redis.get(PROFILE_KEY.format(profile_id))
+            return json.loads(raw) if raw else None
+
+        def read() -> Optional[dict]:
+            try:
+                with open(self._path(profile_id), encoding='utf-8') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(read)
+
+    async def get(self, profile_id: str) -> dict:
+        try:
+            uuid.UUID(profile_id)
+        except ValueError:
+            raise NotFoundError(f"Profile '{profile_id}' not found.")
+        document = await self._load(profile_id)
+        if document is None:
+            raise NotFoundError(f"Profile '{profile_id}' not found.")
+        return document
+
+    async def list(self) -> list[dict]:
+        """Metadata of the stored profiles, newest first."""
+        if redis is not None:
+            ids = await redis.zrevrange(PROFILE_INDEX_KEY, 0, -1)
+            documents = [
+                await self._load(i.decode() if isinstance(i, bytes) else i)
+                for i in ids
+            ]
+        else:
+
+            def read_all() -> list[dict]:
+                if not os.path.isdir(self.directory):
+                    return []
+                found = []
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith('.json'):
+                        with open(entry.path, encoding='utf-8') as f:
+                            found.append(json.load(f))
+                return found
+
+            documents = await asyncio.to_thread(read_all)
+
+        metas = [d['meta'] for d in documents if d]
+        return sorted(metas, key=lambda m: m['created_at'], reverse=True)
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(
+        directory=settings.PROFILING_DIR,
+        ttl=settings.PROFILING_TTL,
+        max_profiles=settings.PROFILING_MAX_PROFILES,
+    )
+
+
+@lru_cache
+def get_stack_sampler() -> StackSampler:
+    return StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+
+
+# ── Middleware ───────────────────────────────────────────────────────────────
+
+
+def _is_admin_request(headers: Headers) -> bool:
+    scheme, _, token = headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+    try:
+        return bool(is_admin(verify_internal_session(token)))
+    except Exception:
+        return False
+
+
+class ProfilingMiddleware:
+    """Profile a request when an admin asks for it or when it turns out slow.
+
+    * An admin sends the ``PROFILING_HEADER`` header (any value); the
+      profile is always kept and its id is returned in the same header.
+    * With ``PROFILING_THRESHOLD_MS`` > 0, every request is sampled and
+      the profile is kept only if the request took at least that long.
+
+    Pure ASGI (not ``BaseHTTPMiddleware``) and installed innermost, so it
+    runs in the same task as the route handler — which is what the sampler
+    follows.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str,
+        threshold_ms: float,
+        sampler: Optional[StackSampler] = None,
+        store: Optional[ProfileStore] = None,
+    ) -> None:
+        self.app = app
+        self.header = header.lower()
+        self.threshold_ms = threshold_ms
+        self.sampler = sampler or get_stack_sampler()
+        self.store = store or get_profile_store()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if self.header in headers and _is_admin_request(headers):
+            trigger = 'header'
+        elif self.threshold_ms > 0:
+            trigger = 'threshold'
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if trigger == 'header':
+                    message.setdefault('headers', [])
+                    message['headers'] = list(message['headers']) + [
+                        (self.header.encode(), profile_id.encode())
+                    ]
+            await send(message)
+
+        profile = RequestProfile(asyncio.current_task(), threading.get_ident())
+        self.sampler.start(profile)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.sampler.stop(profile)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if trigger == 'header' or duration_ms >= self.threshold_ms:
+                route = getattr(scope.get('route'), 'path', None)
+                meta = {
+                    'id': profile_id,
+                    'created_at': time.time(),
+                    'trigger': trigger,
+                    'method': scope.get('method'),
+                    'path': scope.get('path'),
+                    'route': route,
+                    'status': status,
+                    'duration_ms': round(duration_ms, 3),
+                    'samples': profile.samples,
+                    'interval_ms': self.sampler.interval * 1000,
+                }
+                try:
+                    await self.store.save(meta, profile.folded())
+                    logger.info('Request profile stored', extra=meta)
+                except Exception:
+                    logger.exception('Could not store request profile')
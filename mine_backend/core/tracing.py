@@ -0,0 +1,144 @@
+import functools
+import inspect
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from opentelemetry import propagate, trace
+from starlette.requests import Request
+
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer('mine_backend')
+
+
+def _clean(attributes: dict) -> dict:
+    return {
+        k: v if isinstance(v, (str, bool, int, float)) else str(v)
+        for k, v in attributes.items()
+        if v is not None
+    }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[trace.Span]:
+    """Start a child span of the current one.
+
+    Without a configured exporter the OpenTelemetry API hands out no-op
+    spans, so this is safe (and nearly free) on hot paths.
+    """
+    with tracer.start_as_current_span(name, attributes=_clean(attributes)) as s:
+        yield s
+
+
+def setup_tracing(
+    exporter: str,
+    service_name: str,
+    otlp_endpoint: str,
+    file_path: str,
+    sample_ratio: float,
+) -> None:
+    """Install the global tracer provider.
+
+    *exporter* is ``otlp`` (HTTP/protobuf to a local collector), ``file``
+    (one JSON span per line, for offline analysis), ``console`` or empty to
+    leave tracing disabled.
+    """
+    if not exporter:
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import (
+        ParentBased,
+        TraceIdRatioBased,
+    )
+
+    if exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        span_exporter = OTLPSpanExporter(endpoint=otlp_endpoint)
+    elif exporter == 'file':
+        span_exporter = ConsoleSpanExporter(
+            out=open(file_path, 'a', encoding='utf-8'),
+            formatter=lambda s: s.to_json(indent=None) + '\n',
+        )
+    elif exporter == 'console':
+        span_exporter = ConsoleSpanExporter()
+    else:
+        raise RuntimeError(
+            f"Unknown TRACING_EXPORTER '{exporter}' "
+            "(expected 'otlp', 'file' or 'console')"
+        )
+
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    logger.info('Tracing enabled', extra={'exporter': exporter})
+
+
+def shutdown_tracing() -> None:
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, 'shutdown'):
+        provider.shutdown()
+
+
+async def tracing_middleware(request: Request, call_next):
+    """Server span per HTTP request, continuing an incoming ``traceparent``.
+
+    The span is renamed to the route template once routing has happened,
+    e.g. ``GET /buckets/{bucket}/objects``.
+    """
+    context = propagate.extract(request.headers)
+    with tracer.start_as_current_span(
+        f'{request.method} {request.url.path}',
+        context=context,
+        kind=trace.SpanKind.SERVER,
+        attributes={
+            'http.request.method': request.method,
+            'url.path': request.url.path,
+        },
+    ) as s:
+        response = await call_next(request)
+        route = getattr(request.scope.get('route'), 'path', None)
+        if route:
+            s.update_name(f'{request.method} {route}')
+            s.set_attribute('http.route', route)
+        s.set_attribute('http.response.status_code', response.status_code)
+        if response.status_code >= 500:
+            s.set_status(trace.Status(trace.StatusCode.ERROR))
+        return response
+
+
+def traced_tool(fn: Callable) -> Callable:
+    """Wrap an MCP tool so each invocation gets a span.
+
+    Arguments are not recorded (they include session tokens).
+    """
+    name = f'mcp.tool {fn.__name__}'
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, **{'mcp.tool': fn.__name__}):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(name, **{'mcp.tool': fn.__name__}):
+            return fn(*args, **kwargs)
+
+    return wrapper
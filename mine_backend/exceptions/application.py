@@ -39,3 +39,12 @@ class ServiceUnavailableError(AppException):
     def __init__(self, message: str = 'Service unavailable'):
         super().__init__(message, code='UNAVAILABLE_ERROR')
 
+
+class TooManyRequestsError(AppException):
+    def __init__(self, message: str = 'Too many requests'):
+        super().__init__(message, code='TOO_MANY_REQUESTS')
+
+
+class OperationTimeoutError(AppException):
+    def __init__(self, message: str = 'Operation timed out'):
+        super().__init__(message, code='OPERATION_TIMEOUT')
@@ -4,6 +4,18 @@ from mine_backend.api.router import api_router
 from contextlib import asynccontextmanager
 from mine_backend.core.logging_config import setup_logger
 from mine_backend.config import get_admin, settings
+from mine_backend.core.admin_executor import get_admin_executor
+from mine_backend.core.metrics import (
+    http_metrics_middleware,
+    metrics_response,
+    monitor_event_loop,
+)
+from mine_backend.core.profiling import ProfilingMiddleware
+from mine_backend.core.tracing import (
+    setup_tracing,
+    shutdown_tracing,
+    tracing_middleware,
+)
 
 from mine_backend.api.exception_handlers import (
     app_exception_handler,
@@ -13,24 +25,51 @@ from mine_backend.exceptions.base import AppException
 
 from mine_backend.mcp.server import mcp
 
+import asyncio
 import logging
 
 setup_logger('DEBUG')
 
-storage_admin = get_admin()
-
+setup_tracing(
+    exporter=settings.TRACING_EXPORTER,
+    service_name=settings.TRACING_SERVICE_NAME,
+    otlp_endpoint=settings.TRACING_OTLP_ENDPOINT,
+    file_path=settings.TRACING_FILE,
+    sample_ratio=settings.TRACING_SAMPLE_RATIO,
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    storage_admin.setup()
+    # The admin driver (and its SDK imports) is built here rather than at
+    # import time; the S3 driver module is imported on the first request.
+    get_admin().setup()
+    lag_monitor = None
+    if settings.METRICS_ENABLED:
+        lag_monitor = asyncio.create_task(
+            monitor_event_loop(settings.EVENT_LOOP_LAG_INTERVAL)
+        )
     #mcp.session_manager.run()
     async with mcp.session_manager.run():
         yield
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+    get_admin_executor().shutdown()
+    shutdown_tracing()
     logging.info('shutdown')
 
 
 app = FastAPI(title='Mine Backend', lifespan=lifespan)
 
+if settings.PROFILING_ENABLED:
+    # Added first so it is the innermost middleware: it has to run in the
+    # same task as the route handler, and the http middlewares below each
+    # start a new task for the rest of the stack.
+    app.add_middleware(
+        ProfilingMiddleware,
+        header=settings.PROFILING_HEADER,
+        threshold_ms=settings.PROFILING_THRESHOLD_MS,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ALLOWED_ORIGINS,
@@ -39,6 +78,20 @@ app.add_middleware(
     allow_headers=['*'],
 )
 
+
+async def metrics(request):
+    return metrics_response()
+
+
+if settings.METRICS_ENABLED:
+    app.middleware('http')(http_metrics_middleware)
+    app.add_route('/metrics', metrics, methods=['GET'])
+
+if settings.TRACING_EXPORTER:
+    # Added last so it is the outermost middleware and its span covers
+    # the metrics middleware and CORS handling as well.
+    app.middleware('http')(tracing_middleware)
+
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
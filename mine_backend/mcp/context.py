@@ -1,15 +1,26 @@
 from mine_backend.services.bucket_service import BucketService
 from mine_backend.services.object_service import ObjectService
 from mine_backend.services.policy_service import PolicyService
+from mine_backend.services.permission_service import PermissionService
 from mine_backend.services.user_service import UserService
 from mine_backend.services.group_service import GroupService
 from mine_backend.services.credential_service import CredentialService
 from mine_backend.services.admin_notification_service import (
     AdminNotificationService,
 )
+from mine_backend.services.prefix_usage_service import PrefixUsageService
+from mine_backend.services.restore_service import RestoreJobService
+from mine_backend.services.storage_analytics_service import (
+    StorageAnalyticsService,
+)
+from mine_backend.services.multipart_service import MultipartUploadService
 from mine_backend.config import get_admin
+from mine_backend.config import get_multipart_client
 from mine_backend.config import get_s3_client
+from mine_backend.config import get_signing_client
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.core.authorization import is_admin as u_is_admin
+from mine_backend.core.cache import CacheManager
 from mine_backend.core.security import extract_sts_credentials
 from mine_backend.exceptions.application import PermissionDeniedError
 from mine_backend.services.auth_service import AuthService
@@ -50,21 +61,80 @@ def build_object_service_from_token(token: str) -> ObjectService:
     return ObjectService(s3_client)
 
 
-def build_policy_service() -> PolicyService:
-    return PolicyService(get_admin())
+def build_signing_service_from_token(token: str) -> ObjectService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    return ObjectService(
+        get_signing_client(sts),
+        signing_scope=sts['aws_access_key_id'],
+    )
+
+
+def build_multipart_service_from_token(token: str) -> MultipartUploadService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    return MultipartUploadService(get_multipart_client(sts))
+
+
+def build_purge_service_from_token(token: str) -> ObjectService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    return ObjectService(
+        get_s3_client(sts), boto_client=get_multipart_client(sts)
+    )
+
+
+def build_prefix_usage_service_from_token(token: str) -> PrefixUsageService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    cache = CacheManager(
+        user_id=session.get('sub', 'anonymous'),
+        is_admin=u_is_admin(session),
+    )
+    return PrefixUsageService(get_s3_client(sts), cache)
+
+
+def build_analytics_service_from_token(
+    token: str,
+) -> StorageAnalyticsService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    cache = CacheManager(
+        user_id=session.get('sub', 'anonymous'),
+        is_admin=u_is_admin(session),
+    )
+    return StorageAnalyticsService(get_s3_client(sts), cache)
+
+
+def build_restore_service_from_token(token: str) -> RestoreJobService:
+    session = get_current_user(token)
+    sts = extract_sts_credentials(session)
+    user_id = session.get('sub', 'anonymous')
+    cache = CacheManager(user_id=user_id, is_admin=u_is_admin(session))
+    return RestoreJobService(get_s3_client(sts), cache, user_id)
+
+
+def build_policy_service() -> AsyncAdmin:
+    return AsyncAdmin(PolicyService(get_admin()))
+
+
+def build_permission_service_from_session(session: dict) -> PermissionService:
+    sts = extract_sts_credentials(session)
+    s3_client = get_s3_client(sts)
+    return PermissionService(s3_client, get_admin())
 
 
-def build_user_service() -> UserService:
-    return UserService(get_admin())
+def build_user_service() -> AsyncAdmin:
+    return AsyncAdmin(UserService(get_admin()))
 
 
-def build_group_service() -> GroupService:
-    return GroupService(get_admin())
+def build_group_service() -> AsyncAdmin:
+    return AsyncAdmin(GroupService(get_admin()))
 
 
-def build_credential_service() -> CredentialService:
-    return CredentialService(get_admin())
+def build_credential_service() -> AsyncAdmin:
+    return AsyncAdmin(CredentialService(get_admin()))
 
 
-def build_admin_notification_service() -> AdminNotificationService:
-    return AdminNotificationService(get_admin())
+def build_admin_notification_service() -> AsyncAdmin:
+    return AsyncAdmin(AdminNotificationService(get_admin()))
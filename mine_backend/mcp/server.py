@@ -1,6 +1,9 @@
+import importlib
+
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 from mine_backend.config import settings
+from mine_backend.core.tracing import traced_tool
 
 _mcp_allowed_hosts = settings.MCP_ALLOWED_HOSTS
 _mcp_allowed_origins = settings.MCP_ALLOWED_ORIGINS
@@ -22,14 +25,52 @@ else:
         enable_dns_rebinding_protection=False
     )
 
-mcp = FastMCP('mine-mcp', transport_security=_transport_security)
-
-# import tools
-from mine_backend.mcp.tools import bucket_tools
-from mine_backend.mcp.tools import object_tools
-from mine_backend.mcp.tools import policy_tools
-from mine_backend.mcp.tools import quota_tools
-from mine_backend.mcp.tools import user_tools
-from mine_backend.mcp.tools import group_tools
-from mine_backend.mcp.tools import credential_tools
-from mine_backend.mcp.tools import admin_notification_tools
+
+
+# Tool modules are imported (and their tools registered) on the first MCP
+# request: building the argument models for every tool is a noticeable part
+# of startup, and most pods never serve MCP traffic.
+TOOL_MODULES = (
+    'mine_backend.mcp.tools.bucket_tools',
+    'mine_backend.mcp.tools.object_tools',
+    'mine_backend.mcp.tools.policy_tools',
+    'mine_backend.mcp.tools.quota_tools',
+    'mine_backend.mcp.tools.user_tools',
+    'mine_backend.mcp.tools.group_tools',
+    'mine_backend.mcp.tools.credential_tools',
+    'mine_backend.mcp.tools.admin_notification_tools',
+)
+
+
+class TracedFastMCP(FastMCP):
+    """FastMCP whose tools each run inside an ``mcp.tool <name>`` span and
+    are only loaded when first needed."""
+
+    _tools_loaded = False
+
+    def tool(self, *args, **kwargs):
+        register = super().tool(*args, **kwargs)
+
+        def decorator(fn):
+            register(traced_tool(fn))
+            return fn
+
+        return decorator
+
+    def load_tools(self) -> None:
+        if self._tools_loaded:
+            return
+        for module in TOOL_MODULES:
+            importlib.import_module(module)
+        self._tools_loaded = True
+
+    async def list_tools(self):
+        self.load_tools()
+        return await super().list_tools()
+
+    async def call_tool(self, name, arguments):
+        self.load_tools()
+        return await super().call_tool(name, arguments)
+
+
+mcp = TracedFastMCP('mine-mcp', transport_security=_transport_security)
@@ -3,7 +3,7 @@ from mine_backend.mcp.context import build_admin_notification_service, require_a
 
 
 @mcp.tool()
-def list_admin_notification_targets(token: str, type: str):
+async def list_admin_notification_targets(token: str, type: str):
     """List all configured notification targets of a given type. Admin only.
 
     Args:
@@ -15,11 +15,11 @@ def list_admin_notification_targets(token: str, type: str):
     """
     require_admin(token)
     service = build_admin_notification_service()
-    return service.list_targets(type)
+    return await service.list_targets(type)
 
 
 @mcp.tool()
-def create_admin_notification_target(token: str, type: str, identifier: str, config: dict):
+async def create_admin_notification_target(token: str, type: str, identifier: str, config: dict):
     """Create a new notification target. Admin only.
 
     Args:
@@ -34,11 +34,11 @@ def create_admin_notification_target(token: str, type: str, identifier: str, con
     """
     require_admin(token)
     service = build_admin_notification_service()
-    return service.create_target(type, identifier, config)
+    return await service.create_target(type, identifier, config)
 
 
 @mcp.tool()
-def delete_admin_notification_target(token: str, type: str, identifier: str):
+async def delete_admin_notification_target(token: str, type: str, identifier: str):
     """Delete a notification target by type and identifier. Admin only.
 
     Args:
@@ -48,4 +48,4 @@ def delete_admin_notification_target(token: str, type: str, identifier: str):
     """
     require_admin(token)
     service = build_admin_notification_service()
-    return service.delete_target(type, identifier)
+    return await service.delete_target(type, identifier)
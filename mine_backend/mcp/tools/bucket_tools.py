@@ -1,7 +1,12 @@
+from datetime import datetime
+from typing import Optional
+
 from mine_backend.mcp.server import mcp
 from mine_backend.mcp.context import (
     build_bucket_service_from_token,
     build_bucket_service_from_session,
+    build_analytics_service_from_token,
+    build_prefix_usage_service_from_token,
     require_admin,
 )
 
@@ -113,6 +118,36 @@ def get_bucket_usage(token: str, name: str):
     return service.get_usage(name)
 
 
+@mcp.tool()
+async def get_prefix_usage(
+    token: str,
+    name: str,
+    prefix: Optional[str] = None,
+    depth: int = 1,
+    top: int = 20,
+    refresh: bool = False,
+):
+    """Get how much space a prefix ("folder") uses, and its heaviest
+    sub-prefixes.
+
+    Args:
+        token: Internal session token obtained after login.
+        name: Bucket name.
+        prefix: Key prefix to measure, e.g. 'logs/2026/'. Omit for the whole
+                bucket.
+        depth: How many '/'-separated levels below the prefix to break down
+               (1 = direct sub-folders only).
+        top: Number of heaviest sub-prefixes to return (1–1000).
+        refresh: Re-list everything instead of using the cached tree.
+
+    Returns 'total_size', 'total_objects', the size/count of objects directly
+    under the prefix, and 'top': a list of {'prefix', 'depth', 'size',
+    'objects'} sorted by size, largest first.
+    """
+    service = build_prefix_usage_service_from_token(token)
+    return await service.get_usage(name, prefix, depth, top, '/', refresh)
+
+
 @mcp.tool()
 def get_bucket_policy(token: str, name: str):
     """Retrieve the S3 bucket policy document for a bucket.
@@ -211,6 +246,32 @@ def delete_bucket_lifecycle(token: str, name: str):
     return service.delete_bucket_lifecycle(name)
 
 
+@mcp.tool()
+def simulate_bucket_lifecycle(
+    token: str,
+    name: str,
+    lifecycle: Optional[dict] = None,
+    at: Optional[datetime] = None,
+):
+    """Preview what a lifecycle configuration would expire or transition,
+    without applying it.
+
+    Args:
+        token: Internal session token obtained after login.
+        name: Bucket name.
+        lifecycle: Lifecycle configuration to try (see put_bucket_lifecycle).
+                   Omit to simulate the bucket's current configuration.
+        at: Evaluate as of this time, e.g. '2027-01-01T00:00:00Z' to see
+            what will have happened by then (default: now).
+
+    Returns, per rule, the objects and bytes it matches, expires and
+    transitions (current and noncurrent versions), 'totals' counting each
+    object once, and 'not_simulated' actions.
+    """
+    service = build_bucket_service_from_token(token)
+    return service.simulate_lifecycle(name, lifecycle, at)
+
+
 @mcp.tool()
 def validate_bucket_lifecycle(token: str, name: str, lifecycle: dict):
     """Validate a lifecycle configuration without applying it.
@@ -266,3 +327,30 @@ def delete_bucket_events(token: str, name: str):
     """
     service = build_bucket_service_from_token(token)
     return service.delete_bucket_events(name)
+
+
+@mcp.tool()
+async def get_bucket_analytics(
+    token: str,
+    name: str,
+    prefix: Optional[str] = None,
+    top: int = 20,
+    refresh: bool = False,
+):
+    """Get a breakdown of a bucket's objects by size, age and storage class.
+
+    Args:
+        token: Internal session token obtained after login.
+        name: Bucket name.
+        prefix: Only analyze keys under this prefix. Omit for the whole
+                bucket.
+        top: Number of largest objects to return (1–100).
+        refresh: Scan again instead of using the cached result.
+
+    Returns totals, 'size_histogram' (bounds in bytes) and 'age_histogram'
+    (bounds in days since last modified) as lists of {'min', 'max',
+    'objects', 'size'}, 'storage_classes', 'largest' objects and
+    'scanned_at'.
+    """
+    service = build_analytics_service_from_token(token)
+    return await service.get_analytics(name, prefix, top, refresh)
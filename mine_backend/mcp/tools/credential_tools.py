@@ -5,7 +5,7 @@ from mine_backend.mcp.context import build_credential_service, require_admin
 
 
 @mcp.tool()
-def list_credentials(token: str, username: str):
+async def list_credentials(token: str, username: str):
     """List all service account credentials for a storage user. Admin only.
 
     Args:
@@ -17,11 +17,11 @@ def list_credentials(token: str, username: str):
     """
     require_admin(token)
     service = build_credential_service()
-    return service.list_credentials(username)
+    return await service.list_credentials(username)
 
 
 @mcp.tool()
-def create_credential(
+async def create_credential(
     token: str,
     username: str,
     policy: dict,
@@ -45,11 +45,11 @@ def create_credential(
     """
     require_admin(token)
     service = build_credential_service()
-    return service.create_credential(username, policy, expiration)
+    return await service.create_credential(username, policy, expiration)
 
 
 @mcp.tool()
-def delete_credential(token: str, access_key: str):
+async def delete_credential(token: str, access_key: str):
     """Delete a service account credential by its access key. Admin only.
 
     Args:
@@ -59,4 +59,4 @@ def delete_credential(token: str, access_key: str):
     """
     require_admin(token)
     service = build_credential_service()
-    return service.delete_credential(access_key)
+    return await service.delete_credential(access_key)
@@ -5,7 +5,7 @@ from mine_backend.mcp.context import build_group_service, require_admin
 
 
 @mcp.tool()
-def list_groups(token: str):
+async def list_groups(token: str):
     """List all storage groups. Admin only.
 
     Args:
@@ -15,11 +15,11 @@ def list_groups(token: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.list_groups()
+    return await service.list_groups()
 
 
 @mcp.tool()
-def get_group(token: str, name: str):
+async def get_group(token: str, name: str):
     """Get details for a specific storage group. Admin only.
 
     Args:
@@ -31,11 +31,11 @@ def get_group(token: str, name: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.get_group(name)
+    return await service.get_group(name)
 
 
 @mcp.tool()
-def create_group(token: str, name: str, users: List[str]):
+async def create_group(token: str, name: str, users: List[str]):
     """Create a new storage group. Admin only.
 
     Args:
@@ -46,11 +46,11 @@ def create_group(token: str, name: str, users: List[str]):
     """
     require_admin(token)
     service = build_group_service()
-    return service.create_group(name, users)
+    return await service.create_group(name, users)
 
 
 @mcp.tool()
-def delete_group(token: str, name: str):
+async def delete_group(token: str, name: str):
     """Delete a storage group. Admin only.
 
     Args:
@@ -59,11 +59,11 @@ def delete_group(token: str, name: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.delete_group(name)
+    return await service.delete_group(name)
 
 
 @mcp.tool()
-def add_users_to_group(token: str, name: str, users: List[str]):
+async def add_users_to_group(token: str, name: str, users: List[str]):
     """Add one or more users to an existing storage group. Admin only.
 
     Args:
@@ -73,11 +73,11 @@ def add_users_to_group(token: str, name: str, users: List[str]):
     """
     require_admin(token)
     service = build_group_service()
-    return service.add_users(name, users)
+    return await service.add_users(name, users)
 
 
 @mcp.tool()
-def remove_users_from_group(token: str, name: str, users: List[str]):
+async def remove_users_from_group(token: str, name: str, users: List[str]):
     """Remove one or more users from a storage group. Admin only.
 
     Args:
@@ -87,11 +87,11 @@ def remove_users_from_group(token: str, name: str, users: List[str]):
     """
     require_admin(token)
     service = build_group_service()
-    return service.remove_users(name, users)
+    return await service.remove_users(name, users)
 
 
 @mcp.tool()
-def enable_group(token: str, name: str):
+async def enable_group(token: str, name: str):
     """Enable a previously disabled storage group. Admin only.
 
     Members of the group will regain access to the group's attached policies.
@@ -102,11 +102,11 @@ def enable_group(token: str, name: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.enable_group(name)
+    return await service.enable_group(name)
 
 
 @mcp.tool()
-def disable_group(token: str, name: str):
+async def disable_group(token: str, name: str):
     """Disable a storage group, suspending its policy inheritance for all members. Admin only.
 
     Members are not deleted; re-enable the group to restore access.
@@ -117,11 +117,11 @@ def disable_group(token: str, name: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.disable_group(name)
+    return await service.disable_group(name)
 
 
 @mcp.tool()
-def attach_policy_to_group(token: str, group: str, policy: str):
+async def attach_policy_to_group(token: str, group: str, policy: str):
     """Attach a storage policy to a group. Admin only.
 
     All current and future members of the group will inherit the policy.
@@ -133,11 +133,11 @@ def attach_policy_to_group(token: str, group: str, policy: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.attach_policy(group, policy)
+    return await service.attach_policy(group, policy)
 
 
 @mcp.tool()
-def detach_policy_from_group(token: str, group: str, policy: str):
+async def detach_policy_from_group(token: str, group: str, policy: str):
     """Detach a storage policy from a group. Admin only.
 
     Args:
@@ -147,11 +147,11 @@ def detach_policy_from_group(token: str, group: str, policy: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.detach_policy(group, policy)
+    return await service.detach_policy(group, policy)
 
 
 @mcp.tool()
-def get_group_policies(token: str, name: str):
+async def get_group_policies(token: str, name: str):
     """List all policies attached to a storage group. Admin only.
 
     Args:
@@ -160,4 +160,37 @@ def get_group_policies(token: str, name: str):
     """
     require_admin(token)
     service = build_group_service()
-    return service.get_attach_policy(name)
+    return await service.get_attach_policy(name)
+
+
+@mcp.tool()
+async def bulk_add_users_to_groups(token: str, memberships: List[dict]):
+    """Add users to several groups in one call. Admin only.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        memberships: List of objects with 'name' (group name) and 'users'
+                     (usernames to add to that group).
+
+    Returns 'total', 'succeeded', 'failed' and 'results', one entry per
+    group with 'success' and 'error' when it failed.
+    """
+    require_admin(token)
+    service = build_group_service()
+    return await service.bulk_add_users(memberships)
+
+
+@mcp.tool()
+async def bulk_remove_users_from_groups(token: str, memberships: List[dict]):
+    """Remove users from several groups in one call. Admin only.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        memberships: List of objects with 'name' (group name) and 'users'
+                     (usernames to remove from that group).
+
+    Returns per-group results like bulk_add_users_to_groups.
+    """
+    require_admin(token)
+    service = build_group_service()
+    return await service.bulk_remove_users(memberships)
@@ -1,7 +1,16 @@
-from typing import Optional
+import asyncio
+from datetime import datetime
+from typing import List, Optional
 
 from mine_backend.mcp.server import mcp
-from mine_backend.mcp.context import build_object_service_from_token
+from mine_backend.mcp.context import (
+    build_multipart_service_from_token,
+    build_object_service_from_token,
+    build_purge_service_from_token,
+    build_restore_service_from_token,
+    build_signing_service_from_token,
+)
+from mine_backend.services.prefix_usage_service import record_object_changes
 
 
 @mcp.tool()
@@ -11,6 +20,7 @@ def list_objects(
     prefix: Optional[str] = None,
     limit: int = 100,
     continuation_token: Optional[str] = None,
+    delimiter: Optional[str] = None,
 ):
     """List objects in a bucket, optionally filtered by a key prefix.
 
@@ -22,16 +32,22 @@ def list_objects(
         limit: Maximum number of objects to return (1–1000, default 100).
         continuation_token: Opaque token from a previous response's
                             'next_continuation_token' field for pagination.
+        delimiter: Optional folder separator (usually '/'). When set, only
+                   the objects directly under 'prefix' are returned, and
+                   deeper keys are grouped into 'common_prefixes'.
 
     Returns an object with 'objects' list, 'is_truncated' (bool), and
-    'next_continuation_token' (present when is_truncated is true).
+    'next_continuation_token' (present when is_truncated is true), plus
+    'common_prefixes' when a delimiter is given.
     """
     service = build_object_service_from_token(token)
-    return service.list_objects(bucket, prefix, limit, continuation_token)
+    return service.list_objects(
+        bucket, prefix, limit, continuation_token, delimiter
+    )
 
 
 @mcp.tool()
-def delete_object(token: str, bucket: str, key: str):
+async def delete_object(token: str, bucket: str, key: str):
     """Delete an object from a bucket.
 
     Args:
@@ -40,11 +56,13 @@ def delete_object(token: str, bucket: str, key: str):
         key: Full object key (path) to delete, e.g. 'folder/file.txt'.
     """
     service = build_object_service_from_token(token)
-    return service.delete_object(bucket, key)
+    response = await asyncio.to_thread(service.delete_object, bucket, key)
+    await record_object_changes(bucket, key)
+    return response
 
 
 @mcp.tool()
-def copy_object(
+async def copy_object(
     token: str,
     source_bucket: str,
     source_key: str,
@@ -61,11 +79,15 @@ def copy_object(
         dest_key: Destination key for the copied object.
     """
     service = build_object_service_from_token(token)
-    return service.copy_object(source_bucket, source_key, dest_bucket, dest_key)
+    response = await asyncio.to_thread(
+        service.copy_object, source_bucket, source_key, dest_bucket, dest_key
+    )
+    await record_object_changes(dest_bucket, dest_key)
+    return response
 
 
 @mcp.tool()
-def move_object(
+async def move_object(
     token: str,
     source_bucket: str,
     source_key: str,
@@ -82,7 +104,12 @@ def move_object(
         dest_key: Destination key for the moved object.
     """
     service = build_object_service_from_token(token)
-    return service.move_object(source_bucket, source_key, dest_bucket, dest_key)
+    response = await asyncio.to_thread(
+        service.move_object, source_bucket, source_key, dest_bucket, dest_key
+    )
+    await record_object_changes(source_bucket, source_key)
+    await record_object_changes(dest_bucket, dest_key)
+    return response
 
 
 @mcp.tool()
@@ -108,7 +135,7 @@ def generate_upload_url(
 
     Returns an object with 'upload_url', 'bucket', 'key', and 'expires_in'.
     """
-    service = build_object_service_from_token(token)
+    service = build_signing_service_from_token(token)
     return service.generate_upload_url(bucket, key, expires_in, content_type)
 
 
@@ -139,7 +166,7 @@ def generate_download_url(
     if download_as:
         disposition = f'attachment; filename="{download_as}"'
 
-    service = build_object_service_from_token(token)
+    service = build_signing_service_from_token(token)
     return service.generate_download_url(
         bucket=bucket,
         key=key,
@@ -150,25 +177,234 @@ def generate_download_url(
 
 
 @mcp.tool()
-def list_object_versions(token: str, bucket: str, key: str):
-    """List all stored versions of a specific object.
+def presign_urls(
+    token: str,
+    bucket: str,
+    keys: List[str],
+    method: str = 'download',
+    expires_in: int = 3600,
+    content_type: Optional[str] = None,
+):
+    """Generate presigned URLs for many objects in one call.
+
+    Args:
+        token: Internal session token obtained after login.
+        bucket: Bucket name.
+        keys: Object keys to sign (up to 5000).
+        method: 'download' (GET URLs, default) or 'upload' (PUT URLs).
+        expires_in: URL validity in seconds (1–86400, default 3600).
+        content_type: For uploads, the Content-Type the PUT must send; for
+                      downloads, the Content-Type to serve.
+
+    Returns 'urls', a list of {'key', 'url', 'expires_at'} in the order of
+    'keys'. A URL signed moments earlier for the same key may be reused;
+    'expires_at' (Unix time) is always exact.
+    """
+    service = build_signing_service_from_token(token)
+    return service.presign_urls(
+        bucket, keys, method, expires_in, content_type
+    )
+
+
+@mcp.tool()
+def list_object_versions(
+    token: str,
+    bucket: str,
+    key: Optional[str] = None,
+    prefix: Optional[str] = None,
+    limit: int = 100,
+    key_marker: Optional[str] = None,
+    version_id_marker: Optional[str] = None,
+):
+    """List stored versions of an object, or of every object under a prefix,
+    one page at a time.
 
     Requires versioning to be enabled on the bucket.
 
     Args:
         token: Internal session token obtained after login.
         bucket: Bucket name.
-        key: Object key to list versions for.
+        key: Object key to list versions for. Pass either key or prefix.
+        prefix: List the versions of every existing object under this
+                prefix ('' for the whole bucket), ordered by key.
+        limit: Maximum number of versions to return (1–1000, default 100).
+        key_marker: 'next_key_marker' from the previous page.
+        version_id_marker: 'next_version_id_marker' from the previous page.
+
+    Returns an object with 'versions', each entry having 'key',
+    'version_id', 'is_latest', 'last_modified', and 'size', plus
+    'is_truncated' and the next markers when there are more versions.
+    """
+    service = build_object_service_from_token(token)
+    return service.list_object_versions(
+        bucket, key, limit, key_marker, version_id_marker, prefix
+    )
+
+
+@mcp.tool()
+def purge_object_versions(
+    token: str,
+    bucket: str,
+    prefix: Optional[str] = None,
+    keep: int = 0,
+    older_than_days: Optional[int] = None,
+    dry_run: bool = True,
+):
+    """Permanently delete old (noncurrent) versions to reclaim space.
+
+    The current version of each object is never touched. Runs as a dry run
+    by default: call once to review the plan, then again with
+    dry_run=false to delete.
+
+    Args:
+        token: Internal session token obtained after login.
+        bucket: Bucket name.
+        prefix: Only purge versions of objects under this prefix.
+        keep: Number of noncurrent versions to keep per object (default 0).
+        older_than_days: Only purge versions that have been noncurrent for
+                         at least this many days.
+        dry_run: Only compute what would be deleted (default true).
+
+    Returns 'selected', 'reclaimed_bytes', 'deleted', 'failed', a 'sample'
+    of the selected versions and the first 'errors'.
+    """
+    service = build_purge_service_from_token(token)
+    return service.purge_object_versions(
+        bucket, prefix, keep, older_than_days, dry_run
+    )
 
-    Returns an object with 'versions', each entry having 'version_id',
-    'is_latest', 'last_modified', and 'size'.
+
+@mcp.tool()
+async def sync_buckets(
+    token: str,
+    source_bucket: str,
+    dest_bucket: str,
+    prefix: Optional[str] = None,
+    delete: bool = False,
+    dry_run: bool = True,
+):
+    """Compare two buckets and optionally make the destination match.
+
+    Keys are compared by size and ETag. Runs as a dry run by default: call
+    once to see what differs, then again with dry_run=false to copy.
+
+    Args:
+        token: Internal session token obtained after login.
+        source_bucket: Bucket to copy from.
+        dest_bucket: Bucket to bring up to date.
+        prefix: Only compare keys under this prefix.
+        delete: Also delete keys missing from the source (default false).
+        dry_run: Only report the differences (default true).
+
+    Returns counts of 'added', 'changed', 'removed' and 'unchanged' keys,
+    'copy_bytes', 'copied', 'deleted', 'failed', a 'sample' of the
+    differences and the first 'errors'.
     """
     service = build_object_service_from_token(token)
-    return service.list_object_versions(bucket, key)
+    report = await asyncio.to_thread(
+        service.sync_buckets,
+        source_bucket,
+        dest_bucket,
+        prefix,
+        delete,
+        dry_run,
+    )
+    changed_keys = report.pop('changed_keys')
+    if changed_keys:
+        await record_object_changes(dest_bucket, *changed_keys)
+    return report
 
 
 @mcp.tool()
-def delete_object_version(token: str, bucket: str, key: str, version_id: str):
+def find_duplicate_objects(
+    token: str,
+    buckets: List[str],
+    prefix: Optional[str] = None,
+    min_size: int = 1,
+    top: int = 20,
+):
+    """Find objects stored more than once, within or across buckets.
+
+    Objects are considered duplicates when their ETag and size match (the
+    same content uploaded in different part sizes is not detected).
+
+    Args:
+        token: Internal session token obtained after login.
+        buckets: Buckets to scan together.
+        prefix: Only scan keys under this prefix in each bucket.
+        min_size: Ignore objects smaller than this many bytes (default 1).
+        top: Number of duplicate groups to return, most wasteful first
+             (1–100).
+
+    Returns 'scanned', 'groups', 'duplicate_objects', 'reclaimable_bytes'
+    and 'top': a list of {'etag', 'size', 'copies', 'reclaimable_bytes',
+    'locations'}.
+    """
+    service = build_object_service_from_token(token)
+    return service.find_duplicates(buckets, prefix, min_size, top)
+
+
+@mcp.tool()
+async def export_inventory(
+    token: str,
+    bucket: str,
+    dest_bucket: str,
+    dest_key: str,
+    prefix: Optional[str] = None,
+    format: str = 'csv',
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    modified_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+    storage_class: Optional[str] = None,
+    suffix: Optional[str] = None,
+):
+    """Write an inventory of the objects in a bucket to another object.
+
+    Use it for questions over many objects, e.g. "every object over 1 GB
+    not modified in a year": filters are applied while listing, so any
+    bucket size works.
+
+    Args:
+        token: Internal session token obtained after login.
+        bucket: Bucket to inventory.
+        dest_bucket: Bucket to write the inventory to.
+        dest_key: Key of the inventory object.
+        prefix: Only include objects under this prefix.
+        format: 'csv', 'ndjson' or 'parquet' (default 'csv').
+        min_size: Only objects of at least this many bytes.
+        max_size: Only objects of at most this many bytes.
+        modified_after: Only objects modified at or after this time.
+        modified_before: Only objects modified before this time.
+        storage_class: Only objects in this storage class.
+        suffix: Only keys ending with this (e.g. '.log').
+
+    Columns: key, size, last_modified, etag, storage_class.
+    """
+    service = build_object_service_from_token(token)
+    chunks = service.stream_inventory(
+        bucket,
+        prefix,
+        format,
+        {
+            'min_size': min_size,
+            'max_size': max_size,
+            'modified_after': modified_after,
+            'modified_before': modified_before,
+            'storage_class': storage_class,
+            'suffix': suffix,
+        },
+    )
+    uploader = build_multipart_service_from_token(token)
+    response = await asyncio.to_thread(
+        uploader.upload_stream, dest_bucket, dest_key, chunks
+    )
+    await record_object_changes(dest_bucket, dest_key)
+    return response
+
+
+@mcp.tool()
+async def delete_object_version(token: str, bucket: str, key: str, version_id: str):
     """Permanently delete a specific version of an object.
 
     Args:
@@ -178,11 +414,15 @@ def delete_object_version(token: str, bucket: str, key: str, version_id: str):
         version_id: Version ID to delete. Obtain from list_object_versions.
     """
     service = build_object_service_from_token(token)
-    return service.delete_object_version(bucket, key, version_id)
+    response = await asyncio.to_thread(
+        service.delete_object_version, bucket, key, version_id
+    )
+    await record_object_changes(bucket, key)
+    return response
 
 
 @mcp.tool()
-def restore_object_version(token: str, bucket: str, key: str, version_id: str):
+async def restore_object_version(token: str, bucket: str, key: str, version_id: str):
     """Restore a previous version of an object as the current (latest) version.
 
     This copies the specified version to a new version, making it the latest.
@@ -195,7 +435,58 @@ def restore_object_version(token: str, bucket: str, key: str, version_id: str):
         version_id: Version ID to restore. Obtain from list_object_versions.
     """
     service = build_object_service_from_token(token)
-    return service.restore_object_version(bucket, key, version_id)
+    response = await asyncio.to_thread(
+        service.restore_object_version, bucket, key, version_id
+    )
+    await record_object_changes(bucket, key)
+    return response
+
+
+@mcp.tool()
+async def restore_prefix(
+    token: str,
+    bucket: str,
+    at: str,
+    prefix: Optional[str] = None,
+    delete_newer: bool = False,
+    dry_run: bool = False,
+):
+    """Roll back every object under a prefix to its state at a point in time.
+
+    Starts a background job and returns it right away; poll it with
+    get_restore_job. Requires versioning on the bucket. Objects deleted
+    after that time are not brought back.
+
+    Args:
+        token: Internal session token obtained after login.
+        bucket: Bucket name.
+        at: ISO 8601 timestamp to restore to, e.g. '2026-03-01T12:00:00Z'.
+        prefix: Only restore objects under this prefix.
+        delete_newer: Also delete objects created after 'at' (default false).
+        dry_run: Only count what would change (default false).
+
+    Returns the job, with its 'id' and 'status'.
+    """
+    service = build_restore_service_from_token(token)
+    return await service.create_job(
+        bucket, prefix, datetime.fromisoformat(at), delete_newer, dry_run
+    )
+
+
+@mcp.tool()
+async def get_restore_job(token: str, job_id: str):
+    """Get the progress of a restore_prefix job.
+
+    Args:
+        token: Internal session token obtained after login.
+        job_id: The 'id' returned by restore_prefix.
+
+    Returns 'status' (pending, running, completed, failed or cancelled),
+    counts of 'restored', 'deleted', 'unchanged', 'skipped' and 'failed'
+    keys, the first 'errors' and the 'checkpoint' (last key done).
+    """
+    service = build_restore_service_from_token(token)
+    return await service.get_job(job_id)
 
 
 @mcp.tool()
@@ -214,6 +505,34 @@ def get_object_metadata(token: str, bucket: str, key: str):
     return service.get_object_metadata(bucket, key)
 
 
+@mcp.tool()
+def bulk_head_objects(
+    token: str,
+    bucket: str,
+    keys: List[str],
+    metadata: bool = True,
+    tags: bool = False,
+):
+    """Retrieve metadata and/or tags of many objects in one call.
+
+    Objects are read concurrently; a missing or unreadable object does not
+    stop the others.
+
+    Args:
+        token: Internal session token obtained after login.
+        bucket: Bucket name.
+        keys: Full object keys (up to 1000).
+        metadata: Include size, etag, last_modified, content_type and
+                  custom metadata (default true).
+        tags: Include the object tags (default false).
+
+    Returns 'total', 'succeeded', 'failed' and 'results', one entry per key
+    with 'item' (the key), 'success', 'result' and 'error' when it failed.
+    """
+    service = build_object_service_from_token(token)
+    return service.bulk_head_objects(bucket, keys, metadata, tags)
+
+
 @mcp.tool()
 def update_object_metadata(token: str, bucket: str, key: str, metadata: dict):
     """Update the custom metadata on an object.
@@ -1,9 +1,16 @@
+from typing import List
+
+from mine_backend.core.admin_executor import AsyncAdmin
 from mine_backend.mcp.server import mcp
-from mine_backend.mcp.context import build_policy_service, require_admin
+from mine_backend.mcp.context import (
+    build_permission_service_from_session,
+    build_policy_service,
+    require_admin,
+)
 
 
 @mcp.tool()
-def list_policies(token: str):
+async def list_policies(token: str):
     """List all storage policies. Admin only.
 
     Args:
@@ -13,11 +20,11 @@ def list_policies(token: str):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.list_policies()
+    return await service.list_policies()
 
 
 @mcp.tool()
-def get_policy(token: str, name: str):
+async def get_policy(token: str, name: str):
     """Get a storage policy by name. Admin only.
 
     Args:
@@ -26,11 +33,11 @@ def get_policy(token: str, name: str):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.get_policy(name)
+    return await service.get_policy(name)
 
 
 @mcp.tool()
-def get_policy_groups(token: str, name: str):
+async def get_policy_groups(token: str, name: str):
     """Get all groups that have a given storage policy attached. Admin only.
 
     Args:
@@ -41,12 +48,12 @@ def get_policy_groups(token: str, name: str):
     """
     require_admin(token)
     service = build_policy_service()
-    groups = service.get_groups_by_policy(name)
+    groups = await service.get_groups_by_policy(name)
     return {'policy': name, 'groups': groups or []}
 
 
 @mcp.tool()
-def create_policy(token: str, name: str, document: dict):
+async def create_policy(token: str, name: str, document: dict):
     """Create a new storage policy. Admin only.
 
     Args:
@@ -59,11 +66,11 @@ def create_policy(token: str, name: str, document: dict):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.create_policy(name, document)
+    return await service.create_policy(name, document)
 
 
 @mcp.tool()
-def delete_policy(token: str, name: str):
+async def delete_policy(token: str, name: str):
     """Delete a storage policy by name. Admin only.
 
     Detach the policy from all users/groups before deleting it.
@@ -74,11 +81,11 @@ def delete_policy(token: str, name: str):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.delete_policy(name)
+    return await service.delete_policy(name)
 
 
 @mcp.tool()
-def attach_policy(token: str, policy: str, username: str):
+async def attach_policy(token: str, policy: str, username: str):
     """Attach a storage policy to a user. Admin only.
 
     Args:
@@ -88,11 +95,11 @@ def attach_policy(token: str, policy: str, username: str):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.attach_policy(policy, username)
+    return await service.attach_policy(policy, username)
 
 
 @mcp.tool()
-def detach_policy(token: str, policy: str, username: str):
+async def detach_policy(token: str, policy: str, username: str):
     """Detach a storage policy from a user. Admin only.
 
     Args:
@@ -102,4 +109,30 @@ def detach_policy(token: str, policy: str, username: str):
     """
     require_admin(token)
     service = build_policy_service()
-    return service.detach_policy(policy, username)
+    return await service.detach_policy(policy, username)
+
+
+@mcp.tool()
+async def evaluate_permissions(token: str, username: str, checks: List[dict]):
+    """Evaluate what a storage user is allowed to do, without calling storage
+    on their behalf. Admin only.
+
+    User, group and bucket policies are compiled once and every check is
+    answered in-process, so thousands of checks can be sent in one call.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        username: Storage user whose effective permissions are evaluated.
+        checks: List of objects with 'action' (e.g. 's3:GetObject'),
+                'bucket' and optional 'key'. Omit 'key' for bucket-level
+                actions such as 's3:ListBucket'.
+
+    Returns an object with 'results', one entry per check with 'allowed',
+    'decision' ('allow', 'explicit_deny', 'implicit_deny' or
+    'principal_disabled') and the statements that matched.
+    """
+    session = require_admin(token)
+    service = build_permission_service_from_session(session)
+    buckets = service.validate_checks(checks)
+    documents = await AsyncAdmin(service).collect_documents(username, buckets)
+    return service.evaluate(documents, checks)
@@ -1,9 +1,11 @@
+from typing import List
+
 from mine_backend.mcp.server import mcp
 from mine_backend.mcp.context import build_user_service, require_admin
 
 
 @mcp.tool()
-def list_users(token: str):
+async def list_users(token: str):
     """List all storage users. Admin only.
 
     Args:
@@ -13,11 +15,11 @@ def list_users(token: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.list_users()
+    return await service.list_users()
 
 
 @mcp.tool()
-def get_user(token: str, username: str):
+async def get_user(token: str, username: str):
     """Get details for a specific storage user. Admin only.
 
     Args:
@@ -26,11 +28,11 @@ def get_user(token: str, username: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.get_user(username)
+    return await service.get_user(username)
 
 
 @mcp.tool()
-def create_user(token: str, username: str, password: str):
+async def create_user(token: str, username: str, password: str):
     """Create a new storage user. Admin only.
 
     Args:
@@ -40,11 +42,11 @@ def create_user(token: str, username: str, password: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.create_user(username, password)
+    return await service.create_user(username, password)
 
 
 @mcp.tool()
-def delete_user(token: str, username: str):
+async def delete_user(token: str, username: str):
     """Delete a storage user. Admin only.
 
     Args:
@@ -53,11 +55,11 @@ def delete_user(token: str, username: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.delete_user(username)
+    return await service.delete_user(username)
 
 
 @mcp.tool()
-def enable_user(token: str, username: str):
+async def enable_user(token: str, username: str):
     """Enable a previously disabled storage user, restoring their access. Admin only.
 
     Args:
@@ -66,11 +68,11 @@ def enable_user(token: str, username: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.enable_user(username)
+    return await service.enable_user(username)
 
 
 @mcp.tool()
-def disable_user(token: str, username: str):
+async def disable_user(token: str, username: str):
     """Disable a storage user, immediately revoking their storage access. Admin only.
 
     The user record is preserved; use enable_user to restore access.
@@ -81,4 +83,68 @@ def disable_user(token: str, username: str):
     """
     require_admin(token)
     service = build_user_service()
-    return service.disable_user(username)
+    return await service.disable_user(username)
+
+
+@mcp.tool()
+async def bulk_create_users(token: str, users: List[dict]):
+    """Create many storage users in one call. Admin only.
+
+    Users are created concurrently; a failure on one user does not stop
+    the others.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        users: List of objects with 'username' and 'password'.
+
+    Returns 'total', 'succeeded', 'failed' and 'results', one entry per user
+    with 'item' (the username), 'success' and 'error' when it failed.
+    """
+    require_admin(token)
+    service = build_user_service()
+    return await service.bulk_create_users(users)
+
+
+@mcp.tool()
+async def bulk_delete_users(token: str, usernames: List[str]):
+    """Delete many storage users in one call. Admin only.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        usernames: Usernames of the storage users to delete.
+
+    Returns per-user results like bulk_create_users.
+    """
+    require_admin(token)
+    service = build_user_service()
+    return await service.bulk_delete_users(usernames)
+
+
+@mcp.tool()
+async def bulk_enable_users(token: str, usernames: List[str]):
+    """Enable many storage users in one call. Admin only.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        usernames: Usernames of the storage users to enable.
+
+    Returns per-user results like bulk_create_users.
+    """
+    require_admin(token)
+    service = build_user_service()
+    return await service.bulk_enable_users(usernames)
+
+
+@mcp.tool()
+async def bulk_disable_users(token: str, usernames: List[str]):
+    """Disable many storage users in one call. Admin only.
+
+    Args:
+        token: Internal session token. Caller must hold the admin role.
+        usernames: Usernames of the storage users to disable.
+
+    Returns per-user results like bulk_create_users.
+    """
+    require_admin(token)
+    service = build_user_service()
+    return await service.bulk_disable_users(usernames)
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import posixpath
+import tarfile
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = {
+    'zip': 'application/zip',
+    'tar': 'application/x-tar',
+}
+# Chunks buffered per object being read ahead; with ``concurrency``
+# objects in flight, memory stays under concurrency × this × chunk size.
+READ_AHEAD_CHUNKS = 4
+CHUNK_SIZE = 64 * 1024
+
+OpenObject = Callable[[str], AsyncIterator[bytes]]
+
+
+def archive_name(key: str, prefix: Optional[str]) -> Optional[str]:
+    """Path of *key* inside an archive of *prefix*, or ``None`` for keys
+    that are not files (folder markers, or nothing left once sanitized).
+    Leading slashes and ``.``/``..`` segments are dropped so that
+    extracting the archive never writes outside the target directory."""
+    relative = key[len(prefix or '') :]
+    parts = [p for p in relative.split('/') if p not in ('', '.', '..')]
+    if not parts or key.endswith('/'):
+        return None
+    return posixpath.join(*parts)
+
+
+class _Sink:
+    """Write-only file object collecting what ``zipfile`` writes, so the
+    bytes can be yielded as they are produced. It has no ``tell``/``seek``,
+    which makes ``zipfile`` stream (sizes go in data descriptors)."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _read_into(
+    open_object: OpenObject, key: str, queue: asyncio.Queue
+) -> None:
+    try:
+        async for chunk in open_object(key):
+            await queue.put(chunk)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+
+
+async def _read_ahead(
+    entries: Iterable[dict], open_object: OpenObject, concurrency: int
+) -> AsyncIterator[tuple[dict, AsyncIterator[bytes]]]:
+    """``(entry, chunks)`` in order, with up to *concurrency* objects being
+    read at once; each reader stops after :data:`READ_AHEAD_CHUNKS` chunks
+    until the archive writer catches up."""
+    pending: deque = deque()
+    entries = iter(entries)
+
+    def start_next() -> None:
+        entry = next(entries, None)
+        if entry is None:
+            return
+        queue: asyncio.Queue = asyncio.Queue(READ_AHEAD_CHUNKS)
+        task = asyncio.create_task(
+            _read_into(open_object, entry['key'], queue)
+        )
+        pending.append((entry, queue, task))
+
+    async def chunks(queue: asyncio.Queue) -> AsyncIterator[bytes]:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    try:
+        for _ in range(max(1, concurrency)):
+            start_next()
+        while pending:
+            entry, queue, _task = pending.popleft()
+            yield entry, chunks(queue)
+            # The writer is done with this object: start the next one.
+            start_next()
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+
+
+async def _zip_stream(
+    objects: AsyncIterator[tuple[dict, AsyncIterator[bytes]]],
+) -> AsyncIterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        async for entry, chunks in objects:
+            info = zipfile.ZipInfo(
+                entry['name'], _zip_time(entry.get('last_modified'))
+            )
+            info.file_size = entry['size']
+            info.external_attr = 0o644 << 16
+            # zip64 headers on every entry: sizes are not checked before
+            # the data is written, and archives may pass 4 GiB.
+            with archive.open(info, 'w', force_zip64=True) as member:
+                async for chunk in chunks:
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _zip_time(value: Any) -> tuple:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime) or value.year < 1980:
+        return (1980, 1, 1, 0, 0, 0)
+    return value.timetuple()[:6]
+
+
+async def _tar_stream(
+    objects: AsyncIterator[tuple[dict, AsyncIterator[bytes]]],
+) -> AsyncIterator[bytes]:
+    async for entry, chunks in objects:
+        info = tarfile.TarInfo(entry['name'])
+        info.size = entry['size']
+        info.mode = 0o644
+        modified = entry.get('last_modified')
+        if isinstance(modified, str):
+            modified = datetime.fromisoformat(modified)
+        if isinstance(modified, datetime):
+            info.mtime = int(modified.timestamp())
+        yield info.tobuf(format=tarfile.PAX_FORMAT)
+
+        written = 0
+        async for chunk in chunks:
+            written += len(chunk)
+            yield chunk
+        if written != entry['size']:
+            # The header already promised entry['size'] bytes.
+            raise RuntimeError(
+                f"Object '{entry['key']}' changed size while archiving."
+            )
+        remainder = written % tarfile.BLOCKSIZE
+        if remainder:
+            yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
+async def stream_archive(
+    entries: Iterable[dict],
+    open_object: OpenObject,
+    archive_format: str,
+    concurrency: int,
+) -> AsyncIterator[bytes]:
+    """A ZIP (zip64, stored) or TAR archive of *entries*, produced as it
+    is written.
+
+    *entries* have ``key``, ``name`` (path in the archive), ``size`` and
+    ``last_modified``; ``open_object(key)`` yields the content of a key.
+    """
+    objects = _read_ahead(entries, open_object, concurrency)
+    writer = _zip_stream if archive_format == 'zip' else _tar_stream
+    try:
+        async for data in writer(objects):
+            if data:
+                yield data
+    except Exception:
+        logger.exception('Archive stream aborted')
+        raise
+    finally:
+        await objects.aclose()
@@ -1,5 +1,6 @@
 import httpx
 from mine_backend.config import settings
+from mine_backend.core.tracing import span
 from mine_backend.core.security import verify_keycloak_token
 from mine_backend.services.sts_service import assume_role_with_web_identity
 from mine_backend.services.session_service import issue_internal_token
@@ -15,18 +16,19 @@ class AuthService:
             f'{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}'
             '/protocol/openid-connect/token'
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
-                data={
-                    'grant_type': 'authorization_code',
-                    'client_id': settings.KEYCLOAK_CLIENT_ID,
-                    'client_secret': settings.KEYCLOAK_CLIENT_SECRET,
-                    'redirect_uri': redirect_uri,
-                    'code': code,
-                    'code_verifier': code_verifier,
-                },
-            )
+        with span('keycloak.token', **{'url.full': token_url}):
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    token_url,
+                    data={
+                        'grant_type': 'authorization_code',
+                        'client_id': settings.KEYCLOAK_CLIENT_ID,
+                        'client_secret': settings.KEYCLOAK_CLIENT_SECRET,
+                        'redirect_uri': redirect_uri,
+                        'code': code,
+                        'code_verifier': code_verifier,
+                    },
+                )
         if response.status_code != 200:
             raise InvalidTokenError('Keycloak code exchange failed')
 
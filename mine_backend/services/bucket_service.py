@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
+from typing import Optional
+
 from botocore.exceptions import ClientError
 from mine_spec.ports.admin import UserAdminPort
 from mine_spec.ports.object_storage import ObjectStoragePort
 
 
+from mine_backend.config import settings
 from mine_backend.exceptions.application import (
     InconsistentDataError,
     NotFoundError,
@@ -10,6 +14,12 @@ from mine_backend.exceptions.application import (
     UnexpectedError,
     PermissionDeniedError,
 )
+from mine_backend.services.lifecycle_simulator import LifecycleSimulator
+from mine_backend.services.object_listing import (
+    iter_objects,
+    iter_versions,
+    object_row,
+)
 
 import re
 
@@ -325,29 +335,99 @@ class BucketService:
     def validate_policy(self, policy: dict) -> dict:
 
         from mine_backend.services.policy_validator import (
-            validate_policy as _validate,
+            validate_policy_detailed as _validate,
         )
 
         errors = _validate(policy)
 
         return {
             'valid': len(errors) == 0,
-            'errors': errors,
+            'errors': [error.message for error in errors],
+            'details': [error.as_dict() for error in errors],
         }
 
     def validate_lifecycle(self, lifecycle: dict) -> dict:
 
         from mine_backend.services.lifecycle_validator import (
-            validate_lifecycle as _validate,
+            validate_lifecycle_detailed as _validate,
         )
 
         errors = _validate(lifecycle)
 
         return {
             'valid': len(errors) == 0,
-            'errors': errors,
+            'errors': [error.message for error in errors],
+            'details': [error.as_dict() for error in errors],
         }
 
+    def simulate_lifecycle(
+        self,
+        bucket: str,
+        lifecycle: Optional[dict] = None,
+        at: Optional[datetime] = None,
+    ) -> dict:
+        """What *lifecycle* (by default the bucket's current configuration)
+        would expire or transition if evaluated at *at* (default: now),
+        without changing anything. Tag filters on noncurrent versions are
+        checked against the current object's tags."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError('Invalid bucket name.')
+
+        try:
+            if lifecycle is None:
+                lifecycle = self.s3.get_bucket_lifecycle(bucket)
+                if not lifecycle or not lifecycle.get('Rules'):
+                    raise NotFoundError(
+                        f"Bucket '{bucket}' has no lifecycle configuration."
+                    )
+                lifecycle = {'Rules': lifecycle['Rules']}
+
+            result = self.validate_lifecycle(lifecycle)
+            if not result['valid']:
+                raise InconsistentDataError(
+                    'Invalid lifecycle configuration: '
+                    + '; '.join(result['errors'])
+                )
+
+            at = at or datetime.now(timezone.utc)
+            if at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+
+            simulator = LifecycleSimulator(
+                lifecycle['Rules'],
+                at,
+                get_tags=lambda key: self.s3.get_object_tags(
+                    bucket=bucket, key=key
+                ),
+            )
+            prefix = simulator.listing_prefix or None
+            if simulator.needs_versions:
+                # The latest version of each key stands in for the object,
+                # so one listing serves both and tags are fetched once.
+                simulator.add_version_rows(
+                    iter_versions(
+                        self.s3,
+                        bucket,
+                        prefix,
+                        concurrency=settings.OBJECT_BULK_CONCURRENCY,
+                    )
+                )
+            else:
+                for obj in iter_objects(self.s3, bucket, prefix):
+                    simulator.add_object(object_row(obj))
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchBucket':
+                raise NotFoundError(f"Bucket '{bucket}' not found.")
+            if error_code == 'NoSuchLifecycleConfiguration':
+                raise NotFoundError(
+                    f"Bucket '{bucket}' has no lifecycle configuration."
+                )
+            self._handle_s3_error(e)
+
+        return {'bucket': bucket, **simulator.report()}
+
     def put_bucket_lifecycle(
         self,
         bucket: str,
@@ -0,0 +1,162 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
+
+from mine_backend.exceptions.application import UnexpectedError
+from mine_backend.services.bulk import _error, batches, map_in_context
+from mine_backend.services.object_listing import iter_objects, object_row
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = 1000
+SYNC_SAMPLE_SIZE = 100
+SYNC_MAX_ERRORS = 100
+
+
+def _etag(value: Optional[str]) -> Optional[str]:
+    return value.strip('"') if value else value
+
+
+def sorted_rows(s3: Any, bucket: str, prefix: Optional[str]) -> Iterator[dict]:
+    """Rows of the listing of *bucket*, checked to come in key order (the
+    merge in :func:`diff_listings` depends on it)."""
+    previous = None
+    for obj in iter_objects(s3, bucket, prefix):
+        row = object_row(obj)
+        if previous is not None and row['key'] <= previous:
+            raise UnexpectedError(
+                f"Listing of bucket '{bucket}' is not sorted by key."
+            )
+        previous = row['key']
+        yield row
+
+
+def diff_listings(
+    source: Iterable[dict], dest: Iterable[dict]
+) -> Iterator[dict]:
+    """Merge two key-ordered listings in one pass, one row at a time from
+    each side.
+
+    Yields ``{key, status, source_size, dest_size, source_etag,
+    dest_etag}`` per key, with *status* one of ``added`` (only in
+    *source*), ``removed`` (only in *dest*), ``changed`` (size or ETag
+    differ) or ``unchanged``. The same content uploaded with different
+    part sizes has different ETags, so it shows as ``changed``.
+    """
+    source, dest = iter(source), iter(dest)
+    left, right = next(source, None), next(dest, None)
+
+    while left is not None or right is not None:
+        if right is None or (left is not None and left['key'] < right['key']):
+            status, src, dst = 'added', left, None
+            left = next(source, None)
+        elif left is None or right['key'] < left['key']:
+            status, src, dst = 'removed', None, right
+            right = next(dest, None)
+        else:
+            same = left['size'] == right['size'] and (
+                not left['etag']
+                or not right['etag']
+                or _etag(left['etag']) == _etag(right['etag'])
+            )
+            status = 'unchanged' if same else 'changed'
+            src, dst = left, right
+            left, right = next(source, None), next(dest, None)
+
+        yield {
+            'key': (src or dst)['key'],
+            'status': status,
+            'source_size': src['size'] if src else None,
+            'dest_size': dst['size'] if dst else None,
+            'source_etag': src['etag'] if src else None,
+            'dest_etag': dst['etag'] if dst else None,
+        }
+
+
+def sync_buckets(
+    s3: Any,
+    source_bucket: str,
+    dest_bucket: str,
+    differences: Iterable[dict],
+    concurrency: int,
+    delete: bool = False,
+    dry_run: bool = True,
+    changed_limit: int = 0,
+) -> dict:
+    """Make *dest_bucket* match *source_bucket*: copy ``added`` and
+    ``changed`` keys server-side and, with *delete*, remove ``removed``
+    ones. Work goes out in batches of :data:`SYNC_BATCH_SIZE` to
+    *concurrency* workers; a failed key is reported without stopping the
+    sync.
+
+    ``changed_keys`` lists up to *changed_limit* keys written or deleted
+    in *dest_bucket*.
+    """
+    report = {
+        'dry_run': dry_run,
+        'added': 0,
+        'changed': 0,
+        'removed': 0,
+        'unchanged': 0,
+        'copy_bytes': 0,
+        'copied': 0,
+        'deleted': 0,
+        'failed': 0,
+        'sample': [],
+        'errors': [],
+        'changed_keys': [],
+    }
+
+    def apply(difference: dict) -> Optional[dict]:
+        key = difference['key']
+        try:
+            if difference['status'] == 'removed':
+                s3.delete_object(dest_bucket, key)
+            else:
+                s3.copy_object(
+                    source_bucket=source_bucket,
+                    source_key=key,
+                    dest_bucket=dest_bucket,
+                    dest_key=key,
+                )
+        except Exception as e:
+            logger.debug('Sync of key failed', exc_info=True)
+            return {'key': key, **_error(e)}
+        return None
+
+    def actionable(difference: dict) -> bool:
+        report[difference['status']] += 1
+        if difference['status'] == 'unchanged':
+            return False
+        if len(report['sample']) < SYNC_SAMPLE_SIZE:
+            report['sample'].append(difference)
+        if difference['status'] == 'removed':
+            return delete
+        report['copy_bytes'] += difference['source_size'] or 0
+        return True
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix='sync'
+    ) as executor:
+        for batch in batches(
+            filter(actionable, differences), SYNC_BATCH_SIZE
+        ):
+            if dry_run:
+                continue
+
+            outcomes = map_in_context(executor, apply, batch)
+
+            for difference, error in zip(batch, outcomes):
+                if error is not None:
+                    report['failed'] += 1
+                    if len(report['errors']) < SYNC_MAX_ERRORS:
+                        report['errors'].append(error)
+                    continue
+                if difference['status'] == 'removed':
+                    report['deleted'] += 1
+                else:
+                    report['copied'] += 1
+                if len(report['changed_keys']) < changed_limit:
+                    report['changed_keys'].append(difference['key'])
+
+    return report
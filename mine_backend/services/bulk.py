@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.exceptions.base import AppException
+
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+
+def _error(exc: Exception) -> dict:
+    if isinstance(exc, AppException):
+        return {'code': exc.code, 'message': exc.message}
+    return {'code': 'UNEXPECTED_ERROR', 'message': str(exc)}
+
+
+def batches(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """*items* in lists of *size* (the last one may be shorter), pulled
+    from *items* only as each list is needed."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def map_in_context(
+    executor: Executor, fn: Callable[[T], Any], items: list[T]
+) -> Iterator[Any]:
+    """``executor.map(fn, items)``, each call in its own copy of the
+    caller's contextvars so worker threads see e.g. the active trace
+    span."""
+    contexts = [contextvars.copy_context() for _ in items]
+    return executor.map(lambda ctx, item: ctx.run(fn, item), contexts, items)
+
+
+def _checked(items: Iterable[T], max_items: int) -> list[T]:
+    items = list(items)
+
+    if not items:
+        raise InconsistentDataError('At least one item is required.')
+
+    if len(items) > max_items:
+        raise InconsistentDataError(
+            f'At most {max_items} items are allowed per request.'
+        )
+    return items
+
+
+def _outcome(
+    item: str, result: Any = None, error: Optional[Exception] = None
+) -> dict:
+    if error is None:
+        return {'item': item, 'success': True, 'result': result, 'error': None}
+    if not isinstance(error, AppException):
+        logger.exception('Bulk item failed', extra={'item': item})
+    return {
+        'item': item,
+        'success': False,
+        'result': None,
+        'error': _error(error),
+    }
+
+
+def _summary(results: list[dict]) -> dict:
+    succeeded = sum(1 for r in results if r['success'])
+
+    return {
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results,
+    }
+
+
+def run_bulk(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    concurrency: int,
+    max_items: int,
+    label: Callable[[T], str] = str,
+) -> dict:
+    """Apply *fn* to every item with at most *concurrency* calls in flight.
+
+    One failing item never aborts the batch: each item gets its own entry
+    (in input order) with either the call result or the error code/message
+    it raised, plus totals so callers can tell partial from full success.
+    """
+    items = _checked(items, max_items)
+
+    def call(item: T) -> dict:
+        try:
+            return _outcome(label(item), fn(item))
+        except Exception as e:
+            return _outcome(label(item), error=e)
+
+    workers = max(1, min(concurrency, len(items)))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix='bulk'
+    ) as executor:
+        results = list(map_in_context(executor, call, items))
+
+    return _summary(results)
+
+
+async def run_bulk_async(
+    fn: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    concurrency: int,
+    max_items: int,
+    label: Callable[[T], str] = str,
+) -> dict:
+    """:func:`run_bulk` for a coroutine *fn*, with the same report.
+
+    Meant for calls that already run on a shared pool (e.g.
+    :class:`~mine_backend.core.admin_executor.AsyncAdmin` methods): no
+    threads are started here, so that pool's bound and back-pressure apply
+    to every item.
+    """
+    items = _checked(items, max_items)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def call(item: T) -> dict:
+        async with semaphore:
+            try:
+                return _outcome(label(item), await fn(item))
+            except Exception as e:
+                return _outcome(label(item), error=e)
+
+    return _summary(list(await asyncio.gather(*map(call, items))))
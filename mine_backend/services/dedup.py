@@ -0,0 +1,127 @@
+import heapq
+import itertools
+import json
+import logging
+import tempfile
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from mine_backend.services.object_listing import iter_objects
+
+logger = logging.getLogger(__name__)
+
+# Locations listed per duplicate group.
+DEDUP_SAMPLE_LOCATIONS = 10
+
+Entry = tuple  # (etag, size, bucket, key)
+
+
+def iter_entries(
+    s3: Any,
+    buckets: Iterable[str],
+    prefix: Optional[str] = None,
+    min_size: int = 1,
+) -> Iterator[Entry]:
+    """``(etag, size, bucket, key)`` for every object of *buckets* under
+    *prefix* with a known ETag and at least *min_size* bytes."""
+    for bucket in buckets:
+        for obj in iter_objects(s3, bucket, prefix):
+            size = obj.size or 0
+            if not obj.etag or size < min_size:
+                continue
+            yield (obj.etag.strip('"'), size, bucket, obj.key)
+
+
+def _spill(entries: list[Entry]) -> IO[str]:
+    run = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+    for entry in sorted(entries):
+        run.write(json.dumps(entry))
+        run.write('\n')
+    run.seek(0)
+    return run
+
+
+def _read_run(run: IO[str]) -> Iterator[Entry]:
+    for line in run:
+        yield tuple(json.loads(line))
+
+
+def sorted_entries(
+    entries: Iterable[Entry], memory_entries: int
+) -> Iterator[Entry]:
+    """*entries* sorted, keeping at most *memory_entries* in memory: full
+    buffers are sorted and spilled to temporary files, which are then
+    merged. Small inventories never touch the disk."""
+    runs: list[IO[str]] = []
+    buffer: list[Entry] = []
+    try:
+        for entry in entries:
+            buffer.append(entry)
+            if len(buffer) >= memory_entries:
+                runs.append(_spill(buffer))
+                buffer = []
+
+        if not runs:
+            yield from sorted(buffer)
+            return
+
+        logger.info(
+            'Duplicate scan spilled to disk', extra={'runs': len(runs)}
+        )
+        buffer.sort()
+        yield from heapq.merge(buffer, *(_read_run(run) for run in runs))
+    finally:
+        for run in runs:
+            run.close()
+
+
+def find_duplicates(entries: Iterable[Entry], top: int) -> dict:
+    """Groups of objects sharing ``(etag, size)`` in sorted *entries*, with
+    the bytes that keeping one copy per group would reclaim. The *top*
+    groups by reclaimable bytes are returned in full."""
+    report = {
+        'scanned': 0,
+        'groups': 0,
+        'duplicate_objects': 0,
+        'reclaimable_bytes': 0,
+        'top': [],
+    }
+    heaviest: list[tuple] = []
+    counter = itertools.count()
+
+    for (etag, size), group in itertools.groupby(
+        entries, key=lambda e: (e[0], e[1])
+    ):
+        count = 0
+        locations = []
+        for _, _, bucket, key in group:
+            count += 1
+            if len(locations) < DEDUP_SAMPLE_LOCATIONS:
+                locations.append({'bucket': bucket, 'key': key})
+        report['scanned'] += count
+        if count < 2:
+            continue
+
+        reclaimable = size * (count - 1)
+        report['groups'] += 1
+        report['duplicate_objects'] += count - 1
+        report['reclaimable_bytes'] += reclaimable
+
+        item = (reclaimable, next(counter), etag, size, count, locations)
+        if len(heaviest) < top:
+            heapq.heappush(heaviest, item)
+        elif reclaimable > heaviest[0][0]:
+            heapq.heapreplace(heaviest, item)
+
+    report['top'] = [
+        {
+            'etag': etag,
+            'size': size,
+            'copies': count,
+            'reclaimable_bytes': reclaimable,
+            'locations': locations,
+        }
+        for reclaimable, _, etag, size, count, locations in sorted(
+            heaviest, reverse=True
+        )
+    ]
+    return report
@@ -1,4 +1,8 @@
 from mine_spec.ports.admin import UserAdminPort
+
+from mine_backend.config import settings
+from mine_backend.core.admin_executor import AsyncAdmin
+from mine_backend.services.bulk import run_bulk_async
 from mine_backend.exceptions.application import (
     UnexpectedError,
     NotFoundError,
@@ -96,3 +100,31 @@ class GroupService:
             return self.storage_admin.get_policy_from_group(group)
         except RuntimeError as e:
             self._handle_storage_admin_error(e)
+
+    # -----------------------------------------
+    # Bulk
+    # -----------------------------------------
+
+    # Each item is a separate call on the admin executor, as in
+    # UserService._bulk.
+
+    async def _bulk_memberships(self, fn, memberships: list[dict]):
+        return await run_bulk_async(
+            lambda m: fn(m['name'], m['users']),
+            memberships,
+            concurrency=settings.ADMIN_BULK_CONCURRENCY,
+            max_items=settings.ADMIN_BULK_MAX_ITEMS,
+            label=lambda m: str(m.get('name', '')),
+        )
+
+    async def bulk_add_users(self, memberships: list[dict]):
+        """Add users to several groups; one item per group."""
+        return await self._bulk_memberships(
+            AsyncAdmin(self).add_users, memberships
+        )
+
+    async def bulk_remove_users(self, memberships: list[dict]):
+        """Remove users from several groups; one item per group."""
+        return await self._bulk_memberships(
+            AsyncAdmin(self).remove_users, memberships
+        )
@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.bulk import batches
+from mine_backend.services.object_listing import as_datetime
+
+INVENTORY_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+INVENTORY_COLUMNS = ('key', 'size', 'last_modified', 'etag', 'storage_class')
+# Rows encoded per chunk of CSV/NDJSON output.
+TEXT_BATCH_ROWS = 1000
+# Rows per Parquet row group: the only rows held in memory at once.
+PARQUET_ROW_GROUP = 100_000
+
+
+def row_filter(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    modified_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+    storage_class: Optional[str] = None,
+    suffix: Optional[str] = None,
+) -> Callable[[dict], bool]:
+    """Predicate keeping the rows that match every criterion given."""
+    modified_after = as_datetime(modified_after)
+    modified_before = as_datetime(modified_before)
+
+    if min_size is not None and max_size is not None and min_size > max_size:
+        raise InconsistentDataError('min_size must not exceed max_size.')
+
+    def matches(row: dict) -> bool:
+        size = row['size'] or 0
+        if min_size is not None and size < min_size:
+            return False
+        if max_size is not None and size > max_size:
+            return False
+        if modified_after or modified_before:
+            modified = as_datetime(row['last_modified'])
+            if modified is None:
+                return False
+            if modified_after and modified < modified_after:
+                return False
+            if modified_before and modified >= modified_before:
+                return False
+        if storage_class and row['storage_class'] != storage_class:
+            return False
+        if suffix and not row['key'].endswith(suffix):
+            return False
+        return True
+
+    return matches
+
+
+def _text_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_stream(rows: Iterable[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(INVENTORY_COLUMNS)
+    yield buffer.getvalue().encode()
+    for batch in batches(rows, TEXT_BATCH_ROWS):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_text_value(row[c]) for c in INVENTORY_COLUMNS] for row in batch
+        )
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_stream(rows: Iterable[dict]) -> Iterator[bytes]:
+    for batch in batches(rows, TEXT_BATCH_ROWS):
+        yield ''.join(
+            json.dumps({c: _text_value(row[c]) for c in INVENTORY_COLUMNS})
+            + '\n'
+            for row in batch
+        ).encode()
+
+
+class _Sink:
+    """Write-only file object for ``pyarrow``; what the Parquet writer
+    produces is drained after each row group."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_stream(rows: Iterable[dict]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ('key', pa.string()),
+            ('size', pa.int64()),
+            ('last_modified', pa.timestamp('us', tz='UTC')),
+            ('etag', pa.string()),
+            ('storage_class', pa.string()),
+        ]
+    )
+    sink = _Sink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema) as writer:
+        for batch in batches(rows, PARQUET_ROW_GROUP):
+            for row in batch:
+                row['last_modified'] = as_datetime(row['last_modified'])
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_inventory(rows: Iterable[dict], fmt: str) -> Iterator[bytes]:
+    """*rows* encoded as *fmt* (see :data:`INVENTORY_FORMATS`), a chunk
+    at a time; nothing but the current batch is kept in memory."""
+    writers = {
+        'csv': _csv_stream,
+        'ndjson': _ndjson_stream,
+        'parquet': _parquet_stream,
+    }
+    for chunk in writers[fmt](rows):
+        if chunk:
+            yield chunk
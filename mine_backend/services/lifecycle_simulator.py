@@ -0,0 +1,389 @@
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from mine_backend.services.object_listing import as_datetime
+
+# Cheapest first: when several transitions are due for an object, it goes
+# to the cheapest class, as S3 does.
+_CLASS_COST = (
+    'DEEP_ARCHIVE',
+    'GLACIER',
+    'GLACIER_IR',
+    'ONEZONE_IA',
+    'STANDARD_IA',
+    'INTELLIGENT_TIERING',
+    'REDUCED_REDUNDANCY',
+    'STANDARD',
+)
+
+
+class PrefixTrie:
+    """Values stored under string prefixes. :meth:`match` walks a key once
+    and collects the values of every stored prefix of it, so matching costs
+    the length of the key rather than the number of rules."""
+
+    __slots__ = ('children', 'values')
+
+    def __init__(self) -> None:
+        self.children: dict[str, 'PrefixTrie'] = {}
+        self.values: list = []
+
+    def add(self, prefix: str, value: Any) -> None:
+        node = self
+        for char in prefix:
+            node = node.children.setdefault(char, PrefixTrie())
+        node.values.append(value)
+
+    def match(self, key: str) -> list:
+        node = self
+        found = list(node.values)
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+            found.extend(node.values)
+        return found
+
+
+def due_at(start: datetime, days: int) -> datetime:
+    """When an action of *days* applies to something that started at
+    *start*: S3 adds the days and rounds up to the next midnight UTC."""
+    moment = start.astimezone(timezone.utc) + timedelta(days=days)
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight if midnight == moment else midnight + timedelta(days=1)
+
+
+def _cheapest(classes: Iterable[str]) -> Optional[str]:
+    rank = {name: i for i, name in enumerate(_CLASS_COST)}
+    return min(classes, key=lambda c: rank.get(c, len(rank)), default=None)
+
+
+def compile_rule(index: int, rule: dict) -> dict:
+    """The parts of a (validated) lifecycle rule the simulator needs."""
+    rule_filter = rule.get('Filter') or {}
+    conditions = rule_filter.get('And', rule_filter)
+    tags = {}
+    if 'Tag' in rule_filter:
+        tags[rule_filter['Tag']['Key']] = rule_filter['Tag']['Value']
+    for tag in conditions.get('Tags', []):
+        tags[tag['Key']] = tag['Value']
+
+    expiration = rule.get('Expiration') or {}
+    noncurrent = rule.get('NoncurrentVersionExpiration') or {}
+    return {
+        'index': index,
+        'id': rule.get('ID') or f'rule-{index + 1}',
+        'enabled': rule.get('Status') == 'Enabled',
+        'prefix': conditions.get('Prefix', rule.get('Prefix')) or '',
+        'tags': tags,
+        'size_above': conditions.get('ObjectSizeGreaterThan'),
+        'size_below': conditions.get('ObjectSizeLessThan'),
+        'expire_days': expiration.get('Days'),
+        'expire_date': as_datetime(expiration.get('Date')),
+        'transitions': [
+            (t.get('Days'), as_datetime(t.get('Date')), t['StorageClass'])
+            for t in rule.get('Transitions') or []
+        ],
+        'noncurrent_days': noncurrent.get('NoncurrentDays'),
+        'noncurrent_newer': noncurrent.get('NewerNoncurrentVersions'),
+        'has_noncurrent_expiration': bool(noncurrent),
+        'noncurrent_transitions': [
+            (
+                t.get('NoncurrentDays'),
+                t.get('NewerNoncurrentVersions'),
+                t['StorageClass'],
+            )
+            for t in rule.get('NoncurrentVersionTransitions') or []
+        ],
+        'expired_delete_markers': bool(
+            expiration.get('ExpiredObjectDeleteMarker')
+        ),
+        'abort_multipart': 'AbortIncompleteMultipartUpload' in rule,
+    }
+
+
+def _counter() -> dict:
+    return {'objects': 0, 'size': 0}
+
+
+def _add(counter: dict, size: int) -> None:
+    counter['objects'] += 1
+    counter['size'] += size
+
+
+class LifecycleSimulator:
+    """What a lifecycle configuration would do to a bucket at time *at*.
+
+    Rules are indexed by prefix in a :class:`PrefixTrie`; each key only
+    checks the rules whose prefix it starts with. Size conditions are
+    checked next, and tags are looked up (once per key, through
+    *get_tags*) only when a rule that still matches needs them.
+
+    Feed current objects to :meth:`add_object`, or, when
+    :attr:`needs_versions`, the versions listing to
+    :meth:`add_version_rows`, where each key's latest version stands in for
+    its current object. Only the current object's tags are looked up: tag
+    filters on noncurrent versions are checked against those, an
+    approximation where a key's tags changed between versions (S3 uses
+    each version's own). :meth:`report` then gives counts and bytes per
+    rule, and totals where an object is counted once (expiration wins over
+    transition).
+    """
+
+    def __init__(
+        self,
+        rules: list[dict],
+        at: datetime,
+        get_tags: Optional[Callable[[str], dict]] = None,
+    ):
+        self.rules = [compile_rule(i, rule) for i, rule in enumerate(rules)]
+        self.at = at
+        self.get_tags = get_tags
+        self.trie = PrefixTrie()
+        for rule in self.rules:
+            if rule['enabled']:
+                self.trie.add(rule['prefix'], rule)
+
+        self.stats = {
+            rule['index']: {
+                'matched': _counter(),
+                'expire': _counter(),
+                'transition': {},
+                'noncurrent_expire': _counter(),
+                'noncurrent_transition': {},
+            }
+            for rule in self.rules
+        }
+        self.totals = {
+            'expire': _counter(),
+            'transition': {},
+            'noncurrent_expire': _counter(),
+            'noncurrent_transition': {},
+        }
+        self.scanned_objects = 0
+        self.scanned_versions = 0
+        self.tag_lookups = 0
+        self._last_tags: tuple = (None, {})
+
+    @property
+    def needs_versions(self) -> bool:
+        return any(
+            r['enabled']
+            and (r['has_noncurrent_expiration'] or r['noncurrent_transitions'])
+            for r in self.rules
+        )
+
+    def _matching(self, key: str, size: int) -> list[dict]:
+        candidates = [
+            rule
+            for rule in self.trie.match(key)
+            if (rule['size_above'] is None or size > rule['size_above'])
+            and (rule['size_below'] is None or size < rule['size_below'])
+        ]
+        if not any(rule['tags'] for rule in candidates):
+            return candidates
+
+        tags = self._tags(key)
+        return [
+            rule
+            for rule in candidates
+            if all(tags.get(k) == v for k, v in rule['tags'].items())
+        ]
+
+    def _tags(self, key: str) -> dict:
+        # Keys come one at a time (object, then its versions), so
+        # remembering the last lookup is enough to fetch each key once.
+        if self._last_tags[0] != key:
+            tags = {}
+            if self.get_tags is not None:
+                self.tag_lookups += 1
+                tags = self.get_tags(key) or {}
+                if isinstance(tags, list):
+                    tags = {t['Key']: t['Value'] for t in tags}
+            self._last_tags = (key, tags)
+        return self._last_tags[1]
+
+    def add_object(self, row: dict) -> None:
+        """Current actions (Expiration, Transitions) for one object."""
+        self.scanned_objects += 1
+        size = row['size'] or 0
+        modified = as_datetime(row['last_modified'])
+        expired = False
+        targets = []
+
+        for rule in self._matching(row['key'], size):
+            stats = self.stats[rule['index']]
+            _add(stats['matched'], size)
+            if modified is None:
+                continue
+
+            if (
+                rule['expire_days'] is not None
+                and self.at >= due_at(modified, rule['expire_days'])
+            ) or (rule['expire_date'] and self.at >= rule['expire_date']):
+                _add(stats['expire'], size)
+                expired = True
+                continue
+
+            target = _cheapest(
+                storage_class
+                for days, date, storage_class in rule['transitions']
+                if (days is not None and self.at >= due_at(modified, days))
+                or (date and self.at >= date)
+            )
+            if target and target != row.get('storage_class'):
+                _add(stats['transition'].setdefault(target, _counter()), size)
+                targets.append(target)
+
+        if expired:
+            _add(self.totals['expire'], size)
+        elif targets:
+            target = _cheapest(targets)
+            _add(
+                self.totals['transition'].setdefault(target, _counter()), size
+            )
+
+    def add_versions(self, key: str, versions: list[dict]) -> None:
+        """Noncurrent actions for the versions of one key, checked
+        against the tags of its current object."""
+        versions = sorted(
+            versions,
+            key=lambda v: (v['is_latest'], as_datetime(v['last_modified'])),
+            reverse=True,
+        )
+        self.scanned_versions += len(versions)
+        if not versions or not versions[0]['is_latest']:
+            return
+
+        noncurrent = versions[1:]
+        if not noncurrent or not self.trie.match(key):
+            return
+
+        replaced_at = as_datetime(versions[0]['last_modified'])
+        for position, version in enumerate(noncurrent):
+            size = (
+                0 if version.get('is_delete_marker') else version['size'] or 0
+            )
+            expired = False
+            targets = []
+            for rule in self._matching(key, size):
+                stats = self.stats[rule['index']]
+                if rule['has_noncurrent_expiration'] and self._noncurrent_due(
+                    rule['noncurrent_days'],
+                    rule['noncurrent_newer'],
+                    replaced_at,
+                    position,
+                ):
+                    _add(stats['noncurrent_expire'], size)
+                    expired = True
+                    continue
+                target = _cheapest(
+                    storage_class
+                    for days, newer, storage_class in rule[
+                        'noncurrent_transitions'
+                    ]
+                    if self._noncurrent_due(days, newer, replaced_at, position)
+                )
+                if target:
+                    _add(
+                        stats['noncurrent_transition'].setdefault(
+                            target, _counter()
+                        ),
+                        size,
+                    )
+                    targets.append(target)
+
+            if expired:
+                _add(self.totals['noncurrent_expire'], size)
+            elif targets:
+                target = _cheapest(targets)
+                _add(
+                    self.totals['noncurrent_transition'].setdefault(
+                        target, _counter()
+                    ),
+                    size,
+                )
+            replaced_at = as_datetime(version['last_modified'])
+
+    def _noncurrent_due(
+        self,
+        days: Optional[int],
+        newer: Optional[int],
+        replaced_at: Optional[datetime],
+        position: int,
+    ) -> bool:
+        if newer is not None and position < newer:
+            return False
+        if days is None:
+            return newer is not None
+        return replaced_at is not None and self.at >= due_at(replaced_at, days)
+
+    def add_version_rows(self, rows: Iterable[dict]) -> None:
+        """Current and noncurrent actions from a versions listing (rows of
+        many keys, grouped by key): each key's latest version goes to
+        :meth:`add_object`, then all of them to :meth:`add_versions`, so
+        the bucket is listed once."""
+        for key, group in itertools.groupby(rows, key=lambda r: r['key']):
+            versions = list(group)
+            current = next((v for v in versions if v['is_latest']), None)
+            if current is not None and not current.get('is_delete_marker'):
+                self.add_object(current)
+            self.add_versions(key, versions)
+
+    @property
+    def listing_prefix(self) -> str:
+        """Longest prefix shared by the enabled rules: only keys under it
+        can match, so only it needs listing."""
+        prefixes = [r['prefix'] for r in self.rules if r['enabled']]
+        return os.path.commonprefix(prefixes) if prefixes else ''
+
+    def report(self) -> dict:
+        def classes(counters: dict) -> list[dict]:
+            return [
+                {'storage_class': name, **counter}
+                for name, counter in sorted(counters.items())
+            ]
+
+        not_simulated = []
+        if any(r['enabled'] and r['abort_multipart'] for r in self.rules):
+            not_simulated.append('AbortIncompleteMultipartUpload')
+        if any(
+            r['enabled'] and r['expired_delete_markers'] for r in self.rules
+        ):
+            not_simulated.append('ExpiredObjectDeleteMarker')
+
+        return {
+            'at': self.at,
+            'scanned_objects': self.scanned_objects,
+            'scanned_versions': self.scanned_versions,
+            'tag_lookups': self.tag_lookups,
+            'rules': [
+                {
+                    'id': rule['id'],
+                    'enabled': rule['enabled'],
+                    'matched': self.stats[rule['index']]['matched'],
+                    'expire': self.stats[rule['index']]['expire'],
+                    'transition': classes(
+                        self.stats[rule['index']]['transition']
+                    ),
+                    'noncurrent_expire': self.stats[rule['index']][
+                        'noncurrent_expire'
+                    ],
+                    'noncurrent_transition': classes(
+                        self.stats[rule['index']]['noncurrent_transition']
+                    ),
+                }
+                for rule in self.rules
+            ],
+            'totals': {
+                'expire': self.totals['expire'],
+                'transition': classes(self.totals['transition']),
+                'noncurrent_expire': self.totals['noncurrent_expire'],
+                'noncurrent_transition': classes(
+                    self.totals['noncurrent_transition']
+                ),
+            },
+            'not_simulated': not_simulated,
+        }
@@ -0,0 +1,82 @@
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+from mine_backend.core.pagination import ListSnapshot
+
+
+def _as_list(raw: Any) -> list:
+    if raw is None:
+        return []
+    if isinstance(raw, list):
+        return raw
+    return [raw]
+
+
+def user_snapshot(users: Any) -> ListSnapshot:
+    """Index the result of ``UserService.list_users``.
+
+    Drivers return either a list of user objects or a mapping of
+    username → user; both become rows with an explicit ``username`` and the
+    flat list of ``groups`` the user belongs to.
+    """
+    raw = jsonable_encoder(users)
+
+    if isinstance(raw, dict):
+        items = [{**(data or {}), 'username': name} for name, data in raw.items()]
+    else:
+        items = [item for item in _as_list(raw) if isinstance(item, dict)]
+
+    rows = []
+    for item in items:
+        row = dict(item)
+        row['username'] = item.get('username') or item.get('access_key')
+        row['groups'] = [
+            m.get('name')
+            for m in item.get('member_of') or []
+            if isinstance(m, dict) and m.get('name')
+        ]
+        rows.append(row)
+
+    return ListSnapshot(
+        raw,
+        rows,
+        key='username',
+        sortable=('status',),
+        filterable=('status', 'groups'),
+    )
+
+
+def group_snapshot(groups: Any) -> ListSnapshot:
+    """Index the result of ``GroupService.list_groups`` (``[{'groups': [...]}]``
+    or a plain list of names) as one ``{'name': ...}`` row per group.
+    """
+    raw = jsonable_encoder(groups)
+
+    names: list[str] = []
+    for item in _as_list(raw):
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, dict):
+            if 'groups' in item:
+                names.extend(item.get('groups') or [])
+            elif item.get('name'):
+                names.append(item['name'])
+
+    return ListSnapshot(raw, [{'name': n} for n in names], key='name')
+
+
+def policy_snapshot(policies: Any) -> ListSnapshot:
+    raw = jsonable_encoder(policies)
+    rows = [
+        {**item, 'name': item.get('policy')}
+        for item in _as_list(raw)
+        if isinstance(item, dict)
+    ]
+    return ListSnapshot(raw, rows, key='name', filterable=('is_group',))
+
+
+def credential_snapshot(credentials: Any) -> ListSnapshot:
+    raw = jsonable_encoder(credentials)
+    rows = [item for item in _as_list(raw) if isinstance(item, dict)]
+    return ListSnapshot(raw, rows, key='access_key')
@@ -0,0 +1,387 @@
+import math
+import re
+import time
+from typing import Any, Iterable, Optional
+
+from botocore.exceptions import ClientError
+
+from mine_backend.config import settings
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+    PermissionDeniedError,
+    UnexpectedError,
+)
+
+
+# S3 multipart limits.
+MIN_PART_SIZE = 5 * 1024**2
+MAX_PART_SIZE = 5 * 1024**3
+MAX_PARTS = 10_000
+
+BUCKET_REGEX = re.compile(r'^[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]$')
+
+
+def plan_parts(size: Optional[int], part_size: Optional[int] = None) -> dict:
+    """Part size and count for an upload of *size* bytes: the requested (or
+    default) part size, grown as needed to stay within 10,000 parts."""
+    part_size = part_size or settings.MULTIPART_PART_SIZE
+    if part_size < MIN_PART_SIZE or part_size > MAX_PART_SIZE:
+        raise InconsistentDataError(
+            f'Part size must be between {MIN_PART_SIZE} and '
+            f'{MAX_PART_SIZE} bytes.'
+        )
+    if size is None:
+        return {'part_size': part_size, 'part_count': None}
+    if size < 0 or size > MAX_PART_SIZE * MAX_PARTS:
+        raise InconsistentDataError('Invalid object size.')
+
+    # Round up to whole MiB so part boundaries are easy to compute.
+    part_size = max(part_size, math.ceil(size / MAX_PARTS))
+    part_size = math.ceil(part_size / 1024**2) * 1024**2
+    return {
+        'part_size': part_size,
+        'part_count': max(1, math.ceil(size / part_size)),
+    }
+
+
+class MultipartUploadService:
+    """Multipart uploads driven by the browser.
+
+    The backend only starts, signs, lists, completes and aborts; the parts
+    themselves go straight from the browser to storage through presigned
+    ``PUT`` URLs, in parallel. An upload can be resumed after a reload:
+    :meth:`list_uploads` finds it again and :meth:`list_parts` tells which
+    parts are already stored. Completing without a part list uses the
+    parts stored, so the browser does not need to read ``ETag`` headers
+    (which bucket CORS rules often do not expose).
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def _handle_error(self, e: ClientError, bucket: str):
+        error_code = e.response['Error']['Code']
+
+        if error_code == 'NoSuchBucket':
+            raise NotFoundError(f"Bucket '{bucket}' not found.")
+
+        if error_code == 'NoSuchUpload':
+            raise NotFoundError('Upload not found.')
+
+        if error_code in ['AccessDenied', 'AllAccessDisabled']:
+            raise PermissionDeniedError('Access denied.')
+
+        if error_code in ['InvalidPart', 'InvalidPartOrder', 'EntityTooSmall']:
+            raise InconsistentDataError(f'S3 error: {error_code}')
+
+        raise UnexpectedError(f'S3 error: {error_code}')
+
+    def _validate(self, bucket: str, key: str) -> None:
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+        if not key:
+            raise InconsistentDataError('Key must be provided.')
+
+    def initiate(
+        self,
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+        size: Optional[int] = None,
+        part_size: Optional[int] = None,
+    ):
+        self._validate(bucket, key)
+        plan = plan_parts(size, part_size)
+
+        params = {'Bucket': bucket, 'Key': key}
+        if content_type:
+            params['ContentType'] = content_type
+
+        try:
+            response = self.client.create_multipart_upload(**params)
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'upload_id': response['UploadId'],
+            **plan,
+        }
+
+    def presign_parts(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_numbers: list[int],
+        expires_in: int = 3600,
+    ):
+        self._validate(bucket, key)
+
+        if not part_numbers:
+            raise InconsistentDataError('At least one part is required.')
+
+        if len(part_numbers) > settings.MULTIPART_MAX_PRESIGN:
+            raise InconsistentDataError(
+                f'At most {settings.MULTIPART_MAX_PRESIGN} parts are allowed '
+                'per request.'
+            )
+
+        if any(n < 1 or n > MAX_PARTS for n in part_numbers):
+            raise InconsistentDataError(
+                f'Part numbers must be between 1 and {MAX_PARTS}.'
+            )
+
+        if expires_in <= 0 or expires_in > 86400:
+            expires_in = 3600
+
+        signed_at = time.time()
+        try:
+            urls = [
+                {
+                    'part_number': number,
+                    'url': self.client.generate_presigned_url(
+                        'upload_part',
+                        Params={
+                            'Bucket': bucket,
+                            'Key': key,
+                            'UploadId': upload_id,
+                            'PartNumber': number,
+                        },
+                        ExpiresIn=expires_in,
+                    ),
+                }
+                for number in part_numbers
+            ]
+        except Exception as e:
+            raise UnexpectedError(f'Could not generate part URLs: {str(e)}')
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'upload_id': upload_id,
+            'expires_at': int(signed_at + expires_in),
+            'urls': urls,
+        }
+
+    def list_parts(self, bucket: str, key: str, upload_id: str):
+        self._validate(bucket, key)
+
+        parts = []
+        marker = 0
+        try:
+            while True:
+                response = self.client.list_parts(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumberMarker=marker,
+                )
+                parts.extend(
+                    {
+                        'part_number': p['PartNumber'],
+                        'etag': p['ETag'],
+                        'size': p['Size'],
+                    }
+                    for p in response.get('Parts', [])
+                )
+                if not response.get('IsTruncated'):
+                    break
+                marker = response['NextPartNumberMarker']
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'upload_id': upload_id,
+            'parts': parts,
+        }
+
+    def list_uploads(self, bucket: str, prefix: Optional[str] = None):
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        params = {'Bucket': bucket}
+        if prefix:
+            params['Prefix'] = prefix
+
+        try:
+            response = self.client.list_multipart_uploads(**params)
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        return {
+            'bucket': bucket,
+            'prefix': prefix,
+            'uploads': [
+                {
+                    'key': u['Key'],
+                    'upload_id': u['UploadId'],
+                    'initiated': u['Initiated'],
+                }
+                for u in response.get('Uploads', [])
+            ],
+            'is_truncated': bool(response.get('IsTruncated')),
+        }
+
+    def complete(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        parts: Optional[list[dict]] = None,
+    ):
+        self._validate(bucket, key)
+
+        if parts is None:
+            parts = self.list_parts(bucket, key, upload_id)['parts']
+
+        if not parts:
+            raise InconsistentDataError('No parts were uploaded.')
+
+        try:
+            response = self.client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    'Parts': [
+                        {'PartNumber': p['part_number'], 'ETag': p['etag']}
+                        for p in sorted(parts, key=lambda p: p['part_number'])
+                    ]
+                },
+            )
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'etag': response.get('ETag'),
+            'message': 'Upload completed successfully',
+        }
+
+    def abort(self, bucket: str, key: str, upload_id: str):
+        self._validate(bucket, key)
+
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id
+            )
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'upload_id': upload_id,
+            'message': 'Upload aborted',
+        }
+
+    def upload_stream(
+        self,
+        bucket: str,
+        key: str,
+        chunks: Iterable[bytes],
+        content_type: Optional[str] = None,
+    ):
+        """Store *chunks* as *key* without knowing the size up front: one
+        part of ``MULTIPART_PART_SIZE`` is buffered at a time. Output that
+        fits in a single part is written with a plain ``PUT``."""
+        self._validate(bucket, key)
+
+        part_size = settings.MULTIPART_PART_SIZE
+        extra = {'ContentType': content_type} if content_type else {}
+        buffer = bytearray()
+        chunks = iter(chunks)
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= part_size:
+                break
+        else:
+            try:
+                response = self.client.put_object(
+                    Bucket=bucket, Key=key, Body=bytes(buffer), **extra
+                )
+            except ClientError as e:
+                self._handle_error(e, bucket)
+            return {
+                'bucket': bucket,
+                'key': key,
+                'etag': response.get('ETag'),
+                'size': len(buffer),
+                'parts': 1,
+            }
+
+        try:
+            upload_id = self.client.create_multipart_upload(
+                Bucket=bucket, Key=key, **extra
+            )['UploadId']
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        parts = []
+        size = 0
+
+        def send(body: bytes) -> None:
+            try:
+                response = self.client.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=body,
+                )
+            except ClientError as e:
+                self._handle_error(e, bucket)
+            parts.append(
+                {'PartNumber': len(parts) + 1, 'ETag': response['ETag']}
+            )
+
+        try:
+            while True:
+                while len(buffer) >= part_size:
+                    send(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+                    size += part_size
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                buffer += chunk
+            if buffer:
+                send(bytes(buffer))
+                size += len(buffer)
+            try:
+                response = self.client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts},
+                )
+            except ClientError as e:
+                self._handle_error(e, bucket)
+        except BaseException:
+            # Only the upload calls above are reported against *bucket*;
+            # whatever producing *chunks* raised goes up unchanged.
+            try:
+                self.client.abort_multipart_upload(
+                    Bucket=bucket, Key=key, UploadId=upload_id
+                )
+            except ClientError:
+                pass
+            raise
+
+        return {
+            'bucket': bucket,
+            'key': key,
+            'etag': response.get('ETag'),
+            'size': size,
+            'parts': len(parts),
+        }
@@ -0,0 +1,436 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from mine_backend.config import settings
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.bulk import batches, map_in_context
+
+
+logger = logging.getLogger(__name__)
+
+
+# Largest page the S3 ListObjectsV2 API returns.
+SCAN_PAGE_SIZE = 1000
+
+
+def as_datetime(value: Any) -> Optional[datetime]:
+    """*value* (a ``datetime`` or an ISO 8601 string, as listings and
+    cached rows carry them) as an aware ``datetime``, naive ones taken as
+    UTC; ``None`` for anything else."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def object_row(obj: Any) -> dict:
+    return {
+        'key': obj.key,
+        'size': obj.size,
+        'last_modified': obj.last_modified,
+        'etag': obj.etag,
+        'storage_class': obj.storage_class,
+    }
+
+
+def accepts_argument(method: Any, name: str) -> bool:
+    """Whether a driver method takes keyword *name* (drivers may lag behind
+    the newest port features). Follows ``__wrapped__`` through proxies such
+    as ``InstrumentedClient``."""
+    try:
+        parameters = inspect.signature(inspect.unwrap(method)).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters
+
+
+def iter_objects(
+    s3: Any, bucket: str, prefix: Optional[str] = None, **kwargs: Any
+) -> Iterator[Any]:
+    """Every object under *prefix*, following continuation tokens with the
+    largest page size. Extra keyword arguments go to ``list_objects``."""
+    token = None
+    while True:
+        result = s3.list_objects(
+            bucket=bucket,
+            prefix=prefix,
+            limit=SCAN_PAGE_SIZE,
+            continuation_token=token,
+            **kwargs,
+        )
+        yield from result.objects
+        token = result.next_continuation_token
+        if not result.is_truncated or not token:
+            return
+
+
+def _prefix_name(item: Any) -> str:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return item.get('prefix') or item.get('Prefix') or ''
+    return getattr(item, 'prefix', '') or ''
+
+
+# Sorts after any character a key can hold: listing after ``folder +
+# _PAST_CHAR`` skips every key of the folder.
+_PAST_CHAR = '\U0010ffff'
+
+
+def _resume_after(name: str, delimiter: str) -> str:
+    """``start_after`` that resumes a level after entry *name*: past its
+    whole subtree when it is a folder."""
+    return name + _PAST_CHAR if name.endswith(delimiter) else name
+
+
+def _native_level(
+    s3: Any, bucket: str, prefix: str, delimiter: str, after: Optional[str]
+) -> Iterator[tuple[str, Optional[dict]]]:
+    extra = {}
+    if after and accepts_argument(s3.list_objects, 'start_after'):
+        extra['start_after'] = _resume_after(after, delimiter)
+    token = None
+    while True:
+        result = s3.list_objects(
+            bucket=bucket,
+            prefix=prefix or None,
+            limit=SCAN_PAGE_SIZE,
+            continuation_token=token,
+            delimiter=delimiter,
+            **({} if token else extra),
+        )
+        entries = [(o.key, object_row(o)) for o in result.objects]
+        entries += [
+            (_prefix_name(p), None)
+            for p in getattr(result, 'common_prefixes', None) or []
+        ]
+        for name, row in sorted(entries, key=lambda e: e[0]):
+            if name and (not after or name > after):
+                yield name, row
+        token = result.next_continuation_token
+        if not result.is_truncated or not token:
+            return
+
+
+def _grouped_level(
+    s3: Any, bucket: str, prefix: str, delimiter: str, after: Optional[str]
+) -> Iterator[tuple[str, Optional[dict]]]:
+    # With start_after, a page that ends inside a folder already returned
+    # is not followed: the next listing starts past that folder, so each
+    # folder costs at most one extra call instead of its whole subtree.
+    jump = accepts_argument(s3.list_objects, 'start_after')
+    start_after = _resume_after(after, delimiter) if after and jump else None
+    token = None
+    folder = None
+    while True:
+        extra = {}
+        if start_after and not token:
+            extra['start_after'] = start_after
+        result = s3.list_objects(
+            bucket=bucket,
+            prefix=prefix or None,
+            limit=SCAN_PAGE_SIZE,
+            continuation_token=token,
+            **extra,
+        )
+        for obj in result.objects:
+            if after and obj.key <= after:
+                continue
+            rest = obj.key[len(prefix) :]
+            cut = rest.find(delimiter)
+            if cut < 0:
+                yield obj.key, object_row(obj)
+                continue
+            name = prefix + rest[: cut + len(delimiter)]
+            if name != folder and (not after or name > after):
+                folder = name
+                yield name, None
+
+        token = result.next_continuation_token
+        if not result.is_truncated or not token:
+            return
+        last = result.objects[-1].key if result.objects else ''
+        if jump and folder and last.startswith(folder):
+            token, start_after = None, _resume_after(folder, delimiter)
+
+
+def iter_level(
+    s3: Any,
+    bucket: str,
+    prefix: Optional[str],
+    delimiter: str,
+    after: Optional[str] = None,
+) -> Iterator[tuple[str, Optional[dict]]]:
+    """The entries of one level of *bucket* below *prefix*, in S3 order
+    and strictly after *after*: ``(folder, None)`` for each common prefix
+    and ``(key, row)`` for each direct object.
+
+    Drivers whose ``list_objects`` takes a ``delimiter`` are asked for the
+    level directly. Otherwise the flat listing is grouped here. Listing is
+    lazy either way: stop iterating and no further page is requested.
+    """
+    if not delimiter:
+        raise InconsistentDataError('Delimiter must not be empty.')
+    if accepts_argument(s3.list_objects, 'delimiter'):
+        return _native_level(s3, bucket, prefix or '', delimiter, after)
+    return _grouped_level(s3, bucket, prefix or '', delimiter, after)
+
+
+def scan_directory(
+    s3: Any,
+    bucket: str,
+    prefix: Optional[str],
+    delimiter: str,
+    limit: Optional[int] = None,
+    continuation_token: Optional[str] = None,
+) -> dict:
+    """One page of the level below *prefix*: its direct objects and the
+    ``common_prefixes`` ("folders") that group everything deeper,
+    interleaved by name as ``ListObjectsV2`` does with a delimiter.
+
+    Listing stops as soon as the page is full; ``limit=None`` reads the
+    whole level. The continuation token is the last name returned, so it
+    stays meaningful however the level is listed.
+    """
+    if limit is not None and (limit <= 0 or limit > SCAN_PAGE_SIZE):
+        limit = 100
+
+    entries = iter_level(s3, bucket, prefix, delimiter, continuation_token)
+    if limit is not None:
+        entries = islice(entries, limit + 1)
+    entries = list(entries)
+    truncated = limit is not None and len(entries) > limit
+    entries = entries[:limit]
+
+    objects = [row for _, row in entries if row is not None]
+    return {
+        'bucket': bucket,
+        'prefix': prefix or None,
+        'delimiter': delimiter,
+        'count': len(objects),
+        'objects': objects,
+        'common_prefixes': [name for name, row in entries if row is None],
+        'is_truncated': truncated,
+        'next_continuation_token': entries[-1][0] if truncated else None,
+    }
+
+
+# ── Versions ─────────────────────────────────────────────────────────────────
+
+
+def version_row(version: Any, key: str) -> dict:
+    return {
+        'key': getattr(version, 'key', None) or key,
+        'version_id': version.version_id,
+        'is_latest': version.is_latest,
+        'last_modified': version.last_modified,
+        'size': version.size,
+        'is_delete_marker': bool(getattr(version, 'is_delete_marker', False)),
+        'storage_class': getattr(version, 'storage_class', None),
+    }
+
+
+def _just_before(key: str) -> str:
+    """A ``start_after`` that keeps *key* itself in the listing: *key*
+    with its last character lowered, then padded with :data:`_PAST_CHAR`."""
+    last = ord(key[-1]) - 1
+    if last < 0:
+        return key[:-1]
+    if 0xD800 <= last <= 0xDFFF:
+        # Surrogates cannot be encoded in a request.
+        last = 0xD7FF
+    return key[:-1] + chr(last) + _PAST_CHAR
+
+
+def iter_versions(
+    s3: Any,
+    bucket: str,
+    prefix: Optional[str] = None,
+    start_key: Optional[str] = None,
+    concurrency: int = 1,
+    include_start: bool = True,
+) -> Iterator[dict]:
+    """Every version of every object under *prefix*, by key, from
+    *start_key* (included unless *include_start* is false).
+
+    The port lists versions one key at a time, so keys come from the flat
+    listing and their histories are fetched *concurrently* a few batches
+    at a time; rows are yielded as soon as a batch is done, in key order.
+    Only keys that currently exist are seen: a key whose latest version is
+    a delete marker does not show up in the listing.
+
+    Drivers whose ``list_objects`` takes ``start_after`` resume the
+    listing at *start_key*; others list from the start of *prefix* and
+    skip the keys before it.
+    """
+
+    def fetch(key: str) -> list[dict]:
+        return [
+            version_row(v, key)
+            for v in s3.list_object_versions(bucket=bucket, key=key)
+        ]
+
+    extra = {}
+    if start_key and accepts_argument(s3.list_objects, 'start_after'):
+        extra['start_after'] = (
+            _just_before(start_key) if include_start else start_key
+        )
+    keys = (
+        obj.key
+        for obj in iter_objects(s3, bucket, prefix or None, **extra)
+        if not start_key
+        or obj.key > start_key
+        or (include_start and obj.key == start_key)
+    )
+    batch_size = max(1, concurrency) * 4
+    with ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix='versions'
+    ) as executor:
+        for batch in batches(keys, batch_size):
+            for rows in map_in_context(executor, fetch, batch):
+                yield from rows
+
+
+def page_versions(
+    rows: Iterable[dict],
+    limit: int = 100,
+    key_marker: Optional[str] = None,
+    version_id_marker: Optional[str] = None,
+) -> dict:
+    """One page of *rows* (in key order) after the markers, with S3
+    ``ListObjectVersions`` semantics: without *version_id_marker* the
+    listing resumes after every version of *key_marker*; with it, after
+    that version. Only ``limit + 1`` rows past the markers are consumed.
+    """
+    if limit <= 0 or limit > SCAN_PAGE_SIZE:
+        limit = 100
+
+    def after_markers(rows: Iterable[dict]) -> Iterator[dict]:
+        passed = not key_marker
+        for row in rows:
+            if not passed:
+                if row['key'] < key_marker:
+                    continue
+                if row['key'] == key_marker:
+                    if row['version_id'] == version_id_marker:
+                        passed = True
+                    continue
+                passed = True
+            yield row
+
+    versions = list(islice(after_markers(rows), limit + 1))
+    truncated = len(versions) > limit
+    versions = versions[:limit]
+    last = versions[-1] if truncated else None
+    return {
+        'versions': versions,
+        'is_truncated': truncated,
+        'next_key_marker': last['key'] if last else None,
+        'next_version_id_marker': last['version_id'] if last else None,
+    }
+
+
+# ── Page chains and prefetch ─────────────────────────────────────────────────
+
+
+class ListingChain:
+    """Page tokens already seen for one (bucket, prefix, limit) listing.
+
+    S3 continuation tokens are opaque and not guaranteed to repeat, so a
+    cached page is only found again if we remember which token led to it.
+    Each link is its own cache entry under ``objects:{bucket}:`` — written
+    without read-modify-write, and dropped by the same invalidation as the
+    pages themselves:
+
+    * ``...:page:{n}``    → token of page *n* (page 1 has no token);
+    * ``...:token:{sha}`` → page number of a token.
+    """
+
+    def __init__(
+        self, cache: Any, bucket: str, prefix: Optional[str], limit: int
+    ) -> None:
+        self.cache = cache
+        self.base = f'objects:{bucket}:{prefix or ""}:{limit}'
+
+    def page_key(self, token: Optional[str]) -> str:
+        """Cache key of the page listed from *token*."""
+        return f'{self.base}:{token or ""}'
+
+    def _token_key(self, token: str) -> str:
+        digest = hashlib.sha1(token.encode()).hexdigest()
+        return f'{self.base}:token:{digest}'
+
+    async def token_for(self, page: int) -> Optional[str]:
+        """Token of *page*; raises when the chain does not reach it yet."""
+        if page == 1:
+            return None
+        link = await self.cache.get(f'{self.base}:page:{page}')
+        if link is None:
+            raise InconsistentDataError(
+                f'Page {page} is not known yet. '
+                'Page forward from an earlier page first.'
+            )
+        return link
+
+    async def page_of(self, token: Optional[str]) -> Optional[int]:
+        if not token:
+            return 1
+        return await self.cache.get(self._token_key(token))
+
+    async def link(self, page: int, token: str) -> None:
+        # Links outlive the pages: a known token still saves paging
+        # forward from page 1 after the page itself has expired.
+        ttl = settings.LISTING_CHAIN_TTL
+        await self.cache.set(f'{self.base}:page:{page}', token, ttl=ttl)
+        await self.cache.set(self._token_key(token), page, ttl=ttl)
+
+
+class ListingPrefetcher:
+    """Loads the next page of a listing in the background.
+
+    At most ``concurrency`` prefetches run at once and a page already being
+    fetched is not fetched again; anything beyond that is skipped rather
+    than queued, since a prefetch is only a guess.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self._in_flight: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def schedule(
+        self, cache: Any, key: str, fn: Callable, *args: Any
+    ) -> bool:
+        if key in self._in_flight or len(self._in_flight) >= self.concurrency:
+            return False
+        self._in_flight.add(key)
+
+        async def run() -> None:
+            try:
+                # get_or_set only calls fn on a miss; the driver is blocking,
+                # so it runs on a thread.
+                await cache.get_or_set(key, asyncio.to_thread, fn, *args)
+            except Exception:
+                logger.debug('Listing prefetch failed', exc_info=True)
+            finally:
+                self._in_flight.discard(key)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+
+@lru_cache
+def get_listing_prefetcher() -> ListingPrefetcher:
+    return ListingPrefetcher(settings.LISTING_PREFETCH_CONCURRENCY)
@@ -1,14 +1,53 @@
 from botocore.exceptions import ClientError
-from typing import Optional
+from typing import Any, AsyncIterator, Iterator, Optional
 
 import httpx
 from mine_spec.ports.object_storage import ObjectStoragePort
 
+from mine_backend.config import settings
 from mine_backend.exceptions.application import (
     InconsistentDataError,
     NotFoundError,
     UnexpectedError,
     PermissionDeniedError,
+    ServiceUnavailableError,
+)
+from mine_backend.services.archive import (
+    ARCHIVE_FORMATS,
+    CHUNK_SIZE,
+    archive_name,
+    stream_archive,
+)
+from mine_backend.services.bucket_sync import (
+    diff_listings,
+    sorted_rows,
+    sync_buckets,
+)
+from mine_backend.services.bulk import run_bulk
+from mine_backend.services.dedup import (
+    find_duplicates,
+    iter_entries,
+    sorted_entries,
+)
+from mine_backend.services.inventory import (
+    INVENTORY_FORMATS,
+    encode_inventory,
+    parquet_available,
+    row_filter,
+)
+from mine_backend.services.presign import PRESIGN_METHODS, presign_urls
+from mine_backend.services.object_listing import (
+    iter_objects,
+    iter_versions,
+    object_row,
+    page_versions,
+    scan_directory,
+    version_row,
+)
+from mine_backend.services.version_purge import (
+    list_version_rows,
+    purge_versions,
+    select_purgeable,
 )
 
 import re
@@ -18,8 +57,19 @@ BUCKET_REGEX = re.compile(r'^[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]$')
 
 
 class ObjectService:
-    def __init__(self, s3_client: ObjectStoragePort):
+    def __init__(
+        self,
+        s3_client: ObjectStoragePort,
+        signing_scope: Optional[str] = None,
+        boto_client: Any = None,
+    ):
         self.s3 = s3_client
+        # Identity of the credentials behind s3_client; set when signed
+        # URLs may be reused across requests (see presign_urls).
+        self.signing_scope = signing_scope
+        # boto3 client for the S3 calls the driver does not expose (see
+        # get_multipart_client); only purge_object_versions needs it.
+        self.boto_client = boto_client
 
     def _handle_error(self, e: ClientError, bucket: str):
         error_code = e.response['Error']['Code']
@@ -41,8 +91,14 @@ class ObjectService:
         prefix: Optional[str] = None,
         limit: int = 100,
         continuation_token: Optional[str] = None,
+        delimiter: Optional[str] = None,
     ):
 
+        if delimiter:
+            return self.list_directory(
+                bucket, prefix, delimiter, limit, continuation_token
+            )
+
         if not BUCKET_REGEX.match(bucket):
             raise InconsistentDataError(
                 'Invalid bucket name. Must follow S3 naming rules.'
@@ -62,20 +118,35 @@ class ObjectService:
             'bucket': bucket,
             'prefix': prefix,
             'count': len(result.objects),
-            'objects': [
-                {
-                    'key': obj.key,
-                    'size': obj.size,
-                    'last_modified': obj.last_modified,
-                    'etag': obj.etag,
-                    'storage_class': obj.storage_class,
-                }
-                for obj in result.objects
-            ],
+            'objects': [object_row(obj) for obj in result.objects],
             'is_truncated': result.is_truncated,
             'next_continuation_token': result.next_continuation_token,
         }
 
+    def list_directory(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        delimiter: str = '/',
+        limit: Optional[int] = 100,
+        continuation_token: Optional[str] = None,
+    ):
+        """One page of the level below *prefix*: ``common_prefixes`` and
+        the objects directly under it. Only that page is listed;
+        ``limit=None`` returns the whole level."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        try:
+            return scan_directory(
+                self.s3, bucket, prefix, delimiter, limit, continuation_token
+            )
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
     def delete_object(self, bucket: str, key: str):
 
         if not BUCKET_REGEX.match(bucket):
@@ -166,6 +237,90 @@ class ObjectService:
         except Exception as e:
             raise UnexpectedError(f'Could not upload object: {str(e)}')
 
+    def plan_archive(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        archive_format: str = 'zip',
+    ) -> list[dict]:
+        """The objects under *prefix* to put in an archive, checked against
+        ``ARCHIVE_MAX_BYTES`` before anything is downloaded."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        if archive_format not in ARCHIVE_FORMATS:
+            raise InconsistentDataError(
+                f'Format must be one of: {", ".join(ARCHIVE_FORMATS)}.'
+            )
+
+        entries = []
+        total = 0
+        try:
+            for obj in iter_objects(self.s3, bucket, prefix or None):
+                name = archive_name(obj.key, prefix)
+                if name is None:
+                    continue
+                total += obj.size or 0
+                if total > settings.ARCHIVE_MAX_BYTES:
+                    raise InconsistentDataError(
+                        'Prefix is too large to download as an archive '
+                        f'(limit: {settings.ARCHIVE_MAX_BYTES} bytes).'
+                    )
+                entries.append(
+                    {
+                        'key': obj.key,
+                        'name': name,
+                        'size': obj.size or 0,
+                        'last_modified': obj.last_modified,
+                    }
+                )
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        if not entries:
+            raise NotFoundError('No objects found under this prefix.')
+
+        return entries
+
+    async def stream_archive(
+        self,
+        bucket: str,
+        entries: list[dict],
+        archive_format: str = 'zip',
+    ) -> AsyncIterator[bytes]:
+        """Archive of *entries* (from :meth:`plan_archive`), with objects
+        read through presigned URLs like :meth:`upload_object_proxy`."""
+
+        async with httpx.AsyncClient(timeout=300) as client:
+
+            async def open_object(key: str) -> AsyncIterator[bytes]:
+                url = self.s3.generate_download_url(
+                    bucket=bucket,
+                    key=key,
+                    expires_in=300,
+                    response_content_type=None,
+                    response_content_disposition=None,
+                )
+                async with client.stream('GET', url) as resp:
+                    if resp.status_code != 200:
+                        raise UnexpectedError(
+                            f"Download of '{key}' failed: "
+                            f'HTTP {resp.status_code}'
+                        )
+                    async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                        yield chunk
+
+            async for data in stream_archive(
+                entries,
+                open_object,
+                archive_format,
+                settings.ARCHIVE_CONCURRENCY,
+            ):
+                yield data
+
     def generate_upload_url(
         self,
         bucket: str,
@@ -200,6 +355,58 @@ class ObjectService:
         except Exception as e:
             raise UnexpectedError(f'Could not generate upload URL: {str(e)}')
 
+    def presign_urls(
+        self,
+        bucket: str,
+        keys: list[str],
+        method: str = 'download',
+        expires_in: int = 3600,
+        content_type: Optional[str] = None,
+    ):
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        if method not in PRESIGN_METHODS:
+            raise InconsistentDataError(
+                f'Method must be one of: {", ".join(PRESIGN_METHODS)}.'
+            )
+
+        if not keys:
+            raise InconsistentDataError('At least one key is required.')
+
+        if len(keys) > settings.PRESIGN_MAX_KEYS:
+            raise InconsistentDataError(
+                f'At most {settings.PRESIGN_MAX_KEYS} keys are allowed '
+                'per request.'
+            )
+
+        if expires_in <= 0 or expires_in > 86400:
+            expires_in = 3600
+
+        try:
+            urls = presign_urls(
+                self.s3,
+                bucket,
+                keys,
+                method,
+                expires_in,
+                content_type,
+                scope=self.signing_scope,
+            )
+        except Exception as e:
+            raise UnexpectedError(f'Could not generate URLs: {str(e)}')
+
+        return {
+            'bucket': bucket,
+            'method': method,
+            'expires_in': expires_in,
+            'count': len(urls),
+            'urls': urls,
+        }
+
     def generate_download_url(
         self,
         bucket: str,
@@ -236,40 +443,306 @@ class ObjectService:
         except Exception as e:
             raise UnexpectedError(f'Could not generate download URL: {str(e)}')
 
+    def version_history(self, bucket: str, key: str) -> list[dict]:
+        """Every version of *key*. The port returns a key's history in
+        one call, so callers paging it should keep this list rather than
+        fetch it again per page."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        try:
+            return [
+                version_row(v, key)
+                for v in self.s3.list_object_versions(bucket=bucket, key=key)
+            ]
+        except Exception as e:
+            raise UnexpectedError(f'Could not list versions: {str(e)}')
+
     def list_object_versions(
         self,
         bucket: str,
-        key: str,
+        key: Optional[str] = None,
+        limit: int = 100,
+        key_marker: Optional[str] = None,
+        version_id_marker: Optional[str] = None,
+        prefix: Optional[str] = None,
+        history: Optional[list[dict]] = None,
     ):
+        """One page of the versions of *key*, or of every object under
+        *prefix*. Pass back ``next_key_marker`` and
+        ``next_version_id_marker`` to get the next page; pass *history*
+        (from :meth:`version_history`) to page a key without listing it
+        again."""
 
         if not BUCKET_REGEX.match(bucket):
             raise InconsistentDataError(
                 'Invalid bucket name. Must follow S3 naming rules.'
             )
 
+        if (key is None) == (prefix is None):
+            raise InconsistentDataError('Pass either key or prefix.')
+
+        if key is not None:
+            rows = history
+            if rows is None:
+                rows = self.version_history(bucket, key)
+            return {
+                'bucket': bucket,
+                'key': key,
+                'prefix': None,
+                **page_versions(rows, limit, key_marker, version_id_marker),
+            }
+
         try:
-            versions = self.s3.list_object_versions(
-                bucket=bucket,
-                key=key,
+            # Resuming after key_marker alone skips the whole key, so the
+            # listing starts past it; with a version marker it starts at it.
+            rows = iter_versions(
+                self.s3,
+                bucket,
+                prefix,
+                start_key=key_marker,
+                concurrency=settings.OBJECT_BULK_CONCURRENCY,
+                include_start=version_id_marker is not None,
             )
 
             return {
                 'bucket': bucket,
-                'key': key,
-                'versions': [
-                    {
-                        'version_id': v.version_id,
-                        'is_latest': v.is_latest,
-                        'last_modified': v.last_modified,
-                        'size': v.size,
-                    }
-                    for v in versions
-                ],
+                'key': None,
+                'prefix': prefix,
+                **page_versions(rows, limit, key_marker, version_id_marker),
             }
 
         except Exception as e:
             raise UnexpectedError(f'Could not list versions: {str(e)}')
 
+    def stream_inventory(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        inventory_format: str = 'csv',
+        filters: Optional[dict] = None,
+    ) -> Iterator[bytes]:
+        """Every object under *prefix* matching *filters* (see
+        :func:`row_filter`), encoded as it is listed."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        if inventory_format not in INVENTORY_FORMATS:
+            raise InconsistentDataError(
+                f'Format must be one of: {", ".join(INVENTORY_FORMATS)}.'
+            )
+
+        if inventory_format == 'parquet' and not parquet_available():
+            raise ServiceUnavailableError(
+                'Parquet export requires pyarrow to be installed'
+            )
+
+        matches = row_filter(**(filters or {}))
+        objects = iter_objects(self.s3, bucket, prefix or None)
+        try:
+            # The first page is listed now, as in plan_archive: a missing or
+            # forbidden bucket fails before any output is produced.
+            first = next(objects, None)
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+        def listed() -> Iterator[Any]:
+            if first is None:
+                return
+            yield first
+            try:
+                yield from objects
+            except ClientError as e:
+                # Reported against the listed bucket, not wherever the
+                # output is being written.
+                self._handle_error(e, bucket)
+
+        rows = (row for row in map(object_row, listed()) if matches(row))
+        return encode_inventory(rows, inventory_format)
+
+    def _diff_buckets(
+        self, source_bucket: str, dest_bucket: str, prefix: Optional[str]
+    ) -> Iterator[dict]:
+        for bucket in (source_bucket, dest_bucket):
+            if not BUCKET_REGEX.match(bucket):
+                raise InconsistentDataError(
+                    'Invalid bucket name. Must follow S3 naming rules.'
+                )
+
+        if source_bucket == dest_bucket:
+            raise InconsistentDataError(
+                'Source and destination buckets must differ.'
+            )
+
+        return diff_listings(
+            self._sorted_rows(source_bucket, prefix),
+            self._sorted_rows(dest_bucket, prefix),
+        )
+
+    def _sorted_rows(self, bucket: str, prefix: Optional[str]) -> Iterator[dict]:
+        # Each side of a diff reports its listing errors against its own
+        # bucket.
+        try:
+            yield from sorted_rows(self.s3, bucket, prefix or None)
+        except ClientError as e:
+            self._handle_error(e, bucket)
+
+    def diff_buckets(
+        self,
+        source_bucket: str,
+        dest_bucket: str,
+        prefix: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Keys under *prefix* that differ between the buckets, as both
+        listings go (see :func:`diff_listings`)."""
+
+        differences = self._diff_buckets(source_bucket, dest_bucket, prefix)
+        return (d for d in differences if d['status'] != 'unchanged')
+
+    def sync_buckets(
+        self,
+        source_bucket: str,
+        dest_bucket: str,
+        prefix: Optional[str] = None,
+        delete: bool = False,
+        dry_run: bool = True,
+    ):
+        """Copy what is new or changed under *prefix* from *source_bucket*
+        to *dest_bucket* and, with *delete*, remove what the source no
+        longer has. With *dry_run* only the differences are counted."""
+
+        differences = self._diff_buckets(source_bucket, dest_bucket, prefix)
+        report = sync_buckets(
+            self.s3,
+            source_bucket,
+            dest_bucket,
+            differences,
+            concurrency=settings.OBJECT_BULK_CONCURRENCY,
+            delete=delete,
+            dry_run=dry_run,
+            # One past the change log: enough for prefix usage to
+            # know it must rescan (see record_object_changes).
+            changed_limit=settings.PREFIX_USAGE_CHANGE_LOG + 1,
+        )
+
+        return {
+            'source_bucket': source_bucket,
+            'dest_bucket': dest_bucket,
+            'prefix': prefix,
+            **report,
+        }
+
+    def find_duplicates(
+        self,
+        buckets: list[str],
+        prefix: Optional[str] = None,
+        min_size: int = 1,
+        top: int = 20,
+    ):
+        """Objects with the same ETag and size across *buckets*, grouped,
+        with the bytes that removing the extra copies would reclaim."""
+
+        buckets = list(dict.fromkeys(buckets))
+        if not buckets:
+            raise InconsistentDataError('At least one bucket is required.')
+
+        if len(buckets) > settings.DEDUP_MAX_BUCKETS:
+            raise InconsistentDataError(
+                f'At most {settings.DEDUP_MAX_BUCKETS} buckets are allowed.'
+            )
+
+        for bucket in buckets:
+            if not BUCKET_REGEX.match(bucket):
+                raise InconsistentDataError(
+                    'Invalid bucket name. Must follow S3 naming rules.'
+                )
+
+        if top < 1 or top > 100:
+            raise InconsistentDataError('Top must be between 1 and 100.')
+
+        def entries():
+            for bucket in buckets:
+                try:
+                    yield from iter_entries(
+                        self.s3, [bucket], prefix or None, max(1, min_size)
+                    )
+                except ClientError as e:
+                    self._handle_error(e, bucket)
+
+        report = find_duplicates(
+            sorted_entries(entries(), settings.DEDUP_MEMORY_ENTRIES), top
+        )
+        return {'buckets': buckets, 'prefix': prefix, **report}
+
+    def stream_object_versions(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        key_marker: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Every version under *prefix*, as the listing goes."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        return iter_versions(
+            self.s3,
+            bucket,
+            prefix,
+            start_key=key_marker,
+            concurrency=settings.OBJECT_BULK_CONCURRENCY,
+        )
+
+    def purge_object_versions(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        keep: int = 0,
+        older_than_days: Optional[int] = None,
+        dry_run: bool = True,
+    ):
+        """Delete noncurrent versions under *prefix*, keeping the *keep*
+        newest of each key and anything noncurrent for less than
+        *older_than_days*. With *dry_run* only the plan is computed."""
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        if keep < 0:
+            raise InconsistentDataError('Keep must be 0 or greater.')
+
+        if older_than_days is not None and older_than_days < 0:
+            raise InconsistentDataError(
+                'older_than_days must be 0 or greater.'
+            )
+
+        candidates = select_purgeable(
+            list_version_rows(self.boto_client, bucket, prefix),
+            keep=keep,
+            older_than_days=older_than_days,
+        )
+
+        try:
+            report = purge_versions(
+                self.boto_client, bucket, candidates, dry_run=dry_run
+            )
+        except ClientError as e:
+            self._handle_error(e, bucket)
+        except Exception as e:
+            raise UnexpectedError(f'Could not purge versions: {str(e)}')
+
+        return {'bucket': bucket, 'prefix': prefix, **report}
+
     def delete_object_version(
         self,
         bucket: str,
@@ -360,6 +833,56 @@ class ObjectService:
         except Exception as e:
             raise UnexpectedError(f'Could not get object metadata: {str(e)}')
 
+    def bulk_head_objects(
+        self,
+        bucket: str,
+        keys: list[str],
+        metadata: bool = True,
+        tags: bool = False,
+    ):
+        """Metadata and/or tags of many objects, fetched concurrently.
+
+        Each key gets its own result or error, so a missing object does not
+        fail the batch. Repeated keys are fetched once.
+        """
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        if not metadata and not tags:
+            raise InconsistentDataError(
+                'Request at least one of metadata or tags.'
+            )
+
+        def head(key: str) -> dict:
+            info = {}
+            try:
+                if metadata:
+                    meta = self.s3.get_object_metadata(bucket=bucket, key=key)
+                    info.update(
+                        size=meta.size,
+                        etag=meta.etag,
+                        last_modified=meta.last_modified,
+                        content_type=meta.content_type,
+                        metadata=meta.metadata,
+                    )
+                if tags:
+                    info['tags'] = self.s3.get_object_tags(
+                        bucket=bucket, key=key
+                    )
+            except ClientError as e:
+                self._handle_error(e, bucket)
+            return info
+
+        return run_bulk(
+            head,
+            dict.fromkeys(keys),
+            concurrency=settings.OBJECT_BULK_CONCURRENCY,
+            max_items=settings.OBJECT_BULK_MAX_ITEMS,
+        )
+
     def update_object_metadata(
         self,
         bucket: str,
@@ -0,0 +1,210 @@
+import json
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+from mine_spec.ports.admin import UserAdminPort
+from mine_spec.ports.object_storage import ObjectStoragePort
+
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+    PermissionDeniedError,
+    UnexpectedError,
+)
+from mine_backend.services.group_service import GroupService
+from mine_backend.services.policy_evaluator import PolicyEvaluator
+from mine_backend.services.policy_service import PolicyService
+from mine_backend.services.user_service import UserService
+
+import re
+
+
+BUCKET_REGEX = re.compile(r'^[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]$')
+
+MAX_CHECKS = 10000
+
+
+def _first(data: Any) -> Any:
+    if isinstance(data, list):
+        return data[0] if data else None
+    return data
+
+
+class PermissionService:
+    """Answer "can user U do action A on bucket B / key K" in-process.
+
+    The documents are collected once through the existing services — user
+    and group policies via ``PolicyService`` / ``GroupService`` and bucket
+    policies via the storage port — and compiled by ``PolicyEvaluator``.
+
+    Only a policy that does not exist is treated as absent. Any other
+    failure to load one fails the evaluation: a ``Deny`` that could not be
+    read must not turn into an ``allow``.
+    """
+
+    def __init__(
+        self,
+        s3_client: ObjectStoragePort,
+        storage_admin: UserAdminPort,
+    ):
+        self.s3 = s3_client
+        self.storage_admin = storage_admin
+        self.policies = PolicyService(storage_admin)
+        self.groups = GroupService(storage_admin)
+        self.users = UserService(storage_admin)
+
+    # ── Document collection ───────────────────────────────────────────────────
+
+    def _policy_document(self, name: str) -> Optional[dict]:
+        try:
+            item = _first(self.policies.get_policy(name))
+        except NotFoundError:
+            return None
+        info = getattr(item, 'policy_info', None)
+        document = getattr(info, 'policy', None)
+        if isinstance(document, str):
+            try:
+                document = json.loads(document)
+            except ValueError:
+                raise UnexpectedError(f"Policy '{name}' is not valid JSON.")
+        return document if isinstance(document, dict) else None
+
+    def _group_policy_names(self, group: str) -> list[str]:
+        item = _first(self.groups.get_attach_policy(group))
+        result = getattr(item, 'result', None)
+        names: list[str] = []
+        for mapping in getattr(result, 'group_mappings', None) or []:
+            if getattr(mapping, 'group', None) == group:
+                names.extend(getattr(mapping, 'policies', None) or [])
+        return names
+
+    def _bucket_policy(self, bucket: str) -> Optional[dict]:
+        try:
+            policy = self.s3.get_bucket_policy(bucket)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchBucketPolicy':
+                return None
+            if error_code == 'NoSuchBucket':
+                raise NotFoundError(f"Bucket '{bucket}' not found.")
+            if error_code in ['AccessDenied', 'AllAccessDisabled']:
+                raise PermissionDeniedError(
+                    f"Access denied reading the policy of bucket '{bucket}'."
+                )
+            raise UnexpectedError(f'S3 error: {error_code}')
+        if not policy:
+            return None
+        if isinstance(policy, str):
+            try:
+                policy = json.loads(policy)
+            except ValueError:
+                raise UnexpectedError(
+                    f"Policy of bucket '{bucket}' is not valid JSON."
+                )
+        return policy if isinstance(policy, dict) else None
+
+    def collect_documents(self, username: str, buckets: list[str]) -> dict:
+        """Gather every document relevant to *username* as plain JSON.
+
+        The result is cache friendly: it contains only dicts, lists and
+        strings, and is the only part of an evaluation that talks to the
+        storage backend.
+        """
+        user = _first(self.users.get_user(username))
+        if user is None:
+            raise NotFoundError(f"User '{username}' not found.")
+
+        status = str(getattr(user, 'status', 'enabled') or 'enabled')
+
+        sources: list[tuple[str, str]] = []
+        for name in str(getattr(user, 'policy_name', '') or '').split(','):
+            if name.strip():
+                sources.append((f'user:{username}', name.strip()))
+
+        for membership in getattr(user, 'member_of', None) or []:
+            group = getattr(membership, 'name', None)
+            if not group:
+                continue
+            names = getattr(membership, 'policies', None)
+            if names is None:
+                names = self._group_policy_names(group)
+            for name in names:
+                sources.append((f'group:{group}', name))
+
+        identity: list[dict] = []
+        loaded: dict[str, Optional[dict]] = {}
+        for origin, name in sources:
+            if name not in loaded:
+                loaded[name] = self._policy_document(name)
+            if loaded[name] is not None:
+                identity.append(
+                    {
+                        'source': f'{origin}/policy:{name}',
+                        'document': loaded[name],
+                    }
+                )
+
+        return {
+            'username': username,
+            'enabled': status.lower() != 'disabled',
+            'identity': identity,
+            'buckets': {
+                bucket: self._bucket_policy(bucket) for bucket in buckets
+            },
+        }
+
+    # ── Evaluation ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def build_evaluator(documents: dict) -> PolicyEvaluator:
+        return PolicyEvaluator(
+            identity_policies=[
+                (item['source'], item['document'])
+                for item in documents.get('identity', [])
+            ],
+            resource_policies=documents.get('buckets') or {},
+            principal=documents.get('username'),
+            enabled=documents.get('enabled', True),
+        )
+
+    @staticmethod
+    def validate_checks(checks: list[dict]) -> list[str]:
+        if not checks:
+            raise InconsistentDataError('At least one check is required.')
+
+        if len(checks) > MAX_CHECKS:
+            raise InconsistentDataError(
+                f'At most {MAX_CHECKS} checks are allowed per request.'
+            )
+
+        buckets: list[str] = []
+        for check in checks:
+            if not isinstance(check, dict):
+                raise InconsistentDataError('Each check must be an object.')
+            action = check.get('action')
+            if not isinstance(action, str) or not action:
+                raise InconsistentDataError(
+                    "Each check needs an 'action', e.g. 's3:GetObject'."
+                )
+            bucket = check.get('bucket', '')
+            if not isinstance(bucket, str):
+                bucket = ''
+            if not BUCKET_REGEX.match(bucket):
+                raise InconsistentDataError(
+                    f"Invalid bucket name '{bucket}'. Must follow S3 naming rules."
+                )
+            if bucket not in buckets:
+                buckets.append(bucket)
+
+        return buckets
+
+    def evaluate(self, documents: dict, checks: list[dict]) -> dict:
+        evaluator = self.build_evaluator(documents)
+        decisions = evaluator.evaluate_many(
+            (check['action'], check['bucket'], check.get('key'))
+            for check in checks
+        )
+        return {
+            'username': documents.get('username'),
+            'results': [d.as_dict() for d in decisions],
+        }
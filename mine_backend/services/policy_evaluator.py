@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+
+_S3_ARN_PREFIX = 'arn:aws:s3:::'
+# The account segment of an IAM ARN; bucket policies name users as
+# ``arn:aws:iam::<account>:user/<name>`` and any account is accepted.
+_IAM_ACCOUNT = re.compile(r'^arn:aws:iam::[^:]*:')
+_IAM_ANY_ACCOUNT = 'arn:aws:iam::*:'
+
+
+# ── Matchers ──────────────────────────────────────────────────────────────────
+
+
+class _Matcher:
+    """A single IAM pattern (``s3:Get*``, ``arn:aws:s3:::bucket/*``…)
+    compiled into the cheapest possible test.
+
+    Literal patterns become an equality check, trailing-``*`` patterns a
+    ``startswith`` and everything else a pre-compiled regex.
+    """
+
+    __slots__ = ('pattern', 'literal_prefix', '_test')
+
+    def __init__(self, pattern: str, ignore_case: bool) -> None:
+        if ignore_case:
+            pattern = pattern.lower()
+
+        self.pattern = pattern
+        self.literal_prefix = re.split(r'[*?]', pattern, maxsplit=1)[0]
+
+        if pattern == '*':
+            self._test = _always
+        elif '*' not in pattern and '?' not in pattern:
+            self._test = pattern.__eq__
+        elif (
+            pattern.endswith('*')
+            and '*' not in pattern[:-1]
+            and '?' not in pattern
+        ):
+            self._test = _startswith(pattern[:-1])
+        else:
+            regex = ''.join(
+                '.*' if ch == '*' else '.' if ch == '?' else re.escape(ch)
+                for ch in pattern
+            )
+            self._test = re.compile(f'^{regex}$', re.DOTALL).match
+
+    def matches(self, value: str) -> bool:
+        return bool(self._test(value))
+
+
+def _always(_: str) -> bool:
+    return True
+
+
+def _startswith(prefix: str):
+    def test(value: str) -> bool:
+        return value.startswith(prefix)
+
+    return test
+
+
+def _as_list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+def _any_match(matchers: tuple[_Matcher, ...], value: str) -> bool:
+    for matcher in matchers:
+        if matcher.matches(value):
+            return True
+    return False
+
+
+# ── Compiled statements ───────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class CompiledStatement:
+    source: str
+    index: int
+    sid: Optional[str]
+    effect: str
+    actions: tuple[_Matcher, ...]
+    not_actions: tuple[_Matcher, ...]
+    resources: tuple[_Matcher, ...]
+    not_resources: tuple[_Matcher, ...]
+    principals: Optional[tuple[_Matcher, ...]]
+    not_principals: Optional[tuple[_Matcher, ...]]
+    conditional: bool
+
+    def matches_action(self, action: str) -> bool:
+        if self.not_actions:
+            return not _any_match(self.not_actions, action)
+        return _any_match(self.actions, action)
+
+    def matches_resource(self, resource: str) -> bool:
+        if self.not_resources:
+            return not _any_match(self.not_resources, resource)
+        return _any_match(self.resources, resource)
+
+    def matches_principal(self, principal_ids: tuple[str, ...]) -> bool:
+        if self.principals is None and self.not_principals is None:
+            # Identity-based policy: the principal is implicit.
+            return True
+        if self.not_principals is not None:
+            return not any(
+                _any_match(self.not_principals, p) for p in principal_ids
+            )
+        return any(_any_match(self.principals, p) for p in principal_ids)
+
+    def describe(self) -> dict:
+        return {
+            'source': self.source,
+            'statement': self.index,
+            'sid': self.sid,
+            'effect': self.effect,
+        }
+
+
+def _compile_principal(value: Any) -> tuple[_Matcher, ...]:
+    if isinstance(value, dict):
+        patterns: list[str] = []
+        for v in value.values():
+            patterns.extend(_as_list(v))
+    else:
+        patterns = _as_list(value)
+    return tuple(
+        _Matcher(_IAM_ACCOUNT.sub(_IAM_ANY_ACCOUNT, p), ignore_case=False)
+        for p in patterns
+    )
+
+
+def _compile_statements(source: str, document: Any) -> list[CompiledStatement]:
+    if isinstance(document, str):
+        try:
+            document = json.loads(document)
+        except ValueError:
+            return []
+
+    if not isinstance(document, dict):
+        return []
+
+    statements = document.get('Statement')
+    if isinstance(statements, dict):
+        statements = [statements]
+    if not isinstance(statements, list):
+        return []
+
+    compiled: list[CompiledStatement] = []
+
+    for i, stmt in enumerate(statements):
+        if not isinstance(stmt, dict):
+            continue
+
+        effect = stmt.get('Effect')
+        if effect not in ('Allow', 'Deny'):
+            continue
+
+        compiled.append(
+            CompiledStatement(
+                source=source,
+                index=i,
+                sid=stmt.get('Sid') if isinstance(stmt.get('Sid'), str) else None,
+                effect=effect,
+                actions=tuple(
+                    _Matcher(a, ignore_case=True)
+                    for a in _as_list(stmt.get('Action'))
+                ),
+                not_actions=tuple(
+                    _Matcher(a, ignore_case=True)
+                    for a in _as_list(stmt.get('NotAction'))
+                ),
+                resources=tuple(
+                    _Matcher(r, ignore_case=False)
+                    for r in _as_list(stmt.get('Resource'))
+                ),
+                not_resources=tuple(
+                    _Matcher(r, ignore_case=False)
+                    for r in _as_list(stmt.get('NotResource'))
+                ),
+                principals=(
+                    _compile_principal(stmt['Principal'])
+                    if 'Principal' in stmt
+                    else None
+                ),
+                not_principals=(
+                    _compile_principal(stmt['NotPrincipal'])
+                    if 'NotPrincipal' in stmt
+                    else None
+                ),
+                conditional=bool(stmt.get('Condition')),
+            )
+        )
+
+    return compiled
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(
+    source: str, canonical: str
+) -> tuple[CompiledStatement, ...]:
+    return tuple(_compile_statements(source, json.loads(canonical)))
+
+
+def compile_policy(source: str, document: Any) -> tuple[CompiledStatement, ...]:
+    """Compile a policy document into matchers.
+
+    Compilation is memoised on the canonical JSON of the document, so the
+    same policy attached to many users is only compiled once per process.
+    """
+    if isinstance(document, str):
+        try:
+            document = json.loads(document)
+        except ValueError:
+            return ()
+    try:
+        canonical = json.dumps(document, sort_keys=True)
+    except (TypeError, ValueError):
+        return tuple(_compile_statements(source, document))
+    return _compile_cached(source, canonical)
+
+
+# ── Statement index ───────────────────────────────────────────────────────────
+
+
+class _StatementIndex:
+    """Index statements so that a check only visits statements that can
+    possibly apply.
+
+    Literal actions (``s3:getobject``) go into a hash table; wildcard actions
+    are bucketed by their service prefix (``s3:``) and ``NotAction``
+    statements, which can match anything, are always visited. The candidate
+    list for an action is then split once by the bucket named in each
+    statement's resources and memoised, so repeated checks are two dict
+    lookups away from the handful of statements worth matching.
+    """
+
+    def __init__(self, statements: Iterable[CompiledStatement]) -> None:
+        self._exact: dict[str, list[CompiledStatement]] = {}
+        self._by_service: dict[str, list[CompiledStatement]] = {}
+        self._always: list[CompiledStatement] = []
+        self._memo: dict[str, tuple] = {}
+
+        for stmt in statements:
+            if stmt.not_actions or not stmt.actions:
+                self._always.append(stmt)
+                continue
+
+            placed_in: set[int] = set()
+            for matcher in stmt.actions:
+                pattern = matcher.pattern
+                if '*' not in pattern and '?' not in pattern:
+                    bucket = self._exact.setdefault(pattern, [])
+                else:
+                    service = matcher.literal_prefix.split(':', 1)[0]
+                    if ':' not in matcher.literal_prefix:
+                        # '*' or 's3*' – cannot narrow down by service.
+                        service = ''
+                    bucket = self._by_service.setdefault(service, [])
+                if id(bucket) not in placed_in:
+                    bucket.append(stmt)
+                    placed_in.add(id(bucket))
+
+    def _action_candidates(self, action: str) -> list[CompiledStatement]:
+        service = action.split(':', 1)[0]
+        found: list[CompiledStatement] = []
+        seen: set[int] = set()
+        for group in (
+            self._exact.get(action, ()),
+            self._by_service.get(service, ()),
+            self._by_service.get('', ()),
+            self._always,
+        ):
+            for stmt in group:
+                if id(stmt) not in seen:
+                    seen.add(id(stmt))
+                    found.append(stmt)
+        # Keep document order so that reported matches are stable.
+        found.sort(key=lambda s: (s.source, s.index))
+        return found
+
+    def candidates(
+        self, action: str, bucket: Optional[str]
+    ) -> list[CompiledStatement]:
+        entry = self._memo.get(action)
+        if entry is None:
+            everything = self._action_candidates(action)
+            by_bucket: dict[str, list[CompiledStatement]] = {}
+            anywhere: list[CompiledStatement] = []
+            for stmt in everything:
+                names = _resource_buckets(stmt)
+                if names is None:
+                    anywhere.append(stmt)
+                else:
+                    for name in names:
+                        by_bucket.setdefault(name, []).append(stmt)
+            entry = (everything, by_bucket, anywhere)
+            self._memo[action] = entry
+
+        everything, by_bucket, anywhere = entry
+        if bucket is None:
+            return everything
+        return anywhere + by_bucket.get(bucket, [])
+
+
+def _resource_buckets(stmt: CompiledStatement) -> Optional[set[str]]:
+    """Bucket names a statement's ``Resource`` can refer to, or ``None``
+    when the statement may apply to any bucket (wildcards, ``NotResource``,
+    non-S3 ARNs)."""
+    if stmt.not_resources or not stmt.resources:
+        return None
+    names: set[str] = set()
+    for matcher in stmt.resources:
+        if not matcher.pattern.startswith(_S3_ARN_PREFIX):
+            return None
+        rest = matcher.pattern[len(_S3_ARN_PREFIX):]
+        name = rest.split('/', 1)[0]
+        if '*' in name or '?' in name:
+            return None
+        names.add(name)
+    return names
+
+
+# ── Evaluator ─────────────────────────────────────────────────────────────────
+
+
+def s3_resource_arn(bucket: str, key: Optional[str] = None) -> str:
+    if key is None or key == '':
+        return f'{_S3_ARN_PREFIX}{bucket}'
+    return f'{_S3_ARN_PREFIX}{bucket}/{key}'
+
+
+def principal_identifiers(username: str) -> tuple[str, ...]:
+    """Identifiers a bucket policy ``Principal`` may use for *username*.
+
+    Principal ARNs are compiled with their account segment replaced by
+    ``*``, so the user ARN here matches whatever account a policy names.
+    """
+    return (username, f'{_IAM_ANY_ACCOUNT}user/{username}')
+
+
+@dataclass
+class Decision:
+    action: str
+    resource: str
+    allowed: bool
+    decision: str
+    matched: list[dict] = field(default_factory=list)
+    conditional: list[dict] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            'action': self.action,
+            'resource': self.resource,
+            'allowed': self.allowed,
+            'decision': self.decision,
+            'matched': self.matched,
+            'conditional': self.conditional,
+        }
+
+
+class PolicyEvaluator:
+    """Evaluate (action, resource) checks for one principal.
+
+    Identity policies (user and group policies) apply to the principal as
+    is; resource policies (bucket policies, keyed by bucket name) apply only
+    when their ``Principal`` matches. The result follows IAM semantics: an
+    explicit ``Deny`` wins, otherwise any ``Allow`` grants and the default
+    is an implicit deny.
+
+    Statements carrying a ``Condition`` cannot be decided without request
+    context; they never grant or deny and are reported as ``conditional``.
+    """
+
+    def __init__(
+        self,
+        identity_policies: Iterable[tuple[str, Any]] = (),
+        resource_policies: Optional[dict[str, Any]] = None,
+        principal: Optional[str] = None,
+        enabled: bool = True,
+    ) -> None:
+        identity: list[CompiledStatement] = []
+        for source, document in identity_policies:
+            identity.extend(compile_policy(source, document))
+
+        self.enabled = enabled
+        self._identity = _StatementIndex(identity)
+        self._resource: dict[str, _StatementIndex] = {
+            bucket: _StatementIndex(
+                compile_policy(f'bucket:{bucket}', document)
+            )
+            for bucket, document in (resource_policies or {}).items()
+            if document
+        }
+        self._principal_ids = (
+            principal_identifiers(principal) if principal else ('*',)
+        )
+
+    @staticmethod
+    def _bucket_of(resource: str) -> Optional[str]:
+        if not resource.startswith(_S3_ARN_PREFIX):
+            return None
+        return resource[len(_S3_ARN_PREFIX):].split('/', 1)[0]
+
+    def evaluate(self, action: str, resource: str) -> Decision:
+        decision = Decision(
+            action=action,
+            resource=resource,
+            allowed=False,
+            decision='implicit_deny',
+        )
+
+        if not self.enabled:
+            decision.decision = 'principal_disabled'
+            return decision
+
+        normalized_action = action.lower()
+        allow: list[dict] = []
+        deny: list[dict] = []
+
+        indexes = [self._identity]
+        bucket = self._bucket_of(resource)
+        if bucket is not None and bucket in self._resource:
+            indexes.append(self._resource[bucket])
+
+        for index in indexes:
+            for stmt in index.candidates(normalized_action, bucket):
+                if not stmt.matches_action(normalized_action):
+                    continue
+                if not stmt.matches_resource(resource):
+                    continue
+                if not stmt.matches_principal(self._principal_ids):
+                    continue
+                if stmt.conditional:
+                    decision.conditional.append(stmt.describe())
+                    continue
+                (deny if stmt.effect == 'Deny' else allow).append(
+                    stmt.describe()
+                )
+
+        if deny:
+            decision.decision = 'explicit_deny'
+            decision.matched = deny
+        elif allow:
+            decision.allowed = True
+            decision.decision = 'allow'
+            decision.matched = allow
+
+        return decision
+
+    def evaluate_s3(
+        self, action: str, bucket: str, key: Optional[str] = None
+    ) -> Decision:
+        return self.evaluate(action, s3_resource_arn(bucket, key))
+
+    def evaluate_many(
+        self, checks: Iterable[tuple[str, str, Optional[str]]]
+    ) -> list[Decision]:
+        """Evaluate ``(action, bucket, key)`` tuples in order."""
+        return [
+            self.evaluate_s3(action, bucket, key)
+            for action, bucket, key in checks
+        ]
@@ -0,0 +1,277 @@
+import asyncio
+import heapq
+import time
+from collections import deque
+from typing import Any, Iterable, Optional
+
+from mine_spec.ports.object_storage import ObjectStoragePort
+
+from mine_backend.config import settings
+from mine_backend.core.cache import CacheManager
+from mine_backend.core.redis import redis
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.object_listing import iter_objects
+from mine_backend.services.object_service import BUCKET_REGEX
+
+CHANGE_SEQ_KEY = 'usage:seq:{}'
+CHANGE_LOG_KEY = 'usage:changes:{}'
+MAX_TOP = 1000
+
+# Without Redis the change log is kept per process, like the cached trees:
+# bucket → last sequence number, and bucket → recent (seq, key) entries.
+_local_seq: dict[str, int] = {}
+_local_log: dict[str, deque] = {}
+
+
+# ── Change log ───────────────────────────────────────────────────────────────
+
+
+async def record_object_changes(bucket: str, *keys: str) -> None:
+    """Note that *keys* of *bucket* were written or deleted, so cached
+    prefix trees can refresh just the affected subtrees."""
+    if not keys:
+        return
+    if redis is None:
+        log = _local_log.setdefault(
+            bucket, deque(maxlen=settings.PREFIX_USAGE_CHANGE_LOG)
+        )
+        first = _local_seq.get(bucket, 0) + 1
+        log.extend(enumerate(keys, first))
+        _local_seq[bucket] = first + len(keys) - 1
+        return
+    log_key = CHANGE_LOG_KEY.format(bucket)
+    # One INCRBY reserves a sequence number per key; the log is then
+    # written, trimmed and refreshed in a single round trip.
+    last = await redis.incrby(CHANGE_SEQ_KEY.format(bucket), len(keys))
+    first = last - len(keys) + 1
+    async with redis.pipeline() as pipe:
+        pipe.zadd(
+            log_key,
+            {f'{seq}:{key}': seq for seq, key in enumerate(keys, first)},
+        )
+        pipe.zremrangebyrank(
+            log_key, 0, -settings.PREFIX_USAGE_CHANGE_LOG - 1
+        )
+        pipe.expire(log_key, settings.PREFIX_USAGE_TTL)
+        await pipe.execute()
+
+
+async def _current_seq(bucket: str) -> int:
+    if redis is None:
+        return _local_seq.get(bucket, 0)
+    return int(await redis.get(CHANGE_SEQ_KEY.format(bucket)) or 0)
+
+
+async def _changes_since(bucket: str, since: int, now: int) -> Optional[list]:
+    """Keys changed after sequence *since*, or ``None`` when the log no
+    longer reaches back that far."""
+    if since == now:
+        return []
+    if since > now:
+        return None
+    if redis is None:
+        log = _local_log.get(bucket)
+        if not log or log[0][0] > since + 1:
+            return None
+        return [key for seq, key in log if seq > since]
+    log_key = CHANGE_LOG_KEY.format(bucket)
+    oldest = await redis.zrange(log_key, 0, 0, withscores=True)
+    if not oldest or int(oldest[0][1]) > since + 1:
+        return None
+    entries = await redis.zrangebyscore(log_key, f'({since}', '+inf')
+    return [
+        (e.decode() if isinstance(e, bytes) else e).split(':', 1)[1]
+        for e in entries
+    ]
+
+
+# ── Aggregation ──────────────────────────────────────────────────────────────
+
+
+def aggregate(
+    objects: Iterable[Any],
+    prefix: str,
+    delimiter: str,
+    depth: int,
+) -> tuple[list[int], dict[str, dict[str, list[int]]]]:
+    """Size and object count per prefix, up to *depth* levels below
+    *prefix*, in one pass over *objects*.
+
+    Returns ``(direct, shards)``: ``direct`` is ``[size, count]`` of the
+    objects directly under *prefix*; ``shards`` maps each first-level
+    prefix to ``{prefix: [size, count]}`` for itself and its descendants.
+    Shards are the unit of incremental refresh.
+    """
+    direct = [0, 0]
+    shards: dict[str, dict[str, list[int]]] = {}
+    for obj in objects:
+        rest = obj.key[len(prefix) :]
+        size = obj.size or 0
+        shard = None
+        position = 0
+        for _ in range(depth):
+            cut = rest.find(delimiter, position)
+            if cut < 0:
+                break
+            position = cut + len(delimiter)
+            name = prefix + rest[:position]
+            if shard is None:
+                shard = shards.setdefault(name, {})
+            entry = shard.setdefault(name, [0, 0])
+            entry[0] += size
+            entry[1] += 1
+        if shard is None:
+            direct[0] += size
+            direct[1] += 1
+    return direct, shards
+
+
+def summarize(tree: dict, top: int) -> dict:
+    prefix = tree['prefix']
+    delimiter = tree['delimiter']
+    heaviest = heapq.nlargest(
+        top,
+        (
+            (size, count, name)
+            for shard in tree['shards'].values()
+            for name, (size, count) in shard.items()
+        ),
+    )
+    total_size = tree['direct'][0] + sum(
+        shard[name][0] for name, shard in tree['shards'].items()
+    )
+    total_objects = tree['direct'][1] + sum(
+        shard[name][1] for name, shard in tree['shards'].items()
+    )
+    return {
+        'bucket': tree['bucket'],
+        'prefix': prefix or None,
+        'delimiter': delimiter,
+        'depth': tree['depth'],
+        'total_size': total_size,
+        'total_objects': total_objects,
+        'direct_size': tree['direct'][0],
+        'direct_objects': tree['direct'][1],
+        'top': [
+            {
+                'prefix': name,
+                'depth': name[len(prefix) :].count(delimiter),
+                'size': size,
+                'objects': count,
+            }
+            for size, count, name in heaviest
+        ],
+        'scanned_at': tree['scanned_at'],
+    }
+
+
+# ── Service ──────────────────────────────────────────────────────────────────
+
+
+class PrefixUsageService:
+    """Space used under a prefix ("du"), broken down per sub-prefix.
+
+    The first request lists the prefix once and keeps the aggregated tree
+    in the cache for ``PREFIX_USAGE_TTL``. Writes made through the API are
+    recorded in a per-bucket change log, so later requests re-list only
+    the first-level prefixes that changed since the tree was built.
+    Changes made outside the API show up after the TTL, or right away with
+    ``refresh=True``. Without Redis the tree and the change log are kept
+    per process, so with several workers a write shows up in the others
+    only after the TTL.
+    """
+
+    def __init__(self, s3_client: ObjectStoragePort, cache: CacheManager):
+        self.s3 = s3_client
+        self.cache = cache
+
+    def _scan(
+        self,
+        bucket: str,
+        listing_prefix: str,
+        prefix: str,
+        delimiter: str,
+        depth: int,
+    ):
+        """List *listing_prefix* and aggregate relative to *prefix* (the
+        two differ when a single shard of the tree is refreshed)."""
+        return aggregate(
+            iter_objects(self.s3, bucket, listing_prefix or None),
+            prefix,
+            delimiter,
+            depth,
+        )
+
+    async def get_usage(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        depth: int = 1,
+        top: int = 20,
+        delimiter: str = '/',
+        refresh: bool = False,
+    ) -> dict:
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+        if not delimiter:
+            raise InconsistentDataError('Delimiter must not be empty.')
+        if depth < 1 or depth > settings.PREFIX_USAGE_MAX_DEPTH:
+            raise InconsistentDataError(
+                f'Depth must be between 1 and {settings.PREFIX_USAGE_MAX_DEPTH}.'
+            )
+        if top < 1 or top > MAX_TOP:
+            raise InconsistentDataError(
+                f'Top must be between 1 and {MAX_TOP}.'
+            )
+
+        prefix = prefix or ''
+        cache_key = f'prefix_usage:{bucket}:{prefix}:{delimiter}:{depth}'
+        # Read before listing: changes that land during the scan are
+        # replayed on the next request instead of being lost.
+        seq = await _current_seq(bucket)
+
+        tree = None if refresh else await self.cache.get(cache_key)
+        dirty: Optional[set[str]] = None
+        if tree is not None:
+            changed = await _changes_since(bucket, tree['seq'], seq)
+            if changed is not None:
+                dirty = set()
+                for key in changed:
+                    if not key.startswith(prefix):
+                        continue
+                    rest = key[len(prefix) :]
+                    cut = rest.find(delimiter)
+                    if cut < 0:
+                        # A direct child: only a full listing can tell.
+                        dirty = None
+                        break
+                    dirty.add(prefix + rest[: cut + len(delimiter)])
+
+        if tree is None or dirty is None:
+            direct, shards = await asyncio.to_thread(
+                self._scan, bucket, prefix, prefix, delimiter, depth
+            )
+            tree = {
+                'bucket': bucket,
+                'prefix': prefix,
+                'delimiter': delimiter,
+                'depth': depth,
+                'direct': direct,
+                'shards': shards,
+            }
+        elif dirty:
+            for shard in sorted(dirty):
+                _, rescanned = await asyncio.to_thread(
+                    self._scan, bucket, shard, prefix, delimiter, depth
+                )
+                tree['shards'].pop(shard, None)
+                tree['shards'].update(rescanned)
+        else:
+            return summarize(tree, top)
+
+        tree['seq'] = seq
+        tree['scanned_at'] = time.time()
+        await self.cache.set(cache_key, tree, ttl=settings.PREFIX_USAGE_TTL)
+        return summarize(tree, top)
@@ -0,0 +1,77 @@
+import time
+from typing import Any, Iterable, Optional
+
+from mine_backend.config import settings
+from mine_backend.core.memo import LRUCache
+
+
+PRESIGN_METHODS = ('download', 'upload')
+
+# (scope, method, bucket, key, expires_in, content_type, window) →
+# (url, signed_at). Signed URLs are small and only valid for the
+# credentials that signed them, so they stay in process.
+_url_cache = LRUCache(maxsize=50_000)
+
+
+def presign_urls(
+    s3: Any,
+    bucket: str,
+    keys: Iterable[str],
+    method: str = 'download',
+    expires_in: int = 3600,
+    content_type: Optional[str] = None,
+    scope: Optional[str] = None,
+) -> list[dict]:
+    """Presigned URLs for *keys*, signed locally one after another.
+
+    With a *scope* (whose credentials signed the URL), a URL is reused for
+    up to ``PRESIGN_CACHE_SECONDS``: the same (key, expiry) asked for again
+    within that window gets the same URL, and ``expires_at`` tells when it
+    really expires.
+    """
+    window = settings.PRESIGN_CACHE_SECONDS
+    cacheable = scope is not None and 0 < window <= expires_in // 2
+    now = time.time()
+    slot = int(now // window) if cacheable else None
+
+    urls = []
+    for key in keys:
+        cache_key = (
+            scope,
+            method,
+            bucket,
+            key,
+            expires_in,
+            content_type,
+            slot,
+        )
+        cached = _url_cache.get(cache_key) if cacheable else None
+        if cached is not None:
+            url, signed_at = cached
+        else:
+            if method == 'upload':
+                url = s3.generate_upload_url(
+                    bucket=bucket,
+                    key=key,
+                    expires_in=expires_in,
+                    content_type=content_type,
+                )
+            else:
+                url = s3.generate_download_url(
+                    bucket=bucket,
+                    key=key,
+                    expires_in=expires_in,
+                    response_content_type=content_type,
+                    response_content_disposition=None,
+                )
+            signed_at = now
+            if cacheable:
+                _url_cache.set(cache_key, (url, signed_at))
+        urls.append(
+            {
+                'key': key,
+                'url': url,
+                'expires_at': int(signed_at + expires_in),
+            }
+        )
+    return urls
@@ -0,0 +1,321 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import groupby, islice
+from typing import Any, Iterable, Iterator, Optional
+
+from mine_spec.ports.object_storage import ObjectStoragePort
+
+from mine_backend.config import settings
+from mine_backend.core.cache import CacheManager
+from mine_backend.core.redis import redis
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+from mine_backend.services.bulk import _error
+from mine_backend.services.object_listing import as_datetime, iter_versions
+from mine_backend.services.object_service import BUCKET_REGEX
+from mine_backend.services.prefix_usage_service import record_object_changes
+
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY = 'restore:{}'
+# Keys per checkpoint: a resumed job redoes at most this many.
+RESTORE_BATCH_SIZE = 100
+RESTORE_MAX_ERRORS = 100
+# A running job that has not checkpointed for this long is presumed dead
+# (e.g. its worker restarted) and may be resumed.
+RESTORE_STALE_AFTER = 120
+
+# Strong references to running jobs, keyed by job id.
+_running: dict[str, asyncio.Task] = {}
+
+
+def select_restore_actions(
+    rows: Iterable[dict],
+    at: datetime,
+    delete_newer: bool = False,
+) -> Iterator[dict]:
+    """What to do with each key of *rows* (grouped by key) to bring it
+    back to its state at *at*:
+
+    * ``restore``   – copy the newest version at or before *at* over it;
+    * ``delete``    – it did not exist at *at* (a delete marker was
+                      current then, or, with *delete_newer*, it was created
+                      later);
+    * ``unchanged`` – that version is still the current one;
+    * ``skipped``   – created after *at*, and *delete_newer* is off.
+    """
+    at = as_datetime(at)
+    for key, group in groupby(rows, key=lambda r: r['key']):
+        versions = sorted(
+            group,
+            key=lambda r: (as_datetime(r['last_modified']), r['is_latest']),
+            reverse=True,
+        )
+        then = next(
+            (v for v in versions if as_datetime(v['last_modified']) <= at),
+            None,
+        )
+        if then is None:
+            action = 'delete' if delete_newer else 'skipped'
+        elif then['is_delete_marker']:
+            action = 'unchanged' if then['is_latest'] else 'delete'
+        elif then['is_latest']:
+            action = 'unchanged'
+        else:
+            action = 'restore'
+        yield {
+            'key': key,
+            'action': action,
+            'version_id': then['version_id'] if action == 'restore' else None,
+        }
+
+
+class RestoreJobService:
+    """Point-in-time restore of a prefix, run as a background job.
+
+    The job walks the versions under the prefix in key order and, in
+    batches of :data:`RESTORE_BATCH_SIZE` keys, restores each key to its
+    state at the requested time with parallel server-side copies. After
+    every batch the last key done is checkpointed in Redis, so a job that
+    was cancelled, failed or lost with its worker resumes from there.
+
+    Only keys that currently exist are listed (see :func:`iter_versions`):
+    objects deleted after that time are not brought back.
+    """
+
+    def __init__(
+        self,
+        s3_client: ObjectStoragePort,
+        cache: CacheManager,
+        owner: str,
+    ):
+        self.s3 = s3_client
+        self.cache = cache
+        self.owner = owner
+
+    # ── State ────────────────────────────────────────────────────────────────
+
+    def _require_redis(self) -> None:
+        if redis is None:
+            raise ServiceUnavailableError(
+                'Restore jobs require Redis to be configured'
+            )
+
+    async def _save(self, job: dict) -> None:
+        job['updated_at'] = time.time()
+        await redis.setex(  # type: ignore[union-attr]
+            JOB_KEY.format(job['id']),
+            settings.RESTORE_JOB_TTL,
+            json.dumps(job),
+        )
+
+    async def _load(self, job_id: str) -> dict:
+        self._require_redis()
+        raw = await redis.get(JOB_KEY.format(job_id))  # type: ignore[union-attr]
+        if not raw:
+            raise NotFoundError('Restore job not found.')
+        job = json.loads(raw)
+        if job['owner'] != self.owner:
+            raise NotFoundError('Restore job not found.')
+        return job
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    async def create_job(
+        self,
+        bucket: str,
+        prefix: Optional[str],
+        at: datetime,
+        delete_newer: bool = False,
+        dry_run: bool = False,
+    ) -> dict:
+        self._require_redis()
+
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+
+        at = as_datetime(at)
+        if at > datetime.now(timezone.utc):
+            raise InconsistentDataError('Restore time is in the future.')
+
+        job = {
+            'id': str(uuid.uuid4()),
+            'owner': self.owner,
+            'bucket': bucket,
+            'prefix': prefix,
+            'at': at.isoformat(),
+            'delete_newer': delete_newer,
+            'dry_run': dry_run,
+            'status': 'pending',
+            'cancelled': False,
+            'checkpoint': None,
+            'scanned': 0,
+            'restored': 0,
+            'deleted': 0,
+            'unchanged': 0,
+            'skipped': 0,
+            'failed': 0,
+            'errors': [],
+            'error': None,
+            'created_at': time.time(),
+            'finished_at': None,
+        }
+        await self._save(job)
+        self._start(job['id'])
+        return job
+
+    async def get_job(self, job_id: str) -> dict:
+        return await self._load(job_id)
+
+    async def cancel_job(self, job_id: str) -> dict:
+        job = await self._load(job_id)
+        if job['status'] in ('pending', 'running'):
+            job['cancelled'] = True
+            await self._save(job)
+        return job
+
+    async def resume_job(self, job_id: str) -> dict:
+        job = await self._load(job_id)
+        if job['status'] == 'completed':
+            raise InconsistentDataError('Restore job already completed.')
+        if job_id in _running or (
+            job['status'] == 'running'
+            and time.time() - job['updated_at'] < RESTORE_STALE_AFTER
+        ):
+            raise InconsistentDataError('Restore job is still running.')
+        job.update(status='pending', cancelled=False, error=None)
+        await self._save(job)
+        self._start(job_id)
+        return job
+
+    # ── Runner ───────────────────────────────────────────────────────────────
+
+    def _start(self, job_id: str) -> None:
+        task = asyncio.create_task(self.run(job_id))
+        _running[job_id] = task
+        task.add_done_callback(lambda _: _running.pop(job_id, None))
+
+    def _apply(self, bucket: str, action: dict) -> Optional[dict]:
+        try:
+            if action['action'] == 'restore':
+                self.s3.restore_object_version(
+                    bucket=bucket,
+                    key=action['key'],
+                    version_id=action['version_id'],
+                )
+            elif action['action'] == 'delete':
+                self.s3.delete_object(bucket, action['key'])
+        except Exception as e:
+            logger.debug('Restore of key failed', exc_info=True)
+            return {'key': action['key'], **_error(e)}
+        return None
+
+    async def run(self, job_id: str) -> None:
+        job = await self._load(job_id)
+        job['status'] = 'running'
+        await self._save(job)
+
+        bucket = job['bucket']
+        checkpoint = job['checkpoint']
+        rows = iter_versions(
+            self.s3,
+            bucket,
+            job['prefix'],
+            start_key=checkpoint,
+            concurrency=settings.OBJECT_BULK_CONCURRENCY,
+        )
+        actions = select_restore_actions(
+            (r for r in rows if r['key'] != checkpoint),
+            datetime.fromisoformat(job['at']),
+            job['delete_newer'],
+        )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=settings.OBJECT_BULK_CONCURRENCY,
+                thread_name_prefix='restore',
+            ) as executor:
+                while True:
+                    if job['cancelled']:
+                        job['status'] = 'cancelled'
+                        break
+
+                    batch = await asyncio.to_thread(
+                        lambda: list(islice(actions, RESTORE_BATCH_SIZE))
+                    )
+                    if not batch:
+                        job['status'] = 'completed'
+                        break
+
+                    changes = [
+                        a
+                        for a in batch
+                        if a['action'] in ('restore', 'delete')
+                    ]
+                    errors: list[Any] = [None] * len(changes)
+                    if changes and not job['dry_run']:
+                        loop = asyncio.get_running_loop()
+                        errors = await asyncio.gather(
+                            *(
+                                loop.run_in_executor(
+                                    executor,
+                                    contextvars.copy_context().run,
+                                    self._apply,
+                                    bucket,
+                                    action,
+                                )
+                                for action in changes
+                            )
+                        )
+
+                    job['scanned'] += len(batch)
+                    for action in batch:
+                        if action['action'] in ('unchanged', 'skipped'):
+                            job[action['action']] += 1
+                    for action, error in zip(changes, errors):
+                        if error is None:
+                            counter = (
+                                'restored'
+                                if action['action'] == 'restore'
+                                else 'deleted'
+                            )
+                            job[counter] += 1
+                            continue
+                        job['failed'] += 1
+                        if len(job['errors']) < RESTORE_MAX_ERRORS:
+                            job['errors'].append(error)
+
+                    job['checkpoint'] = batch[-1]['key']
+                    # Pick up a cancel made while the batch ran.
+                    job['cancelled'] = (await self._load(job_id))['cancelled']
+                    await self._save(job)
+
+                    if changes and not job['dry_run']:
+                        await self.cache.invalidate_prefix(
+                            f'objects:{bucket}:'
+                        )
+                        await record_object_changes(
+                            bucket, *(a['key'] for a in changes)
+                        )
+        except Exception as e:
+            logger.exception('Restore job failed', extra={'job_id': job_id})
+            job['status'] = 'failed'
+            job['error'] = _error(e)['message']
+        finally:
+            # Closing the listing may wait for in-flight version lookups.
+            await asyncio.to_thread(actions.close)
+
+        job['finished_at'] = time.time()
+        await self._save(job)
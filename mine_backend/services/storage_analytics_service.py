@@ -0,0 +1,152 @@
+import asyncio
+import heapq
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Iterable, Optional
+
+from mine_spec.ports.object_storage import ObjectStoragePort
+
+from mine_backend.config import settings
+from mine_backend.core.cache import CacheManager
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.object_listing import as_datetime, iter_objects
+from mine_backend.services.object_service import BUCKET_REGEX
+
+KiB, MiB, GiB = 1024, 1024**2, 1024**3
+# Lower bounds of the size bins; the last bin is open-ended.
+SIZE_BINS = (0, KiB, 64 * KiB, MiB, 16 * MiB, 128 * MiB, GiB, 5 * GiB)
+# Lower bounds, in days, of the age bins.
+AGE_BINS = (0, 1, 7, 30, 90, 180, 365, 730)
+# Largest objects kept per scan; requests ask for up to this many.
+MAX_TOP = 100
+
+
+def _histogram(bounds: tuple, counts: array, sizes: array) -> list[dict]:
+    return [
+        {
+            'min': low,
+            'max': bounds[i + 1] if i + 1 < len(bounds) else None,
+            'objects': counts[i],
+            'size': sizes[i],
+        }
+        for i, low in enumerate(bounds)
+    ]
+
+
+def analyze(
+    objects: Iterable[Any], now: Optional[float] = None, top: int = MAX_TOP
+) -> dict:
+    """Size and age histograms, storage-class breakdown and the *top*
+    largest objects, in one pass over *objects*.
+
+    Each object only updates fixed-size counters (``array('q')``, one slot
+    per bin) and a bounded heap, so memory does not grow with the bucket.
+    Bins are lower-bound inclusive: ``SIZE_BINS`` in bytes, ``AGE_BINS`` in
+    days since last modification.
+    """
+    now = time.time() if now is None else now
+    size_counts = array('q', bytes(8 * len(SIZE_BINS)))
+    size_bytes = array('q', bytes(8 * len(SIZE_BINS)))
+    age_counts = array('q', bytes(8 * len(AGE_BINS)))
+    age_bytes = array('q', bytes(8 * len(AGE_BINS)))
+    classes: dict[str, list[int]] = {}
+    largest: list[tuple[int, str]] = []
+    total = [0, 0]
+    unknown_age = [0, 0]
+    oldest = newest = None
+
+    for obj in objects:
+        size = obj.size or 0
+        total[0] += size
+        total[1] += 1
+
+        slot = bisect_right(SIZE_BINS, size) - 1
+        size_counts[slot] += 1
+        size_bytes[slot] += size
+
+        modified = as_datetime(obj.last_modified)
+        if modified is None:
+            unknown_age[0] += size
+            unknown_age[1] += 1
+        else:
+            stamp = modified.timestamp()
+            oldest = stamp if oldest is None else min(oldest, stamp)
+            newest = stamp if newest is None else max(newest, stamp)
+            days = max(0.0, (now - stamp) / 86400)
+            slot = bisect_right(AGE_BINS, days) - 1
+            age_counts[slot] += 1
+            age_bytes[slot] += size
+
+        entry = classes.setdefault(obj.storage_class or 'STANDARD', [0, 0])
+        entry[0] += size
+        entry[1] += 1
+
+        if len(largest) < top:
+            heapq.heappush(largest, (size, obj.key))
+        elif size > largest[0][0]:
+            heapq.heapreplace(largest, (size, obj.key))
+
+    return {
+        'total_size': total[0],
+        'total_objects': total[1],
+        'size_histogram': _histogram(SIZE_BINS, size_counts, size_bytes),
+        'age_histogram': _histogram(AGE_BINS, age_counts, age_bytes),
+        'unknown_age': {'size': unknown_age[0], 'objects': unknown_age[1]},
+        'storage_classes': [
+            {'storage_class': name, 'size': size, 'objects': count}
+            for name, (size, count) in sorted(
+                classes.items(), key=lambda item: -item[1][0]
+            )
+        ],
+        'largest': [
+            {'key': key, 'size': size}
+            for size, key in sorted(largest, reverse=True)
+        ],
+        'oldest_modified': oldest,
+        'newest_modified': newest,
+    }
+
+
+class StorageAnalyticsService:
+    """Size/age/storage-class analytics for a bucket or prefix.
+
+    One listing feeds :func:`analyze`; the result is kept in the cache for
+    ``ANALYTICS_TTL`` so the dashboard can show it without scanning again.
+    ``refresh=True`` forces a new scan.
+    """
+
+    def __init__(self, s3_client: ObjectStoragePort, cache: CacheManager):
+        self.s3 = s3_client
+        self.cache = cache
+
+    def _scan(self, bucket: str, prefix: str) -> dict:
+        return analyze(iter_objects(self.s3, bucket, prefix or None))
+
+    async def get_analytics(
+        self,
+        bucket: str,
+        prefix: Optional[str] = None,
+        top: int = 20,
+        refresh: bool = False,
+    ) -> dict:
+        if not BUCKET_REGEX.match(bucket):
+            raise InconsistentDataError(
+                'Invalid bucket name. Must follow S3 naming rules.'
+            )
+        if top < 1 or top > MAX_TOP:
+            raise InconsistentDataError(
+                f'Top must be between 1 and {MAX_TOP}.'
+            )
+
+        prefix = prefix or ''
+        cache_key = f'analytics:{bucket}:{prefix}'
+        result = None if refresh else await self.cache.get(cache_key)
+        if result is None:
+            result = await asyncio.to_thread(self._scan, bucket, prefix)
+            result.update(
+                bucket=bucket, prefix=prefix or None, scanned_at=time.time()
+            )
+            await self.cache.set(cache_key, result, ttl=settings.ANALYTICS_TTL)
+
+        return {**result, 'largest': result['largest'][:top]}
@@ -1,6 +1,8 @@
 import httpx
 import xml.etree.ElementTree as ET
 from mine_backend.config import settings
+from mine_backend.core.metrics import STS_DURATION, timed
+from mine_backend.core.tracing import span
 
 from mine_backend.exceptions.application import (
     InconsistentDataError,
@@ -21,8 +23,14 @@ async def assume_role_with_web_identity(token: str):
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, params=params)
+        with span(
+            'sts.assume_role_with_web_identity',
+            **{'server.address': settings.S3_ENDPOINT},
+        ), timed(STS_DURATION) as labels:
+            labels['outcome'] = 'error'
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(url, params=params)
+            labels['outcome'] = str(response.status_code)
 
         response.raise_for_status()
 
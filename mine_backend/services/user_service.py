@@ -1,5 +1,9 @@
 from mine_spec.ports.admin import UserAdminPort
 
+from mine_backend.config import settings
+from mine_backend.core.admin_executor import AsyncAdmin
+from mine_backend.services.bulk import run_bulk_async
+
 from mine_backend.exceptions.application import (
     InconsistentDataError,
     NotFoundError,
@@ -65,3 +69,36 @@ class UserService:
             return self.storage_admin.disable_user(username)
         except RuntimeError as e:
             self._handle_storage_admin_error(e)
+
+    # -----------------------------------------
+    # Bulk
+    # -----------------------------------------
+
+    # Each item is a separate call on the admin executor, so a bulk request
+    # shares its bound (and its 429s) with every other admin call.
+
+    async def _bulk(self, fn, items, label=str):
+        return await run_bulk_async(
+            fn,
+            items,
+            concurrency=settings.ADMIN_BULK_CONCURRENCY,
+            max_items=settings.ADMIN_BULK_MAX_ITEMS,
+            label=label,
+        )
+
+    async def bulk_create_users(self, users: list[dict]):
+        admin = AsyncAdmin(self)
+        return await self._bulk(
+            lambda u: admin.create_user(u['username'], u['password']),
+            users,
+            label=lambda u: str(u.get('username', '')),
+        )
+
+    async def bulk_delete_users(self, usernames: list[str]):
+        return await self._bulk(AsyncAdmin(self).delete_user, usernames)
+
+    async def bulk_enable_users(self, usernames: list[str]):
+        return await self._bulk(AsyncAdmin(self).enable_user, usernames)
+
+    async def bulk_disable_users(self, usernames: list[str]):
+        return await self._bulk(AsyncAdmin(self).disable_user, usernames)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class ValidationError:
+    """A validation message plus the JSON pointer (RFC 6901) of the value
+    it refers to. An empty pointer designates the whole document."""
+
+    pointer: str
+    message: str
+
+    def as_dict(self) -> dict:
+        return {'pointer': self.pointer, 'message': self.message}
+
+
+def pointer(*parts: Any) -> str:
+    """Build a JSON pointer from path segments, escaping ``~`` and ``/``."""
+    return ''.join(
+        '/' + str(part).replace('~', '~0').replace('/', '~1') for part in parts
+    )
+
+
+def canonical_json(value: Any, digest: bool = False) -> Optional[str]:
+    """Canonical JSON of *value* (or its SHA-256 when *digest* is set),
+    suitable as a cache key. Returns ``None`` for non-serialisable input."""
+    try:
+        text = json.dumps(
+            value, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+        )
+    except (TypeError, ValueError):
+        return None
+    if digest:
+        return hashlib.sha256(text.encode()).hexdigest()
+    return text
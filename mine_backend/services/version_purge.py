@@ -0,0 +1,181 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Any, Iterable, Iterator, Optional
+
+from mine_backend.services.bulk import _error, batches
+from mine_backend.services.object_listing import as_datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Largest batch S3 DeleteObjects accepts; also the unit of progress here.
+PURGE_BATCH_SIZE = 1000
+# Selected versions echoed back in the report (the plan itself can be
+# millions of entries).
+PURGE_SAMPLE_SIZE = 100
+PURGE_MAX_ERRORS = 100
+
+
+def select_purgeable(
+    rows: Iterable[dict],
+    keep: int = 0,
+    older_than_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[dict]:
+    """Versions to purge from *rows* (grouped by key, as listed).
+
+    Follows the S3 lifecycle rules for noncurrent versions: the current
+    version is never selected; of the noncurrent ones, the *keep* newest
+    are kept, and the rest are selected once they have been noncurrent for
+    *older_than_days* (counted from when the next version replaced them).
+    A current delete marker is selected too when nothing else would be
+    left behind it.
+    """
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(
+            days=older_than_days
+        )
+
+    for _, group in groupby(rows, key=lambda r: r['key']):
+        versions = sorted(
+            group,
+            key=lambda r: (r['is_latest'], as_datetime(r['last_modified'])),
+            reverse=True,
+        )
+        current, noncurrent = versions[0], versions[1:]
+        if not current['is_latest']:
+            # Nothing is current (e.g. a listing that started mid-key):
+            # leave the key alone rather than guess.
+            continue
+
+        selected = []
+        replaced_at = as_datetime(current['last_modified'])
+        for position, version in enumerate(noncurrent):
+            if position >= keep and (cutoff is None or replaced_at <= cutoff):
+                selected.append(version)
+            replaced_at = as_datetime(version['last_modified'])
+
+        if current.get('is_delete_marker') and len(selected) == len(
+            noncurrent
+        ):
+            selected.append(current)
+
+        yield from selected
+
+
+def _version_row(entry: dict, is_delete_marker: bool) -> dict:
+    return {
+        'key': entry['Key'],
+        'version_id': entry['VersionId'],
+        'is_latest': entry['IsLatest'],
+        'last_modified': entry['LastModified'],
+        'size': entry.get('Size', 0),
+        'is_delete_marker': is_delete_marker,
+    }
+
+
+def list_version_rows(
+    client: Any, bucket: str, prefix: Optional[str] = None
+) -> Iterator[dict]:
+    """Every version and delete marker under *prefix*, grouped by key, one
+    ``ListObjectVersions`` page at a time.
+
+    Unlike :func:`~mine_backend.services.object_listing.iter_versions`,
+    this reaches keys whose current version is a delete marker, which
+    usually hold most of what a purge reclaims.
+    """
+    params = {'Bucket': bucket, 'Prefix': prefix or ''}
+    while True:
+        page = client.list_object_versions(**params)
+        rows = [_version_row(v, False) for v in page.get('Versions', [])]
+        rows.extend(
+            _version_row(m, True) for m in page.get('DeleteMarkers', [])
+        )
+        # Each list comes in key order; a key cut by the page boundary
+        # continues at the start of the next page.
+        rows.sort(key=lambda r: r['key'])
+        yield from rows
+
+        if not page.get('IsTruncated'):
+            return
+        params['KeyMarker'] = page['NextKeyMarker']
+        if page.get('NextVersionIdMarker'):
+            params['VersionIdMarker'] = page['NextVersionIdMarker']
+        else:
+            params.pop('VersionIdMarker', None)
+
+
+def purge_versions(
+    client: Any,
+    bucket: str,
+    candidates: Iterable[dict],
+    dry_run: bool = True,
+) -> dict:
+    """Delete *candidates* with one ``DeleteObjects`` call per batch of
+    :data:`PURGE_BATCH_SIZE`, and report what was (or, with *dry_run*,
+    would be) reclaimed. A failed delete, or a failed batch, is counted
+    and reported without stopping the purge."""
+    report = {
+        'dry_run': dry_run,
+        'selected': 0,
+        'delete_markers': 0,
+        'reclaimed_bytes': 0,
+        'deleted': 0,
+        'failed': 0,
+        'sample': [],
+        'errors': [],
+    }
+
+    def delete(batch: list[dict]) -> dict:
+        try:
+            response = client.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    'Objects': [
+                        {'Key': v['key'], 'VersionId': v['version_id']}
+                        for v in batch
+                    ],
+                    'Quiet': True,
+                },
+            )
+        except Exception as e:
+            logger.debug('Version purge batch failed', exc_info=True)
+            return {(v['key'], v['version_id']): _error(e) for v in batch}
+        return {
+            (e['Key'], e.get('VersionId')): {
+                'code': e.get('Code', 'UNEXPECTED_ERROR'),
+                'message': e.get('Message', ''),
+            }
+            for e in response.get('Errors', [])
+        }
+
+    for batch in batches(candidates, PURGE_BATCH_SIZE):
+        report['selected'] += len(batch)
+        room = PURGE_SAMPLE_SIZE - len(report['sample'])
+        report['sample'].extend(batch[:room])
+
+        errors = {} if dry_run else delete(batch)
+
+        for version in batch:
+            error = errors.get((version['key'], version['version_id']))
+            if error is not None:
+                report['failed'] += 1
+                if len(report['errors']) < PURGE_MAX_ERRORS:
+                    report['errors'].append(
+                        {
+                            'key': version['key'],
+                            'version_id': version['version_id'],
+                            **error,
+                        }
+                    )
+                continue
+            if version.get('is_delete_marker'):
+                report['delete_markers'] += 1
+            else:
+                report['reclaimed_bytes'] += version.get('size') or 0
+            if not dry_run:
+                report['deleted'] += 1
+
+    return report
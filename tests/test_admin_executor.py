@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+
+from mine_backend.core.admin_executor import AdminExecutor, AsyncAdmin
+from mine_backend.exceptions.application import (
+    NotFoundError,
+    OperationTimeoutError,
+    TooManyRequestsError,
+)
+
+
+class FakeAdmin:
+    name = 'fake'
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def list_users(self):
+        return ['alice']
+
+    def get_user(self, username):
+        raise NotFoundError(f"User '{username}' not found.")
+
+    def slow(self):
+        self.release.wait(5)
+        return 'done'
+
+
+@pytest.fixture
+def executor():
+    executor = AdminExecutor(workers=2, max_queue=1, timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+async def test_methods_become_coroutines(executor):
+    admin = AsyncAdmin(FakeAdmin(), executor)
+    assert await admin.list_users() == ['alice']
+    assert admin.name == 'fake'
+    assert executor.stats()['operations']['list_users']['count'] == 1
+
+
+async def test_errors_propagate(executor):
+    admin = AsyncAdmin(FakeAdmin(), executor)
+    with pytest.raises(NotFoundError):
+        await admin.get_user('bob')
+    stats = executor.stats()
+    assert stats['failed'] == 1
+    assert stats['operations']['get_user']['errors'] == 1
+
+
+async def test_rejects_when_saturated(executor):
+    fake = FakeAdmin()
+    admin = AsyncAdmin(fake, executor)
+    # 2 workers + 1 queued slot
+    tasks = [asyncio.create_task(admin.slow()) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert executor.stats()['queued'] == 1
+
+    with pytest.raises(TooManyRequestsError):
+        await admin.list_users()
+    assert executor.stats()['rejected'] == 1
+
+    fake.release.set()
+    assert await asyncio.gather(*tasks) == ['done'] * 3
+    assert await admin.list_users() == ['alice']
+
+
+async def test_timeout_keeps_slot_until_thread_finishes():
+    executor = AdminExecutor(workers=1, max_queue=0, timeout=5, timeouts={'slow': 0.05})
+    fake = FakeAdmin()
+    admin = AsyncAdmin(fake, executor)
+    try:
+        with pytest.raises(OperationTimeoutError):
+            await admin.slow()
+        assert executor.stats()['timed_out'] == 1
+
+        # The driver thread is still busy, so there is no capacity left.
+        with pytest.raises(TooManyRequestsError):
+            await admin.list_users()
+
+        fake.release.set()
+        for _ in range(100):
+            if executor.stats()['running'] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await admin.list_users() == ['alice']
+    finally:
+        executor.shutdown()
+
+
+async def test_mcp_admin_tools_run_on_executor(executor, monkeypatch):
+    from mine_backend.core import admin_executor
+    from mine_backend.mcp import context
+    from mine_backend.mcp.tools import user_tools
+
+    monkeypatch.setattr(admin_executor, 'get_admin_executor', lambda: executor)
+    monkeypatch.setattr(context, 'get_admin', FakeAdmin)
+    monkeypatch.setattr(user_tools, 'require_admin', lambda token: {})
+
+    assert await user_tools.list_users('token') == ['alice']
+    assert executor.stats()['operations']['list_users']['count'] == 1
+
+
+async def test_bulk_items_each_take_an_executor_slot(executor, monkeypatch):
+    from mine_backend.config import settings
+    from mine_backend.core import admin_executor
+    from mine_backend.services.user_service import UserService
+
+    monkeypatch.setattr(admin_executor, 'get_admin_executor', lambda: executor)
+    monkeypatch.setattr(settings, 'ADMIN_BULK_CONCURRENCY', 2)
+
+    class Admin(FakeAdmin):
+        def disable_user(self, username):
+            return username
+
+    service = AsyncAdmin(UserService(Admin()), executor)
+    result = await service.bulk_disable_users(['a', 'b', 'c', 'd', 'e'])
+
+    assert result['succeeded'] == 5
+    operations = executor.stats()['operations']
+    assert operations['disable_user']['count'] == 5
+    assert 'bulk_disable_users' not in operations
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from mine_backend.services.archive import archive_name, stream_archive
+
+
+CONTENT = {
+    'docs/a.txt': b'hello',
+    'docs/sub/b.bin': bytes(range(256)) * 1000,
+    'docs/empty.txt': b'',
+}
+
+
+def entries(prefix='docs/'):
+    return [
+        {
+            'key': key,
+            'name': archive_name(key, prefix),
+            'size': len(data),
+            'last_modified': '2026-01-02T03:04:06+00:00',
+        }
+        for key, data in CONTENT.items()
+    ]
+
+
+class Storage:
+    def __init__(self):
+        self.open = 0
+        self.max_open = 0
+
+    async def open_object(self, key):
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        try:
+            data = CONTENT[key]
+            for start in range(0, len(data), 7000):
+                await asyncio.sleep(0)
+                yield data[start : start + 7000]
+        finally:
+            self.open -= 1
+
+
+async def collect(archive_format, storage=None, concurrency=2):
+    storage = storage or Storage()
+    chunks = [
+        chunk
+        async for chunk in stream_archive(
+            entries(), storage.open_object, archive_format, concurrency
+        )
+    ]
+    return b''.join(chunks)
+
+
+def test_archive_name():
+    assert archive_name('docs/sub/b.txt', 'docs/') == 'sub/b.txt'
+    assert archive_name('docs/../../etc/x', 'docs/') == 'etc/x'
+    assert archive_name('docs/sub/', 'docs/') is None
+    assert archive_name('a.txt', None) == 'a.txt'
+
+
+async def test_zip_round_trip():
+    data = await collect('zip')
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.read('sub/b.bin') == CONTENT['docs/sub/b.bin']
+        assert archive.read('a.txt') == b'hello'
+        assert archive.getinfo('a.txt').date_time == (2026, 1, 2, 3, 4, 6)
+
+
+async def test_tar_round_trip():
+    data = await collect('tar')
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        assert archive.getnames() == ['a.txt', 'sub/b.bin', 'empty.txt']
+        member = archive.extractfile('sub/b.bin')
+        assert member.read() == CONTENT['docs/sub/b.bin']
+
+
+async def test_reads_at_most_concurrency_objects_at_once():
+    storage = Storage()
+    await collect('tar', storage, concurrency=2)
+    assert storage.max_open <= 2
+
+
+async def test_read_error_aborts_the_stream():
+    async def broken(key):
+        raise RuntimeError('gone')
+        yield b''
+
+    with pytest.raises(RuntimeError, match='gone'):
+        async for _ in stream_archive(entries(), broken, 'zip', 2):
+            pass
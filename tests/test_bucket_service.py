@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import MagicMock
 from botocore.exceptions import ClientError
 
@@ -246,6 +247,80 @@ class TestBucketLifecycle:
         assert 'message' in result
 
 
+class TestSimulateLifecycle:
+    RULES = [
+        {
+            'ID': 'expire-all',
+            'Status': 'Enabled',
+            'Filter': {},
+            'Expiration': {'Days': 1},
+        }
+    ]
+
+    def test_invalid_configuration_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.simulate_lifecycle('my-bucket', {'Rules': []})
+
+    def test_missing_configuration_raises(self, service, mock_s3):
+        mock_s3.get_bucket_lifecycle.side_effect = make_client_error(
+            'NoSuchLifecycleConfiguration'
+        )
+        with pytest.raises(NotFoundError):
+            service.simulate_lifecycle('my-bucket')
+
+    def test_simulates_listing(self, service, mock_s3):
+        obj = MagicMock()
+        obj.key, obj.size, obj.storage_class = 'a.txt', 7, 'STANDARD'
+        obj.last_modified = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        result = MagicMock()
+        result.objects = [obj]
+        result.is_truncated = False
+        mock_s3.list_objects.return_value = result
+
+        report = service.simulate_lifecycle(
+            'my-bucket', {'Rules': self.RULES}
+        )
+
+        assert report['totals']['expire'] == {'objects': 1, 'size': 7}
+        mock_s3.delete_object.assert_not_called()
+
+    def test_versions_listing_serves_both_passes(self, service, mock_s3):
+        obj = MagicMock()
+        obj.key = 'a.txt'
+        result = MagicMock()
+        result.objects = [obj]
+        result.is_truncated = False
+        mock_s3.list_objects.return_value = result
+
+        def version(version_id, day, size, latest):
+            v = MagicMock()
+            v.key, v.version_id, v.size = 'a.txt', version_id, size
+            v.is_latest, v.is_delete_marker = latest, False
+            v.storage_class = 'STANDARD'
+            v.last_modified = datetime(2026, 1, day, tzinfo=timezone.utc)
+            return v
+
+        mock_s3.list_object_versions.return_value = [
+            version('v2', 2, 7, True),
+            version('v1', 1, 5, False),
+        ]
+        rules = [
+            dict(
+                self.RULES[0],
+                NoncurrentVersionExpiration={'NoncurrentDays': 1},
+            )
+        ]
+
+        report = service.simulate_lifecycle('my-bucket', {'Rules': rules})
+
+        mock_s3.list_objects.assert_called_once()
+        assert report['totals']['expire'] == {'objects': 1, 'size': 7}
+        assert report['totals']['noncurrent_expire'] == {
+            'objects': 1,
+            'size': 5,
+        }
+
+
 class TestBucketEvents:
     def test_get_bucket_events_invalid_name_raises(self, service):
         with pytest.raises(InconsistentDataError):
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from mine_backend.exceptions.application import UnexpectedError
+from mine_backend.services.bucket_sync import (
+    diff_listings,
+    sorted_rows,
+    sync_buckets,
+)
+
+
+def row(key, size=1, etag='"e"'):
+    return {
+        'key': key,
+        'size': size,
+        'etag': etag,
+        'last_modified': None,
+        'storage_class': None,
+    }
+
+
+SOURCE = [row('a'), row('b', 2), row('c'), row('e', etag='"x"')]
+DEST = [row('a'), row('b', 3), row('d'), row('e', etag='"y"')]
+
+
+def statuses(differences):
+    return [(d['key'], d['status']) for d in differences]
+
+
+class TestDiffListings:
+    def test_merge_join(self):
+        assert statuses(diff_listings(SOURCE, DEST)) == [
+            ('a', 'unchanged'),
+            ('b', 'changed'),
+            ('c', 'added'),
+            ('d', 'removed'),
+            ('e', 'changed'),
+        ]
+
+    def test_one_side_empty(self):
+        assert statuses(diff_listings([], DEST[:2])) == [
+            ('a', 'removed'),
+            ('b', 'removed'),
+        ]
+
+    def test_reads_both_listings_lazily(self):
+        source = iter(SOURCE)
+        differences = diff_listings(source, iter(DEST))
+        next(differences)
+        assert next(source)['key'] == 'c'
+
+    def test_unsorted_listing_is_rejected(self):
+        s3 = MagicMock()
+        s3.list_objects.return_value = SimpleNamespace(
+            objects=[
+                SimpleNamespace(
+                    key=k,
+                    size=1,
+                    last_modified=None,
+                    etag=None,
+                    storage_class=None,
+                )
+                for k in ('b', 'a')
+            ],
+            is_truncated=False,
+            next_continuation_token=None,
+        )
+        with pytest.raises(UnexpectedError):
+            list(sorted_rows(s3, 'my-bucket', None))
+
+
+class TestSyncBuckets:
+    def test_dry_run_only_counts(self):
+        s3 = MagicMock()
+        report = sync_buckets(
+            s3, 'src', 'dst', diff_listings(SOURCE, DEST), concurrency=2
+        )
+        assert (report['added'], report['changed']) == (1, 2)
+        assert (report['removed'], report['unchanged']) == (1, 1)
+        assert report['copy_bytes'] == 4
+        s3.copy_object.assert_not_called()
+
+    def test_copies_and_deletes(self):
+        s3 = MagicMock()
+        report = sync_buckets(
+            s3,
+            'src',
+            'dst',
+            diff_listings(SOURCE, DEST),
+            concurrency=2,
+            delete=True,
+            dry_run=False,
+            changed_limit=10,
+        )
+        assert (report['copied'], report['deleted']) == (3, 1)
+        assert sorted(report['changed_keys']) == ['b', 'c', 'd', 'e']
+        s3.delete_object.assert_called_once_with('dst', 'd')
+        s3.copy_object.assert_any_call(
+            source_bucket='src',
+            source_key='c',
+            dest_bucket='dst',
+            dest_key='c',
+        )
+
+    def test_removed_kept_without_delete(self):
+        s3 = MagicMock()
+        report = sync_buckets(
+            s3, 'src', 'dst', diff_listings(SOURCE, DEST), 2, dry_run=False
+        )
+        assert report['deleted'] == 0
+        s3.delete_object.assert_not_called()
+
+    def test_failures_are_reported(self):
+        s3 = MagicMock()
+        s3.copy_object.side_effect = RuntimeError('boom')
+        report = sync_buckets(
+            s3, 'src', 'dst', diff_listings(SOURCE, DEST), 2, dry_run=False
+        )
+        assert report['failed'] == 3
+        assert report['errors'][0]['message'] == 'boom'
@@ -0,0 +1,147 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+)
+from mine_backend.services.bulk import (
+    batches,
+    map_in_context,
+    run_bulk,
+    run_bulk_async,
+)
+
+
+class TestRunBulk:
+    def test_results_keep_input_order(self):
+        result = run_bulk(lambda x: x * 2, [3, 1, 2], concurrency=4, max_items=10)
+        assert [r['result'] for r in result['results']] == [6, 2, 4]
+        assert [r['item'] for r in result['results']] == ['3', '1', '2']
+        assert result['total'] == 3
+        assert result['succeeded'] == 3
+        assert result['failed'] == 0
+
+    def test_failures_do_not_abort_the_batch(self):
+        def fn(name):
+            if name == 'bob':
+                raise NotFoundError("User 'bob' not found.")
+            return name
+
+        result = run_bulk(fn, ['alice', 'bob', 'carol'], concurrency=2, max_items=10)
+        assert result['succeeded'] == 2
+        assert result['failed'] == 1
+        failed = result['results'][1]
+        assert failed['success'] is False
+        assert failed['error']['code'] == 'NOT_FOUND'
+
+    def test_unexpected_errors_are_reported(self):
+        def fn(_):
+            raise RuntimeError('boom')
+
+        result = run_bulk(fn, ['a'], concurrency=1, max_items=10)
+        assert result['results'][0]['error'] == {
+            'code': 'UNEXPECTED_ERROR',
+            'message': 'boom',
+        }
+
+    def test_custom_label(self):
+        result = run_bulk(
+            lambda u: None,
+            [{'username': 'alice'}],
+            concurrency=1,
+            max_items=10,
+            label=lambda u: u['username'],
+        )
+        assert result['results'][0]['item'] == 'alice'
+
+    def test_concurrency_is_bounded(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fn(_):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        run_bulk(fn, range(20), concurrency=3, max_items=100)
+        assert peak <= 3
+
+    def test_empty_batch_is_rejected(self):
+        with pytest.raises(InconsistentDataError):
+            run_bulk(lambda x: x, [], concurrency=1, max_items=10)
+
+    def test_oversized_batch_is_rejected(self):
+        with pytest.raises(InconsistentDataError):
+            run_bulk(lambda x: x, range(11), concurrency=1, max_items=10)
+
+
+class TestRunBulkAsync:
+    async def test_same_report_as_run_bulk(self):
+        async def fn(name):
+            if name == 'bob':
+                raise NotFoundError("User 'bob' not found.")
+            return name
+
+        result = await run_bulk_async(
+            fn, ['alice', 'bob', 'carol'], concurrency=2, max_items=10
+        )
+        assert [r['item'] for r in result['results']] == [
+            'alice',
+            'bob',
+            'carol',
+        ]
+        assert result['succeeded'] == 2
+        assert result['results'][1]['error']['code'] == 'NOT_FOUND'
+
+    async def test_concurrency_is_bounded(self):
+        active = 0
+        peak = 0
+
+        async def fn(_):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await run_bulk_async(fn, range(20), concurrency=3, max_items=100)
+        assert peak <= 3
+
+    async def test_empty_batch_is_rejected(self):
+        with pytest.raises(InconsistentDataError):
+            await run_bulk_async(lambda x: x, [], concurrency=1, max_items=10)
+
+
+def test_batches_are_lazy():
+    pulled = []
+
+    def items():
+        for i in range(5):
+            pulled.append(i)
+            yield i
+
+    chunks = batches(items(), 2)
+    assert next(chunks) == [0, 1]
+    assert pulled == [0, 1]
+    assert list(chunks) == [[2, 3], [4]]
+
+
+def test_map_in_context_carries_contextvars():
+    request = contextvars.ContextVar('request')
+    request.set('r1')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        seen = list(
+            map_in_context(executor, lambda i: (i, request.get()), [1, 2])
+        )
+    assert seen == [(1, 'r1'), (2, 'r1')]
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+
+from mine_backend import config
+
+
+@pytest.fixture(autouse=True)
+def clear_factory_cache():
+    config._driver_factory.cache_clear()
+    yield
+    config._driver_factory.cache_clear()
+
+
+class TestDriverFactory:
+    def test_module_is_imported_once(self):
+        with patch.object(
+            config.importlib,
+            'import_module',
+            wraps=config.importlib.import_module,
+        ) as import_module:
+            first = config._driver_factory('benchmarks.fake_backend', 'get_s3_client')
+            second = config._driver_factory('benchmarks.fake_backend', 'get_s3_client')
+
+        assert first is second
+        import_module.assert_called_once_with('benchmarks.fake_backend')
+
+    def test_missing_factory(self):
+        with pytest.raises(RuntimeError, match='must define get_admin_client'):
+            config._driver_factory('json', 'get_admin_client')
+
+
+class TestSigningClient:
+    def test_reused_per_credentials(self):
+        sts = {'aws_access_key_id': 'AK', 'aws_secret_access_key': 'S'}
+        config._signing_clients.clear()
+        with patch.object(
+            config, 'get_s3_client', side_effect=lambda s: object()
+        ) as factory:
+            first = config.get_signing_client(sts)
+            assert config.get_signing_client(dict(sts)) is first
+            other = config.get_signing_client({**sts, 'aws_session_token': 'T'})
+
+        assert other is not first
+        assert factory.call_count == 2
+        config._signing_clients.clear()
+
+
+class TestMultipartClient:
+    def test_reused_per_credentials(self):
+        sts = {
+            'aws_access_key_id': 'AK',
+            'aws_secret_access_key': 'S',
+            'aws_session_token': 'T',
+        }
+        config._multipart_clients.clear()
+        first = config.get_multipart_client(sts)
+        assert config.get_multipart_client(dict(sts)) is first
+        assert first.meta.endpoint_url.endswith(config.settings.S3_ENDPOINT)
+        config._multipart_clients.clear()
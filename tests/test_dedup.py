@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from mine_backend.services import dedup
+from mine_backend.services.dedup import (
+    find_duplicates,
+    iter_entries,
+    sorted_entries,
+)
+
+ENTRIES = [
+    ('aaa', 100, 'tenant-a', 'video.mp4'),
+    ('bbb', 5, 'tenant-a', 'notes.txt'),
+    ('aaa', 100, 'tenant-b', 'copy-of-video.mp4'),
+    ('aaa', 100, 'tenant-c', 'video.mp4'),
+    ('ccc', 50, 'tenant-b', 'report.pdf'),
+    ('ccc', 50, 'tenant-c', 'report.pdf'),
+    # Same ETag, different size: not a duplicate.
+    ('bbb', 6, 'tenant-c', 'notes.txt'),
+]
+
+
+def test_sorted_in_memory():
+    assert list(sorted_entries(ENTRIES, 100)) == sorted(ENTRIES)
+
+
+def test_spills_and_merges(monkeypatch):
+    spilled = []
+    original = dedup._spill
+    monkeypatch.setattr(
+        dedup, '_spill', lambda e: spilled.append(len(e)) or original(e)
+    )
+    assert list(sorted_entries(ENTRIES, 2)) == sorted(ENTRIES)
+    assert spilled == [2, 2, 2]
+
+
+def test_find_duplicates():
+    report = find_duplicates(sorted(ENTRIES), top=1)
+    assert report['scanned'] == 7
+    assert report['groups'] == 2
+    assert report['duplicate_objects'] == 3
+    assert report['reclaimable_bytes'] == 250
+    (group,) = report['top']
+    assert (group['etag'], group['copies']) == ('aaa', 3)
+    assert {'bucket': 'tenant-b', 'key': 'copy-of-video.mp4'} in group[
+        'locations'
+    ]
+
+
+def test_iter_entries_skips_small_and_unknown():
+    s3 = MagicMock()
+    result = MagicMock()
+    result.objects = [
+        SimpleNamespace(key='a', size=10, etag='"x"'),
+        SimpleNamespace(key='b', size=0, etag='"y"'),
+        SimpleNamespace(key='c', size=10, etag=None),
+    ]
+    result.is_truncated = False
+    s3.list_objects.return_value = result
+
+    assert list(iter_entries(s3, ['one', 'two'])) == [
+        ('x', 10, 'one', 'a'),
+        ('x', 10, 'two', 'a'),
+    ]
@@ -14,6 +14,8 @@ from mine_backend.exceptions.application import (
     InconsistentDataError,
     UnexpectedError,
     ServiceUnavailableError,
+    TooManyRequestsError,
+    OperationTimeoutError,
 )
 
 
@@ -70,6 +72,18 @@ async def test_unavailable_error_maps_to_503(mock_request):
     assert response.status_code == 503
 
 
+async def test_too_many_requests_maps_to_429(mock_request):
+    exc = TooManyRequestsError('busy')
+    response = await app_exception_handler(mock_request, exc)
+    assert response.status_code == 429
+
+
+async def test_operation_timeout_maps_to_504(mock_request):
+    exc = OperationTimeoutError('slow')
+    response = await app_exception_handler(mock_request, exc)
+    assert response.status_code == 504
+
+
 async def test_unknown_code_falls_back_to_400(mock_request):
     exc = AppException('custom error', 'UNKNOWN_CODE_XYZ')
     response = await app_exception_handler(mock_request, exc)
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services import inventory
+from mine_backend.services.inventory import (
+    encode_inventory,
+    parquet_available,
+    row_filter,
+)
+
+
+def row(key, size, day, storage_class='STANDARD'):
+    return {
+        'key': key,
+        'size': size,
+        'last_modified': datetime(2026, 1, day, tzinfo=timezone.utc),
+        'etag': f'"{key}"',
+        'storage_class': storage_class,
+    }
+
+
+ROWS = [
+    row('logs/a.log', 10, 1),
+    row('logs/b.log', 2000, 5),
+    row('data/c.bin', 5000, 20, 'GLACIER'),
+]
+
+
+class TestRowFilter:
+    def test_size_and_age(self):
+        matches = row_filter(
+            min_size=1000, modified_before=datetime(2026, 1, 10)
+        )
+        assert [r['key'] for r in ROWS if matches(r)] == ['logs/b.log']
+
+    def test_storage_class_and_suffix(self):
+        assert not row_filter(storage_class='GLACIER')(ROWS[0])
+        assert row_filter(suffix='.bin', storage_class='GLACIER')(ROWS[2])
+
+    def test_no_criteria_keeps_everything(self):
+        assert all(map(row_filter(), ROWS))
+
+    def test_inverted_size_range(self):
+        with pytest.raises(InconsistentDataError):
+            row_filter(min_size=10, max_size=1)
+
+
+def test_csv():
+    text = b''.join(encode_inventory(iter(ROWS), 'csv')).decode()
+    records = list(csv.DictReader(io.StringIO(text)))
+    assert [r['key'] for r in records] == [r['key'] for r in ROWS]
+    assert records[0]['last_modified'] == '2026-01-01T00:00:00+00:00'
+
+
+def test_csv_header_only_when_empty():
+    assert b''.join(encode_inventory(iter([]), 'csv')).startswith(b'key,')
+
+
+def test_ndjson_is_batched(monkeypatch):
+    monkeypatch.setattr(inventory, 'TEXT_BATCH_ROWS', 2)
+    chunks = list(encode_inventory(iter(ROWS), 'ndjson'))
+    assert len(chunks) == 2
+    lines = b''.join(chunks).decode().splitlines()
+    assert json.loads(lines[2])['storage_class'] == 'GLACIER'
+
+
+@pytest.mark.skipif(not parquet_available(), reason='pyarrow not installed')
+def test_parquet_round_trip():
+    import pyarrow.parquet as pq
+
+    data = b''.join(encode_inventory(iter([dict(r) for r in ROWS]), 'parquet'))
+    table = pq.read_table(io.BytesIO(data))
+    assert table.column('size').to_pylist() == [10, 2000, 5000]
@@ -0,0 +1,207 @@
+from datetime import datetime, timezone
+
+from mine_backend.services.lifecycle_simulator import (
+    LifecycleSimulator,
+    PrefixTrie,
+    due_at,
+)
+
+AT = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def day(month, day_of_month):
+    return datetime(2026, month, day_of_month, 12, tzinfo=timezone.utc)
+
+
+def obj(key, size, modified, storage_class='STANDARD'):
+    return {
+        'key': key,
+        'size': size,
+        'last_modified': modified,
+        'storage_class': storage_class,
+    }
+
+
+def version(key, vid, modified, size=1, latest=False, marker=False):
+    return {
+        'key': key,
+        'version_id': vid,
+        'is_latest': latest,
+        'last_modified': modified,
+        'size': size,
+        'is_delete_marker': marker,
+    }
+
+
+RULES = [
+    {
+        'ID': 'expire-logs',
+        'Status': 'Enabled',
+        'Filter': {'Prefix': 'logs/'},
+        'Expiration': {'Days': 30},
+    },
+    {
+        'ID': 'archive-big',
+        'Status': 'Enabled',
+        'Filter': {'ObjectSizeGreaterThan': 100},
+        'Transitions': [
+            {'Days': 10, 'StorageClass': 'STANDARD_IA'},
+            {'Days': 60, 'StorageClass': 'GLACIER'},
+        ],
+    },
+    {
+        'ID': 'tagged',
+        'Status': 'Enabled',
+        'Filter': {
+            'And': {'Prefix': 'tmp/', 'Tags': [{'Key': 'temp', 'Value': '1'}]}
+        },
+        'Expiration': {'Days': 1},
+    },
+    {
+        'ID': 'off',
+        'Status': 'Disabled',
+        'Filter': {},
+        'Expiration': {'Days': 1},
+    },
+]
+
+
+def stats(report, rule_id):
+    return next(r for r in report['rules'] if r['id'] == rule_id)
+
+
+class TestPrefixTrie:
+    def test_collects_every_matching_prefix(self):
+        trie = PrefixTrie()
+        trie.add('', 'all')
+        trie.add('logs/', 'logs')
+        trie.add('logs/2026/', 'recent')
+        trie.add('img/', 'img')
+        assert trie.match('logs/2026/a') == ['all', 'logs', 'recent']
+        assert trie.match('logs') == ['all']
+
+
+def test_due_at_rounds_to_next_midnight():
+    assert due_at(day(1, 1), 1) == datetime(2026, 1, 3, tzinfo=timezone.utc)
+    midnight = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert due_at(midnight, 1) == datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+class TestCurrentActions:
+    def simulate(self, objects, tags=None):
+        simulator = LifecycleSimulator(
+            RULES, AT, get_tags=lambda key: (tags or {}).get(key, {})
+        )
+        for row in objects:
+            simulator.add_object(row)
+        return simulator, simulator.report()
+
+    def test_expiration_and_transitions(self):
+        _, report = self.simulate(
+            [
+                obj('logs/old.log', 500, day(4, 1)),
+                obj('logs/new.log', 5, day(5, 30)),
+                obj('big.iso', 1000, day(3, 1)),
+                obj('mid.iso', 1000, day(5, 1)),
+                obj('cold.iso', 1000, day(5, 1), 'STANDARD_IA'),
+            ]
+        )
+        assert stats(report, 'expire-logs')['expire'] == {
+            'objects': 1,
+            'size': 500,
+        }
+        assert stats(report, 'archive-big')['transition'] == [
+            # logs/old.log counts here too: per rule, what it matches.
+            {'storage_class': 'GLACIER', 'objects': 2, 'size': 1500},
+            {'storage_class': 'STANDARD_IA', 'objects': 1, 'size': 1000},
+        ]
+        # In the totals, each object once; expiration wins.
+        assert report['totals']['expire']['objects'] == 1
+        assert sum(t['objects'] for t in report['totals']['transition']) == 2
+
+    def test_disabled_rules_do_nothing(self):
+        _, report = self.simulate([obj('a.txt', 1, day(1, 1))])
+        assert stats(report, 'off')['matched']['objects'] == 0
+
+    def test_tags_fetched_only_when_needed(self):
+        simulator, report = self.simulate(
+            [
+                obj('tmp/a', 1, day(5, 1)),
+                obj('tmp/b', 1, day(5, 1)),
+                obj('keep/c', 1, day(5, 1)),
+            ],
+            tags={'tmp/a': {'temp': '1'}},
+        )
+        assert simulator.tag_lookups == 2
+        assert stats(report, 'tagged')['expire']['objects'] == 1
+
+    def test_listing_prefix(self):
+        rules = [dict(RULES[0]), dict(RULES[0], ID='x')]
+        rules[1]['Filter'] = {'Prefix': 'logs/app/'}
+        assert LifecycleSimulator(rules, AT).listing_prefix == 'logs/'
+        assert LifecycleSimulator(RULES, AT).listing_prefix == ''
+
+
+class TestNoncurrentActions:
+    RULES = [
+        {
+            'ID': 'keep-two',
+            'Status': 'Enabled',
+            'Filter': {},
+            'NoncurrentVersionExpiration': {
+                'NoncurrentDays': 7,
+                'NewerNoncurrentVersions': 1,
+            },
+        }
+    ]
+
+    def test_keeps_newer_versions_and_counts_age_from_replacement(self):
+        simulator = LifecycleSimulator(self.RULES, AT)
+        assert simulator.needs_versions
+        simulator.add_version_rows(
+            [
+                version('a', 'v4', day(5, 30), latest=True),
+                # Newest noncurrent: kept by NewerNoncurrentVersions.
+                version('a', 'v3', day(5, 1), size=30),
+                # Replaced on 5/1: noncurrent for long enough.
+                version('a', 'v2', day(4, 1), size=20),
+                version('a', 'v1', day(3, 1), size=10),
+            ]
+        )
+        report = simulator.report()
+        assert report['totals']['noncurrent_expire'] == {
+            'objects': 2,
+            'size': 30,
+        }
+        assert report['scanned_versions'] == 4
+
+    def test_latest_version_is_the_current_object(self):
+        rules = [
+            dict(
+                self.RULES[0],
+                Filter={'Tag': {'Key': 'temp', 'Value': '1'}},
+            )
+        ]
+        lookups = []
+
+        def get_tags(key):
+            lookups.append(key)
+            return {'temp': '1'}
+
+        simulator = LifecycleSimulator(rules, AT, get_tags=get_tags)
+        simulator.add_version_rows(
+            [
+                version('a', 'v3', day(5, 30), latest=True),
+                version('a', 'v2', day(5, 1), size=30),
+                version('a', 'v1', day(4, 1), size=20),
+            ]
+        )
+
+        report = simulator.report()
+        assert lookups == ['a']
+        assert report['scanned_objects'] == 1
+        assert report['rules'][0]['matched'] == {'objects': 1, 'size': 1}
+        assert report['totals']['noncurrent_expire'] == {
+            'objects': 1,
+            'size': 20,
+        }
@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from mine_backend.core.metrics import (
+    InstrumentedClient,
+    http_metrics_middleware,
+    key_prefix,
+    metrics_response,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FakeDriver:
+    region = 'us-east-1'
+
+    def list_buckets(self):
+        return ['a']
+
+    def delete_bucket(self, name):
+        raise RuntimeError('boom')
+
+
+class TestInstrumentedClient:
+    def test_times_successful_calls(self):
+        labels = {'backend': 's3', 'operation': 'list_buckets', 'outcome': 'ok'}
+        before = sample('mine_backend_call_duration_seconds_count', **labels)
+        client = InstrumentedClient(FakeDriver(), 's3')
+        assert client.list_buckets() == ['a']
+        after = sample('mine_backend_call_duration_seconds_count', **labels)
+        assert after == before + 1
+
+    def test_times_failed_calls(self):
+        labels = {'backend': 's3', 'operation': 'delete_bucket', 'outcome': 'error'}
+        before = sample('mine_backend_call_duration_seconds_count', **labels)
+        client = InstrumentedClient(FakeDriver(), 's3')
+        with pytest.raises(RuntimeError):
+            client.delete_bucket('a')
+        after = sample('mine_backend_call_duration_seconds_count', **labels)
+        assert after == before + 1
+
+    def test_attributes_pass_through(self):
+        assert InstrumentedClient(FakeDriver(), 's3').region == 'us-east-1'
+
+
+def test_key_prefix():
+    assert key_prefix('users:alice') == 'users'
+    assert key_prefix('users') == 'users'
+
+
+def test_http_middleware_uses_route_template():
+    app = FastAPI()
+    app.middleware('http')(http_metrics_middleware)
+
+    @app.get('/items/{item_id}')
+    async def read_item(item_id: str):
+        return {'id': item_id}
+
+    @app.get('/metrics')
+    async def metrics():
+        return metrics_response()
+
+    client = TestClient(app)
+    labels = {'method': 'GET', 'route': '/items/{item_id}', 'status': '200'}
+    before = sample('mine_http_request_duration_seconds_count', **labels)
+    client.get('/items/1')
+    client.get('/items/2')
+    assert sample('mine_http_request_duration_seconds_count', **labels) == before + 2
+
+    body = client.get('/metrics').text
+    assert 'mine_http_request_duration_seconds_bucket' in body
@@ -0,0 +1,216 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from mine_backend.config import settings
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+)
+from mine_backend.services.multipart_service import (
+    MAX_PARTS,
+    MultipartUploadService,
+    plan_parts,
+)
+
+MiB = 1024**2
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code}}, 'op')
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {'UploadId': 'u1'}
+    client.generate_presigned_url.side_effect = (
+        lambda op, Params, ExpiresIn: f"https://s3/{Params['PartNumber']}"
+    )
+    return client
+
+
+class TestPlanParts:
+    def test_default_part_size(self):
+        assert plan_parts(100 * MiB, 16 * MiB) == {
+            'part_size': 16 * MiB,
+            'part_count': 7,
+        }
+
+    def test_grows_to_stay_within_part_limit(self):
+        plan = plan_parts(200_000 * MiB, 5 * MiB)
+        assert plan['part_count'] <= MAX_PARTS
+        assert plan['part_size'] % MiB == 0
+
+    def test_rejects_small_parts(self):
+        with pytest.raises(InconsistentDataError):
+            plan_parts(10 * MiB, MiB)
+
+
+class TestMultipartUploadService:
+    def test_initiate(self, client):
+        service = MultipartUploadService(client)
+        result = service.initiate(
+            'my-bucket', 'big.iso', 'application/octet-stream', 40 * MiB
+        )
+        assert result['upload_id'] == 'u1'
+        assert result['part_count'] == 3
+        client.create_multipart_upload.assert_called_once_with(
+            Bucket='my-bucket',
+            Key='big.iso',
+            ContentType='application/octet-stream',
+        )
+
+    def test_invalid_bucket(self, client):
+        with pytest.raises(InconsistentDataError):
+            MultipartUploadService(client).initiate('Bad_Bucket', 'k')
+
+    def test_presign_parts(self, client):
+        result = MultipartUploadService(client).presign_parts(
+            'my-bucket', 'big.iso', 'u1', [1, 2, 3]
+        )
+        assert [u['part_number'] for u in result['urls']] == [1, 2, 3]
+        assert result['urls'][2]['url'] == 'https://s3/3'
+        client.create_multipart_upload.assert_not_called()
+
+    def test_presign_rejects_bad_part_numbers(self, client):
+        with pytest.raises(InconsistentDataError):
+            MultipartUploadService(client).presign_parts(
+                'my-bucket', 'big.iso', 'u1', [0]
+            )
+
+    def test_list_parts_follows_markers(self, client):
+        client.list_parts.side_effect = [
+            {
+                'Parts': [{'PartNumber': 1, 'ETag': '"a"', 'Size': 5}],
+                'IsTruncated': True,
+                'NextPartNumberMarker': 1,
+            },
+            {'Parts': [{'PartNumber': 2, 'ETag': '"b"', 'Size': 3}]},
+        ]
+        parts = MultipartUploadService(client).list_parts(
+            'my-bucket', 'big.iso', 'u1'
+        )['parts']
+        assert [p['part_number'] for p in parts] == [1, 2]
+        assert client.list_parts.call_args.kwargs['PartNumberMarker'] == 1
+
+    def test_complete_with_stored_parts(self, client):
+        client.list_parts.return_value = {
+            'Parts': [
+                {'PartNumber': 2, 'ETag': '"b"', 'Size': 3},
+                {'PartNumber': 1, 'ETag': '"a"', 'Size': 5},
+            ]
+        }
+        client.complete_multipart_upload.return_value = {'ETag': '"ab-2"'}
+
+        result = MultipartUploadService(client).complete(
+            'my-bucket', 'big.iso', 'u1'
+        )
+
+        assert result['etag'] == '"ab-2"'
+        sent = client.complete_multipart_upload.call_args.kwargs
+        assert sent['MultipartUpload']['Parts'] == [
+            {'PartNumber': 1, 'ETag': '"a"'},
+            {'PartNumber': 2, 'ETag': '"b"'},
+        ]
+
+    def test_complete_without_parts(self, client):
+        client.list_parts.return_value = {'Parts': []}
+        with pytest.raises(InconsistentDataError):
+            MultipartUploadService(client).complete(
+                'my-bucket', 'big.iso', 'u1'
+            )
+
+    def test_unknown_upload(self, client):
+        client.abort_multipart_upload.side_effect = client_error(
+            'NoSuchUpload'
+        )
+        with pytest.raises(NotFoundError):
+            MultipartUploadService(client).abort('my-bucket', 'big.iso', 'u1')
+
+    def test_list_uploads(self, client):
+        initiated = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        client.list_multipart_uploads.return_value = {
+            'Uploads': [
+                {'Key': 'big.iso', 'UploadId': 'u1', 'Initiated': initiated}
+            ]
+        }
+        result = MultipartUploadService(client).list_uploads(
+            'my-bucket', 'big'
+        )
+        assert result['uploads'] == [
+            {'key': 'big.iso', 'upload_id': 'u1', 'initiated': initiated}
+        ]
+        client.list_multipart_uploads.assert_called_once_with(
+            Bucket='my-bucket', Prefix='big'
+        )
+
+
+class TestUploadStream:
+    def test_small_output_is_a_single_put(self, client):
+        client.put_object.return_value = {'ETag': '"x"'}
+        result = MultipartUploadService(client).upload_stream(
+            'my-bucket', 'inv.csv', [b'a', b'b'], 'text/csv'
+        )
+        assert result['size'] == 2
+        client.put_object.assert_called_once_with(
+            Bucket='my-bucket',
+            Key='inv.csv',
+            Body=b'ab',
+            ContentType='text/csv',
+        )
+        client.create_multipart_upload.assert_not_called()
+
+    def test_large_output_is_split_into_parts(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'MULTIPART_PART_SIZE', 4)
+        client.upload_part.side_effect = lambda **kw: {
+            'ETag': f'"{kw["PartNumber"]}"'
+        }
+        client.complete_multipart_upload.return_value = {'ETag': '"m-3"'}
+
+        result = MultipartUploadService(client).upload_stream(
+            'my-bucket', 'inv.csv', [b'abc', b'defgh', b'ij']
+        )
+
+        bodies = [c.kwargs['Body'] for c in client.upload_part.call_args_list]
+        assert bodies == [b'abcd', b'efgh', b'ij']
+        assert (result['size'], result['parts']) == (10, 3)
+
+    def test_failure_aborts_the_upload(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'MULTIPART_PART_SIZE', 4)
+
+        def chunks():
+            yield b'abcdef'
+            raise RuntimeError('listing failed')
+
+        with pytest.raises(RuntimeError):
+            MultipartUploadService(client).upload_stream(
+                'my-bucket', 'inv.csv', chunks()
+            )
+        client.abort_multipart_upload.assert_called_once()
+
+    def test_source_errors_are_not_blamed_on_destination(
+        self, client, monkeypatch
+    ):
+        monkeypatch.setattr(settings, 'MULTIPART_PART_SIZE', 4)
+
+        def chunks():
+            yield b'abcdef'
+            raise client_error('NoSuchBucket')
+
+        with pytest.raises(ClientError):
+            MultipartUploadService(client).upload_stream(
+                'dest-bucket', 'inv.csv', chunks()
+            )
+        client.abort_multipart_upload.assert_called_once()
+
+    def test_upload_errors_name_destination(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'MULTIPART_PART_SIZE', 4)
+        client.upload_part.side_effect = client_error('NoSuchBucket')
+
+        with pytest.raises(NotFoundError, match="'dest-bucket'"):
+            MultipartUploadService(client).upload_stream(
+                'dest-bucket', 'inv.csv', [b'abcdef']
+            )
@@ -0,0 +1,403 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+from mine_backend.core import cache as cache_module
+from mine_backend.core.cache import CacheManager
+from mine_backend.core.metrics import InstrumentedClient
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.object_listing import (
+    ListingChain,
+    ListingPrefetcher,
+    accepts_argument,
+    iter_objects,
+    iter_versions,
+    page_versions,
+    scan_directory,
+)
+
+
+@dataclass
+class Obj:
+    key: str
+    size: int = 1
+    last_modified: str = '2024-01-01T00:00:00Z'
+    etag: str = '"e"'
+    storage_class: str = 'STANDARD'
+
+
+@dataclass
+class Page:
+    objects: list
+    is_truncated: bool
+    next_continuation_token: Optional[str]
+    common_prefixes: list = field(default_factory=list)
+
+
+KEYS = [
+    'a.txt',
+    'docs/readme.md',
+    'docs/img/logo.png',
+    'logs/2026/01.log',
+    'logs/2026/02.log',
+    'z.txt',
+]
+
+
+class FlatS3:
+    """Driver without delimiter support; pages of two keys."""
+
+    def __init__(self, keys=KEYS):
+        self.keys = sorted(keys)
+        self.calls = 0
+
+    def list_objects(
+        self, bucket, prefix=None, limit=100, continuation_token=None
+    ):
+        self.calls += 1
+        keys = [k for k in self.keys if k.startswith(prefix or '')]
+        start = keys.index(continuation_token) + 1 if continuation_token else 0
+        chunk = keys[start : start + 2]
+        more = start + 2 < len(keys)
+        return Page([Obj(k) for k in chunk], more, chunk[-1] if more else None)
+
+
+class DelimiterS3(FlatS3):
+    def list_objects(
+        self,
+        bucket,
+        prefix=None,
+        limit=100,
+        continuation_token=None,
+        delimiter=None,
+    ):
+        self.calls += 1
+        prefix = prefix or ''
+        objects, prefixes = [], set()
+        for k in self.keys:
+            if not k.startswith(prefix):
+                continue
+            rest = k[len(prefix) :]
+            if delimiter in rest:
+                prefixes.add(prefix + rest[: rest.index(delimiter) + 1])
+            else:
+                objects.append(Obj(k))
+        return Page(objects, False, None, sorted(prefixes))
+
+
+class TestScanDirectory:
+    @pytest.mark.parametrize('driver', [FlatS3, DelimiterS3])
+    def test_root_level(self, driver):
+        listing = scan_directory(driver(), 'b', None, '/')
+        assert listing['common_prefixes'] == ['docs/', 'logs/']
+        assert [o['key'] for o in listing['objects']] == ['a.txt', 'z.txt']
+
+    @pytest.mark.parametrize('driver', [FlatS3, DelimiterS3])
+    def test_nested_level(self, driver):
+        listing = scan_directory(driver(), 'b', 'docs/', '/')
+        assert listing['prefix'] == 'docs/'
+        assert listing['common_prefixes'] == ['docs/img/']
+        assert [o['key'] for o in listing['objects']] == ['docs/readme.md']
+
+    def test_native_delimiter_through_instrumented_client(self):
+        s3 = DelimiterS3()
+        assert accepts_argument(
+            InstrumentedClient(s3, 's3').list_objects, 'delimiter'
+        )
+        assert not accepts_argument(
+            InstrumentedClient(FlatS3(), 's3').list_objects, 'delimiter'
+        )
+        scan_directory(InstrumentedClient(s3, 's3'), 'b', None, '/')
+        assert s3.calls == 1
+
+    def test_empty_delimiter(self):
+        with pytest.raises(InconsistentDataError):
+            scan_directory(FlatS3(), 'b', None, '')
+
+
+def test_iter_objects_follows_tokens():
+    s3 = FlatS3()
+    assert [o.key for o in iter_objects(s3, 'b')] == sorted(KEYS)
+    assert s3.calls == 3
+
+
+class StartAfterS3(FlatS3):
+    """Flat driver that can resume after a key, like ``StartAfter``."""
+
+    def __init__(self, keys=KEYS):
+        super().__init__(keys)
+        self.start_afters = []
+
+    def list_objects(
+        self,
+        bucket,
+        prefix=None,
+        limit=100,
+        continuation_token=None,
+        start_after=None,
+    ):
+        if start_after is None:
+            return super().list_objects(
+                bucket, prefix, limit, continuation_token
+            )
+        self.calls += 1
+        self.start_afters.append(start_after)
+        keys = [
+            k
+            for k in self.keys
+            if k.startswith(prefix or '') and k > start_after
+        ]
+        chunk = keys[:2]
+        more = len(keys) > 2
+        return Page([Obj(k) for k in chunk], more, chunk[-1] if more else None)
+
+
+class TestDirectoryPages:
+    @pytest.mark.parametrize('driver', [FlatS3, StartAfterS3, DelimiterS3])
+    def test_pages_interleave_folders_and_objects(self, driver):
+        s3 = driver()
+        first = scan_directory(s3, 'b', None, '/', limit=3)
+        assert first['common_prefixes'] == ['docs/', 'logs/']
+        assert [o['key'] for o in first['objects']] == ['a.txt']
+        assert first['is_truncated'] is True
+
+        second = scan_directory(
+            s3,
+            'b',
+            None,
+            '/',
+            limit=3,
+            continuation_token=first['next_continuation_token'],
+        )
+        assert second['common_prefixes'] == []
+        assert [o['key'] for o in second['objects']] == ['z.txt']
+        assert second['is_truncated'] is False
+        assert second['next_continuation_token'] is None
+
+    def test_stops_listing_once_page_is_full(self):
+        s3 = FlatS3()
+        page = scan_directory(s3, 'b', None, '/', limit=1)
+        assert [o['key'] for o in page['objects']] == ['a.txt']
+        assert page['next_continuation_token'] == 'a.txt'
+        # 'a.txt' and the first key of 'docs/' fill the page: one call.
+        assert s3.calls == 1
+
+    def test_start_after_skips_folder_subtrees(self):
+        keys = ['a/1', 'a/2', 'a/3', 'a/4', 'a/5', 'b.txt']
+        s3 = StartAfterS3(keys)
+        page = scan_directory(s3, 'b', None, '/')
+        assert page['common_prefixes'] == ['a/']
+        assert [o['key'] for o in page['objects']] == ['b.txt']
+        # The rest of 'a/' is never read: the next listing starts past it.
+        assert s3.calls == 2
+        assert s3.start_afters == ['a/\U0010ffff']
+
+    def test_resumes_after_folder_token(self):
+        s3 = StartAfterS3()
+        page = scan_directory(
+            s3, 'b', None, '/', limit=10, continuation_token='docs/'
+        )
+        assert page['common_prefixes'] == ['logs/']
+        assert [o['key'] for o in page['objects']] == ['z.txt']
+        assert s3.start_afters[0] == 'docs/\U0010ffff'
+
+
+async def test_local_cache_without_redis(monkeypatch):
+    monkeypatch.setattr(cache_module, 'redis', None)
+    monkeypatch.setattr(cache_module, '_local', cache_module.LRUCache(16))
+    cache = CacheManager(user_id='u1', is_admin=False)
+    calls = []
+
+    def load(name):
+        calls.append(name)
+        return {'name': name}
+
+    key = 'objects:b::dir:/:100:'
+    assert await cache.get_or_set_local(key, load, 'x') == {'name': 'x'}
+    assert await cache.get_or_set_local(key, load, 'x') == {'name': 'x'}
+    assert calls == ['x']
+
+    await cache.invalidate_prefix('objects:b:')
+    await cache.get_or_set_local(key, load, 'x')
+    assert calls == ['x', 'x']
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+        self.calls = 0
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+    async def get_or_set(self, key, fn, *args):
+        if key not in self.data:
+            self.calls += 1
+            self.data[key] = await fn(*args)
+        return self.data[key]
+
+
+class TestListingChain:
+    async def test_first_page_needs_no_token(self):
+        chain = ListingChain(FakeCache(), 'bkt', 'p/', 10)
+        assert await chain.token_for(1) is None
+        assert await chain.page_of(None) == 1
+        assert chain.page_key(None) == 'objects:bkt:p/:10:'
+
+    async def test_unknown_page_raises(self):
+        chain = ListingChain(FakeCache(), 'bkt', None, 10)
+        with pytest.raises(InconsistentDataError):
+            await chain.token_for(3)
+
+    async def test_link_resolves_both_ways(self):
+        cache = FakeCache()
+        await ListingChain(cache, 'bkt', None, 10).link(2, 'tok-2')
+
+        chain = ListingChain(cache, 'bkt', None, 10)
+        assert await chain.token_for(2) == 'tok-2'
+        assert await chain.page_of('tok-2') == 2
+        assert await chain.page_of('other') is None
+        # Another page size is another chain.
+        other = ListingChain(cache, 'bkt', None, 20)
+        assert await other.page_of('tok-2') is None
+
+
+class TestListingPrefetcher:
+    async def test_fetches_in_background_once(self):
+        cache = FakeCache()
+        prefetcher = ListingPrefetcher(concurrency=4)
+        calls = []
+
+        def fetch(token):
+            calls.append(token)
+            return {'token': token}
+
+        assert prefetcher.schedule(cache, 'k', fetch, 't')
+        assert not prefetcher.schedule(cache, 'k', fetch, 't')
+        await asyncio.gather(*prefetcher._tasks)
+
+        assert calls == ['t']
+        assert cache.data['k'] == {'token': 't'}
+        # Done: the key may be scheduled again (and is a cache hit).
+        assert prefetcher.schedule(cache, 'k', fetch, 't')
+        await asyncio.gather(*prefetcher._tasks)
+        assert calls == ['t']
+
+    async def test_skips_beyond_concurrency(self):
+        prefetcher = ListingPrefetcher(concurrency=1)
+        cache = FakeCache()
+        assert prefetcher.schedule(cache, 'a', lambda: 1)
+        assert not prefetcher.schedule(cache, 'b', lambda: 2)
+        await asyncio.gather(*prefetcher._tasks)
+        assert 'b' not in cache.data
+
+    async def test_errors_are_swallowed(self):
+        def fail():
+            raise RuntimeError('boom')
+
+        prefetcher = ListingPrefetcher(concurrency=1)
+        prefetcher.schedule(FakeCache(), 'a', fail)
+        await asyncio.gather(*prefetcher._tasks)
+        assert not prefetcher._in_flight
+
+
+@dataclass
+class Version:
+    version_id: str
+    is_latest: bool = False
+    last_modified: str = '2024-01-01T00:00:00Z'
+    size: int = 1
+
+
+class VersionedS3(FlatS3):
+    def __init__(self, keys, versions_per_key=3):
+        super().__init__(keys)
+        self.versions_per_key = versions_per_key
+        self.version_calls = []
+
+    def list_object_versions(self, bucket, key):
+        self.version_calls.append(key)
+        return [
+            Version(f'{key}#{n}', is_latest=n == 0)
+            for n in range(self.versions_per_key)
+        ]
+
+
+class VersionedStartAfterS3(StartAfterS3):
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.version_calls = []
+
+    def list_object_versions(self, bucket, key):
+        self.version_calls.append(key)
+        return [Version(f'{key}#0', is_latest=True)]
+
+
+class TestVersions:
+    def test_iter_versions_by_key_from_start_key(self):
+        s3 = VersionedS3(KEYS, versions_per_key=2)
+        rows = list(iter_versions(s3, 'bkt', 'logs/', concurrency=2))
+        assert [(r['key'], r['version_id']) for r in rows] == [
+            ('logs/2026/01.log', 'logs/2026/01.log#0'),
+            ('logs/2026/01.log', 'logs/2026/01.log#1'),
+            ('logs/2026/02.log', 'logs/2026/02.log#0'),
+            ('logs/2026/02.log', 'logs/2026/02.log#1'),
+        ]
+
+        s3 = VersionedS3(KEYS)
+        list(iter_versions(s3, 'bkt', start_key='logs/2026/02.log'))
+        assert s3.version_calls == ['logs/2026/02.log', 'z.txt']
+
+    def test_start_after_resumes_at_start_key(self):
+        s3 = VersionedStartAfterS3(KEYS)
+        list(iter_versions(s3, 'bkt', start_key='logs/2026/02.log'))
+        assert s3.version_calls == ['logs/2026/02.log', 'z.txt']
+        # One listing from just before the key, not from the first key.
+        assert s3.calls == 1
+        assert s3.start_afters[0] < 'logs/2026/02.log'
+
+        s3 = VersionedStartAfterS3(KEYS)
+        list(
+            iter_versions(
+                s3, 'bkt', start_key='logs/2026/02.log', include_start=False
+            )
+        )
+        assert s3.version_calls == ['z.txt']
+        assert s3.start_afters == ['logs/2026/02.log']
+
+    def test_pages_follow_markers(self):
+        s3 = VersionedS3(KEYS)
+        seen = []
+        markers = {}
+        while True:
+            page = page_versions(
+                iter_versions(s3, 'bkt', concurrency=3), limit=4, **markers
+            )
+            seen += [r['version_id'] for r in page['versions']]
+            if not page['is_truncated']:
+                break
+            markers = {
+                'key_marker': page['next_key_marker'],
+                'version_id_marker': page['next_version_id_marker'],
+            }
+
+        expected = [f'{k}#{n}' for k in sorted(KEYS) for n in range(3)]
+        assert seen == expected
+
+    def test_key_marker_alone_skips_the_whole_key(self):
+        rows = iter_versions(VersionedS3(KEYS), 'bkt')
+        page = page_versions(rows, limit=2, key_marker='docs/readme.md')
+        assert [r['key'] for r in page['versions']] == ['logs/2026/01.log'] * 2
+        assert page['is_truncated']
+
+    def test_page_stops_consuming_after_limit(self):
+        s3 = VersionedS3(KEYS, versions_per_key=1)
+        page = page_versions(iter_versions(s3, 'bkt'), limit=1)
+        assert len(page['versions']) == 1
+        # One batch of keys is fetched; the rest of the bucket is not.
+        assert len(s3.version_calls) <= 4
@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from botocore.exceptions import ClientError
 
+from mine_backend.config import settings
 from mine_backend.services.object_service import ObjectService
 from mine_backend.exceptions.application import (
     InconsistentDataError,
@@ -58,6 +59,24 @@ class TestListObjects:
         assert result['bucket'] == 'my-bucket'
         assert result['prefix'] == 'test/'
 
+    def test_delimiter_groups_common_prefixes(self, service, mock_s3):
+        objects = []
+        for key in ('test/a.txt', 'test/sub/b.txt', 'test/sub/c.txt'):
+            obj = MagicMock()
+            obj.key = key
+            objects.append(obj)
+        mock_s3.list_objects.return_value = make_list_result(objects)
+
+        result = service.list_objects('my-bucket', prefix='test/', delimiter='/')
+
+        assert result['common_prefixes'] == ['test/sub/']
+        assert [o['key'] for o in result['objects']] == ['test/a.txt']
+        assert result['delimiter'] == '/'
+
+    def test_delimiter_invalid_bucket_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.list_objects('AB', delimiter='/')
+
 
 class TestDeleteObject:
     def test_invalid_bucket_raises(self, service):
@@ -98,6 +117,135 @@ class TestMoveObject:
         assert 'message' in result
 
 
+class TestPlanArchive:
+    def make_objects(self, *keys):
+        objects = []
+        for key in keys:
+            obj = MagicMock()
+            obj.key = key
+            obj.size = 10
+            objects.append(obj)
+        return objects
+
+    def test_invalid_format_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.plan_archive('my-bucket', 'docs/', 'rar')
+
+    def test_entries_relative_to_prefix(self, service, mock_s3):
+        mock_s3.list_objects.return_value = make_list_result(
+            self.make_objects('docs/', 'docs/a.txt', 'docs/sub/b.txt')
+        )
+        entries = service.plan_archive('my-bucket', 'docs/')
+        assert [e['name'] for e in entries] == ['a.txt', 'sub/b.txt']
+
+    def test_size_cap(self, service, mock_s3):
+        mock_s3.list_objects.return_value = make_list_result(
+            self.make_objects('a', 'b')
+        )
+        with patch.object(settings, 'ARCHIVE_MAX_BYTES', 15):
+            with pytest.raises(InconsistentDataError):
+                service.plan_archive('my-bucket')
+
+    def test_empty_prefix_raises_not_found(self, service, mock_s3):
+        mock_s3.list_objects.return_value = make_list_result()
+        with pytest.raises(NotFoundError):
+            service.plan_archive('my-bucket', 'nothing/')
+
+
+class TestStreamInventory:
+    def test_filters_while_listing(self, service, mock_s3):
+        objects = []
+        for key, size in [('a.log', 5), ('b.log', 50), ('c.txt', 50)]:
+            obj = MagicMock()
+            obj.key, obj.size = key, size
+            obj.last_modified = None
+            obj.etag, obj.storage_class = 'e', 'STANDARD'
+            objects.append(obj)
+        mock_s3.list_objects.return_value = make_list_result(objects)
+
+        chunks = service.stream_inventory(
+            'my-bucket', None, 'ndjson', {'min_size': 10, 'suffix': '.log'}
+        )
+
+        assert b''.join(chunks).count(b'\n') == 1
+
+    def test_invalid_format_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.stream_inventory('my-bucket', None, 'xlsx')
+
+    def test_missing_bucket_raises_before_streaming(self, service, mock_s3):
+        mock_s3.list_objects.side_effect = make_client_error('NoSuchBucket')
+        with pytest.raises(NotFoundError, match="'my-bucket'"):
+            service.stream_inventory('my-bucket', None, 'csv')
+
+    def test_later_listing_error_names_source_bucket(self, service, mock_s3):
+        obj = MagicMock()
+        obj.key, obj.size, obj.last_modified = 'a', 1, None
+        obj.etag, obj.storage_class = 'e', 'STANDARD'
+        first = make_list_result([obj])
+        first.is_truncated = True
+        first.next_continuation_token = 't'
+        mock_s3.list_objects.side_effect = [
+            first,
+            make_client_error('AccessDenied'),
+        ]
+
+        chunks = service.stream_inventory('my-bucket', None, 'csv')
+
+        with pytest.raises(PermissionDeniedError):
+            b''.join(chunks)
+
+
+class TestSyncBuckets:
+    def test_same_bucket_rejected(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.sync_buckets('my-bucket', 'my-bucket')
+
+    def test_report_names_both_buckets(self, service, mock_s3):
+        mock_s3.list_objects.return_value = make_list_result()
+        report = service.sync_buckets('prod-assets', 'dr-assets')
+        assert report['source_bucket'] == 'prod-assets'
+        assert report['unchanged'] == 0
+
+    def test_dest_listing_error_names_dest_bucket(self, service, mock_s3):
+        def list_objects(bucket, **kwargs):
+            if bucket == 'dr-assets':
+                raise make_client_error('NoSuchBucket')
+            return make_list_result()
+
+        mock_s3.list_objects.side_effect = list_objects
+
+        with pytest.raises(NotFoundError, match="'dr-assets'"):
+            service.sync_buckets('prod-assets', 'dr-assets')
+
+    def test_source_listing_error_names_source_bucket(self, service, mock_s3):
+        def list_objects(bucket, **kwargs):
+            if bucket == 'prod-assets':
+                raise make_client_error('NoSuchBucket')
+            return make_list_result()
+
+        mock_s3.list_objects.side_effect = list_objects
+
+        with pytest.raises(NotFoundError, match="'prod-assets'"):
+            list(service.diff_buckets('prod-assets', 'dr-assets'))
+
+
+class TestFindDuplicates:
+    def test_requires_buckets(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.find_duplicates([])
+
+    def test_same_object_in_two_buckets(self, service, mock_s3):
+        obj = MagicMock()
+        obj.key, obj.size, obj.etag = 'a.bin', 10, '"e"'
+        mock_s3.list_objects.return_value = make_list_result([obj])
+
+        report = service.find_duplicates(['tenant-a', 'tenant-b', 'tenant-a'])
+
+        assert report['buckets'] == ['tenant-a', 'tenant-b']
+        assert report['reclaimable_bytes'] == 10
+
+
 class TestGenerateUploadUrl:
     def test_invalid_bucket_raises(self, service):
         with pytest.raises(InconsistentDataError):
@@ -143,6 +291,45 @@ class TestGenerateDownloadUrl:
         assert 'bucket' in result
 
 
+class TestListObjectVersions:
+    def test_key_or_prefix_required(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.list_object_versions('my-bucket')
+        with pytest.raises(InconsistentDataError):
+            service.list_object_versions('my-bucket', 'key', prefix='p/')
+
+    def test_key_mode_is_paginated(self, service, mock_s3):
+        versions = []
+        for n in range(3):
+            v = MagicMock(spec=['version_id', 'is_latest', 'last_modified', 'size'])
+            v.version_id = f'v{n}'
+            versions.append(v)
+        mock_s3.list_object_versions.return_value = versions
+
+        result = service.list_object_versions('my-bucket', 'key', limit=2)
+
+        assert [v['version_id'] for v in result['versions']] == ['v0', 'v1']
+        assert result['is_truncated']
+        assert result['next_key_marker'] == 'key'
+        assert result['next_version_id_marker'] == 'v1'
+
+        result = service.list_object_versions(
+            'my-bucket', 'key', 2, 'key', 'v1'
+        )
+        assert [v['version_id'] for v in result['versions']] == ['v2']
+        assert not result['is_truncated']
+
+    def test_key_mode_pages_a_given_history(self, service, mock_s3):
+        history = [
+            {'key': 'key', 'version_id': f'v{n}'} for n in range(3)
+        ]
+        result = service.list_object_versions(
+            'my-bucket', 'key', 2, 'key', 'v1', history=history
+        )
+        assert [v['version_id'] for v in result['versions']] == ['v2']
+        mock_s3.list_object_versions.assert_not_called()
+
+
 class TestDeleteObjectVersion:
     def test_empty_version_id_raises(self, service):
         with pytest.raises(InconsistentDataError):
@@ -173,6 +360,45 @@ class TestRestoreObjectVersion:
         assert 'message' in result
 
 
+class TestBulkHeadObjects:
+    def test_invalid_bucket_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.bulk_head_objects('AB', ['key'])
+
+    def test_nothing_requested_raises(self, service):
+        with pytest.raises(InconsistentDataError):
+            service.bulk_head_objects('my-bucket', ['key'], metadata=False)
+
+    def test_partial_results_with_per_key_errors(self, service, mock_s3):
+        def get_object_metadata(bucket, key):
+            if key == 'missing':
+                raise make_client_error('NoSuchKey')
+            meta = MagicMock()
+            meta.size = 3
+            meta.content_type = 'text/plain'
+            return meta
+
+        mock_s3.get_object_metadata.side_effect = get_object_metadata
+        mock_s3.get_object_tags.return_value = {'env': 'dev'}
+
+        result = service.bulk_head_objects(
+            'my-bucket', ['a', 'missing', 'a'], tags=True
+        )
+
+        assert result['total'] == 2
+        assert result['failed'] == 1
+        ok, missing = result['results']
+        assert ok['item'] == 'a'
+        assert ok['result']['content_type'] == 'text/plain'
+        assert ok['result']['tags'] == {'env': 'dev'}
+        assert missing['error']['code'] == 'NOT_FOUND'
+
+    def test_tags_only_skips_head(self, service, mock_s3):
+        mock_s3.get_object_tags.return_value = {}
+        service.bulk_head_objects('my-bucket', ['a'], metadata=False, tags=True)
+        mock_s3.get_object_metadata.assert_not_called()
+
+
 class TestHandleError:
     def test_no_such_bucket_raises_not_found(self, service):
         with pytest.raises(NotFoundError):
@@ -0,0 +1,115 @@
+import pytest
+
+from mine_backend.core.pagination import ListSnapshot, decode_cursor
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.listing import group_snapshot, user_snapshot
+
+
+def make_snapshot(count=25):
+    rows = [
+        {
+            'username': f'user{i:02d}',
+            'status': 'enabled' if i % 3 else 'disabled',
+            'groups': ['ops'] if i % 2 else [],
+        }
+        for i in range(count)
+    ]
+    return ListSnapshot(
+        rows,
+        rows,
+        key='username',
+        sortable=('status',),
+        filterable=('status', 'groups'),
+    )
+
+
+def collect(snapshot, **kwargs):
+    names, cursor = [], None
+    while True:
+        page = snapshot.page(cursor=cursor, **kwargs)
+        names.extend(row['username'] for row in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return names
+
+
+class TestListSnapshot:
+    def test_first_page(self):
+        page = make_snapshot().page(limit=10)
+        assert [r['username'] for r in page['items']][:2] == ['user00', 'user01']
+        assert page['total'] == 25
+        assert page['next_cursor'] is not None
+
+    def test_cursor_walks_every_row_once(self):
+        names = collect(make_snapshot(), limit=7)
+        assert names == [f'user{i:02d}' for i in range(25)]
+
+    def test_descending(self):
+        names = collect(make_snapshot(), limit=4, order='desc')
+        assert names == [f'user{i:02d}' for i in reversed(range(25))]
+
+    def test_sort_by_secondary_field_breaks_ties_by_key(self):
+        names = collect(make_snapshot(), limit=6, sort='status')
+        disabled = [f'user{i:02d}' for i in range(25) if i % 3 == 0]
+        assert names[: len(disabled)] == disabled
+        assert len(names) == 25
+
+    def test_filters_and_search(self):
+        page = make_snapshot().page(
+            limit=100, q='USER1', filters={'groups': 'ops', 'status': 'enabled'}
+        )
+        assert [r['username'] for r in page['items']] == [
+            'user11', 'user13', 'user17', 'user19',
+        ]
+        assert page['total'] == 4
+        assert page['next_cursor'] is None
+
+    def test_unknown_filters_are_ignored(self):
+        page = make_snapshot().page(limit=100, filters={'password': 'x'})
+        assert page['total'] == 25
+
+    def test_cursor_survives_rebuild(self):
+        snapshot = make_snapshot()
+        first = snapshot.page(limit=5)
+        # user02 is deleted and a new user inserted before the cursor.
+        rows = [r for r in snapshot.rows if r['username'] != 'user02']
+        rows.append({'username': 'user00a', 'status': 'enabled', 'groups': []})
+        rebuilt = ListSnapshot(rows, rows, key='username')
+        second = rebuilt.page(limit=5, cursor=first['next_cursor'])
+        assert second['items'][0]['username'] == 'user05'
+
+    def test_rejects_unknown_sort(self):
+        with pytest.raises(InconsistentDataError):
+            make_snapshot().page(sort='password')
+
+    def test_rejects_mismatched_cursor(self):
+        cursor = make_snapshot().page(limit=5)['next_cursor']
+        with pytest.raises(InconsistentDataError):
+            make_snapshot().page(limit=5, cursor=cursor, order='desc')
+
+    def test_rejects_garbage_cursor(self):
+        with pytest.raises(InconsistentDataError):
+            decode_cursor('not a cursor')
+
+
+class TestListingSnapshots:
+    def test_user_mapping_becomes_rows(self):
+        snapshot = user_snapshot(
+            {
+                'bob': {'status': 'enabled', 'member_of': [{'name': 'ops'}]},
+                'alice': {'status': 'disabled'},
+            }
+        )
+        page = snapshot.page(limit=10)
+        assert [r['username'] for r in page['items']] == ['alice', 'bob']
+        assert page['items'][1]['groups'] == ['ops']
+
+    def test_user_list_falls_back_to_access_key(self):
+        snapshot = user_snapshot([{'access_key': 'carol', 'status': 'enabled'}])
+        assert snapshot.rows[0]['username'] == 'carol'
+
+    def test_group_list_is_flattened(self):
+        raw = [{'groups': ['b', 'a']}]
+        snapshot = group_snapshot(raw)
+        assert snapshot.raw == raw
+        assert [r['name'] for r in snapshot.page(limit=10)['items']] == ['a', 'b']
@@ -0,0 +1,167 @@
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+    PermissionDeniedError,
+    UnexpectedError,
+)
+from mine_backend.services.permission_service import PermissionService
+
+
+READ_DATA = {
+    'Version': '2012-10-17',
+    'Statement': [
+        {
+            'Effect': 'Allow',
+            'Action': ['s3:GetObject', 's3:PutObject'],
+            'Resource': 'arn:aws:s3:::data/*',
+        }
+    ],
+}
+
+DENY_PUT_FOR_ALICE = {
+    'Version': '2012-10-17',
+    'Statement': [
+        {
+            'Effect': 'Deny',
+            'Principal': {'AWS': 'arn:aws:iam::123456789012:user/alice'},
+            'Action': 's3:PutObject',
+            'Resource': 'arn:aws:s3:::data/*',
+        }
+    ],
+}
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code}}, 'GetBucketPolicy')
+
+
+def make_user(status='enabled', policy_name='', groups=()):
+    return SimpleNamespace(
+        status=status,
+        policy_name=policy_name,
+        member_of=[SimpleNamespace(name=g, policies=None) for g in groups],
+    )
+
+
+def make_policy(document):
+    return SimpleNamespace(policy_info=SimpleNamespace(policy=document))
+
+
+def group_mapping(group, policies):
+    return SimpleNamespace(
+        result=SimpleNamespace(
+            group_mappings=[SimpleNamespace(group=group, policies=policies)]
+        )
+    )
+
+
+@pytest.fixture
+def service(mock_s3, mock_admin):
+    mock_s3.get_bucket_policy.side_effect = client_error('NoSuchBucketPolicy')
+    return PermissionService(mock_s3, mock_admin)
+
+
+def check(action, bucket='data', key='a.txt'):
+    return {'action': action, 'bucket': bucket, 'key': key}
+
+
+class TestCollectDocuments:
+    def test_unknown_user_raises_not_found(self, service, mock_admin):
+        mock_admin.get_user.return_value = None
+        with pytest.raises(NotFoundError):
+            service.collect_documents('ghost', ['data'])
+
+    def test_missing_bucket_policy_is_absent(self, service, mock_admin):
+        mock_admin.get_user.return_value = make_user(policy_name='read-data')
+        mock_admin.get_policy.return_value = make_policy(READ_DATA)
+
+        documents = service.collect_documents('alice', ['data'])
+
+        assert documents['buckets'] == {'data': None}
+        result = service.evaluate(documents, [check('s3:GetObject')])
+        assert result['results'][0]['allowed'] is True
+
+    def test_missing_identity_policy_is_absent(self, service, mock_admin):
+        mock_admin.get_user.return_value = make_user(policy_name='gone')
+        mock_admin.get_policy.side_effect = RuntimeError('policy not found')
+
+        documents = service.collect_documents('alice', ['data'])
+
+        assert documents['identity'] == []
+
+    def test_failed_bucket_policy_fetch_fails(
+        self, service, mock_s3, mock_admin
+    ):
+        mock_admin.get_user.return_value = make_user()
+        mock_s3.get_bucket_policy.side_effect = client_error('InternalError')
+        with pytest.raises(UnexpectedError):
+            service.collect_documents('alice', ['data'])
+
+    def test_denied_bucket_policy_fetch_fails(
+        self, service, mock_s3, mock_admin
+    ):
+        mock_admin.get_user.return_value = make_user()
+        mock_s3.get_bucket_policy.side_effect = client_error('AccessDenied')
+        with pytest.raises(PermissionDeniedError):
+            service.collect_documents('alice', ['data'])
+
+    def test_failed_identity_policy_fetch_fails(self, service, mock_admin):
+        mock_admin.get_user.return_value = make_user(policy_name='read-data')
+        mock_admin.get_policy.side_effect = RuntimeError('connection reset')
+        with pytest.raises(UnexpectedError):
+            service.collect_documents('alice', ['data'])
+
+
+class TestEvaluate:
+    def test_group_policy_and_bucket_deny(self, service, mock_s3, mock_admin):
+        mock_admin.get_user.return_value = make_user(groups=['staff'])
+        mock_admin.get_policy_from_group.return_value = group_mapping(
+            'staff', ['read-data']
+        )
+        mock_admin.get_policy.return_value = make_policy(READ_DATA)
+        mock_s3.get_bucket_policy.side_effect = None
+        mock_s3.get_bucket_policy.return_value = DENY_PUT_FOR_ALICE
+
+        documents = service.collect_documents('alice', ['data'])
+        result = service.evaluate(
+            documents, [check('s3:GetObject'), check('s3:PutObject')]
+        )
+
+        get, put = result['results']
+        assert get['allowed'] is True
+        assert get['matched'][0]['source'] == 'group:staff/policy:read-data'
+        assert put['allowed'] is False
+        assert put['decision'] == 'explicit_deny'
+
+    def test_disabled_principal_is_denied(self, service, mock_admin):
+        mock_admin.get_user.return_value = make_user(
+            status='disabled', policy_name='read-data'
+        )
+        mock_admin.get_policy.return_value = make_policy(READ_DATA)
+
+        documents = service.collect_documents('alice', ['data'])
+        result = service.evaluate(documents, [check('s3:GetObject')])
+
+        assert documents['enabled'] is False
+        assert result['results'][0]['decision'] == 'principal_disabled'
+
+
+class TestValidateChecks:
+    def test_returns_distinct_buckets(self):
+        buckets = PermissionService.validate_checks(
+            [check('s3:GetObject'), check('s3:GetObject', bucket='logs')]
+        )
+        assert buckets == ['data', 'logs']
+
+    def test_missing_action_raises(self):
+        with pytest.raises(InconsistentDataError):
+            PermissionService.validate_checks([{'bucket': 'data'}])
+
+    def test_invalid_bucket_raises(self):
+        with pytest.raises(InconsistentDataError):
+            PermissionService.validate_checks([check('s3:GetObject', 'AB')])
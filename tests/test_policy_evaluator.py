@@ -0,0 +1,233 @@
+from mine_backend.services.policy_evaluator import (
+    PolicyEvaluator,
+    compile_policy,
+    s3_resource_arn,
+)
+
+
+READ_ONLY = {
+    'Version': '2012-10-17',
+    'Statement': [
+        {
+            'Effect': 'Allow',
+            'Action': ['s3:GetObject', 's3:ListBucket'],
+            'Resource': ['arn:aws:s3:::data', 'arn:aws:s3:::data/*'],
+        }
+    ],
+}
+
+DENY_SECRETS = {
+    'Version': '2012-10-17',
+    'Statement': [
+        {
+            'Sid': 'NoSecrets',
+            'Effect': 'Deny',
+            'Action': 's3:*',
+            'Resource': 'arn:aws:s3:::data/secret/*',
+        }
+    ],
+}
+
+
+def make_evaluator(*documents, buckets=None, principal='alice', enabled=True):
+    return PolicyEvaluator(
+        identity_policies=[(f'policy:{i}', d) for i, d in enumerate(documents)],
+        resource_policies=buckets,
+        principal=principal,
+        enabled=enabled,
+    )
+
+
+class TestResourceArn:
+    def test_bucket_only(self):
+        assert s3_resource_arn('data') == 'arn:aws:s3:::data'
+
+    def test_bucket_and_key(self):
+        assert s3_resource_arn('data', 'a/b.txt') == 'arn:aws:s3:::data/a/b.txt'
+
+
+class TestIdentityPolicies:
+    def test_no_policies_is_implicit_deny(self):
+        decision = make_evaluator().evaluate_s3('s3:GetObject', 'data', 'a')
+        assert decision.allowed is False
+        assert decision.decision == 'implicit_deny'
+
+    def test_matching_allow_grants(self):
+        decision = make_evaluator(READ_ONLY).evaluate_s3(
+            's3:GetObject', 'data', 'reports/q1.csv'
+        )
+        assert decision.allowed is True
+        assert decision.matched[0]['source'] == 'policy:0'
+
+    def test_actions_are_case_insensitive(self):
+        decision = make_evaluator(READ_ONLY).evaluate_s3(
+            'S3:GETOBJECT', 'data', 'a'
+        )
+        assert decision.allowed is True
+
+    def test_other_bucket_is_denied(self):
+        decision = make_evaluator(READ_ONLY).evaluate_s3(
+            's3:GetObject', 'other', 'a'
+        )
+        assert decision.allowed is False
+
+    def test_unlisted_action_is_denied(self):
+        decision = make_evaluator(READ_ONLY).evaluate_s3(
+            's3:PutObject', 'data', 'a'
+        )
+        assert decision.allowed is False
+
+    def test_explicit_deny_wins_over_allow(self):
+        evaluator = make_evaluator(READ_ONLY, DENY_SECRETS)
+        decision = evaluator.evaluate_s3('s3:GetObject', 'data', 'secret/key')
+        assert decision.allowed is False
+        assert decision.decision == 'explicit_deny'
+        assert decision.matched[0]['sid'] == 'NoSecrets'
+
+    def test_question_mark_wildcard(self):
+        policy = {
+            'Statement': [
+                {
+                    'Effect': 'Allow',
+                    'Action': 's3:GetObject',
+                    'Resource': 'arn:aws:s3:::data/log-?.txt',
+                }
+            ]
+        }
+        evaluator = make_evaluator(policy)
+        assert evaluator.evaluate_s3('s3:GetObject', 'data', 'log-1.txt').allowed
+        assert not evaluator.evaluate_s3(
+            's3:GetObject', 'data', 'log-10.txt'
+        ).allowed
+
+    def test_not_action(self):
+        policy = {
+            'Statement': [
+                {
+                    'Effect': 'Allow',
+                    'NotAction': 's3:DeleteObject',
+                    'Resource': '*',
+                }
+            ]
+        }
+        evaluator = make_evaluator(policy)
+        assert evaluator.evaluate_s3('s3:PutObject', 'data', 'a').allowed
+        assert not evaluator.evaluate_s3('s3:DeleteObject', 'data', 'a').allowed
+
+    def test_conditional_statement_is_reported_not_applied(self):
+        policy = {
+            'Statement': [
+                {
+                    'Effect': 'Allow',
+                    'Action': 's3:GetObject',
+                    'Resource': '*',
+                    'Condition': {'IpAddress': {'aws:SourceIp': '10.0.0.0/8'}},
+                }
+            ]
+        }
+        decision = make_evaluator(policy).evaluate_s3('s3:GetObject', 'data', 'a')
+        assert decision.allowed is False
+        assert len(decision.conditional) == 1
+
+    def test_disabled_principal_is_denied(self):
+        decision = make_evaluator(READ_ONLY, enabled=False).evaluate_s3(
+            's3:GetObject', 'data', 'a'
+        )
+        assert decision.allowed is False
+        assert decision.decision == 'principal_disabled'
+
+
+class TestBucketPolicies:
+    def test_public_bucket_policy_grants(self):
+        bucket_policy = {
+            'Statement': [
+                {
+                    'Effect': 'Allow',
+                    'Principal': {'AWS': ['*']},
+                    'Action': 's3:GetObject',
+                    'Resource': 'arn:aws:s3:::public/*',
+                }
+            ]
+        }
+        evaluator = make_evaluator(buckets={'public': bucket_policy})
+        assert evaluator.evaluate_s3('s3:GetObject', 'public', 'a').allowed
+
+    def test_principal_must_match(self):
+        bucket_policy = {
+            'Statement': [
+                {
+                    'Effect': 'Allow',
+                    'Principal': {'AWS': 'arn:aws:iam::*:user/bob'},
+                    'Action': 's3:GetObject',
+                    'Resource': 'arn:aws:s3:::shared/*',
+                }
+            ]
+        }
+        alice = make_evaluator(buckets={'shared': bucket_policy})
+        bob = make_evaluator(buckets={'shared': bucket_policy}, principal='bob')
+        assert not alice.evaluate_s3('s3:GetObject', 'shared', 'a').allowed
+        assert bob.evaluate_s3('s3:GetObject', 'shared', 'a').allowed
+
+    def test_bucket_deny_overrides_identity_allow(self):
+        bucket_policy = {
+            'Statement': [
+                {
+                    'Effect': 'Deny',
+                    'Principal': '*',
+                    'Action': 's3:GetObject',
+                    'Resource': 'arn:aws:s3:::data/*',
+                }
+            ]
+        }
+        evaluator = make_evaluator(READ_ONLY, buckets={'data': bucket_policy})
+        decision = evaluator.evaluate_s3('s3:GetObject', 'data', 'a')
+        assert decision.decision == 'explicit_deny'
+
+    def test_deny_on_user_arn_with_account(self):
+        bucket_policy = {
+            'Statement': [
+                {
+                    'Effect': 'Deny',
+                    'Principal': {
+                        'AWS': 'arn:aws:iam::123456789012:user/alice'
+                    },
+                    'Action': 's3:GetObject',
+                    'Resource': 'arn:aws:s3:::data/*',
+                }
+            ]
+        }
+        alice = make_evaluator(READ_ONLY, buckets={'data': bucket_policy})
+        bob = make_evaluator(
+            READ_ONLY, buckets={'data': bucket_policy}, principal='bob'
+        )
+        decision = alice.evaluate_s3('s3:GetObject', 'data', 'a')
+        assert decision.decision == 'explicit_deny'
+        assert bob.evaluate_s3('s3:GetObject', 'data', 'a').allowed
+
+
+class TestCompilation:
+    def test_invalid_statements_are_skipped(self):
+        compiled = compile_policy(
+            'p', {'Statement': ['nope', {'Effect': 'Maybe'}, READ_ONLY['Statement'][0]]}
+        )
+        assert len(compiled) == 1
+
+    def test_json_string_document(self):
+        import json
+
+        compiled = compile_policy('p', json.dumps(READ_ONLY))
+        assert len(compiled) == 1
+
+    def test_identical_documents_share_compilation(self):
+        assert compile_policy('p', READ_ONLY) is compile_policy('p', dict(READ_ONLY))
+
+    def test_evaluate_many_preserves_order(self):
+        evaluator = make_evaluator(READ_ONLY)
+        decisions = evaluator.evaluate_many(
+            [
+                ('s3:GetObject', 'data', 'a'),
+                ('s3:PutObject', 'data', 'a'),
+                ('s3:ListBucket', 'data', None),
+            ]
+        )
+        assert [d.allowed for d in decisions] == [True, False, True]
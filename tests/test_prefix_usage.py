@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services import prefix_usage_service
+from mine_backend.services.prefix_usage_service import (
+    PrefixUsageService,
+    aggregate,
+    summarize,
+)
+
+
+@dataclass
+class Obj:
+    key: str
+    size: int
+
+
+OBJECTS = [
+    Obj('readme.txt', 1),
+    Obj('logs/2025/a.log', 10),
+    Obj('logs/2026/b.log', 100),
+    Obj('logs/2026/c.log', 100),
+    Obj('img/x.png', 50),
+]
+
+
+def make_s3(objects):
+    s3 = MagicMock()
+
+    def list_objects(bucket, prefix=None, limit=1000, continuation_token=None):
+        result = MagicMock()
+        result.objects = [o for o in objects if o.key.startswith(prefix or '')]
+        result.is_truncated = False
+        result.next_continuation_token = None
+        return result
+
+    s3.list_objects.side_effect = list_objects
+    return s3
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=30):
+        self.values[key] = value
+
+
+class TestAggregate:
+    def test_depth_two(self):
+        direct, shards = aggregate(OBJECTS, '', '/', 2)
+        assert direct == [1, 1]
+        assert shards['logs/'] == {
+            'logs/': [210, 3],
+            'logs/2025/': [10, 1],
+            'logs/2026/': [200, 2],
+        }
+        assert shards['img/'] == {'img/': [50, 1]}
+
+    def test_relative_to_prefix(self):
+        direct, shards = aggregate(OBJECTS[1:4], 'logs/', '/', 1)
+        assert direct == [0, 0]
+        assert set(shards) == {'logs/2025/', 'logs/2026/'}
+
+
+def test_summarize_top_n():
+    direct, shards = aggregate(OBJECTS, '', '/', 2)
+    tree = {
+        'bucket': 'b',
+        'prefix': '',
+        'delimiter': '/',
+        'depth': 2,
+        'direct': direct,
+        'shards': shards,
+        'scanned_at': 0.0,
+    }
+    summary = summarize(tree, 2)
+    assert summary['total_size'] == 261
+    assert summary['total_objects'] == 5
+    assert [t['prefix'] for t in summary['top']] == ['logs/', 'logs/2026/']
+    assert summary['top'][1]['depth'] == 2
+
+
+class TestPrefixUsageService:
+    async def test_full_scan_then_cached(self):
+        s3 = make_s3(OBJECTS)
+        service = PrefixUsageService(s3, FakeCache())
+
+        first = await service.get_usage('my-bucket', depth=1)
+        calls = s3.list_objects.call_count
+        second = await service.get_usage('my-bucket', depth=1)
+
+        assert first['total_size'] == second['total_size'] == 261
+        assert s3.list_objects.call_count == calls
+
+    async def test_incremental_refresh_rescans_changed_shard(
+        self, monkeypatch
+    ):
+        objects = list(OBJECTS)
+        s3 = make_s3(objects)
+        service = PrefixUsageService(s3, FakeCache())
+        seq = AsyncMock(return_value=0)
+        monkeypatch.setattr(prefix_usage_service, '_current_seq', seq)
+        await service.get_usage('my-bucket', depth=1)
+
+        objects.append(Obj('img/y.png', 1000))
+        seq.return_value = 1
+        monkeypatch.setattr(
+            prefix_usage_service,
+            '_changes_since',
+            AsyncMock(return_value=['img/y.png']),
+        )
+        s3.list_objects.reset_mock()
+        usage = await service.get_usage('my-bucket', depth=1)
+
+        assert s3.list_objects.call_args.kwargs['prefix'] == 'img/'
+        assert usage['total_size'] == 1261
+        assert usage['top'][0] == {
+            'prefix': 'img/',
+            'depth': 1,
+            'size': 1050,
+            'objects': 2,
+        }
+
+    async def test_local_change_log_without_redis(self, monkeypatch):
+        from mine_backend.core import cache as cache_module
+
+        monkeypatch.setattr(cache_module, 'redis', None)
+        monkeypatch.setattr(cache_module, '_local', cache_module.LRUCache(16))
+        monkeypatch.setattr(prefix_usage_service, 'redis', None)
+        monkeypatch.setattr(prefix_usage_service, '_local_seq', {})
+        monkeypatch.setattr(prefix_usage_service, '_local_log', {})
+        objects = list(OBJECTS)
+        s3 = make_s3(objects)
+        cache = cache_module.CacheManager(user_id='u1', is_admin=True)
+        service = PrefixUsageService(s3, cache)
+        await service.get_usage('my-bucket', depth=1)
+
+        objects.append(Obj('img/y.png', 1000))
+        await prefix_usage_service.record_object_changes(
+            'my-bucket', 'img/y.png'
+        )
+        s3.list_objects.reset_mock()
+        usage = await service.get_usage('my-bucket', depth=1)
+
+        assert s3.list_objects.call_count == 1
+        assert s3.list_objects.call_args.kwargs['prefix'] == 'img/'
+        assert usage['total_size'] == 1261
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [{'depth': 0}, {'depth': 99}, {'top': 0}, {'delimiter': ''}],
+    )
+    async def test_invalid_arguments(self, kwargs):
+        service = PrefixUsageService(make_s3([]), FakeCache())
+        with pytest.raises(InconsistentDataError):
+            await service.get_usage('my-bucket', **kwargs)
+
+
+class FakePipeline:
+    def __init__(self):
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, *args))
+
+    async def execute(self):
+        return [True] * len(self.commands)
+
+
+async def test_record_changes_in_two_round_trips(monkeypatch):
+    redis = MagicMock()
+    redis.incrby = AsyncMock(return_value=12)
+    pipeline = FakePipeline()
+    redis.pipeline.return_value = pipeline
+    monkeypatch.setattr(prefix_usage_service, 'redis', redis)
+
+    await prefix_usage_service.record_object_changes('b', 'x', 'y', 'z')
+
+    redis.incrby.assert_awaited_once_with('usage:seq:b', 3)
+    assert [c[0] for c in pipeline.commands] == [
+        'zadd',
+        'zremrangebyrank',
+        'expire',
+    ]
+    assert pipeline.commands[0][2] == {'10:x': 10, '11:y': 11, '12:z': 12}
+
+
+async def test_mcp_writes_are_recorded(monkeypatch):
+    from mine_backend.mcp.tools import object_tools
+
+    recorded = AsyncMock()
+    service = MagicMock()
+    monkeypatch.setattr(object_tools, 'record_object_changes', recorded)
+    monkeypatch.setattr(
+        object_tools, 'build_object_service_from_token', lambda token: service
+    )
+
+    await object_tools.move_object('t', 'src', 'a.txt', 'dst', 'b.txt')
+
+    service.move_object.assert_called_once_with('src', 'a.txt', 'dst', 'b.txt')
+    assert [c.args for c in recorded.await_args_list] == [
+        ('src', 'a.txt'),
+        ('dst', 'b.txt'),
+    ]
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mine_backend.config import settings
+from mine_backend.services import presign
+from mine_backend.services.presign import presign_urls
+
+
+@pytest.fixture(autouse=True)
+def clear_url_cache():
+    presign._url_cache.clear()
+    yield
+    presign._url_cache.clear()
+
+
+def make_s3():
+    s3 = MagicMock()
+    s3.generate_download_url.side_effect = (
+        lambda bucket, key, **kwargs: f'https://s/{bucket}/{key}?sig'
+    )
+    s3.generate_upload_url.side_effect = (
+        lambda bucket, key, **kwargs: f'https://s/{bucket}/{key}?put'
+    )
+    return s3
+
+
+def test_signs_in_order():
+    s3 = make_s3()
+    urls = presign_urls(s3, 'bkt', ['b', 'a'], 'upload', 600, 'image/png')
+
+    assert [u['key'] for u in urls] == ['b', 'a']
+    assert urls[0]['url'] == 'https://s/bkt/b?put'
+    assert s3.generate_upload_url.call_args.kwargs['content_type'] == (
+        'image/png'
+    )
+
+
+def test_reuses_urls_within_the_window():
+    s3 = make_s3()
+    with patch.object(presign.time, 'time', return_value=1000.0):
+        first = presign_urls(s3, 'bkt', ['a'], scope='AK1')
+    with patch.object(presign.time, 'time', return_value=1010.0):
+        again = presign_urls(s3, 'bkt', ['a'], scope='AK1')
+
+    assert s3.generate_download_url.call_count == 1
+    assert again == first
+    assert again[0]['expires_at'] == 1000 + 3600
+
+
+def test_no_reuse_across_scopes_windows_or_without_scope():
+    s3 = make_s3()
+    window = settings.PRESIGN_CACHE_SECONDS
+    with patch.object(presign.time, 'time', return_value=0.0):
+        presign_urls(s3, 'bkt', ['a'], scope='AK1')
+        presign_urls(s3, 'bkt', ['a'], scope='AK2')
+        presign_urls(s3, 'bkt', ['a'])
+    with patch.object(presign.time, 'time', return_value=float(window)):
+        presign_urls(s3, 'bkt', ['a'], scope='AK1')
+
+    assert s3.generate_download_url.call_count == 4
+
+
+def test_short_expiry_is_not_cached():
+    s3 = make_s3()
+    for _ in range(2):
+        presign_urls(s3, 'bkt', ['a'], expires_in=60, scope='AK1')
+    assert s3.generate_download_url.call_count == 2
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from mine_backend.core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    RequestProfile,
+    StackSampler,
+)
+from mine_backend.exceptions.application import NotFoundError
+from mine_backend.services.session_service import issue_internal_token
+
+
+def blocking_driver_call():
+    time.sleep(0.05)
+
+
+async def slow(request):
+    blocking_driver_call()
+    await asyncio.sleep(0.05)
+    return PlainTextResponse('slow')
+
+
+async def fast(request):
+    return PlainTextResponse('fast')
+
+
+def make_client(tmp_path, threshold_ms=0.0):
+    store = ProfileStore(str(tmp_path), ttl=60, max_profiles=2)
+    app = Starlette(routes=[Route('/slow', slow), Route('/fast', fast)])
+    app.add_middleware(
+        ProfilingMiddleware,
+        header='X-Profile',
+        threshold_ms=threshold_ms,
+        sampler=StackSampler(0.002),
+        store=store,
+    )
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url='http://test'
+    )
+    return client, store
+
+
+def token(roles):
+    return issue_internal_token(
+        {'sub': 'u1', 'realm_access': {'roles': roles}},
+        {'access_key': 'a', 'secret_key': 's'},
+    )
+
+
+class TestRequestProfile:
+    async def test_samples_blocking_and_awaiting_frames(self):
+        async def handler():
+            blocking_driver_call()
+            await asyncio.sleep(0.05)
+
+        task = asyncio.ensure_future(handler())
+        await asyncio.sleep(0)
+        profile = RequestProfile(task, 0)
+        sampler = StackSampler(0.002)
+        sampler.start(profile)
+        await task
+        sampler.stop(profile)
+
+        folded = profile.folded()
+        assert profile.samples > 0
+        assert 'handler' in folded
+        for line in folded.splitlines():
+            stack, count = line.rsplit(' ', 1)
+            assert int(count) > 0
+            assert stack.split(';')[0].startswith('TestRequestProfile')
+
+
+class TestProfilingMiddleware:
+    async def test_threshold_keeps_only_slow_requests(self, tmp_path):
+        client, store = make_client(tmp_path, threshold_ms=40)
+        async with client:
+            assert (await client.get('/fast')).text == 'fast'
+            assert (await client.get('/slow')).text == 'slow'
+
+        profiles = await store.list()
+        assert len(profiles) == 1
+        meta = profiles[0]
+        assert meta['trigger'] == 'threshold'
+        assert meta['path'] == '/slow'
+        assert meta['status'] == 200
+        assert meta['duration_ms'] >= 40
+
+        document = await store.get(meta['id'])
+        assert 'blocking_driver_call' in document['folded']
+
+    async def test_header_from_admin_profiles_request(self, tmp_path):
+        client, store = make_client(tmp_path)
+        async with client:
+            response = await client.get(
+                '/fast',
+                headers={
+                    'X-Profile': '1',
+                    'Authorization': f'Bearer {token(["admin"])}',
+                },
+            )
+
+        profile_id = response.headers['x-profile']
+        assert (await store.get(profile_id))['meta']['trigger'] == 'header'
+
+    async def test_header_ignored_for_non_admin(self, tmp_path):
+        client, store = make_client(tmp_path)
+        async with client:
+            response = await client.get(
+                '/fast',
+                headers={
+                    'X-Profile': '1',
+                    'Authorization': f'Bearer {token(["viewer"])}',
+                },
+            )
+
+        assert 'x-profile' not in response.headers
+        assert await store.list() == []
+
+
+class TestProfileStore:
+    async def test_keeps_most_recent(self, tmp_path):
+        store = ProfileStore(str(tmp_path), ttl=60, max_profiles=2)
+        for i, profile_id in enumerate(
+            [
+                '00000000-0000-0000-0000-000000000001',
+                '00000000-0000-0000-0000-000000000002',
+                '00000000-0000-0000-0000-000000000003',
+            ]
+        ):
+            await store.save({'id': profile_id, 'created_at': i}, 'a;b 1\n')
+            time.sleep(0.01)
+
+        assert [m['created_at'] for m in await store.list()] == [2, 1]
+
+    async def test_unknown_or_malformed_id(self, tmp_path):
+        store = ProfileStore(str(tmp_path), ttl=60, max_profiles=2)
+        with pytest.raises(NotFoundError):
+            await store.get('00000000-0000-0000-0000-000000000009')
+        with pytest.raises(NotFoundError):
+            await store.get('../etc/passwd')
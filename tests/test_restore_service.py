@@ -0,0 +1,190 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mine_backend.exceptions.application import (
+    InconsistentDataError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+from mine_backend.services import restore_service
+from mine_backend.services.restore_service import (
+    RestoreJobService,
+    select_restore_actions,
+)
+
+
+def at(day):
+    return datetime(2026, 1, day, tzinfo=timezone.utc)
+
+
+def version(key, vid, day, latest=False, marker=False):
+    return {
+        'key': key,
+        'version_id': vid,
+        'is_latest': latest,
+        'last_modified': at(day),
+        'size': 1,
+        'is_delete_marker': marker,
+    }
+
+
+HISTORY = [
+    # Overwritten after day 10.
+    version('a', 'a2', 20, latest=True),
+    version('a', 'a1', 5),
+    # Untouched since day 1.
+    version('b', 'b1', 1, latest=True),
+    # Created after day 10.
+    version('c', 'c1', 15, latest=True),
+    # Deleted before day 10, then written again.
+    version('d', 'd3', 20, latest=True),
+    version('d', 'm', 8, marker=True),
+    version('d', 'd1', 2),
+]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+class FakeCache:
+    def __init__(self):
+        self.invalidate_prefix = AsyncMock()
+
+
+class FakeS3:
+    def __init__(self, rows):
+        self.rows = rows
+        self.restore_object_version = MagicMock()
+        self.delete_object = MagicMock()
+
+    def list_objects(
+        self, bucket, prefix=None, limit=100, continuation_token=None
+    ):
+        result = MagicMock()
+        result.objects = [
+            SimpleNamespace(key=k)
+            for k in sorted({r['key'] for r in self.rows})
+        ]
+        result.is_truncated = False
+        result.next_continuation_token = None
+        return result
+
+    def list_object_versions(self, bucket, key):
+        return [SimpleNamespace(**r) for r in self.rows if r['key'] == key]
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with patch.object(restore_service, 'redis', fake):
+        yield fake
+
+
+async def wait_for(service, job_id):
+    await asyncio.gather(*restore_service._running.values())
+    return await service.get_job(job_id)
+
+
+class TestSelectRestoreActions:
+    def test_actions_per_key(self):
+        actions = {
+            a['key']: (a['action'], a['version_id'])
+            for a in select_restore_actions(HISTORY, at(10))
+        }
+        assert actions == {
+            'a': ('restore', 'a1'),
+            'b': ('unchanged', None),
+            'c': ('skipped', None),
+            'd': ('delete', None),
+        }
+
+    def test_delete_newer(self):
+        actions = select_restore_actions(HISTORY, at(10), delete_newer=True)
+        assert {a['key']: a['action'] for a in actions}['c'] == 'delete'
+
+
+class TestRestoreJobService:
+    async def test_requires_redis(self):
+        service = RestoreJobService(FakeS3([]), FakeCache(), 'alice')
+        with patch.object(restore_service, 'redis', None):
+            with pytest.raises(ServiceUnavailableError):
+                await service.create_job('my-bucket', None, at(10))
+
+    async def test_future_time_rejected(self, fake_redis):
+        service = RestoreJobService(FakeS3([]), FakeCache(), 'alice')
+        with pytest.raises(InconsistentDataError):
+            await service.create_job(
+                'my-bucket', None, datetime(2999, 1, 1, tzinfo=timezone.utc)
+            )
+
+    async def test_restores_and_summarizes(self, fake_redis):
+        s3 = FakeS3(HISTORY)
+        cache = FakeCache()
+        service = RestoreJobService(s3, cache, 'alice')
+
+        job = await service.create_job('my-bucket', None, at(10))
+        job = await wait_for(service, job['id'])
+
+        assert job['status'] == 'completed'
+        assert job['checkpoint'] == 'd'
+        assert (job['restored'], job['deleted']) == (1, 1)
+        assert (job['unchanged'], job['skipped']) == (1, 1)
+        s3.restore_object_version.assert_called_once_with(
+            bucket='my-bucket', key='a', version_id='a1'
+        )
+        s3.delete_object.assert_called_once_with('my-bucket', 'd')
+        cache.invalidate_prefix.assert_awaited_with('objects:my-bucket:')
+
+    async def test_dry_run_changes_nothing(self, fake_redis):
+        s3 = FakeS3(HISTORY)
+        service = RestoreJobService(s3, FakeCache(), 'alice')
+
+        job = await service.create_job('my-bucket', None, at(10), dry_run=True)
+        job = await wait_for(service, job['id'])
+
+        assert job['restored'] == 1
+        s3.restore_object_version.assert_not_called()
+        s3.delete_object.assert_not_called()
+
+    async def test_resume_continues_after_checkpoint(self, fake_redis):
+        s3 = FakeS3(HISTORY)
+        service = RestoreJobService(s3, FakeCache(), 'alice')
+        job = await service.create_job('my-bucket', None, at(10))
+        await wait_for(service, job['id'])
+
+        with pytest.raises(InconsistentDataError):
+            await service.resume_job(job['id'])
+
+        # Pretend the worker died after the first key.
+        stored = await service.get_job(job['id'])
+        stored.update(status='running', checkpoint='a', updated_at=0)
+        fake_redis.data[f'restore:{job["id"]}'] = json.dumps(stored)
+        s3.restore_object_version.reset_mock()
+
+        await service.resume_job(job['id'])
+        job = await wait_for(service, job['id'])
+
+        assert job['status'] == 'completed'
+        s3.restore_object_version.assert_not_called()
+
+    async def test_jobs_are_private(self, fake_redis):
+        service = RestoreJobService(FakeS3([]), FakeCache(), 'alice')
+        job = await service.create_job('my-bucket', None, at(10))
+        await wait_for(service, job['id'])
+
+        other = RestoreJobService(FakeS3([]), FakeCache(), 'bob')
+        with pytest.raises(NotFoundError):
+            await other.get_job(job['id'])
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from mine_backend.exceptions.application import InconsistentDataError
+from mine_backend.services.storage_analytics_service import (
+    MiB,
+    StorageAnalyticsService,
+    analyze,
+)
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc).timestamp()
+
+
+@dataclass
+class Obj:
+    key: str
+    size: int
+    last_modified: Optional[datetime]
+    storage_class: Optional[str] = 'STANDARD'
+
+
+def days_ago(days):
+    return datetime.fromtimestamp(NOW - days * 86400, timezone.utc)
+
+
+OBJECTS = [
+    Obj('tiny.txt', 10, days_ago(0.5)),
+    Obj('photo.jpg', 2 * MiB, days_ago(10)),
+    Obj('video.mp4', 300 * MiB, days_ago(400), 'GLACIER'),
+    Obj('notes.md', 500, None, None),
+]
+
+
+def make_s3(objects):
+    s3 = MagicMock()
+    result = MagicMock()
+    result.objects = objects
+    result.is_truncated = False
+    result.next_continuation_token = None
+    s3.list_objects.return_value = result
+    return s3
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=30):
+        self.values[key] = value
+
+
+def counts(histogram):
+    return [b['objects'] for b in histogram]
+
+
+class TestAnalyze:
+    def test_size_histogram(self):
+        result = analyze(OBJECTS, NOW)
+        assert counts(result['size_histogram']) == [2, 0, 0, 1, 0, 1, 0, 0]
+        assert result['size_histogram'][0] == {
+            'min': 0,
+            'max': 1024,
+            'objects': 2,
+            'size': 510,
+        }
+
+    def test_age_histogram(self):
+        result = analyze(OBJECTS, NOW)
+        assert counts(result['age_histogram']) == [1, 0, 1, 0, 0, 0, 1, 0]
+        assert result['unknown_age'] == {'size': 500, 'objects': 1}
+
+    def test_storage_classes_largest_first(self):
+        classes = analyze(OBJECTS, NOW)['storage_classes']
+        assert [c['storage_class'] for c in classes] == [
+            'GLACIER',
+            'STANDARD',
+        ]
+        assert classes[1]['objects'] == 3
+
+    def test_top_largest(self):
+        result = analyze(OBJECTS, NOW, top=2)
+        assert [o['key'] for o in result['largest']] == [
+            'video.mp4',
+            'photo.jpg',
+        ]
+        assert result['total_objects'] == 4
+
+
+class TestStorageAnalyticsService:
+    async def test_cached_scan_is_reused(self):
+        s3 = make_s3(OBJECTS)
+        service = StorageAnalyticsService(s3, FakeCache())
+
+        first = await service.get_analytics('my-bucket', top=1)
+        second = await service.get_analytics('my-bucket', top=3)
+
+        assert s3.list_objects.call_count == 1
+        assert len(first['largest']) == 1
+        assert len(second['largest']) == 3
+        assert second['scanned_at'] == first['scanned_at']
+
+    async def test_cached_without_redis(self, monkeypatch):
+        from mine_backend.core import cache as cache_module
+
+        monkeypatch.setattr(cache_module, 'redis', None)
+        monkeypatch.setattr(cache_module, '_local', cache_module.LRUCache(16))
+        s3 = make_s3(OBJECTS)
+        cache = cache_module.CacheManager(user_id='u1', is_admin=True)
+        service = StorageAnalyticsService(s3, cache)
+
+        await service.get_analytics('my-bucket')
+        await service.get_analytics('my-bucket')
+
+        assert s3.list_objects.call_count == 1
+
+    async def test_refresh_scans_again(self):
+        s3 = make_s3(OBJECTS)
+        service = StorageAnalyticsService(s3, FakeCache())
+        await service.get_analytics('my-bucket')
+        await service.get_analytics('my-bucket', refresh=True)
+        assert s3.list_objects.call_count == 2
+
+    async def test_invalid_top(self):
+        service = StorageAnalyticsService(make_s3([]), FakeCache())
+        with pytest.raises(InconsistentDataError):
+            await service.get_analytics('my-bucket', top=0)
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mcp.server.fastmcp import FastMCP
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from mine_backend.core.admin_executor import AdminExecutor, AsyncAdmin
+from mine_backend.core.metrics import InstrumentedClient
+from mine_backend.core.tracing import span, traced_tool, tracing_middleware
+
+
+_exporter = InMemorySpanExporter()
+_provider = TracerProvider()
+_provider.add_span_processor(SimpleSpanProcessor(_exporter))
+trace.set_tracer_provider(_provider)
+
+
+@pytest.fixture
+def spans():
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+
+class FakeDriver:
+    def list_users(self):
+        return ['alice']
+
+
+def test_span_drops_none_attributes(spans):
+    with span('work', present='yes', missing=None):
+        pass
+    (finished,) = spans.get_finished_spans()
+    assert finished.name == 'work'
+    assert dict(finished.attributes) == {'present': 'yes'}
+
+
+def test_driver_calls_are_child_spans(spans):
+    client = InstrumentedClient(FakeDriver(), 'admin')
+    with span('parent'):
+        client.list_users()
+    child, parent = spans.get_finished_spans()
+    assert child.name == 'admin.list_users'
+    assert child.parent.span_id == parent.context.span_id
+
+
+async def test_executor_threads_keep_the_parent_span(spans):
+    executor = AdminExecutor(workers=1, max_queue=0, timeout=5)
+    admin = AsyncAdmin(InstrumentedClient(FakeDriver(), 'admin'), executor)
+    try:
+        with span('request'):
+            await admin.list_users()
+    finally:
+        executor.shutdown()
+    child, parent = spans.get_finished_spans()
+    assert child.parent.span_id == parent.context.span_id
+
+
+def test_middleware_names_span_after_route(spans):
+    app = FastAPI()
+    app.middleware('http')(tracing_middleware)
+
+    @app.get('/buckets/{bucket}')
+    async def get_bucket(bucket: str):
+        return {'bucket': bucket}
+
+    TestClient(app).get('/buckets/data')
+    server = [s for s in spans.get_finished_spans() if s.kind == trace.SpanKind.SERVER]
+    assert server[0].name == 'GET /buckets/{bucket}'
+    assert server[0].attributes['http.response.status_code'] == 200
+
+
+def test_middleware_continues_incoming_trace(spans):
+    app = FastAPI()
+    app.middleware('http')(tracing_middleware)
+
+    @app.get('/ping')
+    async def ping():
+        return {}
+
+    trace_id = '4bf92f3577b34da6a3ce929d0e0e4736'
+    TestClient(app).get(
+        '/ping', headers={'traceparent': f'00-{trace_id}-00f067aa0ba902b7-01'}
+    )
+    server = [s for s in spans.get_finished_spans() if s.kind == trace.SpanKind.SERVER]
+    assert format(server[0].context.trace_id, '032x') == trace_id
+
+
+async def test_traced_tool_keeps_signature_and_records_span(spans):
+    mcp = FastMCP('test')
+
+    def echo(token: str, text: str) -> str:
+        """Echo text back."""
+        return text
+
+    mcp.tool()(traced_tool(echo))
+    (tool,) = await mcp.list_tools()
+    assert tool.name == 'echo'
+    assert set(tool.inputSchema['properties']) == {'token', 'text'}
+
+    await mcp.call_tool('echo', {'token': 't', 'text': 'hi'})
+    names = [s.name for s in spans.get_finished_spans()]
+    assert 'mcp.tool echo' in names
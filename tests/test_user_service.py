@@ -87,3 +87,32 @@ class TestUserServiceErrorPropagation:
         mock_admin.create_user.side_effect = RuntimeError('already exists')
         with pytest.raises(AlreadyExistsError):
             service.create_user('alice', 'pw')
+
+
+class TestUserServiceBulk:
+    async def test_bulk_create_reports_each_user(self, service, mock_admin):
+        def create(username, password):
+            if username == 'bob':
+                raise RuntimeError('already exists')
+            return {'created': username}
+
+        mock_admin.create_user.side_effect = create
+        result = await service.bulk_create_users(
+            [
+                {'username': 'alice', 'password': 'pw1'},
+                {'username': 'bob', 'password': 'pw2'},
+            ]
+        )
+        assert result['succeeded'] == 1
+        assert result['failed'] == 1
+        assert result['results'][0]['item'] == 'alice'
+        assert result['results'][1]['error']['code'] == 'ALREADY_EXISTS'
+
+    async def test_bulk_disable_calls_admin_per_user(self, service, mock_admin):
+        result = await service.bulk_disable_users(['alice', 'bob'])
+        assert result['succeeded'] == 2
+        assert mock_admin.disable_user.call_count == 2
+
+    async def test_bulk_delete_rejects_empty_list(self, service):
+        with pytest.raises(InconsistentDataError):
+            await service.bulk_delete_users([])
@@ -0,0 +1,113 @@
+from mine_backend.services import lifecycle_validator, policy_validator
+from mine_backend.services.lifecycle_validator import (
+    validate_lifecycle,
+    validate_lifecycle_detailed,
+)
+from mine_backend.services.policy_validator import (
+    validate_policy,
+    validate_policy_detailed,
+)
+from mine_backend.services.validation import pointer
+
+
+def make_statement(sid, effect='Allow'):
+    return {
+        'Sid': sid,
+        'Effect': effect,
+        'Principal': '*',
+        'Action': 's3:GetObject',
+        'Resource': 'arn:aws:s3:::data/*',
+    }
+
+
+def make_rule(rule_id, days=30):
+    return {
+        'ID': rule_id,
+        'Status': 'Enabled',
+        'Filter': {'Prefix': f'{rule_id}/'},
+        'Expiration': {'Days': days},
+    }
+
+
+class TestPointer:
+    def test_segments_are_joined(self):
+        assert pointer('Statement', 2, 'Effect') == '/Statement/2/Effect'
+
+    def test_special_characters_are_escaped(self):
+        assert pointer('a/b', 'c~d') == '/a~1b/c~0d'
+
+
+class TestPolicyValidator:
+    def test_valid_policy_has_no_errors(self):
+        assert validate_policy({'Statement': [make_statement('a')]}) == []
+
+    def test_error_carries_pointer(self):
+        errors = validate_policy_detailed(
+            {'Statement': [make_statement('a'), make_statement('b', 'Maybe')]}
+        )
+        assert [e.pointer for e in errors] == ['/Statement/1/Effect']
+        assert errors[0].message.startswith('Statement "b":')
+
+    def test_list_item_pointer(self):
+        stmt = make_statement('a')
+        stmt['Action'] = ['s3:GetObject', 3]
+        errors = validate_policy_detailed({'Statement': [stmt]})
+        assert errors[0].pointer == '/Statement/0/Action/1'
+
+    def test_invalid_sid_uses_positional_label(self):
+        stmt = make_statement(5)
+        errors = validate_policy({'Statement': [stmt]})
+        assert errors == ['Statement[0]: "Sid" must be a string.']
+
+    def test_same_statement_at_other_position_keeps_its_label(self):
+        bad = {'Effect': 'Allow'}
+        first = validate_policy({'Statement': [bad]})
+        second = validate_policy({'Statement': [make_statement('a'), bad]})
+        assert first[0].startswith('Statement[0]:')
+        assert second[0].startswith('Statement[1]:')
+
+    def test_repeated_documents_are_served_from_cache(self):
+        policy_validator._document_cache.clear()
+        document = {'Statement': [make_statement('cached')]}
+        validate_policy(document)
+        validate_policy(document)
+        assert policy_validator._document_cache.hits == 1
+
+    def test_unhashable_effect_is_reported(self):
+        stmt = make_statement('a')
+        stmt['Effect'] = {'x': 1}
+        assert validate_policy_detailed({'Statement': [stmt]})[0].pointer == (
+            '/Statement/0/Effect'
+        )
+
+
+class TestLifecycleValidator:
+    def test_valid_configuration_has_no_errors(self):
+        assert validate_lifecycle({'Rules': [make_rule('a')]}) == []
+
+    def test_repeated_documents_are_served_from_cache(self):
+        lifecycle_validator._document_cache.clear()
+        document = {'Rules': [make_rule('cached')]}
+        validate_lifecycle(document)
+        validate_lifecycle(document)
+        assert lifecycle_validator._document_cache.hits == 1
+
+    def test_error_carries_pointer(self):
+        errors = validate_lifecycle_detailed(
+            {'Rules': [make_rule('a'), make_rule('b', days=0)]}
+        )
+        assert errors[0].pointer == '/Rules/1/Expiration/Days'
+        assert errors[0].message.startswith('Rule "b":')
+
+    def test_duplicate_ids_are_detected(self):
+        errors = validate_lifecycle({'Rules': [make_rule('a'), make_rule('a')]})
+        assert errors == ['Rule[1]: Duplicate rule ID "a".']
+
+    def test_transition_suffix_in_label(self):
+        rule = make_rule('a')
+        rule['Transitions'] = [{'Days': 10}]
+        errors = validate_lifecycle_detailed({'Rules': [rule]})
+        assert errors[0].pointer == '/Rules/0/Transitions/0'
+        assert errors[0].message == (
+            'Rule "a".Transitions[0]: "StorageClass" is required.'
+        )
@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from mine_backend.services import version_purge
+from mine_backend.services.version_purge import (
+    purge_versions,
+    select_purgeable,
+)
+
+
+NOW = datetime(2026, 1, 31, tzinfo=timezone.utc)
+
+
+def version(key, vid, day, latest=False, size=10, marker=False):
+    return {
+        'key': key,
+        'version_id': vid,
+        'is_latest': latest,
+        'last_modified': datetime(2026, 1, day, tzinfo=timezone.utc),
+        'size': size,
+        'is_delete_marker': marker,
+    }
+
+
+HISTORY = [
+    version('a', 'a4', 30, latest=True),
+    version('a', 'a3', 20),
+    version('a', 'a2', 10),
+    version('a', 'a1', 1),
+    version('b', 'b1', 1, latest=True),
+]
+
+
+def ids(rows):
+    return [r['version_id'] for r in rows]
+
+
+class TestSelectPurgeable:
+    def test_all_noncurrent_by_default(self):
+        assert ids(select_purgeable(HISTORY)) == ['a3', 'a2', 'a1']
+
+    def test_keep_newest_noncurrent(self):
+        assert ids(select_purgeable(HISTORY, keep=2)) == ['a1']
+
+    def test_age_counts_from_replacement(self):
+        # a3 was replaced on day 30, a2 on day 20, a1 on day 10.
+        selected = select_purgeable(HISTORY, older_than_days=5, now=NOW)
+        assert ids(selected) == ['a2', 'a1']
+
+    def test_orphaned_delete_marker_goes_too(self):
+        rows = [
+            version('c', 'm', 5, latest=True, marker=True),
+            version('c', 'c1', 1),
+        ]
+        assert ids(select_purgeable(rows)) == ['c1', 'm']
+        assert ids(select_purgeable(rows, keep=1)) == []
+
+    def test_string_timestamps(self):
+        rows = [
+            {**HISTORY[0], 'last_modified': '2026-01-30T00:00:00Z'},
+            {**HISTORY[1], 'last_modified': '2026-01-20T00:00:00+00:00'},
+        ]
+        assert ids(select_purgeable(rows)) == ['a3']
+
+
+class TestListVersionRows:
+    def test_pages_include_keys_behind_a_delete_marker(self):
+        def entry(key, vid, latest=False, size=None):
+            listed = {
+                'Key': key,
+                'VersionId': vid,
+                'IsLatest': latest,
+                'LastModified': NOW,
+            }
+            if size is not None:
+                listed['Size'] = size
+            return listed
+
+        client = MagicMock()
+        client.list_object_versions.side_effect = [
+            {
+                'Versions': [
+                    entry('a', 'a1', True, 5),
+                    entry('b', 'b1', size=7),
+                ],
+                'DeleteMarkers': [entry('b', 'bm', True)],
+                'IsTruncated': True,
+                'NextKeyMarker': 'b',
+                'NextVersionIdMarker': 'b1',
+            },
+            {'Versions': [entry('b', 'b0', size=3)], 'IsTruncated': False},
+        ]
+
+        rows = list(version_purge.list_version_rows(client, 'bkt', 'p/'))
+
+        assert [r['key'] for r in rows] == ['a', 'b', 'b', 'b']
+        assert rows[2]['is_delete_marker'] and rows[2]['size'] == 0
+        assert client.list_object_versions.call_args_list[1].kwargs == {
+            'Bucket': 'bkt',
+            'Prefix': 'p/',
+            'KeyMarker': 'b',
+            'VersionIdMarker': 'b1',
+        }
+        assert ids(select_purgeable(rows)) == ['b1', 'b0', 'bm']
+
+
+class TestPurgeVersions:
+    def test_dry_run_deletes_nothing(self):
+        client = MagicMock()
+        report = purge_versions(client, 'bkt', HISTORY[1:4])
+
+        client.delete_objects.assert_not_called()
+        assert report['selected'] == 3
+        assert report['reclaimed_bytes'] == 30
+        assert report['deleted'] == 0
+        assert ids(report['sample']) == ['a3', 'a2', 'a1']
+
+    def test_batches_and_per_version_errors(self):
+        client = MagicMock()
+        client.delete_objects.side_effect = [
+            {
+                'Errors': [
+                    {
+                        'Key': 'a',
+                        'VersionId': 'a2',
+                        'Code': 'AccessDenied',
+                        'Message': 'Access Denied',
+                    }
+                ]
+            },
+            {},
+        ]
+        rows = HISTORY[1:4] + [version('c', 'm', 5, marker=True)]
+
+        with patch.object(version_purge, 'PURGE_BATCH_SIZE', 2):
+            report = purge_versions(client, 'bkt', iter(rows), dry_run=False)
+
+        assert client.delete_objects.call_count == 2
+        first = client.delete_objects.call_args_list[0].kwargs
+        assert first['Delete']['Objects'] == [
+            {'Key': 'a', 'VersionId': 'a3'},
+            {'Key': 'a', 'VersionId': 'a2'},
+        ]
+        assert report['deleted'] == 3
+        assert report['failed'] == 1
+        assert report['delete_markers'] == 1
+        assert report['reclaimed_bytes'] == 20
+        assert report['errors'][0]['version_id'] == 'a2'
+        assert report['errors'][0]['code'] == 'AccessDenied'
+
+    def test_failed_batch_is_reported(self):
+        client = MagicMock()
+        client.delete_objects.side_effect = RuntimeError('boom')
+
+        report = purge_versions(client, 'bkt', HISTORY[1:3], dry_run=False)
+
+        assert report['failed'] == 2
+        assert report['deleted'] == 0
+        assert report['errors'][0]['code'] == 'UNEXPECTED_ERROR'